@@ -1,6 +1,7 @@
 """Application lifespan management."""
 
 import asyncio
+import os
 from contextlib import asynccontextmanager
 from typing import Any
 
@@ -57,9 +58,19 @@ async def lifespan(app: FastAPI):
         threads=app.state.thread_repo,
     )
 
+    # @@@event-fanout — opt-in cross-process fan-out so several workers can serve the same streams.
+    app.state.event_fanout = None
+    app.state.thread_fanout_unsubs: dict[str, Any] = {}
+    broker_socket = os.getenv("LEON_EVENT_BROKER_SOCKET")
+    if broker_socket:
+        from backend.web.services.event_broker import EventBrokerClient
+        broker_client = EventBrokerClient(broker_socket)
+        await broker_client.connect()
+        app.state.event_fanout = broker_client
+
     from backend.web.services.chat_events import ChatEventBus
     from backend.web.services.typing_tracker import TypingTracker
-    app.state.chat_event_bus = ChatEventBus()
+    app.state.chat_event_bus = ChatEventBus(fanout=app.state.event_fanout)
     app.state.typing_tracker = TypingTracker(app.state.chat_event_bus)
 
     from storage.providers.sqlite.contact_repo import SQLiteContactRepo
@@ -162,3 +173,7 @@ async def lifespan(app: FastAPI):
                 agent.close()
             except Exception as e:
                 print(f"[web] Agent cleanup error: {e}")
+
+        # Cleanup: disconnect from the cross-process event broker
+        if app.state.event_fanout is not None:
+            await app.state.event_fanout.close()
@@ -37,6 +37,30 @@ async def list_chats(
     return app.state.chat_service.list_chats_for_entity(entity_id)
 
 
+@router.get("/mentions")
+async def list_unread_mentions(
+    entity_id: Annotated[str, Depends(get_current_entity_id)],
+    app: Annotated[Any, Depends(get_app)],
+    limit: int = Query(50, ge=1, le=200),
+):
+    """Unread @mentions of the current user's entity across all chats: per-chat badge counts + newest messages."""
+    message_repo = app.state.chat_message_repo
+    msgs = message_repo.list_unread_mentions(entity_id, limit=limit)
+    senders = {e.id: e for e in app.state.entity_repo.get_by_ids(list({m.sender_entity_id for m in msgs}))}
+    return {
+        "counts": message_repo.count_unread_mentions(entity_id),
+        "messages": [
+            {
+                "id": m.id, "chat_id": m.chat_id, "sender_entity_id": m.sender_entity_id,
+                "sender_name": senders[m.sender_entity_id].name if m.sender_entity_id in senders else "unknown",
+                "content": m.content,
+                "created_at": m.created_at,
+            }
+            for m in msgs
+        ],
+    }
+
+
 @router.post("")
 async def create_chat(
     body: CreateChatBody,
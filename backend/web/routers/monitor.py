@@ -59,6 +59,16 @@ def health_snapshot():
     return monitor_service.runtime_health_snapshot()
 
 
+@router.get("/web-search-cache")
+def web_search_cache_snapshot():
+    return monitor_service.web_search_cache_snapshot()
+
+
+@router.get("/row-cache")
+def row_cache_snapshot():
+    return monitor_service.row_cache_snapshot()
+
+
 @router.get("/resources")
 def resources_overview():
     return get_resource_overview_snapshot()
@@ -19,7 +19,7 @@ from backend.web.services.agent_pool import get_or_create_agent, resolve_thread_
 from backend.web.services.event_buffer import ThreadEventBuffer
 from backend.web.services.sandbox_service import destroy_thread_resources_sync
 from backend.web.services.streaming_service import (
-    get_or_create_thread_buffer,
+    create_replaying_thread_buffer,
     observe_run_events,
     observe_thread_events,
     start_agent_run,
@@ -219,6 +219,9 @@ async def delete_thread(
     app.state.thread_sandbox.pop(thread_id, None)
     app.state.thread_cwd.pop(thread_id, None)
     app.state.thread_event_buffers.pop(thread_id, None)
+    fanout_unsub = getattr(app.state, "thread_fanout_unsubs", {}).pop(thread_id, None)
+    if fanout_unsub is not None:
+        fanout_unsub()
     app.state.queue_manager.clear_all(thread_id)
 
     # Remove per-thread Agent from pool
@@ -492,26 +495,33 @@ async def stream_thread_events(
         )
 
     # No buffer yet — create one and optionally replay from SQLite
-    thread_buf = get_or_create_thread_buffer(app, thread_id)
-
-    if after > 0:
-        # Replay from SQLite for reconnection
-        from backend.web.services.event_store import get_latest_run_id, read_events_after
+    thread_buf, release_remote = create_replaying_thread_buffer(app, thread_id)
+    replayed_seqs: set[int] = set()
+    try:
+        if after > 0:
+            # Replay from SQLite for reconnection
+            from backend.web.services.event_store import get_latest_run_id, read_events_after
 
-        run_id = await get_latest_run_id(thread_id)
-        if run_id:
-            events = await read_events_after(thread_id, run_id, after)
-            for ev in events:
-                seq = ev.get("seq", 0)
-                data_str = ev.get("data", "{}")
-                try:
-                    data = json.loads(data_str) if isinstance(data_str, str) else data_str
-                except (json.JSONDecodeError, TypeError):
-                    data = {}
-                if isinstance(data, dict):
-                    data["_seq"] = seq
-                    data_str = json.dumps(data, ensure_ascii=False)
-                await thread_buf.put({"event": ev["event"], "data": data_str})
+            run_id = await get_latest_run_id(thread_id)
+            if run_id:
+                events = await read_events_after(thread_id, run_id, after)
+                for ev in events:
+                    seq = ev.get("seq", 0)
+                    data_str = ev.get("data", "{}")
+                    try:
+                        data = json.loads(data_str) if isinstance(data_str, str) else data_str
+                    except (json.JSONDecodeError, TypeError):
+                        data = {}
+                    if isinstance(data, dict):
+                        data["_seq"] = seq
+                        data_str = json.dumps(data, ensure_ascii=False)
+                    # @@@replay-local - persisted events were published when first produced; replay them
+                    # into this worker's buffer only, never back out through the broker.
+                    thread_buf.deliver({"event": ev["event"], "data": data_str})
+                    replayed_seqs.add(seq)
+    finally:
+        # Live events from other workers that arrived during the replay go after it.
+        release_remote(replayed_seqs)
 
     return EventSourceResponse(
         observe_thread_events(thread_buf, after=after),
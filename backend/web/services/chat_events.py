@@ -3,18 +3,34 @@
 import asyncio
 import logging
 
+from backend.web.services.event_broker import EventFanout, Unsubscribe, chat_topic
+
 logger = logging.getLogger(__name__)
 
 
 class ChatEventBus:
-    """Per-chat pub/sub using asyncio.Queue per subscriber."""
+    """Per-chat pub/sub using asyncio.Queue per subscriber.
+
+    With a ``fanout`` backend attached, published events are also relayed to
+    other worker processes, and their events are delivered to local subscribers.
+    ``publish`` is safe to call from tool threads.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, fanout: EventFanout | None = None) -> None:
         self._subscribers: dict[str, list[asyncio.Queue]] = {}
+        self._fanout = fanout
+        self._remote_unsubs: dict[str, Unsubscribe] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
 
     def subscribe(self, chat_id: str) -> asyncio.Queue:
+        self._loop = asyncio.get_running_loop()
         queue: asyncio.Queue = asyncio.Queue(maxsize=256)
-        self._subscribers.setdefault(chat_id, []).append(queue)
+        subs = self._subscribers.setdefault(chat_id, [])
+        if not subs and self._fanout is not None:
+            self._remote_unsubs[chat_id] = self._fanout.subscribe(
+                chat_topic(chat_id), lambda event: self._deliver(chat_id, event)
+            )
+        subs.append(queue)
         return queue
 
     def unsubscribe(self, chat_id: str, queue: asyncio.Queue) -> None:
@@ -23,9 +39,32 @@ class ChatEventBus:
             subs.remove(queue)
         if not subs:
             self._subscribers.pop(chat_id, None)
+            remote_unsub = self._remote_unsubs.pop(chat_id, None)
+            if remote_unsub is not None:
+                remote_unsub()
 
     def publish(self, chat_id: str, event: dict) -> None:
         """Publish event to all subscribers."""
+        self._deliver(chat_id, event)
+        if self._fanout is not None:
+            self._fanout.publish(chat_topic(chat_id), event)
+
+    def _deliver(self, chat_id: str, event: dict) -> None:
+        # @@@chat-bus-thread-safe - blocking chat tools publish from ToolRunner pool threads;
+        # asyncio.Queue is loop-bound, so hop onto the subscribers' loop first.
+        loop = self._loop
+        if loop is not None and chat_id in self._subscribers:
+            try:
+                in_loop = asyncio.get_running_loop() is loop
+            except RuntimeError:
+                in_loop = False
+            if not in_loop:
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(self._put, chat_id, event)
+                return
+        self._put(chat_id, event)
+
+    def _put(self, chat_id: str, event: dict) -> None:
         for queue in self._subscribers.get(chat_id, []):
             try:
                 queue.put_nowait(event)
@@ -5,16 +5,20 @@ from __future__ import annotations
 import logging
 import time
 import uuid
-from typing import Any, Callable
+from collections.abc import Callable
+from typing import Any
 
 from storage.contracts import (
     ChatEntityRepo,
+    ChatEntityRow,
     ChatMessageRepo,
     ChatMessageRow,
     ChatRepo,
     ChatRow,
+    DeliveryAction,
     DeliveryResolver,
     EntityRepo,
+    EntityRow,
     MemberRepo,
 )
 
@@ -110,80 +114,144 @@ class ChatService:
         mentioned_entity_ids: list[str] | None = None,
         signal: str | None = None,
     ) -> None:
-        """For each non-sender agent entity in the chat, deliver to their brain thread."""
-        mentions = set(mentioned_entity_ids or [])
-        participants = self._chat_entities.list_entities(chat_id)
-        sender_entity = self._entities.get_by_id(sender_entity_id)
+        """For each non-sender agent entity in the chat, deliver to their brain thread.
+
+        @@@delivery-plan - participants, entities, the sender's member and every recipient's
+        delivery action are loaded in bulk once per message (_plan_delivery). The delivery
+        function only schedules the wake-up; its concurrency is bounded where the work runs
+        (core.agents.communication.delivery).
+        """
+        targets, sender_name, sender_avatar_url = self._plan_delivery(
+            chat_id, sender_entity_id, mentioned_entity_ids
+        )
+        if not targets:
+            return
+        if not self._delivery_fn:
+            for entity in targets:
+                logger.warning("[deliver] NO delivery_fn for %s", entity.id)
+            return
+
+        for entity in targets:
+            logger.debug("[deliver] → %s (thread=%s) from=%s", entity.id, entity.thread_id, sender_name)
+            try:
+                self._delivery_fn(
+                    entity, content, sender_name, chat_id, sender_entity_id, sender_avatar_url, signal=signal
+                )
+            except Exception:
+                logger.exception("Failed to deliver chat message to entity %s", entity.id)
+
+    def _plan_delivery(
+        self, chat_id: str, sender_entity_id: str, mentioned_entity_ids: list[str] | None,
+    ) -> tuple[list[EntityRow], str, str | None]:
+        """(agent entities to deliver to, sender name, sender avatar url) for one message."""
+        participants = [
+            ce for ce in self._chat_entities.list_entities(chat_id) if ce.entity_id != sender_entity_id
+        ]
+        entity_ids = [sender_entity_id, *(ce.entity_id for ce in participants)]
+        entities = {e.id: e for e in self._entities.get_by_ids(entity_ids)}
+        sender_entity = entities.get(sender_entity_id)
         sender_name = sender_entity.name if sender_entity else "unknown"
         # @@@sender-avatar — compute once for all recipients
         sender_avatar_url = None
         if sender_entity:
             from backend.web.utils.serializers import avatar_url
             sender_member = self._members.get_by_id(sender_entity.member_id) if self._members else None
-            sender_avatar_url = avatar_url(sender_entity.member_id, bool(sender_member.avatar if sender_member else None))
+            sender_avatar_url = avatar_url(
+                sender_entity.member_id, bool(sender_member.avatar if sender_member else None)
+            )
 
+        recipients = []
         for ce in participants:
-            if ce.entity_id == sender_entity_id:
-                continue
-            entity = self._entities.get_by_id(ce.entity_id)
+            entity = entities.get(ce.entity_id)
             if not entity or entity.type != "agent" or not entity.thread_id:
-                logger.debug("[deliver] SKIP %s type=%s thread=%s", ce.entity_id, getattr(entity, "type", None), getattr(entity, "thread_id", None))
-                continue
-            # @@@delivery-strategy-gate — check contact block/mute + chat mute
-            # @@@mention-override — mentioned entities skip mute (but not block)
-            if self._delivery_resolver:
-                from storage.contracts import DeliveryAction
-                is_mentioned = ce.entity_id in mentions
-                action = self._delivery_resolver.resolve(
-                    ce.entity_id, chat_id, sender_entity_id, is_mentioned=is_mentioned,
+                logger.debug(
+                    "[deliver] SKIP %s type=%s thread=%s",
+                    ce.entity_id, getattr(entity, "type", None), getattr(entity, "thread_id", None),
                 )
+                continue
+            recipients.append(ce)
+
+        # @@@delivery-strategy-gate — check contact block/mute + chat mute
+        # @@@mention-override — mentioned entities skip mute (but not block)
+        if self._delivery_resolver and recipients:
+            mentions = set(mentioned_entity_ids or [])
+            actions = self._resolve_actions(recipients, chat_id, sender_entity_id, mentions)
+            allowed = []
+            for ce in recipients:
+                action = actions[ce.entity_id]
                 if action != DeliveryAction.DELIVER:
-                    logger.info("[deliver] POLICY %s for %s (sender=%s chat=%s mentioned=%s)", action.value, ce.entity_id, sender_entity_id, chat_id[:8], is_mentioned)
+                    logger.info(
+                        "[deliver] POLICY %s for %s (sender=%s chat=%s mentioned=%s)",
+                        action.value, ce.entity_id, sender_entity_id, chat_id[:8], ce.entity_id in mentions,
+                    )
                     continue
-            if self._delivery_fn:
-                logger.debug("[deliver] → %s (thread=%s) from=%s", entity.id, entity.thread_id, sender_name)
-                try:
-                    self._delivery_fn(entity, content, sender_name, chat_id, sender_entity_id, sender_avatar_url, signal=signal)
-                except Exception:
-                    logger.exception("Failed to deliver chat message to entity %s", entity.id)
-            else:
-                logger.warning("[deliver] NO delivery_fn for %s", entity.id)
+                allowed.append(ce)
+            recipients = allowed
+        return [entities[ce.entity_id] for ce in recipients], sender_name, sender_avatar_url
+
+    def _resolve_actions(
+        self, recipients: list[ChatEntityRow], chat_id: str, sender_entity_id: str, mentions: set[str],
+    ) -> dict[str, DeliveryAction]:
+        resolve_many = getattr(self._delivery_resolver, "resolve_many", None)
+        if resolve_many is not None:
+            return resolve_many(recipients, chat_id, sender_entity_id, mentioned_entity_ids=mentions)
+        return {
+            ce.entity_id: self._delivery_resolver.resolve(
+                ce.entity_id, chat_id, sender_entity_id, is_mentioned=ce.entity_id in mentions,
+            )
+            for ce in recipients
+        }
 
     def set_delivery_fn(self, fn) -> None:
         self._delivery_fn = fn
 
     def list_chats_for_entity(self, entity_id: str) -> list[dict]:
-        """List all chats for an entity with summary info."""
-        chat_ids = self._chat_entities.list_chats_for_entity(entity_id)
+        """List all chats for an entity with summary info, most recently active first.
+
+        @@@inbox-query - summaries come from the materialized chat_inbox (one read for all chats);
+        participants, senders and their members are then resolved with one batched lookup each.
+        """
+        from backend.web.utils.serializers import avatar_url
+
+        inbox = self._chat_entities.list_inbox(entity_id)
+        entity_ids = {eid for row in inbox for eid in row.participant_ids}
+        entity_ids.update(row.last_sender_entity_id for row in inbox if row.last_sender_entity_id)
+        entities = {e.id: e for e in self._entities.get_by_ids(list(entity_ids))}
+        members = (
+            {m.id: m for m in self._members.get_by_ids(list({e.member_id for e in entities.values()}))}
+            if self._members
+            else {}
+        )
+
+        # Same few entities recur across chats: build each summary once, hand out copies
+        entity_infos: dict[str, dict] = {}
+        for e in entities.values():
+            m = members.get(e.member_id)
+            entity_infos[e.id] = {
+                "id": e.id,
+                "name": e.name,
+                "type": e.type,
+                "avatar_url": avatar_url(e.member_id, bool(m.avatar if m else None)),
+            }
+
         result = []
-        for cid in chat_ids:
-            chat = self._chats.get_by_id(cid)
-            if not chat or chat.status != "active":
-                continue
-            participants = self._chat_entities.list_entities(cid)
-            entities_info = []
-            for p in participants:
-                e = self._entities.get_by_id(p.entity_id)
-                if e:
-                    from backend.web.utils.serializers import avatar_url
-                    m = self._members.get_by_id(e.member_id) if self._members else None
-                    entities_info.append({"id": e.id, "name": e.name, "type": e.type, "avatar_url": avatar_url(e.member_id, bool(m.avatar if m else None))})
-            msgs = self._messages.list_by_chat(cid, limit=1)
+        for row in inbox:
             last_msg = None
-            if msgs:
-                m = msgs[0]
-                sender = self._entities.get_by_id(m.sender_entity_id)
-                last_msg = {"content": m.content, "sender_name": sender.name if sender else "unknown", "created_at": m.created_at}
-            unread = self._messages.count_unread(cid, entity_id)
-            has_mention = self._messages.has_unread_mention(cid, entity_id)
+            if row.last_message_at is not None:
+                sender = entities.get(row.last_sender_entity_id or "")
+                last_msg = {
+                    "content": row.last_message_content,
+                    "sender_name": sender.name if sender else "unknown",
+                    "created_at": row.last_message_at,
+                }
             result.append({
-                "id": cid,
-                "title": chat.title,
-                "status": chat.status,
-                "created_at": chat.created_at,
-                "entities": entities_info,
+                "id": row.chat_id,
+                "title": row.title,
+                "status": row.status,
+                "created_at": row.created_at,
+                "entities": [dict(entity_infos[eid]) for eid in row.participant_ids if eid in entity_infos],
                 "last_message": last_msg,
-                "unread_count": unread,
-                "has_mention": has_mention,
+                "unread_count": row.unread_count,
+                "has_mention": row.has_mention,
             })
         return result
@@ -8,8 +8,9 @@ from __future__ import annotations
 
 import logging
 import time
+from collections.abc import Callable
 
-from storage.contracts import ChatEntityRepo, ContactRepo, DeliveryAction
+from storage.contracts import ChatEntityRepo, ChatEntityRow, ContactRepo, ContactRow, DeliveryAction
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +33,41 @@ class DefaultDeliveryResolver:
         self, recipient_entity_id: str, chat_id: str, sender_entity_id: str,
         *, is_mentioned: bool = False,
     ) -> DeliveryAction:
-        # 1. Contact-level block — always DROP, even if mentioned
         contact = self._contacts.get(recipient_entity_id, sender_entity_id)
+        # Chat mute is only consulted when no contact rule or mention decides first
+        return self._decide(
+            recipient_entity_id, chat_id, sender_entity_id, contact, is_mentioned,
+            lambda: self._is_chat_muted(recipient_entity_id, chat_id),
+        )
+
+    def resolve_many(
+        self, recipients: list[ChatEntityRow], chat_id: str, sender_entity_id: str,
+        *, mentioned_entity_ids: set[str] | None = None,
+    ) -> dict[str, DeliveryAction]:
+        """resolve() for many recipients of one message: one contact query, mute state from the given rows.
+
+        @@@bulk-resolve - per-recipient resolve() costs a contacts lookup plus a full list_entities
+        scan for the chat mute, i.e. O(participants^2) per group message.
+        """
+        mentioned = mentioned_entity_ids or set()
+        contacts = {
+            c.owner_entity_id: c
+            for c in self._contacts.get_for_owners([ce.entity_id for ce in recipients], sender_entity_id)
+        }
+        now = time.time()
+        return {
+            ce.entity_id: self._decide(
+                ce.entity_id, chat_id, sender_entity_id, contacts.get(ce.entity_id), ce.entity_id in mentioned,
+                lambda ce=ce: _mute_active(ce, now),
+            )
+            for ce in recipients
+        }
+
+    def _decide(
+        self, recipient_entity_id: str, chat_id: str, sender_entity_id: str,
+        contact: ContactRow | None, is_mentioned: bool, chat_muted: Callable[[], bool],
+    ) -> DeliveryAction:
+        # 1. Contact-level block — always DROP, even if mentioned
         if contact and contact.relation == "blocked":
             logger.debug("[resolver] DROP: %s blocked %s", recipient_entity_id[:15], sender_entity_id[:15])
             return DeliveryAction.DROP
@@ -48,7 +82,7 @@ class DefaultDeliveryResolver:
             return DeliveryAction.NOTIFY
 
         # 3. Chat-level mute
-        if self._is_chat_muted(recipient_entity_id, chat_id):
+        if chat_muted():
             logger.debug("[resolver] NOTIFY: %s muted chat %s", recipient_entity_id[:15], chat_id[:8])
             return DeliveryAction.NOTIFY
 
@@ -60,11 +94,12 @@ class DefaultDeliveryResolver:
         entities = self._chat_entities.list_entities(chat_id)
         for ce in entities:
             if ce.entity_id == entity_id:
-                muted = getattr(ce, "muted", False)
-                if not muted:
-                    return False
-                mute_until = getattr(ce, "mute_until", None)
-                if mute_until is not None and mute_until < time.time():
-                    return False  # mute expired
-                return True
+                return _mute_active(ce, time.time())
+        return False
+
+
+def _mute_active(ce: ChatEntityRow, now: float) -> bool:
+    if not getattr(ce, "muted", False):
         return False
+    mute_until = getattr(ce, "mute_until", None)
+    return mute_until is None or mute_until >= now  # expired mutes no longer apply
@@ -0,0 +1,329 @@
+"""Cross-process event fan-out over a local Unix-socket broker.
+
+Thread SSE buffers and the chat event bus are per-process. When several
+backend workers serve the same app, events produced in one worker must reach
+SSE clients attached to another. The broker is a tiny local relay:
+
+    worker A ──┐                      ┌──→ worker B (subscribed to topic)
+               ├──→ EventBrokerServer ┤
+    worker C ──┘   (Unix socket)      └──→ worker C (subscribed to topic)
+
+Wire format is newline-delimited JSON:
+    {"op": "sub",   "topic": "thread:<id>"}
+    {"op": "unsub", "topic": "thread:<id>"}
+    {"op": "pub",   "topic": "thread:<id>", "origin": "<worker>", "event": {...}}
+
+The broker never echoes a publish back to its sender — publishers deliver
+locally themselves. A single stream socket per worker keeps each publisher's
+events in order; receivers additionally drop events whose ``_seq`` (the
+run-event sequence) is not newer than the last one seen from the same
+publisher and run, so reconnect replays never duplicate. Seqs are only
+ordered within one worker (each reserves its own seq blocks), so they are
+never compared across publishers.
+
+Run standalone:
+    python -m backend.web.services.event_broker --socket ~/.leon/events.sock
+Workers connect when ``LEON_EVENT_BROKER_SOCKET`` points at that path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[dict[str, Any]], None]
+Unsubscribe = Callable[[], None]
+
+_RECONNECT_DELAY_S = 0.5
+_MAX_RECONNECT_DELAY_S = 5.0
+# asyncio's default 64 KiB line limit is smaller than a large tool_result frame.
+_STREAM_LIMIT = 64 * 1024 * 1024
+
+
+class EventFanout(Protocol):
+    """Backend that carries topic events between processes."""
+
+    def publish(self, topic: str, event: dict[str, Any]) -> None: ...
+    def subscribe(self, topic: str, handler: EventHandler) -> Unsubscribe: ...
+
+
+def thread_topic(thread_id: str) -> str:
+    return f"thread:{thread_id}"
+
+
+def chat_topic(chat_id: str) -> str:
+    return f"chat:{chat_id}"
+
+
+def event_seq(event: dict[str, Any]) -> int | None:
+    """Extract run-event ``_seq`` from an SSE event dict, if present."""
+    seq, _ = _seq_and_run(event)
+    return seq
+
+
+def _seq_and_run(event: dict[str, Any]) -> tuple[int | None, str | None]:
+    data = event.get("data")
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except (json.JSONDecodeError, TypeError):
+            return None, None
+    if not isinstance(data, dict) or not isinstance(data.get("_seq"), int):
+        return None, None
+    run_id = data.get("_run_id")
+    return data["_seq"], run_id if isinstance(run_id, str) else None
+
+
+# ---------------------------------------------------------------------------
+# Broker server
+# ---------------------------------------------------------------------------
+
+
+class EventBrokerServer:
+    """Relays published events to every other connection subscribed to the topic."""
+
+    def __init__(self, socket_path: str | Path) -> None:
+        self.socket_path = Path(socket_path).expanduser()
+        self._server: asyncio.AbstractServer | None = None
+        self._topics: dict[str, set[asyncio.StreamWriter]] = {}
+
+    async def start(self) -> None:
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            # @@@stale-socket - a previous broker died without unlinking; binding would fail with EADDRINUSE.
+            self.socket_path.unlink()
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path), limit=_STREAM_LIMIT)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for writers in self._topics.values():
+            for writer in writers:
+                writer.close()
+        self._topics.clear()
+        self.socket_path.unlink(missing_ok=True)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        subscribed: set[str] = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    logger.warning("Event broker dropped frame over %d bytes", _STREAM_LIMIT)
+                    continue
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Event broker dropped malformed frame")
+                    continue
+                op = msg.get("op")
+                topic = msg.get("topic")
+                if not isinstance(topic, str):
+                    continue
+                if op == "sub":
+                    self._topics.setdefault(topic, set()).add(writer)
+                    subscribed.add(topic)
+                elif op == "unsub":
+                    self._drop(topic, writer)
+                    subscribed.discard(topic)
+                elif op == "pub":
+                    self._relay(topic, line, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for topic in subscribed:
+                self._drop(topic, writer)
+            writer.close()
+
+    def _relay(self, topic: str, frame: bytes, sender: asyncio.StreamWriter) -> None:
+        for writer in list(self._topics.get(topic, ())):
+            if writer is sender or writer.is_closing():
+                continue
+            writer.write(frame)
+
+    def _drop(self, topic: str, writer: asyncio.StreamWriter) -> None:
+        writers = self._topics.get(topic)
+        if writers is None:
+            return
+        writers.discard(writer)
+        if not writers:
+            self._topics.pop(topic, None)
+
+
+# ---------------------------------------------------------------------------
+# Worker-side client
+# ---------------------------------------------------------------------------
+
+
+class EventBrokerClient:
+    """Per-worker connection to the broker implementing :class:`EventFanout`.
+
+    ``publish`` is safe to call from any thread; handlers run on the client's
+    event loop. The client reconnects with backoff and re-subscribes its topics.
+    """
+
+    def __init__(self, socket_path: str | Path) -> None:
+        self.socket_path = Path(socket_path).expanduser()
+        self._handlers: dict[str, list[EventHandler]] = {}
+        self._origin = uuid.uuid4().hex
+        # topic -> (publisher origin, run id) -> last seq delivered
+        self._last_seq: dict[str, dict[tuple[str, str | None], int]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._connected = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+
+    async def connect(self, timeout: float = 5.0) -> None:
+        """Connect and start the background reader (reconnects on later failures)."""
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+        except TimeoutError:
+            await self.close()
+            raise RuntimeError(f"Event broker not reachable at {self.socket_path}") from None
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._writer is not None:
+            self._writer.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def subscribe(self, topic: str, handler: EventHandler) -> Unsubscribe:
+        handlers = self._handlers.setdefault(topic, [])
+        if not handlers:
+            self._send({"op": "sub", "topic": topic})
+        handlers.append(handler)
+
+        def _unsubscribe() -> None:
+            subs = self._handlers.get(topic, [])
+            if handler in subs:
+                subs.remove(handler)
+            if not subs and self._handlers.pop(topic, None) is not None:
+                self._last_seq.pop(topic, None)
+                self._send({"op": "unsub", "topic": topic})
+
+        return _unsubscribe
+
+    def publish(self, topic: str, event: dict[str, Any]) -> None:
+        self._send({"op": "pub", "topic": topic, "origin": self._origin, "event": event})
+
+    def _send(self, msg: dict[str, Any]) -> None:
+        if self._loop is None or self._closed:
+            return
+        frame = (json.dumps(msg, ensure_ascii=False) + "\n").encode()
+        # @@@broker-thread-safe - chat sends can come from tool threads; transports are loop-bound.
+        try:
+            in_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            self._write(frame)
+        else:
+            self._loop.call_soon_threadsafe(self._write, frame)
+
+    def _write(self, frame: bytes) -> None:
+        # Frames sent while disconnected are dropped; subscriptions are replayed on reconnect.
+        if self._writer is not None and not self._writer.is_closing():
+            self._writer.write(frame)
+
+    async def _run(self) -> None:
+        delay = _RECONNECT_DELAY_S
+        while not self._closed:
+            try:
+                reader, writer = await asyncio.open_unix_connection(str(self.socket_path), limit=_STREAM_LIMIT)
+            except OSError as exc:
+                logger.warning("Event broker unreachable at %s: %s", self.socket_path, exc)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _MAX_RECONNECT_DELAY_S)
+                continue
+            delay = _RECONNECT_DELAY_S
+            self._writer = writer
+            for topic in self._handlers:
+                self._write((json.dumps({"op": "sub", "topic": topic}) + "\n").encode())
+            self._connected.set()
+            try:
+                while True:
+                    try:
+                        line = await reader.readline()
+                    except ValueError:
+                        logger.warning("Event broker client dropped frame over %d bytes", _STREAM_LIMIT)
+                        continue
+                    if not line:
+                        break
+                    self._dispatch(line)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+            finally:
+                self._writer = None
+                writer.close()
+            if not self._closed:
+                logger.warning("Event broker connection lost; reconnecting")
+
+    def _dispatch(self, line: bytes) -> None:
+        try:
+            msg = json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning("Event broker client dropped malformed frame")
+            return
+        topic = msg.get("topic")
+        event = msg.get("event")
+        if not isinstance(topic, str) or not isinstance(event, dict):
+            return
+        seq, run_id = _seq_and_run(event)
+        if seq is not None:
+            # @@@seq-order - seq is only monotonic within one publisher's run; workers hold disjoint seq
+            # blocks, so a lower seq from another worker is a new event, not a stale one.
+            origin = msg.get("origin")
+            key = (origin if isinstance(origin, str) else "", run_id)
+            last_seen = self._last_seq.setdefault(topic, {})
+            if seq <= last_seen.get(key, 0):
+                return
+            last_seen[key] = seq
+        for handler in list(self._handlers.get(topic, ())):
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Event broker handler failed for %s", topic)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Leon cross-process event broker")
+    parser.add_argument("--socket", default=str(Path.home() / ".leon" / "events.sock"))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    server = EventBrokerServer(args.socket)
+    logger.info("Event broker listening on %s", server.socket_path)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """In-memory event buffer for decoupling agent execution from SSE consumers."""
 
 import asyncio
-from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass, field
 
 
@@ -65,17 +65,39 @@ class ThreadEventBuffer:
     Ring buffer mode: keeps the most recent `maxlen` events in memory.
     Older events are available via SQLite fallback (event_store).
     Never calls mark_done() — the connection lifecycle is managed by client disconnect.
+
+    Events are addressed by absolute sequence (0-based count of events ever put);
+    slot ``seq % maxlen`` holds event ``seq``, so a read of k new events costs O(k)
+    regardless of ring size. Each waiting reader parks on its own future, which
+    put() resolves directly — no shared Condition lock to re-acquire on wake.
     """
 
-    _ring: deque[dict] = field(default_factory=lambda: deque(maxlen=2000))
-    _notify: asyncio.Condition = field(default_factory=asyncio.Condition)
+    maxlen: int = 2000
+    # Called with every locally produced event; used to fan out to other worker processes.
+    on_put: Callable[[dict], None] | None = field(default=None, repr=False)
+    _slots: list[dict | None] = field(init=False, repr=False)
+    _waiters: set[asyncio.Future[None]] = field(init=False, repr=False, default_factory=set)
     _total_count: int = 0  # monotonic counter (total events ever put)
 
+    def __post_init__(self) -> None:
+        if self.maxlen < 1:
+            raise ValueError(f"maxlen must be >= 1, got {self.maxlen}")
+        self._slots = [None] * self.maxlen
+
     async def put(self, event: dict) -> None:
-        self._ring.append(event)
+        self.deliver(event)
+        if self.on_put is not None:
+            self.on_put(event)
+
+    def deliver(self, event: dict) -> None:
+        """Append an event without re-publishing it (remote events from the broker land here)."""
+        self._slots[self._total_count % self.maxlen] = event
         self._total_count += 1
-        async with self._notify:
-            self._notify.notify_all()
+        if self._waiters:
+            waiters, self._waiters = self._waiters, set()
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
 
     async def read_with_timeout(self, cursor: int, timeout: float = 30) -> tuple[list[dict] | None, int]:
         """Return events after cursor position. cursor is an absolute index into _total_count.
@@ -83,30 +105,31 @@ class ThreadEventBuffer:
         Returns:
             (events, new_cursor) — events is None on timeout, [] never happens (no mark_done).
         """
-        avail_start = self._total_count - len(self._ring)
-        if cursor < avail_start:
-            # Cursor points before the ring — return everything in ring
-            events = list(self._ring)
-            return events, self._total_count
-        offset = cursor - avail_start
-        if offset < len(self._ring):
-            events = list(self._ring)[offset:]
-            return events, self._total_count
+        if cursor < self._total_count:
+            return self._read_from(cursor), self._total_count
         # No new events — wait
-        async with self._notify:
-            try:
-                await asyncio.wait_for(self._notify.wait(), timeout)
-            except TimeoutError:
-                return None, cursor
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except TimeoutError:
+            return None, cursor
+        finally:
+            self._waiters.discard(waiter)
         # Re-check after wake
-        avail_start = self._total_count - len(self._ring)
-        if cursor < avail_start:
-            return list(self._ring), self._total_count
-        offset = cursor - avail_start
-        if offset < len(self._ring):
-            return list(self._ring)[offset:], self._total_count
+        if cursor < self._total_count:
+            return self._read_from(cursor), self._total_count
         return None, cursor
 
+    def _read_from(self, cursor: int) -> list[dict]:
+        # Cursor before the ring start means those events were evicted — return everything retained.
+        start = max(cursor, self._total_count - self.maxlen, 0)
+        count = self._total_count - start
+        head = start % self.maxlen
+        if head + count <= self.maxlen:
+            return self._slots[head : head + count]  # type: ignore[return-value]
+        return self._slots[head:] + self._slots[: head + count - self.maxlen]  # type: ignore[operator]
+
     @property
     def total_count(self) -> int:
         return self._total_count
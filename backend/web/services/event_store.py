@@ -73,6 +73,12 @@ async def append_event(
     )
 
 
+async def flush_events(run_event_repo: RunEventRepo | None = None) -> None:
+    """Wait until every appended event is durable (no-op unless the repo batches writes)."""
+    repo = _resolve_run_event_repo(run_event_repo)
+    await asyncio.to_thread(repo.flush)
+
+
 async def read_events_after(
     thread_id: str,
     run_id: str,
@@ -7,7 +7,9 @@ from datetime import UTC, datetime
 from typing import Any
 
 from backend.web.services.sandbox_service import init_providers_and_managers, load_all_sessions
+from core.tools.web.search_cache import shared_search_cache_stats
 from storage.providers.sqlite.kernel import SQLiteDBRole, connect_sqlite_role, resolve_role_db_path
+from storage.providers.sqlite.row_cache import row_cache_stats
 from storage.providers.sqlite.sandbox_monitor_repo import SQLiteSandboxMonitorRepo
 
 # ---------------------------------------------------------------------------
@@ -364,3 +366,19 @@ def runtime_health_snapshot() -> dict[str, Any]:
         "db": {"path": str(db_path), "exists": db_exists, "counts": tables},
         "sessions": {"total": len(sessions), "providers": provider_counts},
     }
+
+
+def row_cache_snapshot() -> dict[str, Any]:
+    """Hit/miss counters of the entity/member/contact row caches."""
+    return {
+        "snapshot_at": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
+        "tables": row_cache_stats(),
+    }
+
+
+def web_search_cache_snapshot() -> dict[str, Any]:
+    """Hit/miss counters of the process-wide WebSearch result cache."""
+    return {
+        "snapshot_at": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
+        **shared_search_cache_stats(),
+    }
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
@@ -16,12 +17,13 @@ from sandbox.providers.docker import DockerProvider
 from sandbox.providers.daytona import DaytonaProvider
 from sandbox.providers.e2b import E2BProvider
 from sandbox.providers.agentbay import AgentBayProvider
-from sandbox.provider import RESOURCE_CAPABILITY_KEYS
+from sandbox.provider import RESOURCE_CAPABILITY_KEYS, SandboxProvider
 from sandbox.resource_snapshot import (
     ensure_resource_snapshot_table,
     list_snapshots_by_lease_ids,
     probe_and_upsert_for_instance,
     upsert_lease_resource_snapshot,
+    upsert_probe_result,
 )
 from storage.models import map_lease_to_session_status
 from storage.providers.sqlite.sandbox_monitor_repo import SQLiteSandboxMonitorRepo
@@ -542,8 +544,27 @@ def sandbox_read(lease_id: str, path: str) -> dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 
+def _has_bulk_metrics(provider: Any) -> bool:
+    # The base get_metrics_bulk just loops get_metrics; only a real override earns the bulk path.
+    impl = getattr(type(provider), "get_metrics_bulk", None)
+    return impl is not None and impl is not SandboxProvider.get_metrics_bulk
+
+
+def _collect_bulk_metrics(provider: Any, instance_ids: list[str]) -> dict[str, Any]:
+    try:
+        return provider.get_metrics_bulk(instance_ids)
+    except Exception as exc:
+        # Whole-provider failure (daemon down, auth): every instance reports it
+        return dict.fromkeys(instance_ids, exc)
+
+
 def refresh_resource_snapshots() -> dict[str, Any]:
-    """Probe active lease instances and upsert resource snapshots."""
+    """Probe active lease instances and upsert resource snapshots.
+
+    @@@bulk-probe - targets of providers that override get_metrics_bulk are grouped by provider;
+    each answers for all of its instances in one call, and the providers are collected in
+    parallel. Other providers are probed one instance at a time.
+    """
     ensure_resource_snapshot_table()
     repo = SQLiteSandboxMonitorRepo()
     try:
@@ -556,6 +577,7 @@ def refresh_resource_snapshots() -> dict[str, Any]:
     errors = 0
     running_targets = 0
     non_running_targets = 0
+    bulk_targets: dict[str, list[tuple[dict, str]]] = {}
 
     for item in probe_targets:
         lease_id = item["lease_id"]
@@ -569,10 +591,9 @@ def refresh_resource_snapshots() -> dict[str, Any]:
         else:
             non_running_targets += 1
 
-        provider = provider_cache.get(provider_key)
-        if provider is None:
-            provider = build_provider_from_config_name(provider_key)
-            provider_cache[provider_key] = provider
+        if provider_key not in provider_cache:
+            provider_cache[provider_key] = build_provider_from_config_name(provider_key)
+        provider = provider_cache[provider_key]
         if provider is None:
             upsert_lease_resource_snapshot(
                 lease_id=lease_id,
@@ -584,6 +605,10 @@ def refresh_resource_snapshots() -> dict[str, Any]:
             errors += 1
             continue
 
+        if _has_bulk_metrics(provider):
+            bulk_targets.setdefault(provider_key, []).append((item, probe_mode))
+            continue
+
         result = probe_and_upsert_for_instance(
             lease_id=lease_id,
             provider_name=provider_key,
@@ -596,6 +621,33 @@ def refresh_resource_snapshots() -> dict[str, Any]:
         if not result["ok"]:
             errors += 1
 
+    if bulk_targets:
+        with ThreadPoolExecutor(max_workers=len(bulk_targets)) as pool:
+            futures = {
+                provider_key: pool.submit(
+                    _collect_bulk_metrics,
+                    provider_cache[provider_key],
+                    list(dict.fromkeys(item["instance_id"] for item, _ in targets)),
+                )
+                for provider_key, targets in bulk_targets.items()
+            }
+        for provider_key, targets in bulk_targets.items():
+            collected = futures[provider_key].result()
+            for item, probe_mode in targets:
+                value = collected.get(item["instance_id"])
+                failed = isinstance(value, Exception)
+                result = upsert_probe_result(
+                    lease_id=item["lease_id"],
+                    provider_name=provider_key,
+                    observed_state=item["observed_state"],
+                    probe_mode=probe_mode,
+                    metrics=None if failed else value,
+                    probe_error=str(value) if failed else None,
+                )
+                probed += 1
+                if not result["ok"]:
+                    errors += 1
+
     return {
         "probed": probed,
         "errors": errors,
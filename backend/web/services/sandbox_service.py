@@ -67,6 +67,8 @@ def init_providers_and_managers() -> tuple[dict, dict]:
                     image=config.docker.image,
                     mount_path=config.docker.mount_path,
                     provider_name=name,
+                    docker_host=config.docker.docker_host,
+                    transport=config.docker.transport,
                 )
             elif config.provider == "e2b":
                 from sandbox.providers.e2b import E2BProvider
@@ -282,6 +284,7 @@ def build_provider_from_config_name(name: str, *, sandboxes_dir: Path | None = N
                 mount_path=config.docker.mount_path,
                 provider_name=name,
                 docker_host=getattr(config.docker, "docker_host", None),
+                transport=getattr(config.docker, "transport", "cli"),
             )
         if config.provider == "e2b":
             from sandbox.providers.e2b import E2BProvider
@@ -6,9 +6,11 @@ import logging
 import random
 import traceback
 import uuid as _uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from typing import Any
 
+from backend.web.services.event_broker import event_seq, thread_topic
+
 logger = logging.getLogger(__name__)
 
 from backend.web.services.event_buffer import RunEventBuffer, ThreadEventBuffer
@@ -233,10 +235,55 @@ def get_or_create_thread_buffer(app: Any, thread_id: str) -> ThreadEventBuffer:
     if isinstance(buf, ThreadEventBuffer):
         return buf
     buf = ThreadEventBuffer()
+    _attach_fanout(app, thread_id, buf, buf.deliver)
     app.state.thread_event_buffers[thread_id] = buf
     return buf
 
 
+def create_replaying_thread_buffer(
+    app: Any, thread_id: str
+) -> tuple[ThreadEventBuffer, Callable[[set[int]], None]]:
+    """Like get_or_create_thread_buffer, but holds broker events until persisted events are replayed.
+
+    Returns (buffer, release). The caller delivers the replayed events, then calls
+    ``release(replayed_seqs)``; held live events follow in arrival order, minus any
+    whose ``_seq`` was already replayed.
+    """
+    buf = app.state.thread_event_buffers.get(thread_id)
+    if isinstance(buf, ThreadEventBuffer):
+        return buf, lambda replayed_seqs: None
+    buf = ThreadEventBuffer()
+    held: list[dict] | None = []
+
+    # @@@replay-gate - remote events can arrive while the replay awaits SQLite; delivering them
+    # first would put newer seqs ahead of older replayed ones (and duplicate those replayed later).
+    def _deliver_remote(event: dict) -> None:
+        if held is None:
+            buf.deliver(event)
+        else:
+            held.append(event)
+
+    def _release(replayed_seqs: set[int]) -> None:
+        nonlocal held
+        pending, held = held or [], None
+        for event in pending:
+            if event_seq(event) not in replayed_seqs:
+                buf.deliver(event)
+
+    _attach_fanout(app, thread_id, buf, _deliver_remote)
+    app.state.thread_event_buffers[thread_id] = buf
+    return buf, _release
+
+
+def _attach_fanout(app: Any, thread_id: str, buf: ThreadEventBuffer, deliver_remote: Callable[[dict], None]) -> None:
+    # @@@thread-fanout - with a broker, local events go out to other workers and theirs land in this buffer.
+    fanout = getattr(app.state, "event_fanout", None)
+    if fanout is not None:
+        topic = thread_topic(thread_id)
+        buf.on_put = lambda event: fanout.publish(topic, event)
+        app.state.thread_fanout_unsubs[thread_id] = fanout.subscribe(topic, deliver_remote)
+
+
 # ---------------------------------------------------------------------------
 # Per-thread handler setup (idempotent, survives across runs)
 # ---------------------------------------------------------------------------
@@ -383,7 +430,7 @@ async def _run_agent_to_buffer(
     message_metadata: dict[str, Any] | None = None,
 ) -> None:
     """Run agent execution and write all SSE events into *thread_buf*."""
-    from backend.web.services.event_store import append_event
+    from backend.web.services.event_store import append_event, flush_events
 
     run_event_repo = _resolve_run_event_repo(agent)
 
@@ -398,6 +445,10 @@ async def _run_agent_to_buffer(
             message_id,
             run_event_repo=run_event_repo,
         )
+        if event.get("event") == "run_done":
+            # @@@run-done-flush - with group commit, make the whole run durable before clients
+            # see run_done, so a reconnect replaying via read_events_after never misses the tail.
+            await flush_events(run_event_repo=run_event_repo)
         try:
             data = json.loads(event.get("data", "{}")) if isinstance(event.get("data"), str) else event.get("data", {})
         except (json.JSONDecodeError, TypeError):
@@ -65,6 +65,12 @@ class CompactionConfig(BaseModel):
     reserve_tokens: int = Field(16384, gt=0, description="Reserve space for new messages")
     keep_recent_tokens: int = Field(20000, gt=0, description="Keep recent messages verbatim")
     min_messages: int = Field(20, gt=0, description="Minimum messages before compaction")
+    speculative_threshold: float | None = Field(
+        None,
+        gt=0,
+        lt=1,
+        description="Start compaction in the background once context usage passes this fraction (e.g. 0.6)",
+    )
 
 
 class MemoryConfig(BaseModel):
@@ -72,6 +78,7 @@ class MemoryConfig(BaseModel):
 
     pruning: PruningConfig = Field(default_factory=PruningConfig)
     compaction: CompactionConfig = Field(default_factory=CompactionConfig)
+    tokenizer: bool = Field(False, description="Count tokens with tiktoken (if installed) instead of chars // 2")
 
 
 # ============================================================================
@@ -107,6 +114,10 @@ class GrepConfig(BaseModel):
 
     enabled: bool = True
     max_file_size: int = Field(10485760, gt=0, description="Max file size in bytes (10MB)")
+    index: bool = Field(False, description="Prefilter files with a persistent trigram index under .leon/")
+    index_refresh_interval: float = Field(
+        2.0, ge=0, description="Seconds between workspace re-stats for the index (agent edits are always seen)"
+    )
 
 
 class SearchToolsConfig(BaseModel):
@@ -116,11 +127,21 @@ class SearchToolsConfig(BaseModel):
     glob: bool = True
 
 
+class FileInventoryConfig(BaseModel):
+    """Configuration for the cached workspace file inventory used by Glob."""
+
+    enabled: bool = False
+    poll_interval: float = Field(1.0, ge=0, description="Seconds between directory-mtime polls")
+    full_rescan_interval: float = Field(30.0, ge=0, description="Seconds between file mtime re-stats")
+    persist: bool = Field(False, description="Persist the inventory under .leon/ across restarts")
+
+
 class SearchConfig(BaseModel):
     """Configuration for search middleware."""
 
     enabled: bool = True
     tools: SearchToolsConfig = Field(default_factory=SearchToolsConfig)
+    inventory: FileInventoryConfig = Field(default_factory=FileInventoryConfig)
 
 
 class WebSearchConfig(BaseModel):
@@ -131,6 +152,14 @@ class WebSearchConfig(BaseModel):
     tavily_api_key: str | None = Field(None, description="Tavily API key")
     exa_api_key: str | None = Field(None, description="Exa API key")
     firecrawl_api_key: str | None = Field(None, description="Firecrawl API key")
+    hedge_delay: float | None = Field(
+        1.0, ge=0, description="Seconds before also trying the next provider (0 = all at once, null = sequential)"
+    )
+    adaptive_order: bool = Field(True, description="Try providers in order of measured latency and error rate")
+    cache: bool = Field(True, description="Share normalized-query results across agents in the process")
+    cache_ttl: int = Field(3600, ge=0, description="Seconds a cached search result is reused")
+    cache_max_entries: int = Field(1000, gt=0, description="Cached queries kept (LRU eviction)")
+    cache_persist: bool = Field(False, description="Also persist cached results in ~/.leon/web_search_cache.db")
 
 
 class FetchConfig(BaseModel):
@@ -138,6 +167,9 @@ class FetchConfig(BaseModel):
 
     enabled: bool = True
     jina_api_key: str | None = Field(None, description="Jina AI API key")
+    cache: bool = Field(True, description="Cache fetched pages on disk under ~/.leon/web_cache")
+    cache_ttl: int = Field(900, ge=0, description="Seconds a cached page is served without revalidation")
+    cache_max_mb: int = Field(256, gt=0, description="Size cap of cached page bodies (LRU eviction)")
 
 
 class WebToolsConfig(BaseModel):
@@ -193,6 +225,16 @@ class SpillBufferConfig(BaseModel):
     )
 
 
+class ToolPoolConfig(BaseModel):
+    """Thread pool for blocking tool handlers (shared by every agent in the process)."""
+
+    max_workers: int = Field(16, gt=0, description="Worker threads for blocking tool handlers")
+    max_concurrency: dict[str, int] = Field(
+        default_factory=dict,
+        description="Per-tool concurrency caps, overriding the tool's own default",
+    )
+
+
 class ToolsConfig(BaseModel):
     """Tools configuration."""
 
@@ -201,6 +243,7 @@ class ToolsConfig(BaseModel):
     web: WebConfig = Field(default_factory=WebConfig)
     command: CommandConfig = Field(default_factory=CommandConfig)
     spill_buffer: SpillBufferConfig = Field(default_factory=SpillBufferConfig)
+    pool: ToolPoolConfig = Field(default_factory=ToolPoolConfig)
     tool_modes: dict[str, str] = Field(
         default_factory=dict,
         description="Per-tool mode overrides: tool_name -> 'inline' | 'deferred'",
@@ -193,6 +193,7 @@ class ChatToolService:
             },
             handler=handle,
             source="chat",
+            blocking=True,
         ))
 
     def _register_chat_read(self, registry: ToolRegistry) -> None:
@@ -261,6 +262,7 @@ class ChatToolService:
             },
             handler=handle,
             source="chat",
+            blocking=True,
         ))
 
     def _register_chat_send(self, registry: ToolRegistry) -> None:
@@ -335,23 +337,35 @@ class ChatToolService:
             },
             handler=handle,
             source="chat",
+            blocking=True,
         ))
 
     def _register_chat_search(self, registry: ToolRegistry) -> None:
         eid = self._entity_id
 
-        def handle(query: str, entity_id: str | None = None) -> str:
-            chat_id = None
-            if entity_id:
+        def handle(query: str, entity_id: str | None = None, chat_id: str | None = None,
+                   sender_id: str | None = None, range: str | None = None) -> str:
+            if not chat_id and entity_id:
                 chat_id = self._chat_entities.find_chat_between(eid, entity_id)
-            results = self._messages.search(query, chat_id=chat_id, limit=20)
-            if not results:
+            after = before = None
+            if range:
+                try:
+                    parsed = _parse_range(range)
+                except ValueError as e:
+                    return str(e)
+                if parsed["type"] != "time":
+                    return "chat_search range must be a time range, e.g. '-1d:' or '2026-03-20:2026-03-22'."
+                after, before = parsed["after"], parsed["before"]
+            hits = self._messages.search_ranked(
+                query, chat_id=chat_id, sender_entity_id=sender_id, after=after, before=before, limit=20,
+            )
+            if not hits:
                 return f"No messages matching '{query}'."
             lines = []
-            for m in results:
-                sender = self._entities.get_by_id(m.sender_entity_id)
+            for hit in hits:
+                sender = self._entities.get_by_id(hit.message.sender_entity_id)
                 name = sender.name if sender else "unknown"
-                lines.append(f"[{name}] {m.content[:100]}")
+                lines.append(f"[{name}] {hit.snippet}")
             return "\n".join(lines)
 
         registry.register(ToolEntry(
@@ -359,18 +373,31 @@ class ChatToolService:
             mode=ToolMode.INLINE,
             schema={
                 "name": "chat_search",
-                "description": "Search messages. Optionally filter by entity_id.",
+                "description": (
+                    "Search messages, best matches first. Matched text is shown in [brackets].\n"
+                    "Optionally filter by chat (entity_id or chat_id), sender, and time range."
+                ),
                 "parameters": {
                     "type": "object",
                     "properties": {
-                        "query": {"type": "string", "description": "Search query"},
+                        "query": {"type": "string", "description": "Search query (substring match, any language)"},
                         "entity_id": {"type": "string", "description": "Optional: only search in chat with this entity"},
+                        "chat_id": {"type": "string", "description": "Optional: only search in this chat"},
+                        "sender_id": {
+                            "type": "string",
+                            "description": "Optional: only messages sent by this entity_id",
+                        },
+                        "range": {
+                            "type": "string",
+                            "description": "Optional time range: '-1h:', '-2d:-1d', '2026-03-20:2026-03-22'.",
+                        },
                     },
                     "required": ["query"],
                 },
             },
             handler=handle,
             source="chat",
+            blocking=True,
         ))
 
     def _register_directory(self, registry: ToolRegistry) -> None:
@@ -413,6 +440,7 @@ class ChatToolService:
             },
             handler=handle,
             source="chat",
+            blocking=True,
         ))
 
 
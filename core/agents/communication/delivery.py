@@ -2,7 +2,9 @@
 
 v3: no full message text injected. Agent must chat_read to see content.
 ChatService._deliver_to_agents calls the delivery function for each
-non-sender agent entity.
+non-sender agent entity. The function only schedules onto the event loop
+(so it is thread-safe and returns at once); the deliveries themselves,
+including cold agent creation, run at most _DELIVERY_PARALLELISM at a time.
 """
 
 from __future__ import annotations
@@ -14,6 +16,8 @@ from storage.contracts import EntityRow
 
 logger = logging.getLogger(__name__)
 
+_DELIVERY_PARALLELISM = 8
+
 
 def make_chat_delivery_fn(app: Any):
     """Create a delivery callback for ChatService.
@@ -25,14 +29,20 @@ def make_chat_delivery_fn(app: Any):
 
     loop = asyncio.get_running_loop()
     logger.info("[delivery] make_chat_delivery_fn: loop=%s", loop)
+    # @@@delivery-bound - a message to a large group must not cold-start every recipient agent at once
+    semaphore = asyncio.Semaphore(_DELIVERY_PARALLELISM)
+
+    async def _bounded_deliver(*args: Any, **kwargs: Any) -> None:
+        async with semaphore:
+            await _async_deliver(*args, **kwargs)
 
     def _deliver(entity: EntityRow, content: str, sender_name: str, chat_id: str,
                  sender_entity_id: str, sender_avatar_url: str | None = None,
                  signal: str | None = None) -> None:
         logger.info("[delivery] _deliver called: entity=%s, thread=%s", entity.id, entity.thread_id)
         future = asyncio.run_coroutine_threadsafe(
-            _async_deliver(app, entity, sender_name, chat_id, sender_entity_id,
-                           sender_avatar_url, signal=signal),
+            _bounded_deliver(app, entity, sender_name, chat_id, sender_entity_id,
+                             sender_avatar_url, signal=signal),
             loop,
         )
         def _on_done(f):
@@ -0,0 +1,52 @@
+"""Shared tokenizer and BM25 scoring for local (no model call) text ranking.
+
+Used by tool_search (core.runtime.tool_index) and by WebFetch chunk selection
+(core.tools.web.extraction), so both rank with the same tokens and math.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import Mapping
+
+K1 = 1.2
+B = 0.75
+
+_CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])|(?<=[A-Za-z])(?=[0-9])")
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens; camelCase, snake_case and trailing digits are split into parts."""
+    return [t.lower() for t in _WORD_RE.findall(_CAMEL_RE.sub(" ", text))]
+
+
+def idf(n_docs: int, df: int) -> float:
+    """BM25 inverse document frequency (never negative)."""
+    return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+
+def term_score(tf: float, term_idf: float, length: float, avg_length: float) -> float:
+    """One term's BM25 contribution to a document of ``length`` with term frequency ``tf``."""
+    norm = K1 * (1 - B + B * length / avg_length)
+    return term_idf * tf * (K1 + 1) / (tf + norm)
+
+
+def score_documents(docs: list[Mapping[str, float]], query_terms: set[str]) -> list[float]:
+    """BM25 score of each term-frequency mapping against the query terms, in input order."""
+    if not docs:
+        return []
+    n_docs = len(docs)
+    lengths = [sum(terms.values()) for terms in docs]
+    avg_length = sum(lengths) / n_docs or 1.0
+    idfs = {term: idf(n_docs, sum(1 for terms in docs if term in terms)) for term in query_terms}
+    scores: list[float] = []
+    for terms, length in zip(docs, lengths):
+        score = 0.0
+        for term, term_idf in idfs.items():
+            tf = terms.get(term)
+            if tf:
+                score += term_score(tf, term_idf, length, avg_length)
+        scores.append(score)
+    return scores
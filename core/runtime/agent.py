@@ -30,6 +30,10 @@ from langchain_core.messages import SystemMessage
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 
 from config.schema import DEFAULT_MODEL
+from core.runtime.middleware.memory import TokenLedger
+from core.runtime.tool_pool import get_shared_pool
+from core.tools.web.cache import WebFetchCache
+from core.tools.web.search_cache import get_shared_search_cache
 
 # Load .env file
 _env_file = Path(__file__).parent / ".env"
@@ -709,6 +713,7 @@ class LeonAgent:
         self._cleanup_sandbox()
         self._mark_terminated()
         self._cleanup_mcp_client()
+        self._cleanup_web_service()
         self._cleanup_sqlite_connection()
 
     def _cleanup_sandbox(self) -> None:
@@ -762,6 +767,17 @@ class LeonAgent:
             print(f"[LeonAgent] MCP cleanup error: {e}")
         self._mcp_client = None
 
+    def _cleanup_web_service(self) -> None:
+        """Release pooled web connections and the fetch cache."""
+        web_service = getattr(self, "_web_service", None)
+        if web_service is None:
+            return
+        try:
+            web_service.close()
+        except Exception as e:
+            print(f"[LeonAgent] Web service cleanup error: {e}")
+        self._web_service = None
+
     def _cleanup_sqlite_connection(self) -> None:
         """Clean up SQLite connection.
 
@@ -826,9 +842,11 @@ class LeonAgent:
         middleware.append(self._steering_middleware)
 
         # 5. ToolRunner (innermost — routes all ToolRegistry-registered tool calls)
+        pool_cfg = self.config.tools.pool
         self._tool_runner = ToolRunner(
             registry=self._tool_registry,
             validator=ToolValidator(),
+            pool=get_shared_pool(max_workers=pool_cfg.max_workers, max_concurrency=pool_cfg.max_concurrency),
         )
         middleware.append(self._tool_runner)
 
@@ -863,6 +881,9 @@ class LeonAgent:
         db_path = self.db_path
         # @@@memory-storage-consumer - memory summary persistence must consume injected storage container, not fixed sqlite path.
         summary_repo = self.storage_container.summary_repo() if self.storage_container is not None else None
+        # @@@shared-token-ledger - monitor + memory + compactor count history through one ledger.
+        token_ledger = TokenLedger.for_model(self.model_name, use_tokenizer=self.config.memory.tokenizer)
+        self._monitor_middleware._context_monitor.token_ledger = token_ledger
         self._memory_middleware = MemoryMiddleware(
             context_limit=context_limit,
             pruning_config=pruning_config,
@@ -872,6 +893,8 @@ class LeonAgent:
             checkpointer=self.checkpointer,
             compaction_threshold=0.7,
             verbose=self.verbose,
+            token_ledger=token_ledger,
+            speculative_threshold=compaction_config.speculative_threshold,
         )
         # Cap keep_recent_tokens for small context windows
         self._memory_middleware.set_context_limit(context_limit)
@@ -916,12 +939,26 @@ class LeonAgent:
 
         # Search tools
         if self.config.tools.search.enabled:
-            max_file_size = self.config.tools.search.tools.grep.max_file_size
+            grep_config = self.config.tools.search.tools.grep
+            inventory_config = self.config.tools.search.inventory
+            is_local = self._sandbox.name == "local"
             self._search_service = SearchService(
                 registry=self._tool_registry,
                 workspace_root=self.workspace_root,
-                max_file_size=max_file_size,
+                max_file_size=grep_config.max_file_size,
+                use_index=grep_config.index and is_local,
+                index_refresh_interval=grep_config.index_refresh_interval,
+                use_inventory=inventory_config.enabled and is_local,
+                inventory_poll_interval=inventory_config.poll_interval,
+                inventory_full_rescan_interval=inventory_config.full_rescan_interval,
+                persist_inventory=inventory_config.persist,
             )
+            # Keep the Grep index / Glob inventory fresh on agent writes/edits without waiting for a re-stat
+            filesystem_service = getattr(self, "_filesystem_service", None)
+            if filesystem_service is not None:
+                for tracker in (self._search_service.index, self._search_service.inventory):
+                    if tracker is not None:
+                        filesystem_service.hooks.append(tracker)
 
         # Web tools
         if self.config.tools.web.enabled:
@@ -930,6 +967,22 @@ class LeonAgent:
             firecrawl_key = self.config.tools.web.tools.web_search.firecrawl_api_key or os.getenv("FIRECRAWL_API_KEY")
             jina_key = self.config.tools.web.tools.fetch.jina_api_key or os.getenv("JINA_AI_API_KEY")
             extraction_model = self._create_extraction_model()
+            fetch_config = self.config.tools.web.tools.fetch
+            fetch_cache = (
+                WebFetchCache(ttl=fetch_config.cache_ttl, max_bytes=fetch_config.cache_max_mb * 1024 * 1024)
+                if fetch_config.cache
+                else None
+            )
+            search_config = self.config.tools.web.tools.web_search
+            search_cache = (
+                get_shared_search_cache(
+                    ttl=search_config.cache_ttl,
+                    max_entries=search_config.cache_max_entries,
+                    persist=search_config.cache_persist,
+                )
+                if search_config.cache
+                else None
+            )
             self._web_service = WebService(
                 registry=self._tool_registry,
                 tavily_api_key=tavily_key,
@@ -939,6 +992,10 @@ class LeonAgent:
                 max_search_results=self.config.tools.web.tools.web_search.max_results,
                 timeout=self.config.tools.web.timeout,
                 extraction_model=extraction_model,
+                fetch_cache=fetch_cache,
+                search_hedge_delay=search_config.hedge_delay,
+                search_adaptive_order=search_config.adaptive_order,
+                search_cache=search_cache,
             )
 
         # Shared background run registry: CommandService (bash) and AgentService (agent)
@@ -1,4 +1,5 @@
 from .middleware import MemoryMiddleware
 from .summary_store import SummaryStore
+from .token_ledger import TokenLedger
 
-__all__ = ["MemoryMiddleware", "SummaryStore"]
+__all__ = ["MemoryMiddleware", "SummaryStore", "TokenLedger"]
@@ -2,14 +2,25 @@
 
 Generates summaries of old messages, caches them in memory.
 Does NOT modify LangGraph state.
+
+Compaction is incremental: each pass feeds the model the previous summary plus
+only the messages evicted since the last split (rolling summary). Evicted
+messages are also summarized in bounded chunks that form a tree — leaves cover
+message ranges, parents merge ``fanout`` consecutive siblings — so a long
+thread never needs one call over its whole history.
 """
 
 from __future__ import annotations
 
+import asyncio
+import uuid
+from dataclasses import dataclass, field
 from typing import Any
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from .token_ledger import TokenLedger
+
 SUMMARY_PROMPT = """\
 Provide a detailed summary for continuing our conversation. Include:
 1. Key decisions made and their rationale
@@ -24,6 +35,45 @@ This summary covers the prefix of a split turn. Focus on the original request,
 early progress, and any details needed to understand the retained suffix.
 Provide a concise summary that captures the essential context."""
 
+ROLLING_SUMMARY_PROMPT = """\
+You maintain the running summary of a long conversation. Update the existing
+summary with the new material below. Keep every decision, file, error and
+outstanding task that is still relevant; drop details later messages made
+obsolete. Return the complete updated summary, not just the changes."""
+
+CHUNK_SUMMARY_PROMPT = """\
+Summarize this segment of a longer conversation. Keep key decisions, files
+touched, errors and their resolutions, and open tasks. Be concise; the result
+will be merged with summaries of neighbouring segments."""
+
+MERGE_SUMMARY_PROMPT = """\
+Merge these consecutive segment summaries of one conversation into a single
+summary, preserving their order. Keep decisions, files, errors and open tasks;
+remove repetition."""
+
+
+@dataclass
+class SummaryNode:
+    """One node of the chunk-summary tree, covering messages[start_index:end_index]."""
+
+    level: int
+    start_index: int
+    end_index: int
+    summary_text: str
+    node_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    children: list[SummaryNode] = field(default_factory=list)
+
+
+def _cover(nodes: list[SummaryNode], start_index: int) -> list[SummaryNode]:
+    """Maximal nodes starting at or after start_index, oldest first (they tile the range once)."""
+    inside = [n for n in nodes if n.start_index >= start_index]
+    maximal = [
+        n for n in inside
+        if not any(o is not n and o.start_index <= n.start_index and n.end_index <= o.end_index and o.level > n.level
+                   for o in inside)
+    ]
+    return sorted(maximal, key=lambda n: n.start_index)
+
 
 class ContextCompactor:
     """Summarize old messages via LLM call. Stateless — caller manages cache."""
@@ -32,9 +82,18 @@ class ContextCompactor:
         self,
         reserve_tokens: int = 16384,
         keep_recent_tokens: int = 20000,
+        token_ledger: TokenLedger | None = None,
+        chunk_tokens: int = 8000,
+        fanout: int = 4,
     ):
+        if fanout < 2:
+            raise ValueError(f"fanout must be >= 2, got {fanout}")
         self.reserve_tokens = reserve_tokens
         self.keep_recent_tokens = keep_recent_tokens
+        # Upper bound on raw message tokens fed to a single summarization call
+        self.chunk_tokens = chunk_tokens
+        self.fanout = fanout
+        self.token_ledger = token_ledger or TokenLedger()
 
     def should_compact(self, estimated_tokens: int, context_limit: int, threshold: float = 0.7) -> bool:
         """Whether current context exceeds the compaction threshold.
@@ -50,7 +109,7 @@ class ContextCompactor:
         threshold_tokens = int(context_limit * threshold)
         return estimated_tokens > threshold_tokens
 
-    def split_messages(self, messages: list[Any]) -> tuple[list[Any], list[Any]]:
+    def split_messages(self, messages: list[Any], view: str = "compact") -> tuple[list[Any], list[Any]]:
         """Split messages into (to_summarize, to_keep).
 
         Keeps recent messages up to keep_recent_tokens.
@@ -59,17 +118,9 @@ class ContextCompactor:
         if len(messages) <= 2:
             return [], messages
 
-        # Walk backwards, accumulating tokens for to_keep
-        accumulated = 0
-        split_idx = len(messages)
-
-        for i in range(len(messages) - 1, -1, -1):
-            msg_tokens = self._estimate_msg_tokens(messages[i])
-            if accumulated + msg_tokens > self.keep_recent_tokens:
-                split_idx = i + 1
-                break
-            accumulated += msg_tokens
-        else:
+        # Smallest index whose suffix fits keep_recent_tokens (prefix sums + bisect)
+        split_idx = self.token_ledger.split_for_recent(messages, self.keep_recent_tokens, view=view)
+        if split_idx == 0:
             return [], messages
 
         # Adjust boundary to avoid splitting tool_calls from ToolMessages
@@ -95,20 +146,140 @@ class ContextCompactor:
         response = await model.ainvoke(summary_messages)
         return response.content if hasattr(response, "content") else str(response)
 
+    # ========== Incremental (rolling + tree) compaction ==========
+
+    async def compact_incremental(
+        self,
+        new_messages: list[Any],
+        model: Any,
+        previous_summary: str | None = None,
+        start_index: int = 0,
+        roots: list[SummaryNode] | None = None,
+    ) -> tuple[str, list[SummaryNode]]:
+        """Fold newly evicted messages into the running summary.
+
+        Args:
+            new_messages: Messages evicted since the previous split
+                (``messages[start_index:split_idx]``)
+            model: Summarization model
+            previous_summary: Summary covering ``messages[:start_index]``, if any
+            start_index: Absolute index of ``new_messages[0]``
+            roots: Current root nodes of the persisted tree, oldest first
+
+        Returns:
+            (summary_text, new_nodes): Updated summary for ``messages[:start_index + len(new_messages)]``
+            and the tree nodes created by this pass (leaves and merged parents, children linked).
+        """
+        chunks = self.chunk_messages(new_messages)
+        if len(chunks) == 1 and previous_summary is None:
+            # First pass over a small prefix: the leaf summary is the summary
+            summary_text = await self.compact(new_messages, model)
+            leaves = [SummaryNode(0, start_index, start_index + len(new_messages), summary_text)]
+        elif len(chunks) == 1:
+            # @@@rolling-raw - a single chunk is folded in verbatim (one call). Its leaf keeps the
+            # formatted chunk, at most chunk_tokens, and is condensed when a merge first reads it.
+            formatted = self._format_messages_for_summary(new_messages)
+            summary_text = await self._roll(previous_summary, formatted, model)
+            leaves = [SummaryNode(0, start_index, start_index + len(new_messages), formatted)]
+        else:
+            leaves = await self.summarize_chunks(chunks, model, start_index)
+            summary_text = None
+
+        _, parents = await self.roll_up(list(roots or []) + leaves, model)
+        if summary_text is None:
+            # Large eviction: fold this pass's leaves, reduced to the largest nodes lying wholly in
+            # the new range, never the raw text. Parents that also cover older roots are skipped
+            # (the previous summary has those), but their new children are not.
+            fresh = _cover([*leaves, *parents], start_index)
+            summary_text = await self._roll(previous_summary, "\n\n---\n\n".join(n.summary_text for n in fresh), model)
+        return summary_text, leaves + parents
+
+    def chunk_messages(self, messages: list[Any]) -> list[list[Any]]:
+        """Greedy split into consecutive chunks of at most chunk_tokens (at least one message each)."""
+        chunks: list[list[Any]] = []
+        current: list[Any] = []
+        current_tokens = 0
+        for msg in messages:
+            tokens = self._estimate_msg_tokens(msg)
+            if current and current_tokens + tokens > self.chunk_tokens:
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(msg)
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def summarize_chunks(self, chunks: list[list[Any]], model: Any, start_index: int) -> list[SummaryNode]:
+        """Summarize chunks concurrently into level-0 nodes."""
+        texts = await asyncio.gather(
+            *(self._summarize_text(CHUNK_SUMMARY_PROMPT, self._format_messages_for_summary(c), model) for c in chunks)
+        )
+        leaves = []
+        offset = start_index
+        for chunk, text in zip(chunks, texts):
+            leaves.append(SummaryNode(0, offset, offset + len(chunk), text))
+            offset += len(chunk)
+        return leaves
+
+    async def roll_up(self, roots: list[SummaryNode], model: Any) -> tuple[list[SummaryNode], list[SummaryNode]]:
+        """Merge ``fanout`` consecutive same-level roots until no level has that many.
+
+        Returns (roots_after, created_parents). Each merge reads at most fanout summaries.
+        """
+        roots = list(roots)
+        created: list[SummaryNode] = []
+        level = 0
+        while any(node.level >= level for node in roots):
+            at_level = [i for i, node in enumerate(roots) if node.level == level]
+            # Roots are ordered oldest-first with levels non-increasing, so same-level roots are adjacent
+            groups = [at_level[i : i + self.fanout] for i in range(0, len(at_level) - self.fanout + 1, self.fanout)]
+            if groups:
+                texts = await asyncio.gather(
+                    *(
+                        self._summarize_text(
+                            MERGE_SUMMARY_PROMPT,
+                            "\n\n---\n\n".join(roots[i].summary_text for i in group),
+                            model,
+                        )
+                        for group in groups
+                    )
+                )
+                merged: dict[int, SummaryNode | None] = {}
+                for group, text in zip(groups, texts):
+                    children = [roots[i] for i in group]
+                    parent = SummaryNode(
+                        level + 1, children[0].start_index, children[-1].end_index, text, children=children
+                    )
+                    created.append(parent)
+                    merged.update(dict.fromkeys(group[1:]))
+                    merged[group[0]] = parent
+                roots = [merged.get(i, node) for i, node in enumerate(roots) if merged.get(i, node) is not None]
+            level += 1
+        return roots, created
+
+    async def _roll(self, previous_summary: str | None, new_material: str, model: Any) -> str:
+        if previous_summary is None:
+            return await self._summarize_text(MERGE_SUMMARY_PROMPT, new_material, model)
+        summary_messages = [
+            SystemMessage(content=ROLLING_SUMMARY_PROMPT),
+            HumanMessage(
+                content=(
+                    f"Existing summary:\n\n{previous_summary}\n\n"
+                    f"New conversation since that summary:\n\n{new_material}"
+                )
+            ),
+        ]
+        response = await model.ainvoke(summary_messages)
+        return response.content if hasattr(response, "content") else str(response)
+
+    async def _summarize_text(self, prompt: str, text: str, model: Any) -> str:
+        response = await model.ainvoke([SystemMessage(content=prompt), HumanMessage(content=text)])
+        return response.content if hasattr(response, "content") else str(response)
+
     def _estimate_msg_tokens(self, msg: Any) -> int:
-        """Estimate tokens for a single message (chars // 2)."""
-        content = getattr(msg, "content", "")
-        if isinstance(content, str):
-            return len(content) // 2
-        if isinstance(content, list):
-            total = 0
-            for block in content:
-                if isinstance(block, dict):
-                    total += len(block.get("text", "")) // 2
-                elif isinstance(block, str):
-                    total += len(block) // 2
-            return total
-        return 0
+        """Estimate tokens for a single message (cached per message id by the ledger)."""
+        return self.token_ledger.message_tokens(msg)
 
     def _adjust_boundary(self, messages: list[Any], split_idx: int) -> int:
         """Adjust split boundary so to_keep starts at a valid conversation point.
@@ -175,18 +346,23 @@ class ContextCompactor:
         return to_keep[:prefix_end_idx]
 
     async def compact_with_split_turn(
-        self, to_summarize: list[Any], turn_prefix: list[Any], model: Any
+        self,
+        to_summarize: list[Any],
+        turn_prefix: list[Any],
+        model: Any,
+        history_summary: str | None = None,
     ) -> tuple[str, str]:
         """Generate summary with split turn handling.
 
         Creates two summaries:
-        1. Historical summary (standard)
+        1. Historical summary (standard, or ``history_summary`` if already computed incrementally)
         2. Turn prefix summary (focused on original request)
 
         Returns:
             (combined_summary, prefix_summary)
         """
-        history_summary = await self.compact(to_summarize, model)
+        if history_summary is None:
+            history_summary = await self.compact(to_summarize, model)
 
         formatted_prefix = self._format_messages_for_summary(turn_prefix)
         prefix_messages = [
@@ -7,8 +7,10 @@ does NOT modify LangGraph state. TUI sees full history, agent sees compressed.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -21,13 +23,44 @@ from langchain.agents.middleware.types import (
 from langchain_core.messages import SystemMessage
 
 from storage.contracts import SummaryRepo
-from .compactor import ContextCompactor
+from .compactor import ContextCompactor, SummaryNode
 from .pruner import SessionPruner
 from .summary_store import SummaryStore
+from .token_ledger import TokenLedger
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _SpeculativeSummary:
+    """Background compaction result, adopted only if its split point still matches."""
+
+    summary_text: str
+    compact_up_to_index: int
+    boundary: Any  # last summarized message
+    first_kept: Any  # first message kept verbatim
+    compacted_at: int
+    nodes: list[SummaryNode] = field(default_factory=list)
+    reset_tree: bool = False
+
+
+def _tiles(roots: list[SummaryNode], end_index: int) -> bool:
+    """Whether roots cover messages[:end_index] back to back (an empty tree tiles 0)."""
+    expected = 0
+    for node in roots:
+        if node.start_index != expected:
+            return False
+        expected = node.end_index
+    return expected == end_index
+
+
+def _same_message(a: Any, b: Any) -> bool:
+    if a is b:
+        return True
+    a_id = getattr(a, "id", None)
+    return bool(a_id) and a_id == getattr(b, "id", None) and type(a) is type(b)
+
+
 class MemoryMiddleware(AgentMiddleware):
     """Context memory management middleware.
 
@@ -47,10 +80,18 @@ class MemoryMiddleware(AgentMiddleware):
         checkpointer: Any = None,
         compaction_threshold: float = 0.7,
         verbose: bool = False,
+        token_ledger: TokenLedger | None = None,
+        speculative_threshold: float | None = None,
     ):
         self.verbose = verbose
         self._context_limit = context_limit
         self._compaction_threshold = compaction_threshold
+        # Lower watermark for background compaction; None keeps compaction inline only
+        self._speculative_threshold = speculative_threshold
+        self._speculative_task: asyncio.Task | None = None
+        self._speculative_result: _SpeculativeSummary | None = None
+        # Shared with ContextMonitor/ContextCompactor so history is counted once per turn
+        self.token_ledger = token_ledger or TokenLedger()
 
         # Layer 1: Pruner
         if pruning_config:
@@ -67,9 +108,10 @@ class MemoryMiddleware(AgentMiddleware):
             self.compactor = ContextCompactor(
                 reserve_tokens=compaction_config.reserve_tokens,
                 keep_recent_tokens=compaction_config.keep_recent_tokens,
+                token_ledger=self.token_ledger,
             )
         else:
-            self.compactor = ContextCompactor()
+            self.compactor = ContextCompactor(token_ledger=self.token_ledger)
 
         # Persistent storage
         summary_db_path = db_path or Path.home() / ".leon" / "leon.db"
@@ -144,9 +186,9 @@ class MemoryMiddleware(AgentMiddleware):
         sys_tokens = self._estimate_system_tokens(request)
 
         # Layer 1: Prune old ToolMessage content
-        pre_prune_tokens = self._estimate_tokens(messages) + sys_tokens
+        pre_prune_tokens = self._estimate_tokens(messages, view="raw") + sys_tokens
         messages = self.pruner.prune(messages)
-        post_prune_tokens = self._estimate_tokens(messages) + sys_tokens
+        post_prune_tokens = self._estimate_tokens(messages, view="pruned") + sys_tokens
 
         if self.verbose:
             pruned_saved = pre_prune_tokens - post_prune_tokens
@@ -160,10 +202,17 @@ class MemoryMiddleware(AgentMiddleware):
                     print(f"[Memory]   msg[{i}] ToolMessage: {orig_len} → {new_len} chars ({action})")
 
         # Layer 2: Compaction
-        estimated = self._estimate_tokens(messages) + sys_tokens
+        pruned = messages
+        thread_id = self._extract_thread_id(request)
+        estimated = self._estimate_tokens(messages, view="pruned") + sys_tokens
+        if self._speculative_threshold is not None:
+            await self._adopt_speculative_summary(messages, thread_id)
+            # @@@speculative-effective-size - judge what the model will actually see (summary + kept tail),
+            # otherwise the already-summarized prefix keeps tripping the threshold.
+            estimated = self._effective_tokens(messages) + sys_tokens
+        should_compact = self.compactor.should_compact(estimated, self._context_limit, self._compaction_threshold)
         if self.verbose:
             threshold = int(self._context_limit * self._compaction_threshold)
-            should_compact = self.compactor.should_compact(estimated, self._context_limit, self._compaction_threshold)
             print(
                 f"[Memory] Context: ~{estimated} tokens "
                 f"(sys={sys_tokens}, msgs={estimated - sys_tokens}), "
@@ -171,8 +220,7 @@ class MemoryMiddleware(AgentMiddleware):
                 f"compact={'YES' if should_compact else 'no'}"
             )
 
-        if self.compactor.should_compact(estimated, self._context_limit, self._compaction_threshold) and self._model:
-            thread_id = self._extract_thread_id(request)
+        if should_compact and self._model and not self._defer_to_speculative(estimated):
             messages = await self._do_compact(messages, thread_id)
         elif self._cached_summary and self._compact_up_to_index > 0:
             if self._compact_up_to_index <= len(messages):
@@ -185,8 +233,11 @@ class MemoryMiddleware(AgentMiddleware):
                         f"{len(messages) - 1} msgs sent to LLM"
                     )
 
+        if self._speculative_threshold is not None and self._model:
+            self._maybe_start_speculative(pruned, estimated, thread_id)
+
         if self.verbose:
-            final_tokens = self._estimate_tokens(messages) + sys_tokens
+            final_tokens = self._estimate_tokens(messages, view="final") + sys_tokens
             print(
                 f"[Memory] Final: {len(messages)} msgs (~{final_tokens} tokens) "
                 f"sent to LLM (original: {original_count} msgs)"
@@ -199,15 +250,18 @@ class MemoryMiddleware(AgentMiddleware):
         if self._runtime:
             self._runtime.set_flag("isCompacting", True)
         try:
-            to_summarize, to_keep = self.compactor.split_messages(messages)
+            to_summarize, to_keep = self.compactor.split_messages(messages, view="pruned")
             if len(to_summarize) < 2:
                 return messages
 
             is_split_turn, turn_prefix = self.compactor.detect_split_turn(messages, to_keep, self._context_limit)
+            history_text, nodes, reset_tree = await self._summarize_history(
+                to_summarize, thread_id, self._cached_summary, self._compact_up_to_index
+            )
 
             if is_split_turn:
                 summary_text, prefix_summary = await self.compactor.compact_with_split_turn(
-                    to_summarize, turn_prefix, self._resolved_model
+                    to_summarize, turn_prefix, self._resolved_model, history_summary=history_text
                 )
                 to_keep = to_keep[len(turn_prefix) :]
                 if self.verbose:
@@ -216,7 +270,7 @@ class MemoryMiddleware(AgentMiddleware):
                         f"{len(turn_prefix)} prefix msgs → summary + {len(to_keep)} suffix msgs"
                     )
             else:
-                summary_text = await self.compactor.compact(to_summarize, self._resolved_model)
+                summary_text = history_text
                 prefix_summary = None
                 if self.verbose:
                     print(f"[Memory] Compacted: {len(to_summarize)} msgs → summary + {len(to_keep)} recent")
@@ -238,6 +292,7 @@ class MemoryMiddleware(AgentMiddleware):
                         print(f"[Memory] Saved summary {summary_id} to store")
                 except Exception as e:
                     logger.error(f"[Memory] Failed to save summary to store: {e}")
+                self._save_summary_tree(thread_id, nodes, reset_tree)
 
             summary_msg = SystemMessage(content=f"[Conversation Summary]\n{summary_text}")
             return [summary_msg] + to_keep
@@ -245,6 +300,148 @@ class MemoryMiddleware(AgentMiddleware):
             if self._runtime:
                 self._runtime.set_flag("isCompacting", False)
 
+    async def _summarize_history(
+        self,
+        to_summarize: list[Any],
+        thread_id: str | None,
+        previous_summary: str | None,
+        previous_index: int,
+    ) -> tuple[str, list[SummaryNode], bool]:
+        """Rolling summary of to_summarize, reusing a previous summary that covers a strict prefix.
+
+        Returns (summary_text, new_tree_nodes, reset_tree). reset_tree means the stored
+        tree does not describe this history and must be dropped before saving the new nodes.
+        """
+        if not previous_summary or not 0 < previous_index < len(to_summarize):
+            previous_summary, previous_index = None, 0
+        roots: list[SummaryNode] = []
+        if self.summary_store and thread_id and previous_index > 0:
+            roots = self.summary_store.get_summary_roots(thread_id)
+        # @@@tree-tiling - stored roots must cover exactly messages[:previous_index] back to back;
+        # anything else belongs to a rewritten history, so the tree restarts from this pass.
+        reset_tree = not _tiles(roots, previous_index)
+        if reset_tree:
+            roots = []
+        summary_text, nodes = await self.compactor.compact_incremental(
+            to_summarize[previous_index:],
+            self._resolved_model,
+            previous_summary=previous_summary,
+            start_index=previous_index,
+            roots=roots,
+        )
+        if self.verbose and previous_summary:
+            print(
+                f"[Memory] Rolling summary: {len(to_summarize) - previous_index} new msgs folded into "
+                f"summary of {previous_index}"
+            )
+        return summary_text, nodes, reset_tree
+
+    def _save_summary_tree(self, thread_id: str, nodes: list[SummaryNode], reset_tree: bool) -> None:
+        try:
+            if reset_tree:
+                self.summary_store.reset_summary_tree(thread_id)
+            self.summary_store.save_summary_nodes(thread_id, nodes)
+        except Exception as e:
+            logger.error(f"[Memory] Failed to save summary tree to store: {e}")
+
+    # ========== Speculative (background) compaction ==========
+
+    def _effective_tokens(self, messages: list[Any]) -> int:
+        """Tokens the model will see: cached summary + messages after the split, or everything."""
+        idx = self._compact_up_to_index
+        if not self._cached_summary or not 0 < idx <= len(messages):
+            return self._estimate_tokens(messages, view="pruned")
+        summary_tokens = self.token_ledger.message_tokens(SystemMessage(content=self._cached_summary))
+        return summary_tokens + self._estimate_tokens(messages[idx:], view="effective")
+
+    def _defer_to_speculative(self, estimated: int) -> bool:
+        """Skip inline compaction while a background pass is running and the request still fits."""
+        task = self._speculative_task
+        return task is not None and not task.done() and estimated < self._context_limit
+
+    def _maybe_start_speculative(self, messages: list[Any], estimated: int, thread_id: str | None) -> None:
+        if self._speculative_task is not None and not self._speculative_task.done():
+            return
+        if self._speculative_result is not None:
+            return
+        if not self.compactor.should_compact(estimated, self._context_limit, self._speculative_threshold):
+            return
+        to_summarize, to_keep = self.compactor.split_messages(messages, view="pruned")
+        split_idx = len(messages) - len(to_keep)
+        # Only worth a pass if it moves the split point forward
+        if len(to_summarize) < 2 or split_idx <= self._compact_up_to_index:
+            return
+        if self.verbose:
+            print(f"[Memory] Speculative compaction started: {len(to_summarize)} msgs in background")
+        self._speculative_task = asyncio.create_task(
+            self._speculative_compact(
+                list(messages), to_summarize, split_idx, thread_id, self._cached_summary, self._compact_up_to_index
+            )
+        )
+
+    async def _speculative_compact(
+        self,
+        snapshot: list[Any],
+        to_summarize: list[Any],
+        split_idx: int,
+        thread_id: str | None,
+        previous_summary: str | None,
+        previous_index: int,
+    ) -> None:
+        try:
+            summary_text, nodes, reset_tree = await self._summarize_history(
+                to_summarize, thread_id, previous_summary, previous_index
+            )
+        except Exception:
+            logger.exception("[Memory] Speculative compaction failed")
+            return
+        self._speculative_result = _SpeculativeSummary(
+            summary_text=summary_text,
+            compact_up_to_index=split_idx,
+            boundary=snapshot[split_idx - 1],
+            first_kept=snapshot[split_idx],
+            compacted_at=len(snapshot),
+            nodes=nodes,
+            reset_tree=reset_tree,
+        )
+
+    async def _adopt_speculative_summary(self, messages: list[Any], thread_id: str | None) -> None:
+        """Swap in a finished background summary if its split point is still valid."""
+        result = self._speculative_result
+        if result is None:
+            return
+        self._speculative_result = None
+        idx = result.compact_up_to_index
+        valid = (
+            idx > self._compact_up_to_index
+            and idx < len(messages)
+            and _same_message(messages[idx - 1], result.boundary)
+            and _same_message(messages[idx], result.first_kept)
+        )
+        if not valid:
+            if self.verbose:
+                print(f"[Memory] Discarded speculative summary: split point {idx} no longer valid")
+            return
+
+        self._cached_summary = result.summary_text
+        self._compact_up_to_index = idx
+        if self.verbose:
+            print(f"[Memory] Adopted speculative summary: {idx} old msgs replaced")
+
+        # Persist only once adopted, so a restart never restores a summary whose split was invalid
+        if self.summary_store and thread_id:
+            try:
+                await asyncio.to_thread(
+                    self.summary_store.save_summary,
+                    thread_id=thread_id,
+                    summary_text=result.summary_text,
+                    compact_up_to_index=idx,
+                    compacted_at=result.compacted_at,
+                )
+            except Exception as e:
+                logger.error(f"[Memory] Failed to save speculative summary to store: {e}")
+            await asyncio.to_thread(self._save_summary_tree, thread_id, result.nodes, result.reset_tree)
+
     async def force_compact(self, messages: list[Any]) -> dict[str, Any] | None:
         """Manual compaction trigger (/compact command). Ignores threshold."""
         if not self._model:
@@ -271,20 +468,9 @@ class MemoryMiddleware(AgentMiddleware):
             if self._runtime:
                 self._runtime.set_flag("isCompacting", False)
 
-    def _estimate_tokens(self, messages: list[Any]) -> int:
-        """Estimate total tokens for messages (chars // 2)."""
-        total = 0
-        for msg in messages:
-            content = getattr(msg, "content", "")
-            if isinstance(content, str):
-                total += len(content)
-            elif isinstance(content, list):
-                for block in content:
-                    if isinstance(block, dict):
-                        total += len(block.get("text", ""))
-                    elif isinstance(block, str):
-                        total += len(block)
-        return total // 2
+    def _estimate_tokens(self, messages: list[Any], view: str = "default") -> int:
+        """Estimate total tokens for messages via the shared ledger (only new messages are counted)."""
+        return self.token_ledger.count(messages, view=view)
 
     def _estimate_system_tokens(self, request: Any) -> int:
         """Estimate tokens for system_message (not in messages list)."""
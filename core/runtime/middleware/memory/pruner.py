@@ -1,13 +1,22 @@
 """SessionPruner — Layer 1: trim/clear old ToolMessage content.
 
 Pure string operations, no LLM calls. Protects recent tool results.
+
+Pruned copies are memoized by (tool_call_id, content length, policy) and the
+result prefix that was already outside the protected window on the previous
+call is reused as-is, so per-call work is O(protected window + new messages).
+Returning the same copy objects every turn also keeps downstream identity
+checks (TokenLedger) and provider prompt caches stable.
 """
 
 from __future__ import annotations
 
 import copy
+import operator
 from typing import Any
 
+_MAX_CACHED_PRUNED = 10_000
+
 
 class SessionPruner:
     """Prune old ToolMessage content to reduce context size.
@@ -26,28 +35,59 @@ class SessionPruner:
         self.soft_trim_chars = soft_trim_chars
         self.hard_clear_threshold = hard_clear_threshold
         self.protect_recent = protect_recent
+        # (tool_call_id, content length, policy) → pruned copy
+        self._pruned_cache: dict[tuple[Any, ...], Any] = {}
+        # Previous call: input, output, protected-window start, policy
+        self._last_input: list[Any] = []
+        self._last_output: list[Any] = []
+        self._last_window_start = 0
+        self._last_policy: tuple[int, int, int] | None = None
+
+    @property
+    def _policy(self) -> tuple[int, int, int]:
+        return (self.soft_trim_chars, self.hard_clear_threshold, self.protect_recent)
 
     def prune(self, messages: list[Any]) -> list[Any]:
         """Return new message list with old ToolMessage content trimmed/cleared.
 
         Does NOT modify original messages — returns shallow copies with replaced content.
         """
-        protected_ids = self._get_protected_tool_call_ids(messages)
-        result = []
-        for msg in messages:
+        protected_ids, window_start = self._get_protected_window(messages)
+
+        # @@@prune-prefix-reuse - everything before last call's protected window was already
+        # pruned and can only stay unprotected as the thread grows; reuse it if the input prefix is identical.
+        reuse = 0
+        if self._last_policy == self._policy:
+            candidate = min(self._last_window_start, len(messages))
+            if all(map(operator.is_, messages[:candidate], self._last_input[:candidate])):
+                reuse = candidate
+
+        result = self._last_output[:reuse]
+        for msg in messages[reuse:]:
             if self._is_tool_message(msg) and not self._is_protected(msg, protected_ids):
                 result.append(self._prune_tool_message(msg))
             else:
                 result.append(msg)
-        return result
+
+        self._last_input = list(messages)
+        self._last_output = result
+        self._last_window_start = window_start
+        self._last_policy = self._policy
+        return list(result)
 
     def _get_protected_tool_call_ids(self, messages: list[Any]) -> set[str]:
         """Collect tool_call_ids from the most recent N AIMessages with tool_calls."""
+        return self._get_protected_window(messages)[0]
+
+    def _get_protected_window(self, messages: list[Any]) -> tuple[set[str], int]:
+        """Protected tool_call_ids plus the index where the protected window starts."""
         ids: set[str] = set()
         count = 0
-        for msg in reversed(messages):
+        window_start = len(messages)
+        for idx in range(len(messages) - 1, -1, -1):
             if count >= self.protect_recent:
                 break
+            msg = messages[idx]
             if not self._is_ai_message(msg):
                 continue
 
@@ -60,7 +100,8 @@ class SessionPruner:
                 if tc_id:
                     ids.add(tc_id)
             count += 1
-        return ids
+            window_start = idx
+        return ids, window_start
 
     def _is_tool_message(self, msg: Any) -> bool:
         return msg.__class__.__name__ == "ToolMessage"
@@ -72,15 +113,8 @@ class SessionPruner:
         tool_call_id = getattr(msg, "tool_call_id", None)
         return tool_call_id in protected_ids if tool_call_id else False
 
-    def _prune_tool_message(self, msg: Any) -> Any:
-        content = getattr(msg, "content", "")
-        if not isinstance(content, str):
-            return msg
-
+    def _build_pruned(self, msg: Any, content: str) -> Any:
         n = len(content)
-        if n <= self.soft_trim_chars:
-            return msg
-
         # Determine new content based on size
         if n > self.hard_clear_threshold:
             new_content = f"[Tool output cleared — {n} chars]"
@@ -91,3 +125,19 @@ class SessionPruner:
         new_msg = copy.copy(msg)
         new_msg.content = new_content
         return new_msg
+
+    def _prune_tool_message(self, msg: Any) -> Any:
+        content = getattr(msg, "content", "")
+        if not isinstance(content, str) or len(content) <= self.soft_trim_chars:
+            return msg
+
+        tool_call_id = getattr(msg, "tool_call_id", None)
+        if not tool_call_id:
+            return self._build_pruned(msg, content)
+        key = (tool_call_id, len(content), self.soft_trim_chars, self.hard_clear_threshold)
+        cached = self._pruned_cache.get(key)
+        if cached is None:
+            if len(self._pruned_cache) >= _MAX_CACHED_PRUNED:
+                self._pruned_cache.clear()
+            cached = self._pruned_cache[key] = self._build_pruned(msg, content)
+        return cached
@@ -8,6 +8,7 @@ Architecture:
     - Summaries stored with thread_id as key
     - Only latest summary per thread is active
     - Historical summaries retained for audit
+    - Chunk-summary tree (summary_nodes) kept alongside for incremental compaction
 """
 
 from __future__ import annotations
@@ -27,6 +28,8 @@ from storage.providers.sqlite.kernel import connect_sqlite
 
 from storage.providers.sqlite.summary_repo import SQLiteSummaryRepo
 
+from .compactor import SummaryNode
+
 logger = logging.getLogger(__name__)
 
 
@@ -187,6 +190,64 @@ class SummaryStore:
         """
         return self._repo.list_summaries(thread_id)
 
+    def save_summary_nodes(self, thread_id: str, nodes: list[SummaryNode]) -> None:
+        """Persist tree nodes created by one compaction pass and link their children.
+
+        Args:
+            thread_id: Thread identifier
+            nodes: New leaves and parents; parents' children may be nodes stored earlier
+        """
+        if not nodes:
+            return
+        self._repo.save_summary_nodes(
+            thread_id,
+            [
+                {
+                    "node_id": node.node_id,
+                    "level": node.level,
+                    "start_index": node.start_index,
+                    "end_index": node.end_index,
+                    "summary_text": node.summary_text,
+                    "child_ids": [child.node_id for child in node.children],
+                }
+                for node in nodes
+            ],
+            datetime.now().isoformat(),
+        )
+
+    def get_summary_roots(self, thread_id: str) -> list[SummaryNode]:
+        """Root nodes of the tree (not yet merged into a parent), oldest first.
+
+        Args:
+            thread_id: Thread identifier
+
+        Returns:
+            Roots as SummaryNode without children loaded; empty on failure
+        """
+        try:
+            rows = self._repo.list_summary_node_rows(thread_id, roots_only=True)
+        except Exception as e:
+            logger.error(f"[SummaryStore] Failed to read summary tree for thread {thread_id}: {e}")
+            return []
+        return [
+            SummaryNode(
+                level=int(row["level"]),
+                start_index=int(row["start_index"]),
+                end_index=int(row["end_index"]),
+                summary_text=str(row["summary_text"]),
+                node_id=str(row["node_id"]),
+            )
+            for row in rows
+        ]
+
+    def list_summary_nodes(self, thread_id: str) -> list[dict[str, Any]]:
+        """List every tree node for a thread (for audit purposes)."""
+        return self._repo.list_summary_node_rows(thread_id)
+
+    def reset_summary_tree(self, thread_id: str) -> None:
+        """Drop the tree, e.g. when compaction restarts from the beginning of the thread."""
+        self._repo.delete_summary_nodes(thread_id)
+
     def delete_thread_summaries(self, thread_id: str) -> None:
         """Delete all summaries for a thread.
 
@@ -0,0 +1,158 @@
+"""TokenLedger — incremental token accounting shared by memory and monitor.
+
+Every model call used to re-estimate the whole history three times (monitor,
+memory, compactor). The ledger caches per-message counts by message id and
+keeps per-view prefix sums, so a new turn only counts the appended messages
+and split points are found by bisection instead of a backwards walk.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import operator
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+TokenCounter = Callable[[str], int]
+
+
+def estimate_chars(text: str) -> int:
+    """Default heuristic: chars // 2 (same as the historical estimate)."""
+    return len(text) // 2
+
+
+@lru_cache(maxsize=16)
+def get_token_counter(model_name: str) -> TokenCounter | None:
+    """Return a real tokenizer for model_name, cached per model. None if tiktoken is unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        logger.debug("tiktoken not installed; falling back to chars // 2 estimate")
+        return None
+    try:
+        encoding = tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def _content_text(content: Any) -> str | None:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for block in content:
+            if isinstance(block, dict):
+                parts.append(block.get("text", ""))
+            elif isinstance(block, str):
+                parts.append(block)
+        return "".join(parts)
+    return None
+
+
+def _content_signature(content: Any) -> tuple[int, ...]:
+    if isinstance(content, str):
+        return (len(content),)
+    if isinstance(content, list):
+        # Block count alone misses edits inside a block (e.g. streamed text growing in place).
+        chars = sum(
+            len(block.get("text", "")) if isinstance(block, dict) else len(block) if isinstance(block, str) else 0
+            for block in content
+        )
+        return (len(content), chars)
+    return (0,)
+
+
+class _View:
+    """Prefix sums over one append-mostly message sequence."""
+
+    __slots__ = ("messages", "prefix")
+
+    def __init__(self) -> None:
+        self.messages: list[Any] = []
+        self.prefix: list[int] = [0]
+
+
+class TokenLedger:
+    """Per-thread token ledger keyed by message id.
+
+    ``count(messages, view)`` returns the total for a message list. Each
+    ``view`` (e.g. one per thread for raw history, one for the pruned copy)
+    remembers the last sequence it saw; when the new list starts with the
+    same message objects, only the tail is counted.
+    """
+
+    def __init__(self, counter: TokenCounter | None = None, max_cached_messages: int = 50_000) -> None:
+        self._counter = counter or estimate_chars
+        self._max_cached = max_cached_messages
+        # message id → (content signature, tokens)
+        self._by_id: dict[str, tuple[tuple[Any, ...], int]] = {}
+        self._views: dict[str, _View] = {}
+
+    @classmethod
+    def for_model(cls, model_name: str | None, *, use_tokenizer: bool = False) -> TokenLedger:
+        counter = get_token_counter(model_name) if use_tokenizer and model_name else None
+        return cls(counter=counter)
+
+    def message_tokens(self, msg: Any) -> int:
+        content = msg.get("content", "") if isinstance(msg, dict) else getattr(msg, "content", "")
+        msg_id = None if isinstance(msg, dict) else getattr(msg, "id", None)
+        # @@@ledger-signature - pruned copies share the original id but carry different content;
+        # the signature keeps both forms cached without hashing the text itself.
+        signature = (type(msg).__name__, *_content_signature(content))
+        if msg_id:
+            cached = self._by_id.get(msg_id)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+        text = _content_text(content)
+        tokens = self._counter(text) if text else 0
+        if msg_id:
+            if len(self._by_id) >= self._max_cached:
+                self._by_id.clear()
+            self._by_id[msg_id] = (signature, tokens)
+        return tokens
+
+    def count(self, messages: list[Any], view: str = "default") -> int:
+        """Total tokens for messages, counting only what changed since the last call for this view."""
+        return self._sync(messages, view).prefix[len(messages)]
+
+    def split_for_recent(self, messages: list[Any], keep_tokens: int, view: str = "default") -> int:
+        """Smallest index whose suffix fits in keep_tokens (0 when everything fits)."""
+        prefix = self._sync(messages, view).prefix
+        total = prefix[len(messages)]
+        return bisect.bisect_left(prefix, total - keep_tokens, 0, len(messages) + 1)
+
+    def forget(self, view: str) -> None:
+        self._views.pop(view, None)
+
+    def _sync(self, messages: list[Any], view: str) -> _View:
+        state = self._views.get(view)
+        if state is None:
+            state = self._views[view] = _View()
+        known = state.messages
+        n = len(messages)
+        # @@@ledger-identity-check - C-level identity scan; any replaced message (pruned copy,
+        # compaction rewrite, RemoveMessage) invalidates from the start and recounts via per-id cache.
+        if n <= len(known):
+            if all(map(operator.is_, messages, known)):
+                return state
+            start = 0
+        elif all(map(operator.is_, known, messages)):
+            start = len(known)
+        else:
+            start = 0
+        if start == 0:
+            state.messages = []
+            state.prefix = [0]
+        prefix = state.prefix
+        running = prefix[-1]
+        tail = messages[start:]
+        for msg in tail:
+            running += self.message_tokens(msg)
+            prefix.append(running)
+        state.messages.extend(tail)
+        return state
@@ -14,6 +14,8 @@ class ContextMonitor(BaseMonitor):
 
     def __init__(self, context_limit: int = 100000):
         self.context_limit = context_limit
+        # 共享 TokenLedger（由 agent 注入）：与 MemoryMiddleware 共用 "raw" 视图，避免重复全量估算
+        self.token_ledger: Any = None
         self.message_count = 0
         self.estimated_tokens = 0
         self._last_request_messages = 0
@@ -55,6 +57,8 @@ class ContextMonitor(BaseMonitor):
         简单估算：每 4 个字符约 1 个 token（英文）
         中文每个字符约 1-2 个 token
         """
+        if self.token_ledger is not None:
+            return self.token_ledger.count(messages, view="raw")
         total_chars = sum(self._extract_content_length(msg) for msg in messages)
         return total_chars // 2
 
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import copy
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from enum import Enum
 
+from .tool_index import ToolSearchIndex
+
+DEFAULT_SEARCH_LIMIT = 5
+
 Handler = Callable[..., str] | Callable[..., Awaitable[str]]
 SchemaProvider = dict | Callable[[], dict]
 
@@ -20,11 +25,25 @@ class ToolEntry:
     schema: SchemaProvider
     handler: Handler
     source: str
+    # Synchronous handler that does I/O (files, subprocess, SQLite, network): ToolRunner runs it
+    # on the blocking-tool pool instead of the event loop
+    blocking: bool = False
+    # Max concurrent pool executions of this tool across all agents (None = pool size)
+    max_concurrency: int | None = None
 
     def get_schema(self) -> dict:
         return self.schema() if callable(self.schema) else self.schema
 
 
+@dataclass(frozen=True)
+class InlineSnapshot:
+    """Inline tool schemas as of one registry version (same objects until the next change)."""
+
+    version: int
+    schemas: tuple[dict, ...]
+    names: frozenset[str]
+
+
 class ToolRegistry:
     """Central registry for all tools.
 
@@ -40,40 +59,98 @@ class ToolRegistry:
         self._tools: dict[str, ToolEntry] = {}
         self._allowed_tools = allowed_tools
         self._blocked_tools = blocked_tools or set()
+        # Bumped on every change that can alter the inline tool set
+        self._version = 0
+        self._inline_snapshot: InlineSnapshot | None = None
+        self._index = ToolSearchIndex()
 
     @property
     def blocked_tools(self) -> set[str]:
         return self._blocked_tools
 
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def set_blocked_tools(self, blocked_tools: set[str]) -> None:
+        """Replace the blocked set; already-registered tools in it are no longer injected or found."""
+        self._blocked_tools = set(blocked_tools)
+        self._changed()
+
+    def invalidate(self) -> None:
+        """Rebuild derived state after a callable schema provider changed its output."""
+        for entry in self._tools.values():
+            if callable(entry.schema):
+                self._index.add(entry.name, entry.get_schema())
+        self._changed()
+
+    def _changed(self) -> None:
+        self._version += 1
+        self._inline_snapshot = None
+
     def register(self, entry: ToolEntry) -> None:
         if self._allowed_tools is not None and entry.name not in self._allowed_tools:
             return  # silently skip
         if entry.name in self._blocked_tools:
             return  # silently skip disabled tools
         self._tools[entry.name] = entry
+        self._index.add(entry.name, entry.get_schema())
+        self._changed()
 
     def get(self, name: str) -> ToolEntry | None:
+        if name in self._blocked_tools:
+            return None
         return self._tools.get(name)
 
     def get_inline_schemas(self) -> list[dict]:
-        return [
-            e.get_schema() for e in self._tools.values() if e.mode == ToolMode.INLINE
-        ]
-
-    def search(self, query: str) -> list[ToolEntry]:
-        """Return all matching tools (including inline) for tool_search."""
-        q = query.lower()
-        results = []
-        for entry in self._tools.values():
+        return list(self.inline_snapshot().schemas)
+
+    def inline_snapshot(self) -> InlineSnapshot:
+        """Frozen inline schemas, rebuilt only after register/blocked-tool changes.
+
+        @@@inline-snapshot - schemas are deep-copied once and returned as the same objects on every
+        call, so the serialized tool block stays byte-identical for provider-side prompt caching.
+        """
+        snapshot = self._inline_snapshot
+        if snapshot is None:
+            schemas = tuple(
+                copy.deepcopy(e.get_schema())
+                for e in self._tools.values()
+                if e.mode == ToolMode.INLINE and e.name not in self._blocked_tools
+            )
+            snapshot = self._inline_snapshot = InlineSnapshot(
+                version=self._version,
+                schemas=schemas,
+                names=frozenset(s.get("name") for s in schemas),
+            )
+        return snapshot
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> list[ToolEntry]:
+        """Return the best-matching tools (including inline) for tool_search."""
+        return [entry for entry, _ in self.search_scored(query, limit)]
+
+    def search_scored(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> list[tuple[ToolEntry, float]]:
+        """Top ``limit`` tools ranked by BM25 over name, description and parameter names.
+
+        Queries with no indexed term (e.g. mid-word fragments) fall back to a
+        substring scan, scored 0. Empty when nothing matches.
+        """
+        ranked = self._index.search(query, limit, exclude=self._blocked_tools)
+        if ranked:
+            return [(self._tools[name], score) for name, score in ranked]
+        q = query.lower().strip()
+        if not q:
+            return []
+        results: list[tuple[ToolEntry, float]] = []
+        for entry in self.list_all():
             schema = entry.get_schema()
             name = schema.get("name", "")
             desc = schema.get("description", "")
             if q in name.lower() or q in desc.lower():
-                results.append(entry)
-        # If no match, return all
-        if not results:
-            results = list(self._tools.values())
+                results.append((entry, 0.0))
+                if len(results) >= limit:
+                    break
         return results
 
     def list_all(self) -> list[ToolEntry]:
-        return list(self._tools.values())
+        return [e for e in self._tools.values() if e.name not in self._blocked_tools]
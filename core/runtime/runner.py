@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import operator
 from collections.abc import Awaitable, Callable
 
 from langchain.agents.middleware.types import (
@@ -15,6 +16,7 @@ from langchain_core.messages import ToolMessage
 
 from .errors import InputValidationError
 from .registry import ToolRegistry
+from .tool_pool import BlockingToolPool, get_shared_pool
 from .validator import ToolValidator
 
 logger = logging.getLogger(__name__)
@@ -25,17 +27,46 @@ class ToolRunner(AgentMiddleware):
 
     - wrap_model_call: injects inline tool schemas
     - wrap_tool_call: validates, dispatches, normalizes errors
+
+    On the async path, handlers registered with ``blocking=True`` run on a
+    BlockingToolPool (the process-wide shared pool unless one is given).
     """
 
     def __init__(
-        self, registry: ToolRegistry, validator: ToolValidator | None = None
+        self,
+        registry: ToolRegistry,
+        validator: ToolValidator | None = None,
+        pool: BlockingToolPool | None = None,
     ):
         self._registry = registry
         self._validator = validator or ToolValidator()
+        self._pool = pool
+        # (registry version, request tools it was built from, merged tool list)
+        self._merged_tools: tuple[int, tuple, list] | None = None
+
+    @property
+    def pool(self) -> BlockingToolPool:
+        if self._pool is None:
+            self._pool = get_shared_pool()
+        return self._pool
+
+    def get_metrics(self) -> dict:
+        """Blocking-tool pool metrics (queue/run times per tool)."""
+        return self.pool.get_metrics()
 
     def _inject_tools(self, request: ModelRequest) -> ModelRequest:
-        inline_schemas = self._registry.get_inline_schemas()
-        existing_tools = list(request.tools or [])
+        snapshot = self._registry.inline_snapshot()
+        existing_tools = request.tools or []
+        cached = self._merged_tools
+        # @@@merged-tools-cache - same registry version + same tool objects → reuse the merged list
+        if (
+            cached is not None
+            and cached[0] == snapshot.version
+            and len(cached[1]) == len(existing_tools)
+            and all(map(operator.is_, cached[1], existing_tools))
+        ):
+            return request.override(tools=cached[2])
+
         # tools can be BaseTool instances or dicts - handle both
         existing_names: set[str] = set()
         for t in existing_tools:
@@ -46,9 +77,11 @@ class ToolRunner(AgentMiddleware):
             if name:
                 existing_names.add(name)
         new_tools = [
-            s for s in inline_schemas if s.get("name") not in existing_names
+            s for s in snapshot.schemas if s.get("name") not in existing_names
         ]
-        return request.override(tools=existing_tools + new_tools)
+        merged = list(existing_tools) + new_tools
+        self._merged_tools = (snapshot.version, tuple(existing_tools), merged)
+        return request.override(tools=merged)
 
     def _extract_call_info(self, request: ToolCallRequest) -> tuple[str, dict, str]:
         tool_call = request.tool_call
@@ -71,7 +104,7 @@ class ToolRunner(AgentMiddleware):
 
         schema = entry.get_schema()
         try:
-            self._validator.validate(schema, args)
+            args = self._validator.validate(schema, args).params
         except InputValidationError as e:
             return ToolMessage(
                 content=f"InputValidationError: {name} failed due to the following issue:\n{e}",
@@ -101,7 +134,7 @@ class ToolRunner(AgentMiddleware):
 
         schema = entry.get_schema()
         try:
-            self._validator.validate(schema, args)
+            args = self._validator.validate(schema, args).params
         except InputValidationError as e:
             return ToolMessage(
                 content=f"InputValidationError: {name} failed due to the following issue:\n{e}",
@@ -110,7 +143,11 @@ class ToolRunner(AgentMiddleware):
             )
 
         try:
-            result = entry.handler(**args)
+            # @@@blocking-off-loop - sync I/O handlers would stall every other thread's stream
+            if entry.blocking:
+                result = await self.pool.run(entry, args)
+            else:
+                result = entry.handler(**args)
             if asyncio.iscoroutine(result):
                 result = await result
             return ToolMessage(content=str(result), tool_call_id=call_id, name=name)
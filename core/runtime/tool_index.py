@@ -0,0 +1,131 @@
+"""ToolSearchIndex — BM25 ranking for tool_search over many (MCP) tools.
+
+ToolRegistry.search used to substring-scan every entry's name and
+description and return *all* tools when nothing matched. The index is an
+inverted index over three fields, maintained incrementally at registration:
+
+- name: split on camelCase / snake_case / punctuation, weighted highest
+- description
+- parameter names (top-level ``properties`` keys)
+
+Scores are BM25 (``core.bm25``) over the field-weighted term frequencies. A
+query term with no exact match is expanded to vocabulary terms it prefixes
+("creat" → "create"), so partial words still find tools like the old
+substring scan.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+from collections import Counter
+from dataclasses import dataclass
+
+from core.bm25 import idf, term_score, tokenize
+
+_FIELD_WEIGHTS = {"name": 3.0, "description": 1.0, "params": 1.5}
+_PREFIX_WEIGHT = 0.7
+_MAX_PREFIX_EXPANSIONS = 16
+_MIN_PREFIX_LEN = 2
+
+@dataclass
+class _Doc:
+    terms: dict[str, float]
+    length: float
+
+
+class ToolSearchIndex:
+    """Incremental inverted index over tool schemas, ranked with BM25."""
+
+    def __init__(self) -> None:
+        self._docs: dict[str, _Doc] = {}
+        self._postings: dict[str, dict[str, float]] = {}
+        self._total_length = 0.0
+        self._vocab: list[str] = []
+        self._vocab_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, name: str, schema: dict) -> None:
+        """Index (or re-index) one tool under its registry name."""
+        self.remove(name)
+        params = schema.get("parameters", {}).get("properties", {})
+        fields = {
+            "name": f"{name} {schema.get('name', '')}" if schema.get("name") not in (None, name) else name,
+            "description": schema.get("description", "") or "",
+            "params": " ".join(params) if isinstance(params, dict) else "",
+        }
+        terms: Counter[str] = Counter()
+        for field_name, text in fields.items():
+            weight = _FIELD_WEIGHTS[field_name]
+            for token in tokenize(text):
+                terms[token] += weight
+        length = sum(terms.values())
+        self._docs[name] = _Doc(terms=dict(terms), length=length)
+        self._total_length += length
+        for term, tf in terms.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                self._vocab_dirty = True
+            posting[name] = tf
+
+    def remove(self, name: str) -> None:
+        doc = self._docs.pop(name, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        for term in doc.terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(name, None)
+            if not posting:
+                del self._postings[term]
+                self._vocab_dirty = True
+
+    def search(
+        self, query: str, limit: int, exclude: set[str] | frozenset[str] = frozenset()
+    ) -> list[tuple[str, float]]:
+        """Top ``limit`` (name, score) pairs, best first; empty when no query term matches."""
+        n_docs = len(self._docs)
+        if n_docs == 0 or limit <= 0:
+            return []
+        avg_length = self._total_length / n_docs or 1.0
+        scores: dict[str, float] = {}
+        for term, boost in self._expand(tokenize(query)):
+            posting = self._postings[term]
+            term_idf = idf(n_docs, len(posting))
+            for name, tf in posting.items():
+                score = term_score(tf, term_idf, self._docs[name].length, avg_length)
+                scores[name] = scores.get(name, 0.0) + boost * score
+        return heapq.nsmallest(
+            limit,
+            ((name, score) for name, score in scores.items() if name not in exclude),
+            key=lambda item: (-item[1], item[0]),
+        )
+
+    def _expand(self, query_terms: list[str]) -> list[tuple[str, float]]:
+        expanded: dict[str, float] = {}
+        for term in dict.fromkeys(query_terms):
+            if term in self._postings:
+                expanded[term] = max(expanded.get(term, 0.0), 1.0)
+                continue
+            if len(term) < _MIN_PREFIX_LEN:
+                continue
+            for candidate in self._prefixed(term):
+                expanded[candidate] = max(expanded.get(candidate, 0.0), _PREFIX_WEIGHT)
+        return list(expanded.items())
+
+    def _prefixed(self, prefix: str) -> list[str]:
+        if self._vocab_dirty:
+            self._vocab = sorted(self._postings)
+            self._vocab_dirty = False
+        start = bisect.bisect_left(self._vocab, prefix)
+        matches: list[str] = []
+        for term in self._vocab[start : start + _MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
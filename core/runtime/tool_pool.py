@@ -0,0 +1,185 @@
+"""BlockingToolPool — runs synchronous tool handlers off the event loop.
+
+ToolRunner used to call every handler directly on the loop, so one agent's
+ripgrep subprocess or SQLite query stalled every other thread's SSE stream
+in the same backend process. Handlers registered with ``blocking=True`` are
+submitted here instead:
+
+- one bounded ThreadPoolExecutor shared by every agent in the process
+- per-tool concurrency caps (``ToolEntry.max_concurrency`` or an override),
+  enforced before a worker is taken so a capped tool cannot fill the pool
+- the caller's contextvars (sandbox thread id, LangChain run config) are
+  copied into the worker
+- per-tool queue-time / run-time metrics via ``get_metrics()``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from .registry import ToolEntry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 16
+# Queue waits above this are logged — the pool or a tool cap is saturated
+SLOW_QUEUE_WARN_MS = 1000.0
+
+
+@dataclass
+class _ToolStats:
+    calls: int = 0
+    errors: int = 0
+    queued: int = 0
+    running: int = 0
+    queue_ms_total: float = 0.0
+    queue_ms_max: float = 0.0
+    run_ms_total: float = 0.0
+    run_ms_max: float = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        done = max(self.calls, 1)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "queued": self.queued,
+            "running": self.running,
+            "queue_ms_avg": round(self.queue_ms_total / done, 2),
+            "queue_ms_max": round(self.queue_ms_max, 2),
+            "run_ms_avg": round(self.run_ms_total / done, 2),
+            "run_ms_max": round(self.run_ms_max, 2),
+        }
+
+
+@dataclass
+class _PendingCall:
+    enqueued: float
+    started: bool = False
+
+
+class BlockingToolPool:
+    """Bounded thread pool with per-tool concurrency caps and queue metrics."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_concurrency: dict[str, int] | None = None,
+    ) -> None:
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        self.max_workers = max_workers
+        self._overrides = dict(max_concurrency or {})
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool-pool")
+        self._stats: dict[str, _ToolStats] = {}
+        self._stats_lock = threading.Lock()
+        # asyncio.Semaphore is loop-bound; agents on different loops get their own caps
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def limit_for(self, entry: ToolEntry) -> int | None:
+        limit = self._overrides.get(entry.name, entry.max_concurrency)
+        return limit if limit and limit < self.max_workers else None
+
+    async def run(self, entry: ToolEntry, args: dict[str, Any]) -> Any:
+        """Run entry.handler(**args) on a pool thread; exceptions propagate to the caller."""
+        stats = self._tool_stats(entry.name)
+        call = _PendingCall(enqueued=time.perf_counter())
+        with self._stats_lock:
+            stats.queued += 1
+        try:
+            semaphore = self._semaphore(entry)
+            if semaphore is None:
+                return await self._submit(entry, args, stats, call)
+            async with semaphore:
+                return await self._submit(entry, args, stats, call)
+        finally:
+            with self._stats_lock:
+                # Cancelled (or failed to submit) before a worker picked it up
+                if not call.started:
+                    stats.queued -= 1
+
+    async def _submit(self, entry: ToolEntry, args: dict[str, Any], stats: _ToolStats, call: _PendingCall) -> Any:
+        ctx = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, ctx.run, self._call, entry, args, stats, call)
+
+    def _call(self, entry: ToolEntry, args: dict[str, Any], stats: _ToolStats, call: _PendingCall) -> Any:
+        started = time.perf_counter()
+        queue_ms = (started - call.enqueued) * 1000
+        with self._stats_lock:
+            call.started = True
+            stats.queued -= 1
+            stats.running += 1
+            stats.queue_ms_total += queue_ms
+            stats.queue_ms_max = max(stats.queue_ms_max, queue_ms)
+        if queue_ms > SLOW_QUEUE_WARN_MS:
+            logger.warning("[BlockingToolPool] %s waited %.0fms for a worker", entry.name, queue_ms)
+        failed = False
+        try:
+            return entry.handler(**args)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            run_ms = (time.perf_counter() - started) * 1000
+            with self._stats_lock:
+                stats.running -= 1
+                stats.calls += 1
+                stats.errors += failed
+                stats.run_ms_total += run_ms
+                stats.run_ms_max = max(stats.run_ms_max, run_ms)
+
+    def _semaphore(self, entry: ToolEntry) -> asyncio.Semaphore | None:
+        limit = self.limit_for(entry)
+        if limit is None:
+            return None
+        per_loop = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        semaphore = per_loop.get(entry.name)
+        if semaphore is None:
+            semaphore = per_loop[entry.name] = asyncio.Semaphore(limit)
+        return semaphore
+
+    def _tool_stats(self, name: str) -> _ToolStats:
+        with self._stats_lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _ToolStats()
+            return stats
+
+    def get_metrics(self) -> dict[str, Any]:
+        with self._stats_lock:
+            tools = {name: stats.snapshot() for name, stats in self._stats.items()}
+        return {
+            "max_workers": self.max_workers,
+            "queued": sum(t["queued"] for t in tools.values()),
+            "running": sum(t["running"] for t in tools.values()),
+            "tools": tools,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_shared_pool: BlockingToolPool | None = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_pool(
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_concurrency: dict[str, int] | None = None,
+) -> BlockingToolPool:
+    """Process-wide pool shared by every agent's ToolRunner (sized by the first caller)."""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = BlockingToolPool(max_workers=max_workers, max_concurrency=max_concurrency)
+        return _shared_pool
@@ -1,7 +1,42 @@
+"""ToolValidator — tool argument validation against the tool's JSON schema.
+
+Schemas are compiled once into nested closures (cached by schema identity)
+instead of re-walking the schema dict on every call. The compiled validator:
+
+- checks required fields, types and enums at every level (nested objects,
+  array items), reporting the path of the offending value
+- fills in ``default`` values for missing properties
+- coerces numeric strings ("5", "2.5") for integer/number fields, since
+  models often quote numbers
+
+Unknown keywords (anyOf, pattern, ...) are accepted without checks.
+"""
+
+from __future__ import annotations
+
+import copy
 import json
+import math
+from collections.abc import Callable
+from itertools import repeat
+from typing import Any
 
 from .errors import InputValidationError
 
+Check = Callable[[Any], Any]
+
+_CACHE_SIZE = 512
+
+_TYPE_NAMES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+    "null": (type(None),),
+}
+
 
 class ValidationResult:
     def __init__(self, ok: bool, params: dict):
@@ -9,55 +44,231 @@ class ValidationResult:
         self.params = params
 
 
+class _InvalidError(Exception):
+    """Internal failure; the path is collected while unwinding so the happy path formats nothing."""
+
+    def __init__(self, kind: str, detail: Any = None) -> None:
+        self.kind = kind
+        self.detail = detail
+        self.path: list[str | int] = []
+
+    def at(self, key: str | int) -> _InvalidError:
+        self.path.insert(0, key)
+        return self
+
+
+def _format_path(parts: list[str | int]) -> str:
+    out = ""
+    for key in parts:
+        if isinstance(key, int):
+            out += f"[{key}]"
+        else:
+            out = f"{out}.{key}" if out else key
+    return out
+
+
+def _coerce_number(val: str, types: tuple[str, ...]) -> Any:
+    """"5" → 5, "2.5" → 2.5 (number only), "3.0" → 3; anything else is returned unchanged."""
+    text = val.strip()
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        number = float(text)
+    except ValueError:
+        return val
+    if not math.isfinite(number):
+        return val
+    if "number" in types:
+        return number
+    return int(number) if number.is_integer() else val
+
+
+def _identity(val: Any) -> Any:
+    return val
+
+
+_EXACT_TYPES = {
+    "string": frozenset({str}),
+    "integer": frozenset({int}),
+    "number": frozenset({int, float}),
+    "boolean": frozenset({bool}),
+    "array": frozenset({list}),
+    "object": frozenset({dict}),
+    "null": frozenset({type(None)}),
+}
+_DOC_KEYWORDS = frozenset({"type", "description", "title", "default"})
+
+
+def _is_type_only(schema: Any) -> bool:
+    return isinstance(schema, dict) and schema.get("type") in _EXACT_TYPES and not set(schema) - _DOC_KEYWORDS
+
+
+def _plain_types(schema: Any) -> tuple[type, ...] | None:
+    """Python types for a schema that is only ``{"type": "string"|"boolean"}`` (plus docs), else None."""
+    if not isinstance(schema, dict) or set(schema) - {"type", "description", "title"}:
+        return None
+    t = schema.get("type")
+    return _TYPE_NAMES[t] if t in ("string", "boolean") else None
+
+
+def _compile(schema: Any) -> Check:
+    """Compile one (sub)schema into check(value) -> value (possibly coerced); raises _InvalidError."""
+    if not isinstance(schema, dict):
+        return _identity
+
+    raw_type = schema.get("type")
+    types: tuple[str, ...] = tuple(raw_type) if isinstance(raw_type, list) else ((raw_type,) if raw_type else ())
+    if any(t not in _TYPE_NAMES for t in types):
+        types = ()  # unknown type keyword: don't guess
+    py_types = tuple(cls for t in types for cls in _TYPE_NAMES[t])
+    # bool is an int subclass; true/false is not a valid integer/number
+    reject_bool = "boolean" not in types and any(t in ("integer", "number") for t in types)
+    numeric = any(t in ("integer", "number") for t in types)
+    enum_vals = schema.get("enum")
+    item_check = _compile(schema["items"]) if isinstance(schema.get("items"), dict) else None
+    # Arrays of plain strings/booleans: one C-level isinstance sweep instead of a call per item
+    item_types = _plain_types(schema.get("items")) if item_check is not None else None
+    object_check = _compile_object(schema) if "properties" in schema or "required" in schema else None
+
+    if not types and not enum_vals and item_check is None and object_check is None:
+        return _identity
+
+    def check(val: Any) -> Any:
+        if py_types and (not isinstance(val, py_types) or (reject_bool and isinstance(val, bool))):
+            coerced = _coerce_number(val, types) if numeric and isinstance(val, str) else val
+            if coerced is val:
+                raise _InvalidError("type", (types, type(val).__name__))
+            val = coerced
+        if enum_vals and val not in enum_vals:
+            raise _InvalidError("enum", (enum_vals, val))
+        if item_types is not None and isinstance(val, list):
+            if not all(map(isinstance, val, repeat(item_types, len(val)))):
+                for i, item in enumerate(val):
+                    if not isinstance(item, item_types):
+                        raise _InvalidError("type", ((schema["items"]["type"],), type(item).__name__)).at(i)
+        elif item_check is not None and isinstance(val, list):
+            items = val
+            for i, item in enumerate(items):
+                try:
+                    checked = item_check(item)
+                except _InvalidError as e:
+                    raise e.at(i) from None
+                if checked is not item:
+                    if val is items:
+                        val = list(items)
+                    val[i] = checked
+        if object_check is not None and isinstance(val, dict):
+            val = object_check(val)
+        return val
+
+    return check
+
+
+def _compile_object(schema: dict) -> Check:
+    properties = schema.get("properties") or {}
+    required = tuple(schema.get("required") or ())
+    checks = {name: _compile(prop) for name, prop in properties.items()}
+    checks = {name: c for name, c in checks.items() if c is not _identity}
+    defaults = {
+        name: prop["default"]
+        for name, prop in properties.items()
+        if isinstance(prop, dict) and "default" in prop and name not in required
+    }
+    closed = schema.get("additionalProperties") is False
+    known = frozenset(properties)
+    # Type-only properties: exact type() membership (no call, and bool never passes as integer)
+    exact = {name: _EXACT_TYPES[prop["type"]] for name, prop in properties.items() if _is_type_only(prop)}
+
+    def check(val: dict) -> dict:
+        for field in required:
+            if field not in val:
+                raise _InvalidError("missing", [f for f in required if f not in val])
+        if closed:
+            for name in val:
+                if name not in known:
+                    raise _InvalidError("unexpected").at(name)
+        out = val
+        enum_issues: list[_InvalidError] = []
+        for name, item in val.items():
+            fast = exact.get(name)
+            if fast is not None and type(item) in fast:
+                continue
+            item_check = checks.get(name)
+            if item_check is None:
+                continue
+            try:
+                checked = item_check(item)
+            except _InvalidError as e:
+                if e.kind == "enum" and not e.path:
+                    enum_issues.append(e.at(name))
+                    continue
+                raise e.at(name) from None
+            if checked is not item:
+                if out is val:
+                    out = dict(val)
+                out[name] = checked
+        if enum_issues:
+            raise _InvalidError("enums", enum_issues)
+        for name, default in defaults.items():
+            if name not in out:
+                if out is val:
+                    out = dict(val)
+                out[name] = copy.deepcopy(default) if isinstance(default, (list, dict)) else default
+        return out
+
+    return check
+
+
+def _to_error(e: _InvalidError) -> InputValidationError:
+    if e.kind == "missing":
+        prefix = _format_path(e.path)
+        fields = [f"{prefix}.{f}" if prefix else f for f in e.detail]
+        return InputValidationError("\n".join(f"The required parameter `{f}` is missing" for f in fields))
+    if e.kind == "type":
+        types, actual = e.detail
+        expected = types[0] if len(types) == 1 else " | ".join(types)
+        return InputValidationError(
+            f"The parameter `{_format_path(e.path)}` type is expected as `{expected}` but provided as `{actual}`"
+        )
+    if e.kind == "unexpected":
+        return InputValidationError(f"Unexpected parameter `{_format_path(e.path)}`")
+    # enum issues (one object level)
+    issues = e.detail if e.kind == "enums" else [e]
+    prefix = e.path if e.kind == "enums" else []
+    return InputValidationError(
+        json.dumps(
+            [
+                {"field": _format_path(prefix + issue.path), "expected": issue.detail[0], "got": issue.detail[1]}
+                for issue in issues
+            ]
+        )
+    )
+
+
 class ToolValidator:
-    """Three-phase tool argument validation."""
+    """Three-phase tool argument validation (required, types, enums) with compiled schemas."""
+
+    def __init__(self) -> None:
+        # id(schema) → (schema, compiled); holding the schema keeps its id from being reused
+        self._compiled: dict[int, tuple[dict, Check]] = {}
 
     def validate(self, schema: dict, args: dict) -> ValidationResult:
-        properties = schema.get("parameters", {}).get("properties", {})
-        required = schema.get("parameters", {}).get("required", [])
-
-        # Phase 1: required fields
-        missing = [f for f in required if f not in args]
-        if missing:
-            msgs = [f"The required parameter `{f}` is missing" for f in missing]
-            raise InputValidationError("\n".join(msgs))
-
-        # Phase 2: type check
-        for name, val in args.items():
-            prop = properties.get(name, {})
-            expected = prop.get("type")
-            if expected and not self._type_matches(val, expected):
-                actual = type(val).__name__
-                raise InputValidationError(
-                    f"The parameter `{name}` type is expected as `{expected}` but provided as `{actual}`"
-                )
-
-        # Phase 3: enum validation
-        issues = self._validate_enum(properties, args)
-        if issues:
-            raise InputValidationError(json.dumps(issues))
-
-        return ValidationResult(ok=True, params=args)
-
-    def _type_matches(self, val, expected: str) -> bool:
-        type_map = {
-            "string": str,
-            "integer": int,
-            "number": (int, float),
-            "boolean": bool,
-            "array": list,
-            "object": dict,
-        }
-        expected_type = type_map.get(expected)
-        if expected_type is None:
-            return True
-        return isinstance(val, expected_type)
-
-    def _validate_enum(self, properties: dict, args: dict) -> list:
-        issues = []
-        for name, val in args.items():
-            prop = properties.get(name, {})
-            enum_vals = prop.get("enum")
-            if enum_vals and val not in enum_vals:
-                issues.append({"field": name, "expected": enum_vals, "got": val})
-        return issues
+        try:
+            params = self.compile(schema)(args)
+        except _InvalidError as e:
+            raise _to_error(e) from None
+        return ValidationResult(ok=True, params=params)
+
+    def compile(self, schema: dict) -> Check:
+        key = id(schema)
+        cached = self._compiled.get(key)
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        parameters = schema.get("parameters") or {}
+        check = _compile_object(parameters) if isinstance(parameters, dict) else _identity
+        self._compiled[key] = (schema, check)
+        if len(self._compiled) > _CACHE_SIZE:
+            del self._compiled[next(iter(self._compiled))]
+        return check
@@ -28,6 +28,7 @@ from langchain_core.messages import ToolMessage
 from core.tools.filesystem.backend import FileSystemBackend
 from core.tools.filesystem.read import ReadLimits, ReadResult
 from core.tools.filesystem.read import read_file as read_file_dispatch
+from core.tools.filesystem.read.line_index import count_lines, count_text_lines
 
 if TYPE_CHECKING:
     from core.operations import FileOperationRecorder
@@ -198,9 +199,13 @@ class FileSystemMiddleware(AgentMiddleware):
 
     def _count_lines(self, resolved: Path) -> int:
         """Count total lines in a file (for error messages)."""
+        from core.tools.filesystem.local_backend import LocalBackend
+
         try:
+            if isinstance(self.backend, LocalBackend):
+                return count_lines(resolved)
             raw = self.backend.read_file(str(resolved))
-            return raw.content.count('\n') + 1
+            return count_text_lines(raw.content)
         except Exception:
             return 0
 
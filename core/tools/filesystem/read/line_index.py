@@ -0,0 +1,264 @@
+"""Sparse line-offset index for large text files.
+
+read_file used to ``readlines()`` the whole file before slicing offset/limit,
+and the oversized-file error counted lines by reading it again. For a large
+log that means loading all of it into memory twice to return 100 lines.
+
+The index is built once per file version by streaming the file in blocks:
+
+- ``checkpoints``: (line number, byte offset) pairs recorded at line starts
+  roughly every ``interval`` lines, so a read seeks to the nearest checkpoint
+  and only scans the bytes between it and the requested line
+- ``total_lines``: same count as ``len(f.readlines())``
+- ``utf8``: whether the whole file decodes, so the not-UTF-8 error is
+  reported exactly as before even though a read only decodes its range
+- ``lone_cr``: files with bare ``\\r`` line breaks (universal newlines split
+  on them, byte counting would not) are left to the in-memory reader
+
+Indexes are keyed by path + mtime_ns + size, kept in a small in-process LRU
+and persisted as JSON under ``~/.leon/line_index/`` (``LEON_LINE_INDEX_DIR``
+overrides), so a restart does not rescan unchanged files. The directory keeps
+at most ``max_persisted`` index files; the least recently used are deleted.
+
+Line totals use ``readlines()`` semantics everywhere: a trailing newline does
+not start another line (``count_text_lines`` gives the same count for content
+read through a non-local backend).
+"""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+LINE_INDEX_INTERVAL = 1000
+# Files smaller than this are read in memory; indexing would cost more than it saves
+LINE_INDEX_MIN_BYTES = 1024 * 1024
+_BLOCK_SIZE = 64 * 1024
+_MEMORY_CACHE_SIZE = 64
+_MAX_PERSISTED_INDEXES = 512
+_PERSIST_VERSION = 1
+
+
+def default_index_dir() -> Path:
+    return Path(os.getenv("LEON_LINE_INDEX_DIR") or (Path.home() / ".leon" / "line_index"))
+
+
+@dataclass
+class LineIndex:
+    """Line count and sparse (line, byte offset) checkpoints for one file version."""
+
+    path: str
+    mtime_ns: int
+    size: int
+    total_lines: int
+    utf8: bool = True
+    lone_cr: bool = False
+    checkpoint_lines: list[int] = field(default_factory=lambda: [0])
+    checkpoint_offsets: list[int] = field(default_factory=lambda: [0])
+
+    def matches(self, st: os.stat_result) -> bool:
+        return self.mtime_ns == st.st_mtime_ns and self.size == st.st_size
+
+    def line_offset(self, f: io.BufferedReader, line: int) -> int:
+        """Byte offset where 0-indexed ``line`` starts, scanning forward from the nearest checkpoint."""
+        i = bisect_right(self.checkpoint_lines, line) - 1
+        current, offset = self.checkpoint_lines[i], self.checkpoint_offsets[i]
+        f.seek(offset)
+        while current < line:
+            block = f.read(_BLOCK_SIZE)
+            if not block:
+                break
+            newlines = block.count(b"\n")
+            if current + newlines < line:
+                current += newlines
+                offset += len(block)
+                continue
+            pos = -1
+            for _ in range(line - current):
+                pos = block.index(b"\n", pos + 1)
+            return offset + pos + 1
+        return offset
+
+    def iter_lines(self, path: Path, start_line: int) -> Iterator[str]:
+        """Decoded lines from 0-indexed ``start_line`` onward, read lazily."""
+        with open(path, "rb") as raw:
+            raw.seek(self.line_offset(raw, start_line))
+            # Same decoding/newline handling as open(path, encoding="utf-8")
+            with io.TextIOWrapper(raw, encoding="utf-8") as text:
+                yield from text
+
+    def to_json(self) -> dict:
+        return {
+            "version": _PERSIST_VERSION,
+            "path": self.path,
+            "mtime_ns": self.mtime_ns,
+            "size": self.size,
+            "total_lines": self.total_lines,
+            "utf8": self.utf8,
+            "lone_cr": self.lone_cr,
+            "checkpoints": [self.checkpoint_lines, self.checkpoint_offsets],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> LineIndex | None:
+        if data.get("version") != _PERSIST_VERSION:
+            return None
+        lines, offsets = data["checkpoints"]
+        return cls(
+            path=data["path"],
+            mtime_ns=data["mtime_ns"],
+            size=data["size"],
+            total_lines=data["total_lines"],
+            utf8=data["utf8"],
+            lone_cr=data["lone_cr"],
+            checkpoint_lines=lines,
+            checkpoint_offsets=offsets,
+        )
+
+
+def build_line_index(path: Path, interval: int = LINE_INDEX_INTERVAL) -> LineIndex:
+    """Stream the file once, counting lines and recording checkpoints at block boundaries."""
+    st = path.stat()
+    index = LineIndex(path=str(path), mtime_ns=st.st_mtime_ns, size=st.st_size, total_lines=0)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    lines = 0
+    offset = 0
+    last_checkpoint = 0
+    cr = crlf = 0
+    last_byte = b""
+    with open(path, "rb") as f:
+        while block := f.read(_BLOCK_SIZE):
+            if index.utf8:
+                try:
+                    decoder.decode(block)
+                except UnicodeDecodeError:
+                    index.utf8 = False
+            cr += block.count(b"\r")
+            # A "\r\n" split across blocks is a trailing "\r" here and a leading "\n" in the next block
+            crlf += block.count(b"\r\n") + (last_byte == b"\r" and block[:1] == b"\n")
+            newlines = block.count(b"\n")
+            lines += newlines
+            if newlines and lines - last_checkpoint >= interval:
+                index.checkpoint_lines.append(lines)
+                index.checkpoint_offsets.append(offset + block.rindex(b"\n") + 1)
+                last_checkpoint = lines
+            offset += len(block)
+            last_byte = block[-1:]
+    index.lone_cr = cr != crlf
+    if index.utf8:
+        try:
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            index.utf8 = False
+    index.total_lines = lines + (1 if last_byte and last_byte != b"\n" else 0)
+    return index
+
+
+class LineIndexCache:
+    """In-process LRU of line indexes backed by per-file JSON under ``index_dir``."""
+
+    def __init__(
+        self,
+        index_dir: Path | None = None,
+        interval: int = LINE_INDEX_INTERVAL,
+        max_persisted: int = _MAX_PERSISTED_INDEXES,
+    ) -> None:
+        self.index_dir = index_dir
+        self.interval = interval
+        self.max_persisted = max_persisted
+        self._memory: OrderedDict[str, LineIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> LineIndex:
+        """Index for the current version of path, built (and persisted) if missing or stale."""
+        key = str(path)
+        st = path.stat()
+        with self._lock:
+            index = self._memory.get(key)
+            if index is not None and index.matches(st):
+                self._memory.move_to_end(key)
+                return index
+        index = self._load(key)
+        if index is None or not index.matches(st):
+            index = build_line_index(path, self.interval)
+            self._save(index)
+        with self._lock:
+            self._memory[key] = index
+            self._memory.move_to_end(key)
+            while len(self._memory) > _MEMORY_CACHE_SIZE:
+                self._memory.popitem(last=False)
+        return index
+
+    def _index_file(self, key: str) -> Path:
+        index_dir = self.index_dir or default_index_dir()
+        return index_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def _load(self, key: str) -> LineIndex | None:
+        index_file = self._index_file(key)
+        try:
+            data = json.loads(index_file.read_text(encoding="utf-8"))
+            index = LineIndex.from_json(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if index is None or index.path != key:
+            return None
+        try:
+            os.utime(index_file)  # mtime doubles as last-use time for eviction
+        except OSError:
+            pass
+        return index
+
+    def _save(self, index: LineIndex) -> None:
+        target = self._index_file(index.path)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(index.to_json()), encoding="utf-8")
+            os.replace(tmp, target)
+        except OSError as e:
+            logger.warning("[LineIndex] Failed to persist index for %s: %s", index.path, e)
+            return
+        self._evict(target.parent)
+
+    def _evict(self, index_dir: Path) -> None:
+        """Delete the least recently used index files beyond max_persisted."""
+        entries = []
+        for entry in index_dir.glob("*.json"):
+            try:
+                entries.append((entry.stat().st_mtime_ns, entry))
+            except OSError:
+                continue
+        if len(entries) <= self.max_persisted:
+            return
+        entries.sort()
+        for _, entry in entries[: len(entries) - self.max_persisted]:
+            entry.unlink(missing_ok=True)
+
+
+_default_cache = LineIndexCache()
+
+
+def get_line_index(path: Path) -> LineIndex:
+    return _default_cache.get(path)
+
+
+def count_lines(path: Path) -> int:
+    """Total lines (as ``readlines()`` would count them) without loading the file."""
+    return get_line_index(path).total_lines
+
+
+def count_text_lines(text: str) -> int:
+    """``count_lines`` for content already in memory (e.g. read through a remote backend)."""
+    return text.count("\n") + (1 if text and not text.endswith("\n") else 0)
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from pathlib import Path
 
+from core.tools.filesystem.read.line_index import LINE_INDEX_MIN_BYTES, LineIndex, get_line_index
 from core.tools.filesystem.read.types import FileType, ReadLimits, ReadResult
 
 
@@ -21,6 +23,9 @@ def read_text(
     2. max_chars: Maximum total characters to return
     3. max_line_length: Truncate individual lines exceeding this
 
+    Files of LINE_INDEX_MIN_BYTES or more are streamed from a sparse
+    line-offset index instead of being loaded whole.
+
     Args:
         path: Absolute path to file
         limits: ReadLimits configuration
@@ -36,6 +41,18 @@ def read_text(
         total_size=path.stat().st_size,
     )
 
+    if result.total_size >= LINE_INDEX_MIN_BYTES:
+        try:
+            index = get_line_index(path)
+        except Exception as e:
+            result.error = f"Error reading file: {e}"
+            return result
+        if not index.utf8:
+            result.error = f"Cannot read file (not UTF-8): {path}"
+            return result
+        if not index.lone_cr:
+            return _read_indexed(path, index, limits, offset, limit, result)
+
     try:
         with open(path, encoding="utf-8") as f:
             all_lines = f.readlines()
@@ -54,19 +71,55 @@ def read_text(
         result.error = f"Offset {offset} exceeds file length {total_lines}"
         return result
 
-    effective_limit = limit if limit else limits.max_lines
-    if offset is None and limit is None and total_lines > limits.max_lines:
-        effective_limit = limits.max_lines
+    _format_lines(all_lines[start_idx:], start_idx, _effective_limit(limits, limit), limits, result)
+    return result
 
-    lines_to_process = all_lines[start_idx:]
 
+def _read_indexed(
+    path: Path,
+    index: LineIndex,
+    limits: ReadLimits,
+    offset: int | None,
+    limit: int | None,
+    result: ReadResult,
+) -> ReadResult:
+    """Seek to the requested line via the line-offset index and decode only the lines returned."""
+    result.total_lines = index.total_lines
+
+    start_idx = (offset - 1) if offset and offset > 0 else 0
+    if start_idx >= index.total_lines:
+        result.error = f"Offset {offset} exceeds file length {index.total_lines}"
+        return result
+
+    lines = index.iter_lines(path, start_idx)
+    try:
+        _format_lines(lines, start_idx, _effective_limit(limits, limit), limits, result)
+    except Exception as e:
+        result.error = f"Error reading file: {e}"
+    finally:
+        lines.close()
+    return result
+
+
+def _effective_limit(limits: ReadLimits, limit: int | None) -> int:
+    return limit if limit else limits.max_lines
+
+
+def _format_lines(
+    lines: Iterable[str],
+    start_idx: int,
+    effective_limit: int,
+    limits: ReadLimits,
+    result: ReadResult,
+) -> None:
+    """Number and truncate lines into result; stops pulling from lines once a limit is hit."""
     output_lines: list[str] = []
     total_chars = 0
     truncated = False
     truncation_reason: str | None = None
     line_count = 0
 
-    for i, line in enumerate(lines_to_process):
+    for i, line in enumerate(lines):
         if line_count >= effective_limit:
             truncated = True
             truncation_reason = f"max_lines={effective_limit}"
@@ -93,5 +146,3 @@ def read_text(
     result.end_line = start_idx + line_count
     result.truncated = truncated
     result.truncation_reason = truncation_reason
-
-    return result
@@ -16,6 +16,7 @@ from typing import TYPE_CHECKING, Any
 from core.tools.filesystem.backend import FileSystemBackend
 from core.tools.filesystem.read import ReadLimits, ReadResult
 from core.tools.filesystem.read import read_file as read_file_dispatch
+from core.tools.filesystem.read.line_index import count_lines, count_text_lines
 from core.runtime.registry import ToolEntry, ToolMode, ToolRegistry
 
 if TYPE_CHECKING:
@@ -93,6 +94,7 @@ class FileSystemService:
             },
             handler=self._read_file,
             source="FileSystemService",
+            blocking=True,
         ))
 
         registry.register(ToolEntry(
@@ -118,6 +120,7 @@ class FileSystemService:
             },
             handler=self._write_file,
             source="FileSystemService",
+            blocking=True,
         ))
 
         registry.register(ToolEntry(
@@ -156,6 +159,7 @@ class FileSystemService:
             },
             handler=self._edit_file,
             source="FileSystemService",
+            blocking=True,
         ))
 
         registry.register(ToolEntry(
@@ -177,6 +181,7 @@ class FileSystemService:
             },
             handler=self._list_dir,
             source="FileSystemService",
+            blocking=True,
         ))
 
     # ------------------------------------------------------------------
@@ -232,6 +237,15 @@ class FileSystemService:
     def _update_file_tracking(self, resolved: Path) -> None:
         self._read_files[resolved] = self.backend.file_mtime(str(resolved))
 
+    def _notify_file_changed(self, resolved: Path, operation: str) -> None:
+        """Tell hooks that track file contents (e.g. the Grep index) about a completed write/edit."""
+        for hook in self.hooks:
+            if hasattr(hook, "on_file_changed"):
+                try:
+                    hook.on_file_changed(str(resolved), operation)
+                except Exception:
+                    logger.exception("[FileSystemService] on_file_changed hook failed for %s", resolved)
+
     def _record_operation(
         self,
         operation_type: str,
@@ -262,9 +276,13 @@ class FileSystemService:
             raise RuntimeError(f"[FileSystemService] Failed to record operation: {e}") from e
 
     def _count_lines(self, resolved: Path) -> int:
+        from core.tools.filesystem.local_backend import LocalBackend
+
         try:
+            if isinstance(self.backend, LocalBackend):
+                return count_lines(resolved)
             raw = self.backend.read_file(str(resolved))
-            return raw.content.count("\n") + 1
+            return count_text_lines(raw.content)
         except Exception:
             return 0
 
@@ -344,6 +362,7 @@ class FileSystemService:
                 return f"Error writing file: {result.error}"
 
             self._update_file_tracking(resolved)
+            self._notify_file_changed(resolved, "write")
             self._record_operation(
                 operation_type="write",
                 file_path=file_path,
@@ -398,6 +417,7 @@ class FileSystemService:
                 return f"Error editing file: {result.error}"
 
             self._update_file_tracking(resolved)
+            self._notify_file_changed(resolved, "edit")
             self._record_operation(
                 operation_type="edit",
                 file_path=file_path,
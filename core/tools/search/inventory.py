@@ -0,0 +1,327 @@
+"""Workspace file inventory — cached file list with mtimes for Glob.
+
+Glob used to walk the whole workspace and stat every file on each call. The
+inventory keeps a per-directory snapshot (directory mtime, file mtimes,
+subdirectories) and refreshes it incrementally:
+
+- every ``poll_interval`` seconds, one stat per directory; only directories
+  whose mtime changed (entries added/removed/renamed) are re-listed
+- every ``full_rescan_interval`` seconds, files are re-stat'ed too, which
+  catches in-place content changes for mtime ordering
+- ``on_file_changed`` (FileSystemService hook) updates a written/edited file
+  immediately, so agent edits are ordered correctly without waiting
+
+Symlinked directories are not followed. The snapshot can be persisted to
+``<workspace>/.leon/file_inventory.json`` so a restart only re-lists changed
+directories instead of re-stat'ing every file.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+INVENTORY_FILENAME = "file_inventory.json"
+_PERSIST_VERSION = 1
+_PERSIST_MIN_INTERVAL_S = 30.0
+
+
+@dataclass
+class _DirSnapshot:
+    mtime_ns: int
+    files: dict[str, int] = field(default_factory=dict)  # name → mtime_ns
+    subdirs: set[str] = field(default_factory=set)
+
+
+def _translate_segment(segment: str) -> str:
+    """fnmatch-style segment (``*``, ``?``, ``[...]``, ``[!...]``) → regex confined to one path part."""
+    out: list[str] = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and segment[j] == "!":
+                j += 1
+            if j < n and segment[j] == "]":
+                j += 1
+            j = segment.find("]", j)
+            if j < 0:
+                out.append(re.escape(c))
+            else:
+                body = segment[i + 1 : j].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                elif body.startswith("^"):
+                    body = "\\" + body
+                out.append(f"[{body}]")
+                i = j
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def compile_path_glob(pattern: str) -> re.Pattern[str] | None:
+    """Translate a pathlib-style glob (``*``, ``?``, ``[...]``, ``**`` segments) to a regex
+    over posix relative paths. None for patterns whose pathlib semantics are not mirrored."""
+    if not pattern or pattern.startswith("/") or pattern.endswith("/"):
+        return None
+    parts = pattern.split("/")
+    if parts[-1] == "**" or any(p in ("", ".", "..") for p in parts):
+        return None
+    out: list[str] = []
+    for i, part in enumerate(parts):
+        if part == "**":
+            out.append("(?:[^/]+/)*")
+            continue
+        if "**" in part:
+            return None
+        out.append(_translate_segment(part) + ("" if i == len(parts) - 1 else "/"))
+    return re.compile("".join(out) + r"\Z")
+
+
+class WorkspaceInventory:
+    """In-memory, incrementally refreshed list of workspace files with mtimes."""
+
+    def __init__(
+        self,
+        workspace_root: str | Path,
+        *,
+        excludes: Iterable[str],
+        poll_interval: float = 1.0,
+        full_rescan_interval: float = 30.0,
+        persist_path: str | Path | None = None,
+    ) -> None:
+        self.workspace_root = Path(workspace_root).resolve()
+        self.excludes = frozenset(excludes)
+        self.poll_interval = poll_interval
+        self.full_rescan_interval = full_rescan_interval
+        self.persist_path = Path(persist_path) if persist_path else None
+        self._dirs: dict[str, _DirSnapshot] = {}
+        self._lock = threading.RLock()
+        self._last_poll = 0.0
+        self._last_full = 0.0
+        self._last_persist = 0.0
+        self._dirty_persist = False
+        # Bumped on every change; results cached per (root, pattern) are valid for one version
+        self.version = 0
+        self._glob_cache: dict[tuple[str, str], tuple[int, list[str]]] = {}
+        # Mirrors SearchService._is_excluded, which checks every part of the absolute path
+        self._root_excluded = any(part in self.excludes for part in self.workspace_root.parts)
+        if self.persist_path is not None:
+            self._load()
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def glob(self, root: Path, pattern: str) -> list[str] | None:
+        """Absolute paths of files under root matching pattern, newest first.
+
+        None when the pattern cannot be answered from the inventory (caller walks instead).
+        """
+        regex = compile_path_glob(pattern)
+        if regex is None:
+            return None
+        try:
+            rel_root = root.resolve().relative_to(self.workspace_root).as_posix()
+        except ValueError:
+            return None
+        prefix = "" if rel_root == "." else rel_root + "/"
+        with self._lock:
+            self.refresh()
+            key = (prefix, pattern)
+            cached = self._glob_cache.get(key)
+            if cached is not None and cached[0] == self.version:
+                return cached[1]
+            matches: list[tuple[int, str]] = []
+            base = str(self.workspace_root)
+            for dir_rel, snap in self._dirs.items():
+                dir_prefix = "" if dir_rel == "." else dir_rel + "/"
+                if not dir_prefix.startswith(prefix):
+                    continue
+                sub = dir_prefix[len(prefix):]
+                for name, mtime_ns in snap.files.items():
+                    if regex.match(sub + name):
+                        matches.append((mtime_ns, f"{base}/{dir_prefix}{name}"))
+            matches.sort(key=lambda m: m[0], reverse=True)
+            result = [path for _, path in matches]
+            if len(self._glob_cache) > 256:
+                self._glob_cache.clear()
+            self._glob_cache[key] = (self.version, result)
+            return result
+
+    def file_count(self) -> int:
+        with self._lock:
+            return sum(len(snap.files) for snap in self._dirs.values())
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def on_file_changed(self, file_path: str, operation: str) -> None:
+        """FileSystemService hook: record a write/edit without waiting for the next poll."""
+        path = Path(file_path)
+        try:
+            rel_dir = path.parent.resolve().relative_to(self.workspace_root).as_posix()
+        except ValueError:
+            return
+        with self._lock:
+            snap = self._dirs.get(rel_dir)
+            if snap is None:
+                # New directory: let the next poll list it from its nearest known ancestor
+                self._last_poll = 0.0
+                return
+            try:
+                st = path.stat()
+            except OSError:
+                snap.files.pop(path.name, None)
+            else:
+                snap.files[path.name] = st.st_mtime_ns
+            self._changed()
+
+    def refresh(self, *, force: bool = False) -> None:
+        """Bring the snapshot up to date according to the poll/full-rescan intervals."""
+        with self._lock:
+            now = time.monotonic()
+            full = force or not self._dirs or now - self._last_full >= self.full_rescan_interval
+            if not full and now - self._last_poll < self.poll_interval:
+                return
+            self._last_poll = now
+            if full:
+                self._last_full = now
+            if self._root_excluded:
+                return
+            self._refresh_dir(".", self.workspace_root, restat_files=full)
+            self._maybe_persist(now)
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def _refresh_dir(self, rel: str, path: Path, *, restat_files: bool) -> None:
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            self._drop_tree(rel)
+            return
+        snap = self._dirs.get(rel)
+        if snap is None or snap.mtime_ns != mtime_ns:
+            self._scan_dir(rel, path, mtime_ns)
+            snap = self._dirs.get(rel)
+            if snap is None:
+                return
+        elif restat_files:
+            for name, old in list(snap.files.items()):
+                try:
+                    st = os.stat(path / name)
+                except OSError:
+                    del snap.files[name]
+                    self._changed()
+                    continue
+                if st.st_mtime_ns != old:
+                    snap.files[name] = st.st_mtime_ns
+                    self._changed()
+        for name in list(snap.subdirs):
+            child = name if rel == "." else f"{rel}/{name}"
+            self._refresh_dir(child, path / name, restat_files=restat_files)
+
+    def _scan_dir(self, rel: str, path: Path, mtime_ns: int) -> None:
+        old = self._dirs.get(rel)
+        snap = _DirSnapshot(mtime_ns=mtime_ns)
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            self._drop_tree(rel)
+            return
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in self.excludes:
+                        snap.subdirs.add(entry.name)
+                elif entry.is_file():
+                    if entry.name in self.excludes:
+                        continue
+                    if self.persist_path is not None and Path(entry.path) == self.persist_path:
+                        continue
+                    snap.files[entry.name] = entry.stat().st_mtime_ns
+            except OSError:
+                continue
+        if old is not None:
+            for gone in old.subdirs - snap.subdirs:
+                self._drop_tree(gone if rel == "." else f"{rel}/{gone}")
+        self._dirs[rel] = snap
+        self._changed()
+
+    def _drop_tree(self, rel: str) -> None:
+        snap = self._dirs.pop(rel, None)
+        if snap is None:
+            return
+        for name in snap.subdirs:
+            self._drop_tree(name if rel == "." else f"{rel}/{name}")
+        self._changed()
+
+    def _changed(self) -> None:
+        self.version += 1
+        self._dirty_persist = True
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self) -> None:
+        if self.persist_path is None:
+            return
+        with self._lock:
+            payload = {
+                "version": _PERSIST_VERSION,
+                "root": str(self.workspace_root),
+                "dirs": {
+                    rel: [snap.mtime_ns, snap.files, sorted(snap.subdirs)] for rel, snap in self._dirs.items()
+                },
+            }
+            self._dirty_persist = False
+        self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.persist_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, self.persist_path)
+
+    def _maybe_persist(self, now: float) -> None:
+        if self.persist_path is None or not self._dirty_persist:
+            return
+        if now - self._last_persist < _PERSIST_MIN_INTERVAL_S and self._last_persist:
+            return
+        self._last_persist = now
+        try:
+            self.save()
+        except OSError as e:
+            logger.warning("[WorkspaceInventory] Failed to persist inventory: %s", e)
+
+    def _load(self) -> None:
+        assert self.persist_path is not None
+        try:
+            payload = json.loads(self.persist_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if payload.get("version") != _PERSIST_VERSION or payload.get("root") != str(self.workspace_root):
+            return
+        self._dirs = {
+            rel: _DirSnapshot(mtime_ns=int(mtime_ns), files=dict(files), subdirs=set(subdirs))
+            for rel, (mtime_ns, files, subdirs) in payload.get("dirs", {}).items()
+        }
+        # Loaded snapshot counts as a full scan: the first refresh only re-lists changed directories
+        self._last_full = time.monotonic()
@@ -3,6 +3,10 @@
 Tools:
 - Grep: Content search using regex (ripgrep preferred, Python fallback)
 - Glob: File pattern matching sorted by modification time
+
+With ``use_index=True`` Grep first narrows candidate files through a
+persistent trigram index (see trigram_index.py); output is unchanged.
+With ``use_inventory=True`` Glob answers from a cached file list (see inventory.py).
 """
 
 from __future__ import annotations
@@ -13,6 +17,13 @@ import subprocess
 from pathlib import Path
 
 from core.runtime.registry import ToolEntry, ToolMode, ToolRegistry
+from core.tools.search.inventory import INVENTORY_FILENAME, WorkspaceInventory
+from core.tools.search.trigram_index import (
+    DEFAULT_REFRESH_INTERVAL,
+    MAX_CANDIDATES,
+    TrigramIndex,
+    compile_glob,
+)
 
 DEFAULT_EXCLUDES: list[str] = [
     "node_modules",
@@ -39,10 +50,34 @@ class SearchService:
         workspace_root: str | Path,
         *,
         max_file_size: int = 10 * 1024 * 1024,
+        use_index: bool = False,
+        index_refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        use_inventory: bool = False,
+        inventory_poll_interval: float = 1.0,
+        inventory_full_rescan_interval: float = 30.0,
+        persist_inventory: bool = False,
     ):
         self.workspace_root = Path(workspace_root).resolve()
         self.max_file_size = max_file_size
         self.has_ripgrep = shutil.which("rg") is not None
+        self.index: TrigramIndex | None = None
+        if use_index:
+            self.index = TrigramIndex(
+                self.workspace_root,
+                excludes=DEFAULT_EXCLUDES,
+                max_file_size=max_file_size,
+                use_ripgrep=self.has_ripgrep,
+                refresh_interval=index_refresh_interval,
+            )
+        self.inventory: WorkspaceInventory | None = None
+        if use_inventory:
+            self.inventory = WorkspaceInventory(
+                self.workspace_root,
+                excludes=DEFAULT_EXCLUDES,
+                poll_interval=inventory_poll_interval,
+                full_rescan_interval=inventory_full_rescan_interval,
+                persist_path=self.workspace_root / ".leon" / INVENTORY_FILENAME if persist_inventory else None,
+            )
         self._register(registry)
 
     def _register(self, registry: ToolRegistry) -> None:
@@ -110,6 +145,9 @@ class SearchService:
             },
             handler=self._grep,
             source="SearchService",
+            blocking=True,
+            # @@@grep-cap - each call may spawn ripgrep over the whole workspace
+            max_concurrency=4,
         ))
 
         registry.register(ToolEntry(
@@ -135,6 +173,7 @@ class SearchService:
             },
             handler=self._glob,
             source="SearchService",
+            blocking=True,
         ))
 
     # ------------------------------------------------------------------
@@ -190,6 +229,10 @@ class SearchService:
         if not resolved.exists():
             return f"Path not found: {path or self.workspace_root}"
 
+        candidates = self._index_candidates(resolved, pattern, glob, type, case_insensitive)
+        if candidates is not None and not candidates:
+            return "No matches found"
+
         if self.has_ripgrep:
             try:
                 return self._ripgrep_search(
@@ -203,6 +246,7 @@ class SearchService:
                     head_limit=head_limit,
                     offset=offset,
                     multiline=multiline,
+                    files=candidates,
                 )
             except Exception:
                 pass  # fallback to Python
@@ -214,8 +258,32 @@ class SearchService:
             output_mode=output_mode,
             head_limit=head_limit,
             offset=offset,
+            files=candidates if not self.has_ripgrep else None,
         )
 
+    def _index_candidates(
+        self,
+        path: Path,
+        pattern: str,
+        glob: str | None,
+        type_filter: str | None,
+        case_insensitive: bool,
+    ) -> list[Path] | None:
+        """Files that may match according to the trigram index; None to search normally."""
+        if self.index is None or not path.is_dir() or type_filter:
+            return None
+        glob_ok = compile_glob(glob, ripgrep=self.has_ripgrep)
+        if glob_ok is None:
+            return None
+        try:
+            re.compile(pattern)
+            files = self.index.candidates(path, pattern, case_insensitive)
+        except Exception:
+            return None  # invalid regex or index failure: let the engine report/handle it
+        if files is None or len(files) > MAX_CANDIDATES:
+            return None
+        return [fp for fp in files if glob_ok(fp)]
+
     def _ripgrep_search(
         self,
         path: Path,
@@ -231,8 +299,14 @@ class SearchService:
         head_limit: int | None,
         offset: int | None,
         multiline: bool,
+        files: list[Path] | None = None,
     ) -> str:
-        cmd: list[str] = ["rg", pattern, str(path)]
+        # @@@explicit-files - index candidates are passed as paths (already glob-filtered; rg skips
+        # --glob and ignore rules for explicit paths) with -H so output matches a directory search.
+        if files is None:
+            cmd: list[str] = ["rg", pattern, str(path)]
+        else:
+            cmd = ["rg", "-H", "-e", pattern, *(str(fp) for fp in files)]
 
         for excl in DEFAULT_EXCLUDES:
             cmd.extend(["--glob", f"!{excl}"])
@@ -287,6 +361,7 @@ class SearchService:
         output_mode: str,
         head_limit: int | None,
         offset: int | None,
+        files: list[Path] | None = None,
     ) -> str:
         flags = re.IGNORECASE if case_insensitive else 0
         try:
@@ -294,7 +369,8 @@ class SearchService:
         except re.error as e:
             return f"Invalid regex: {e}"
 
-        files = self._collect_files(path, glob)
+        if files is None:
+            files = self._collect_files(path, glob)
         lines: list[str] = []
 
         for fp in files:
@@ -335,6 +411,11 @@ class SearchService:
         if not resolved.is_dir():
             return f"Not a directory: {resolved}"
 
+        if self.inventory is not None:
+            cached = self.inventory.glob(resolved, pattern)
+            if cached is not None:
+                return "\n".join(cached) if cached else "No files found"
+
         matches: list[tuple[float, str]] = []
         for p in resolved.glob(pattern):
             if not p.is_file():
@@ -371,6 +452,8 @@ class SearchService:
                 continue
             if self._is_excluded(fp):
                 continue
+            if self.index is not None and self.index.owns(fp):
+                continue
             if fp.stat().st_size > self.max_file_size:
                 continue
             files.append(fp)
@@ -0,0 +1,436 @@
+"""Persistent trigram index used to prefilter Grep candidates.
+
+Every Grep used to read every file under the search root. The index keeps,
+per workspace, the set of byte trigrams each file contains (ASCII-lowercased)
+in ``<workspace>/.leon/grep_index.db``. A query extracts the literals every
+regex match must contain, and only files holding all of their trigrams are
+handed to the real matcher (ripgrep or the Python fallback), so results are
+unchanged — the index only ever answers "could this file match?".
+
+Freshness:
+- A query re-stats the workspace listing at most once per ``refresh_interval``
+  seconds (default 2s, so bursts of Greps share one listing) and re-indexes
+  files whose mtime/size changed.
+- ``on_file_changed`` (FileSystemService hook) marks a path dirty so agent
+  writes/edits are visible to the next query even inside the refresh interval.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from storage.providers.sqlite.connection import create_connection
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIRNAME = ".leon"
+INDEX_FILENAME = "grep_index.db"
+
+# Files larger than this are listed but not tokenized; they are always candidates.
+MAX_INDEXED_BYTES = 4 * 1024 * 1024
+
+# A prefilter that keeps more than this many files is not worth the explicit file list.
+MAX_CANDIDATES = 5000
+
+DEFAULT_REFRESH_INTERVAL = 2.0
+
+_NUL_SCAN_CHUNK = 1024 * 1024
+
+# Requiring a subset of a long literal's trigrams is still exact as a prefilter.
+MAX_QUERY_TRIGRAMS = 64
+
+# @@@unicode-casefold - under case-insensitive matching Python re and ripgrep fold
+# i/k/s to non-ASCII code points (İ ı K ſ); ASCII lowering cannot see those, so
+# trigrams containing them are not used as required evidence.
+_UNSAFE_CASEFOLD_BYTES = frozenset(b"iks")
+
+_QUANT_RE = re.compile(r"\{(\d*)(,\d*)?\}")
+_ESCAPE_SPAN = {"x": 2, "u": 4, "U": 8}
+
+
+def _trigram_keys(data: bytes) -> set[int]:
+    data = data.lower()
+    return {int.from_bytes(data[i : i + 3], "big") for i in range(len(data) - 2)}
+
+
+def required_literals(pattern: str) -> tuple[list[str], bool] | None:
+    """Literal substrings every match of ``pattern`` must contain.
+
+    Conservative: groups, classes and optional atoms are skipped. Returns
+    (literals, inline_ignorecase), or None when the pattern has a top-level
+    alternation or verbose flag (no literal is guaranteed).
+    """
+    literals: list[str] = []
+    run: list[str] = []
+    inline_ignorecase = False
+    depth = 0
+    i = 0
+    n = len(pattern)
+
+    def cut() -> None:
+        if run:
+            literals.append("".join(run))
+            run.clear()
+
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            if i + 1 >= n:
+                break
+            nxt = pattern[i + 1]
+            i += 2
+            if not nxt.isalnum() and nxt != "_":
+                if depth == 0:
+                    run.append(nxt)
+                continue
+            cut()
+            if nxt in _ESCAPE_SPAN:
+                i += _ESCAPE_SPAN[nxt]
+            elif nxt in ("N", "p", "P") and i < n and pattern[i] == "{":
+                end = pattern.find("}", i)
+                i = n if end < 0 else end + 1
+            elif nxt.isdigit():
+                while i < n and pattern[i].isdigit():
+                    i += 1
+            continue
+        if c == "[":
+            cut()
+            i += 1
+            if i < n and pattern[i] == "^":
+                i += 1
+            if i < n and pattern[i] == "]":
+                i += 1
+            while i < n and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+            continue
+        if c == "(":
+            cut()
+            if pattern.startswith("(?", i):
+                m = re.match(r"\(\?([aiLmsux]+)(?:\)|:|-)", pattern[i:])
+                if m:
+                    if "x" in m.group(1):
+                        return None
+                    if "i" in m.group(1):
+                        inline_ignorecase = True
+            depth += 1
+            i += 1
+            continue
+        if c == ")":
+            cut()
+            depth = max(depth - 1, 0)
+            i += 1
+            continue
+        if c == "|":
+            if depth == 0:
+                return None
+            i += 1
+            continue
+        if c in "*?":
+            if run and depth == 0:
+                run.pop()
+            cut()
+            i += 1
+            continue
+        if c == "{":
+            m = _QUANT_RE.match(pattern, i)
+            if m:
+                if not m.group(1) or int(m.group(1)) == 0:
+                    if run and depth == 0:
+                        run.pop()
+                cut()
+                i = m.end()
+                continue
+        if c in ".^$+":
+            cut()
+            i += 1
+            continue
+        if depth == 0:
+            run.append(c)
+        i += 1
+    cut()
+    return literals, inline_ignorecase
+
+
+def query_trigrams(pattern: str, case_insensitive: bool) -> set[int] | None:
+    """Trigram keys a file must contain to possibly match; None if no prefilter applies."""
+    parsed = required_literals(pattern)
+    if parsed is None:
+        return None
+    literals, inline_ignorecase = parsed
+    fold = case_insensitive or inline_ignorecase
+    keys: set[int] = set()
+    for literal in literals:
+        data = literal.encode("utf-8").lower()
+        for j in range(len(data) - 2):
+            tri = data[j : j + 3]
+            if fold and any(b >= 0x80 or b in _UNSAFE_CASEFOLD_BYTES for b in tri):
+                continue
+            keys.add(int.from_bytes(tri, "big"))
+    if len(keys) > MAX_QUERY_TRIGRAMS:
+        keys = set(sorted(keys)[:MAX_QUERY_TRIGRAMS])
+    return keys or None
+
+
+def compile_glob(glob: str | None, *, ripgrep: bool) -> Callable[[Path], bool] | None:
+    """Turn a Grep ``glob`` into a predicate on candidate paths.
+
+    Returns None when the glob cannot be evaluated per basename with the same
+    semantics as the search engine (path globs, ``**``, ripgrep brace sets).
+    """
+    if not glob:
+        return lambda path: True
+    include = True
+    if ripgrep and glob.startswith("!"):
+        include, glob = False, glob[1:]
+    if "/" in glob or "**" in glob or (ripgrep and "{" in glob):
+        return None
+    return lambda path: fnmatch.fnmatchcase(path.name, glob) == include
+
+
+class TrigramIndex:
+    """Per-workspace trigram index stored in SQLite under ``.leon/``."""
+
+    def __init__(
+        self,
+        workspace_root: str | Path,
+        *,
+        excludes: Iterable[str],
+        max_file_size: int,
+        use_ripgrep: bool,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        db_path: str | Path | None = None,
+    ) -> None:
+        self.workspace_root = Path(workspace_root).resolve()
+        self.excludes = list(excludes)
+        self.max_file_size = max_file_size
+        self.use_ripgrep = use_ripgrep
+        self.refresh_interval = refresh_interval
+        self.db_path = Path(db_path) if db_path else self.workspace_root / INDEX_DIRNAME / INDEX_FILENAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = create_connection(self.db_path)
+        self._lock = threading.Lock()
+        self._dirty: set[str] = set()
+        self._last_refresh = 0.0
+        self.files_indexed = 0
+        self._ensure_tables()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # FileSystemService hook
+    # ------------------------------------------------------------------
+
+    def on_file_changed(self, file_path: str, operation: str) -> None:
+        """Mark a path written/edited by FileSystemService for re-indexing on the next query."""
+        with self._lock:
+            self._dirty.add(file_path)
+
+    def owns(self, path: Path) -> bool:
+        """Whether path is one of the index's own database files."""
+        return path.parent == self.db_path.parent and path.name.startswith(self.db_path.name)
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def candidates(self, root: Path, pattern: str, case_insensitive: bool) -> list[Path] | None:
+        """Files under ``root`` that may match ``pattern``, sorted by path.
+
+        None means the index cannot narrow this query and the caller should
+        search normally.
+        """
+        keys = query_trigrams(pattern, case_insensitive)
+        if keys is None:
+            return None
+        try:
+            rel_root = root.relative_to(self.workspace_root).as_posix()
+        except ValueError:
+            return None
+        prefix = "" if rel_root == "." else rel_root + "/"
+        # @@@rg-binary - a directory search skips NUL-containing files, but rg searches any
+        # path named explicitly, so binary files must not become candidates.
+        text_only = "AND f.binary = 0" if self.use_ripgrep else ""
+        with self._lock:
+            self._refresh()
+            placeholders = ",".join("?" * len(keys))
+            rows = self._conn.execute(
+                f"""
+                SELECT f.path FROM files f
+                WHERE f.indexed = 0 AND substr(f.path, 1, ?) = ? {text_only}
+                UNION
+                SELECT f.path FROM files f
+                JOIN (
+                    SELECT file_id FROM postings WHERE trigram IN ({placeholders})
+                    GROUP BY file_id HAVING COUNT(*) = ?
+                ) hit ON hit.file_id = f.file_id
+                WHERE substr(f.path, 1, ?) = ? {text_only}
+                ORDER BY 1
+                """,
+                (len(prefix), prefix, *keys, len(keys), len(prefix), prefix),
+            ).fetchall()
+        return [self.workspace_root / row[0] for row in rows]
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _ensure_tables(self) -> None:
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(files)")}
+        if columns and "binary" not in columns:
+            # Index from before the binary flag: it is only a cache, rebuild it
+            self._conn.executescript("DROP TABLE files; DROP TABLE IF EXISTS postings;")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                file_id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                indexed INTEGER NOT NULL,
+                binary INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                trigram INTEGER NOT NULL,
+                file_id INTEGER NOT NULL,
+                PRIMARY KEY (trigram, file_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_file ON postings(file_id);
+            """
+        )
+        self._conn.commit()
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._last_refresh and now - self._last_refresh < self.refresh_interval:
+            if self._dirty:
+                self._reindex_paths(self._dirty)
+                self._dirty.clear()
+            return
+        self._dirty.clear()
+        self._last_refresh = now
+
+        listing = self._list_files()
+        known = {
+            path: (file_id, mtime_ns, size)
+            for file_id, path, mtime_ns, size in self._conn.execute("SELECT file_id, path, mtime_ns, size FROM files")
+        }
+        removed = [known[path][0] for path in known.keys() - listing.keys()]
+        changed = [
+            (path, stat)
+            for path, stat in listing.items()
+            if path not in known or known[path][1:] != stat
+        ]
+        if not removed and not changed:
+            return
+        self._delete_ids(removed)
+        for path, (mtime_ns, size) in changed:
+            self._index_file(path, mtime_ns, size, known.get(path, (None,))[0])
+        self._conn.commit()
+
+    def _reindex_paths(self, paths: Iterable[str]) -> None:
+        for raw in paths:
+            abs_path = Path(raw)
+            try:
+                rel = abs_path.relative_to(self.workspace_root).as_posix()
+            except ValueError:
+                continue
+            row = self._conn.execute("SELECT file_id FROM files WHERE path = ?", (rel,)).fetchone()
+            try:
+                st = abs_path.stat()
+            except OSError:
+                if row:
+                    self._delete_ids([row[0]])
+                continue
+            if self._excluded(abs_path, st.st_size):
+                continue
+            self._index_file(rel, st.st_mtime_ns, st.st_size, row[0] if row else None)
+        self._conn.commit()
+
+    def _index_file(self, rel: str, mtime_ns: int, size: int, file_id: int | None) -> None:
+        keys: set[int] | None = None
+        try:
+            if size <= MAX_INDEXED_BYTES:
+                raw = (self.workspace_root / rel).read_bytes()
+                binary = b"\0" in raw
+                # Decode/encode like the Python fallback so every match it can find is indexed
+                keys = _trigram_keys(raw.decode("utf-8", errors="ignore").encode("utf-8"))
+            else:
+                binary = self._has_nul(self.workspace_root / rel)
+        except OSError:
+            return
+        if file_id is None:
+            cur = self._conn.execute(
+                "INSERT INTO files (path, mtime_ns, size, indexed, binary) VALUES (?, ?, ?, ?, ?)",
+                (rel, mtime_ns, size, keys is not None, binary),
+            )
+            file_id = cur.lastrowid
+        else:
+            self._conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+            self._conn.execute(
+                "UPDATE files SET mtime_ns = ?, size = ?, indexed = ?, binary = ? WHERE file_id = ?",
+                (mtime_ns, size, keys is not None, binary, file_id),
+            )
+        if keys:
+            self._conn.executemany(
+                "INSERT INTO postings (trigram, file_id) VALUES (?, ?)", ((k, file_id) for k in keys)
+            )
+        self.files_indexed += 1
+
+    @staticmethod
+    def _has_nul(path: Path) -> bool:
+        with path.open("rb") as f:
+            while chunk := f.read(_NUL_SCAN_CHUNK):
+                if b"\0" in chunk:
+                    return True
+        return False
+
+    def _delete_ids(self, file_ids: list[int]) -> None:
+        for file_id in file_ids:
+            self._conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+            self._conn.execute("DELETE FROM files WHERE file_id = ?", (file_id,))
+
+    def _excluded(self, path: Path, size: int) -> bool:
+        # Only components below the workspace root count: a workspace inside build/ is still searched
+        rel_parts = path.relative_to(self.workspace_root).parts
+        if self.owns(path) or any(part in self.excludes for part in rel_parts):
+            return True
+        # ripgrep searches files of any size; the Python fallback skips large ones later
+        return False if self.use_ripgrep else size > self.max_file_size
+
+    def _list_files(self) -> dict[str, tuple[int, int]]:
+        """Searchable files (relative posix path → (mtime_ns, size)) as the active engine sees them."""
+        paths: list[str]
+        if self.use_ripgrep:
+            cmd = ["rg", "--files", "--no-messages", str(self.workspace_root)]
+            for excl in self.excludes:
+                cmd.extend(["--glob", f"!{excl}"])
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            paths = result.stdout.splitlines()
+        else:
+            paths = []
+            for dirpath, dirnames, filenames in os.walk(self.workspace_root):
+                dirnames[:] = [d for d in dirnames if d not in self.excludes]
+                paths.extend(os.path.join(dirpath, name) for name in filenames)
+        listing: dict[str, tuple[int, int]] = {}
+        for raw in paths:
+            path = Path(raw)
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if self._excluded(path, st.st_size):
+                continue
+            listing[path.relative_to(self.workspace_root).as_posix()] = (st.st_mtime_ns, st.st_size)
+        return listing
+
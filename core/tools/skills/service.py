@@ -3,7 +3,11 @@
 Tools:
 - load_skill: Progressive disclosure of specialized capabilities
 
-Uses dynamic schema (callable) to reflect current skill index on each call.
+The schema is a callable built from the skill index. ToolRegistry caches its
+output in the inline-schema snapshot, so the index is read once when the
+snapshot is built; anything that changes the index later must call
+``ToolRegistry.invalidate()``. Today the index is only loaded in ``__init__``,
+before registration.
 """
 
 from __future__ import annotations
@@ -15,7 +19,7 @@ from core.runtime.registry import ToolEntry, ToolMode, ToolRegistry
 
 
 class SkillsService:
-    """Registers load_skill tool into ToolRegistry with dynamic schema."""
+    """Registers load_skill tool into ToolRegistry with a schema built from the skill index."""
 
     def __init__(
         self,
@@ -64,6 +68,7 @@ class SkillsService:
             schema=self._get_schema,
             handler=self._load_skill,
             source="SkillsService",
+            blocking=True,
         ))
 
     def _get_schema(self) -> dict:
@@ -289,6 +289,7 @@ class TaskService:
                     schema=schema,
                     handler=handler,
                     source="TaskService",
+                    blocking=True,
                 )
             )
 
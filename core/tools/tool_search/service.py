@@ -1,7 +1,7 @@
 """ToolSearchService - Discover available tools via search.
 
 Registers a single INLINE tool (tool_search) that queries ToolRegistry
-to find matching tools by name or description.
+for the top-ranked tools by name, description and parameter names.
 """
 
 from __future__ import annotations
@@ -9,10 +9,14 @@ from __future__ import annotations
 import json
 import logging
 
-from core.runtime.registry import ToolEntry, ToolMode, ToolRegistry
+from core.runtime.registry import DEFAULT_SEARCH_LIMIT, ToolEntry, ToolMode, ToolRegistry
 
 logger = logging.getLogger(__name__)
 
+MAX_SEARCH_LIMIT = 20
+# Names listed when nothing matches (instead of every full schema)
+MAX_FALLBACK_NAMES = 50
+
 TOOL_SEARCH_SCHEMA = {
     "name": "tool_search",
     "description": (
@@ -26,6 +30,10 @@ TOOL_SEARCH_SCHEMA = {
                 "type": "string",
                 "description": "Search query - tool name or description of what you want to do",
             },
+            "max_results": {
+                "type": "integer",
+                "description": f"Max tools to return (default {DEFAULT_SEARCH_LIMIT}, max {MAX_SEARCH_LIMIT})",
+            },
         },
         "required": ["query"],
     },
@@ -48,7 +56,13 @@ class ToolSearchService:
         )
         logger.info("ToolSearchService initialized")
 
-    def _search(self, query: str = "", **kwargs) -> str:
-        results = self._registry.search(query)
-        schemas = [e.get_schema() for e in results]
-        return json.dumps(schemas, indent=2, ensure_ascii=False)
+    def _search(self, query: str = "", max_results: int | None = None, **kwargs) -> str:
+        limit = min(max(max_results or DEFAULT_SEARCH_LIMIT, 1), MAX_SEARCH_LIMIT)
+        results = self._registry.search_scored(query, limit)
+        if not results:
+            names = [e.name for e in self._registry.list_all()]
+            listed = ", ".join(names[:MAX_FALLBACK_NAMES])
+            more = f" (+{len(names) - MAX_FALLBACK_NAMES} more)" if len(names) > MAX_FALLBACK_NAMES else ""
+            return f"No tools matched {query!r}. Available tools: {listed}{more}"
+        matches = [{"score": round(score, 3), **entry.get_schema()} for entry, score in results]
+        return json.dumps(matches, indent=2, ensure_ascii=False)
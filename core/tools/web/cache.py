@@ -0,0 +1,283 @@
+"""WebFetchCache — on-disk cache of fetched, converted pages.
+
+Every WebFetch used to re-download and re-convert its URL, even when several
+agents of a team read the same docs page minutes apart. Fetchers now consult
+this cache, shared by every agent on the machine:
+
+- ``fresh`` (younger than ``ttl``): served with no request at all
+- ``stale``: revalidated with ``If-None-Match`` / ``If-Modified-Since``; a
+  304 refreshes the entry without re-downloading or re-converting
+- bodies are stored content-addressed (sha256 of the converted markdown) under
+  ``blobs/``, so identical pages behind different URLs share one file
+- page metadata (validators, title, fetch/access times) lives in
+  ``index.db``; once blobs exceed ``max_bytes`` the least recently accessed
+  pages are evicted and unreferenced blobs deleted
+
+Responses marked ``Cache-Control: no-store`` are never written. The cache
+lives under ``~/.leon/web_cache/`` (``LEON_WEB_CACHE_DIR`` overrides).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+from storage.providers.sqlite.connection import create_connection
+
+logger = logging.getLogger(__name__)
+
+WEB_CACHE_TTL = 15 * 60
+WEB_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    truncated INTEGER NOT NULL DEFAULT 0,
+    truncation_reason TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages(accessed_at);
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL
+);
+"""
+
+_PAGE_COLUMNS = (
+    "url, content_hash, title, description, truncated, truncation_reason, etag, last_modified, fetched_at"
+)
+
+
+def default_cache_dir() -> Path:
+    return Path(os.getenv("LEON_WEB_CACHE_DIR") or (Path.home() / ".leon" / "web_cache"))
+
+
+@dataclass
+class CachedPage:
+    """A cached, already-converted page and the validators to revalidate it."""
+
+    key: str
+    url: str
+    content: str
+    title: str | None = None
+    description: str | None = None
+    truncated: bool = False
+    truncation_reason: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class WebFetchCache:
+    """Content-addressed page cache with TTL, HTTP revalidation and an LRU size cap."""
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        ttl: float = WEB_CACHE_TTL,
+        max_bytes: int = WEB_CACHE_MAX_BYTES,
+    ) -> None:
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._stats = {"hits": 0, "stale": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+
+    # ------------------------------------------------------------------
+    # lookups
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> CachedPage | None:
+        """Cached page for key (fresh or stale), or None. Marks it recently used."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(f"SELECT {_PAGE_COLUMNS} FROM pages WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            content = self._read_blob(row[1])
+            if content is None:
+                # Blob removed behind our back: forget the page
+                conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+                conn.commit()
+                self._stats["misses"] += 1
+                return None
+            conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            page = CachedPage(
+                key=key,
+                url=row[0],
+                content=content,
+                title=row[2],
+                description=row[3],
+                truncated=bool(row[4]),
+                truncation_reason=row[5],
+                etag=row[6],
+                last_modified=row[7],
+                fetched_at=row[8],
+            )
+            self._stats["hits" if self.is_fresh(page, now) else "stale"] += 1
+            return page
+
+    def is_fresh(self, page: CachedPage, now: float | None = None) -> bool:
+        return (now if now is not None else time.time()) - page.fetched_at < self.ttl
+
+    # ------------------------------------------------------------------
+    # writes
+    # ------------------------------------------------------------------
+
+    def put(self, page: CachedPage, response_headers: Mapping[str, str] | None = None) -> bool:
+        """Store a freshly fetched page; returns False when the response forbids caching."""
+        headers = response_headers or {}
+        if "no-store" in (headers.get("cache-control") or "").lower():
+            return False
+        page.etag = headers.get("etag") or page.etag
+        page.last_modified = headers.get("last-modified") or page.last_modified
+        data = page.content.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            self._write_blob(content_hash, data)
+            conn.execute("INSERT OR IGNORE INTO blobs (hash, size) VALUES (?, ?)", (content_hash, len(data)))
+            conn.execute(
+                f"INSERT OR REPLACE INTO pages (key, {_PAGE_COLUMNS}, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    page.key,
+                    page.url,
+                    content_hash,
+                    page.title,
+                    page.description,
+                    int(page.truncated),
+                    page.truncation_reason,
+                    page.etag,
+                    page.last_modified,
+                    now,
+                    now,
+                ),
+            )
+            self._evict(conn)
+            conn.commit()
+            self._stats["stores"] += 1
+        page.fetched_at = now
+        return True
+
+    def touch(self, page: CachedPage, response_headers: Mapping[str, str] | None = None) -> None:
+        """Record a 304: the stored body is current again for another ``ttl``."""
+        headers = response_headers or {}
+        page.etag = headers.get("etag") or page.etag
+        page.last_modified = headers.get("last-modified") or page.last_modified
+        page.fetched_at = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "UPDATE pages SET etag = ?, last_modified = ?, fetched_at = ?, accessed_at = ? WHERE key = ?",
+                (page.etag, page.last_modified, page.fetched_at, page.fetched_at, page.key),
+            )
+            conn.commit()
+            self._stats["revalidated"] += 1
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+            self._delete_orphan_blobs(conn)
+            conn.commit()
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            if self._conn is not None:
+                stats["pages"] = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+                stats["bytes"] = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # storage helpers (caller holds the lock)
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._conn = create_connection(self.cache_dir / "index.db")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _blob_path(self, content_hash: str) -> Path:
+        return self.cache_dir / "blobs" / content_hash[:2] / f"{content_hash}.md"
+
+    def _read_blob(self, content_hash: str) -> str | None:
+        try:
+            return self._blob_path(content_hash).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _write_blob(self, content_hash: str, data: bytes) -> None:
+        target = self._blob_path(content_hash)
+        if target.exists():
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        self._delete_orphan_blobs(conn)
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = conn.execute("SELECT key FROM pages ORDER BY accessed_at ASC").fetchall()
+        for (key,) in victims:
+            conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+            self._stats["evictions"] += 1
+            total -= self._delete_orphan_blobs(conn)
+            if total <= self.max_bytes:
+                break
+
+    def _delete_orphan_blobs(self, conn: sqlite3.Connection) -> int:
+        """Drop blobs no page references; returns the bytes freed."""
+        orphans = conn.execute(
+            "SELECT hash, size FROM blobs WHERE hash NOT IN (SELECT content_hash FROM pages)"
+        ).fetchall()
+        freed = 0
+        for content_hash, size in orphans:
+            conn.execute("DELETE FROM blobs WHERE hash = ?", (content_hash,))
+            try:
+                self._blob_path(content_hash).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("[WebFetchCache] Failed to delete blob %s: %s", content_hash, e)
+            freed += size
+        return freed
@@ -0,0 +1,102 @@
+"""Chunk selection for map-reduce WebFetch extraction.
+
+WebFetch used to send up to 100,000 characters of page text to the
+extraction model in a single 30-second call: long pages lost their tail to
+truncation or timed out. Large pages are now handled as map-reduce:
+
+- fetch: with an extraction model configured, fetchers keep up to
+  ``EXTRACTION_MAX_CHARS`` of page text (see ``extraction_limits``) so the
+  ranker sees the whole page, not just its first 100,000 characters
+
+- rank: the fetcher's ContentChunks are scored against the prompt locally
+  (BM25 over heading + text, no model call)
+- select: the best chunks up to ``SELECTED_CHARS`` are kept and packed, in
+  page order, into map batches of at most ``MAP_BATCH_CHARS``
+- map / reduce (WebService): batches are extracted concurrently, then the
+  partial answers are merged by one final call
+
+When no prompt term occurs in the page, chunks are taken from the top of the
+page, which is what the old truncation effectively did.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from dataclasses import replace
+
+from core.bm25 import score_documents, tokenize
+from core.tools.web.types import ContentChunk, FetchLimits
+
+# Pages up to this size keep the single-call extraction
+SINGLE_CALL_CHARS = 16_000
+# Total page text sent to the map step
+SELECTED_CHARS = 48_000
+MAP_BATCH_CHARS = 12_000
+MAX_PARALLEL_EXTRACTIONS = 4
+# Page text kept for ranking; only SELECTED_CHARS of it reaches the model
+EXTRACTION_MAX_CHARS = 2_000_000
+# Map answers that mean "this part of the page has nothing relevant"
+NO_ANSWER = "NONE"
+
+_HEADING_WEIGHT = 2
+
+
+def extraction_limits(limits: FetchLimits) -> FetchLimits:
+    """Fetch limits widened so chunking covers pages up to EXTRACTION_MAX_CHARS."""
+    max_chars = max(limits.max_chars, EXTRACTION_MAX_CHARS)
+    # Chunks break at line boundaries and can come out well under chunk_size; leave headroom.
+    max_chunks = max(limits.max_chunks, 2 * math.ceil(max_chars / limits.chunk_size))
+    return replace(limits, max_chars=max_chars, max_chunks=max_chunks)
+
+
+def rank_chunks(chunks: list[ContentChunk], prompt: str) -> list[tuple[ContentChunk, float]]:
+    """Chunks with their BM25 score against prompt, best first (page order breaks ties)."""
+    query = set(tokenize(prompt))
+    docs: list[Counter[str]] = []
+    for chunk in chunks:
+        terms = Counter(tokenize(chunk.content))
+        for token in tokenize(chunk.heading or ""):
+            terms[token] += _HEADING_WEIGHT
+        docs.append(terms)
+    scores = score_documents(docs, query)
+    order = sorted(range(len(docs)), key=lambda i: (-scores[i], chunks[i].position))
+    return [(chunks[i], scores[i]) for i in order]
+
+
+def select_batches(
+    chunks: list[ContentChunk],
+    prompt: str,
+    budget: int = SELECTED_CHARS,
+    batch_chars: int = MAP_BATCH_CHARS,
+) -> list[list[ContentChunk]]:
+    """Best-scoring chunks within budget, packed in page order into map batches."""
+    selected: list[ContentChunk] = []
+    used = 0
+    for chunk, _score in rank_chunks(chunks, prompt):
+        size = len(chunk.content)
+        if selected and used + size > budget:
+            continue
+        selected.append(chunk)
+        used += size
+    selected.sort(key=lambda chunk: chunk.position)
+
+    batches: list[list[ContentChunk]] = []
+    batch_size = 0
+    for chunk in selected:
+        if batches and batch_size + len(chunk.content) <= batch_chars:
+            batches[-1].append(chunk)
+            batch_size += len(chunk.content)
+        else:
+            batches.append([chunk])
+            batch_size = len(chunk.content)
+    return batches
+
+
+def join_batch(batch: list[ContentChunk]) -> str:
+    """Batch text; neighbouring chunks rejoin seamlessly, gaps are marked with [...]."""
+    parts = [batch[0].content]
+    for prev, chunk in zip(batch, batch[1:]):
+        parts.append("\n" if chunk.position == prev.position + 1 else "\n\n[...]\n\n")
+        parts.append(chunk.content)
+    return "".join(parts)
@@ -2,17 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 
-from core.tools.web.types import FetchLimits, FetchResult
+from core.tools.web.cache import CachedPage, WebFetchCache
+from core.tools.web.http import HttpClientPool
+from core.tools.web.types import ContentChunk, FetchLimits, FetchResult
 
 
 class BaseFetcher(ABC):
     """Abstract base class for URL fetchers."""
 
-    def __init__(self, limits: FetchLimits | None = None, timeout: int = 10):
+    def __init__(
+        self,
+        limits: FetchLimits | None = None,
+        timeout: int = 10,
+        http: HttpClientPool | None = None,
+        cache: WebFetchCache | None = None,
+    ):
         self.limits = limits or FetchLimits()
         self.timeout = timeout
+        self.http = http or HttpClientPool()
+        self.cache = cache
 
     @abstractmethod
     async def fetch(self, url: str) -> FetchResult:
@@ -27,6 +39,65 @@ class BaseFetcher(ABC):
         """
         ...
 
+    def _finish(self, result: FetchResult, content: str) -> FetchResult:
+        """Apply max_chars truncation and chunking to converted content."""
+        if len(content) > self.limits.max_chars:
+            content = content[: self.limits.max_chars]
+            result.truncated = True
+            result.truncation_reason = f"max_chars={self.limits.max_chars}"
+
+        result.total_chars = len(content)
+
+        chunk_data = self._split_into_chunks(content)
+        result.chunks = [ContentChunk(position=pos, content=cont, heading=head) for pos, cont, head in chunk_data]
+        result.total_chunks = len(result.chunks)
+
+        result.content = content
+        return result
+
+    # ------------------------------------------------------------------
+    # response cache
+    # ------------------------------------------------------------------
+
+    def _cache_key(self, url: str) -> str:
+        # Same URL converted by another fetcher or truncated differently is a different entry
+        return f"{type(self).__name__}|{self.limits.max_chars}|{url}"
+
+    async def _cache_lookup(self, url: str) -> CachedPage | None:
+        if self.cache is None:
+            return None
+        return await asyncio.to_thread(self.cache.get, self._cache_key(url))
+
+    def _cache_fresh(self, page: CachedPage | None) -> bool:
+        return page is not None and self.cache is not None and self.cache.is_fresh(page)
+
+    async def _cache_revalidated(self, page: CachedPage, headers: Mapping[str, str]) -> FetchResult:
+        """A 304 answered a conditional request: extend the entry and serve it."""
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.touch, page, headers)
+        return self._from_cache(page)
+
+    async def _cache_store(self, result: FetchResult, headers: Mapping[str, str]) -> None:
+        if self.cache is None or result.error or not result.content:
+            return
+        page = CachedPage(
+            key=self._cache_key(result.url),
+            url=result.url,
+            content=result.content,
+            title=result.title,
+            description=result.description,
+            truncated=result.truncated,
+            truncation_reason=result.truncation_reason,
+        )
+        await asyncio.to_thread(self.cache.put, page, headers)
+
+    def _from_cache(self, page: CachedPage) -> FetchResult:
+        result = FetchResult(url=page.url, title=page.title, description=page.description)
+        self._finish(result, page.content)
+        result.truncated = result.truncated or page.truncated
+        result.truncation_reason = result.truncation_reason or page.truncation_reason
+        return result
+
     def _split_into_chunks(self, content: str, headings: list[str] | None = None) -> list[tuple[int, str, str | None]]:
         """
         Split content into chunks.
@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import httpx
 
+from core.tools.web.cache import WebFetchCache
 from core.tools.web.fetchers.base import BaseFetcher
-from core.tools.web.types import ContentChunk, FetchLimits, FetchResult
+from core.tools.web.http import HttpClientPool
+from core.tools.web.types import FetchLimits, FetchResult
 
 
 class JinaFetcher(BaseFetcher):
@@ -25,12 +27,18 @@ class JinaFetcher(BaseFetcher):
         api_key: str,
         limits: FetchLimits | None = None,
         timeout: int = 15,
+        http: HttpClientPool | None = None,
+        cache: WebFetchCache | None = None,
     ):
-        super().__init__(limits, timeout)
+        super().__init__(limits, timeout, http, cache)
         self.api_key = api_key
 
     async def fetch(self, url: str) -> FetchResult:
         """Fetch URL content using Jina Reader API."""
+        cached = await self._cache_lookup(url)
+        if self._cache_fresh(cached):
+            return self._from_cache(cached)
+
         result = FetchResult(url=url)
 
         try:
@@ -40,29 +48,22 @@ class JinaFetcher(BaseFetcher):
                 "Authorization": f"Bearer {self.api_key}",
                 "X-Return-Format": "markdown",
             }
+            if cached is not None:
+                headers.update(cached.conditional_headers())
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(reader_url, headers=headers)
-                response.raise_for_status()
+            response = await self.http.client().get(reader_url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and cached is not None:
+                return await self._cache_revalidated(cached, response.headers)
+            response.raise_for_status()
 
             content = response.text
 
-            if len(content) > self.limits.max_chars:
-                content = content[: self.limits.max_chars]
-                result.truncated = True
-                result.truncation_reason = f"max_chars={self.limits.max_chars}"
-
-            result.total_chars = len(content)
-
             title_line = content.split("\n")[0] if content else None
             if title_line and title_line.startswith("#"):
                 result.title = title_line.lstrip("#").strip()
 
-            chunk_data = self._split_into_chunks(content)
-            result.chunks = [ContentChunk(position=pos, content=cont, heading=head) for pos, cont, head in chunk_data]
-            result.total_chunks = len(result.chunks)
-
-            result.content = content
+            self._finish(result, content)
+            await self._cache_store(result, response.headers)
 
         except httpx.TimeoutException:
             result.error = f"Timeout fetching URL: {url}"
@@ -6,8 +6,10 @@ import re
 
 import httpx
 
+from core.tools.web.cache import WebFetchCache
 from core.tools.web.fetchers.base import BaseFetcher
-from core.tools.web.types import ContentChunk, FetchLimits, FetchResult
+from core.tools.web.http import HttpClientPool
+from core.tools.web.types import FetchLimits, FetchResult
 
 try:
     from markdownify import markdownify as md
@@ -42,39 +44,49 @@ class MarkdownifyFetcher(BaseFetcher):
         limits: FetchLimits | None = None,
         timeout: int = 10,
         user_agent: str = _BROWSER_UA,
+        http: HttpClientPool | None = None,
+        cache: WebFetchCache | None = None,
     ):
-        super().__init__(limits, timeout)
+        super().__init__(limits, timeout, http, cache)
         self.user_agent = user_agent
         self.has_markdownify = HAS_MARKDOWNIFY
         self.has_bs4 = HAS_BS4
 
-    async def _do_fetch(self, url: str, verify: bool = True) -> httpx.Response:
-        """Fetch URL with explicit timeout and redirect following."""
+    async def _do_fetch(self, url: str, verify: bool = True, headers: dict[str, str] | None = None) -> httpx.Response:
+        """Fetch URL on the pooled client with explicit timeout; a 304 is returned, not raised."""
         timeout = httpx.Timeout(self.timeout, connect=5.0)
-        async with httpx.AsyncClient(
+        response = await self.http.client(verify).get(
+            url,
+            headers={"User-Agent": self.user_agent, **(headers or {})},
             timeout=timeout,
-            follow_redirects=True,
-            verify=verify,
-        ) as client:
-            response = await client.get(url, headers={"User-Agent": self.user_agent})
+        )
+        if response.status_code != 304:
             response.raise_for_status()
-            return response
+        return response
 
     async def fetch(self, url: str) -> FetchResult:
         """Fetch URL content and convert to Markdown."""
+        cached = await self._cache_lookup(url)
+        if self._cache_fresh(cached):
+            return self._from_cache(cached)
+
         result = FetchResult(url=url)
+        conditional = cached.conditional_headers() if cached is not None else None
 
         try:
             try:
-                response = await self._do_fetch(url, verify=True)
+                response = await self._do_fetch(url, verify=True, headers=conditional)
             except httpx.ConnectError as e:
                 # Only retry without SSL verify for certificate-related errors
                 cause = str(e.__cause__) if e.__cause__ else str(e)
                 if "ssl" in cause.lower() or "certificate" in cause.lower():
-                    response = await self._do_fetch(url, verify=False)
+                    response = await self._do_fetch(url, verify=False, headers=conditional)
                 else:
                     raise
 
+            if response.status_code == 304 and cached is not None:
+                return await self._cache_revalidated(cached, response.headers)
+
             content_type = response.headers.get("Content-Type", "")
 
             if "text/html" in content_type:
@@ -82,18 +94,8 @@ class MarkdownifyFetcher(BaseFetcher):
             else:
                 content = response.text
 
-            if len(content) > self.limits.max_chars:
-                content = content[: self.limits.max_chars]
-                result.truncated = True
-                result.truncation_reason = f"max_chars={self.limits.max_chars}"
-
-            result.total_chars = len(content)
-
-            chunk_data = self._split_into_chunks(content)
-            result.chunks = [ContentChunk(position=pos, content=cont, heading=head) for pos, cont, head in chunk_data]
-            result.total_chunks = len(result.chunks)
-
-            result.content = content
+            self._finish(result, content)
+            await self._cache_store(result, response.headers)
 
         except httpx.TimeoutException:
             result.error = f"Timeout fetching URL ({self.timeout}s): {url}"
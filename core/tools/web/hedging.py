@@ -0,0 +1,159 @@
+"""HedgedSearch — hedged fan-out across web search providers.
+
+WebSearch used to try Tavily, Exa and Firecrawl strictly one after another,
+so a slow or failing first provider added its full timeout to every search.
+HedgedSearch starts the preferred provider and, if it has not answered
+within ``hedge_delay`` seconds (or as soon as it fails), starts the next one
+as well. The first non-error SearchResult wins and the in-flight rest are
+cancelled.
+
+- ``hedge_delay=0``: every provider at once
+- ``hedge_delay=None``: the old sequential fallback (next only on failure)
+
+Per-provider latency and error rate are tracked as EWMAs; with
+``adaptive=True`` providers are tried fastest-healthy first, while providers
+without samples keep their configured order after the measured ones.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from core.tools.web.types import SearchResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEDGE_DELAY = 1.0
+_EWMA_ALPHA = 0.3
+# An error costs as much as this much extra latency when ordering providers
+_ERROR_PENALTY_MS = 10_000.0
+
+
+@dataclass
+class ProviderStats:
+    calls: int = 0
+    successes: int = 0
+    errors: int = 0
+    cancelled: int = 0
+    wins: int = 0
+    latency_ms_ewma: float | None = None
+    error_rate_ewma: float = 0.0
+    last_error: str | None = None
+
+    def record(self, latency_ms: float, error: str | None) -> None:
+        self.calls += 1
+        if error is None:
+            self.successes += 1
+        else:
+            self.errors += 1
+            self.last_error = error
+        self.latency_ms_ewma = (
+            latency_ms
+            if self.latency_ms_ewma is None
+            else _EWMA_ALPHA * latency_ms + (1 - _EWMA_ALPHA) * self.latency_ms_ewma
+        )
+        self.error_rate_ewma = _EWMA_ALPHA * (error is not None) + (1 - _EWMA_ALPHA) * self.error_rate_ewma
+
+    def score(self) -> float:
+        """Expected cost in ms; lower is tried first. Unmeasured providers sort last."""
+        if self.latency_ms_ewma is None:
+            return math.inf
+        return self.latency_ms_ewma + self.error_rate_ewma * _ERROR_PENALTY_MS
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "wins": self.wins,
+            "latency_ms_ewma": None if self.latency_ms_ewma is None else round(self.latency_ms_ewma, 1),
+            "error_rate_ewma": round(self.error_rate_ewma, 3),
+            "last_error": self.last_error,
+        }
+
+
+class HedgedSearch:
+    """Runs a query across ordered providers with hedged launches; first good result wins."""
+
+    def __init__(
+        self,
+        providers: list[tuple[str, Any]],
+        hedge_delay: float | None = DEFAULT_HEDGE_DELAY,
+        adaptive: bool = True,
+    ) -> None:
+        if hedge_delay is not None and hedge_delay < 0:
+            raise ValueError("hedge_delay must be >= 0 or None")
+        self.providers = list(providers)
+        self.hedge_delay = hedge_delay
+        self.adaptive = adaptive
+        self._stats = {name: ProviderStats() for name, _ in self.providers}
+
+    def ordered(self) -> list[tuple[str, Any]]:
+        if not self.adaptive:
+            return list(self.providers)
+        position = {name: i for i, (name, _) in enumerate(self.providers)}
+        return sorted(self.providers, key=lambda p: (self._stats[p[0]].score(), position[p[0]]))
+
+    async def search(self, **kwargs: Any) -> tuple[str, SearchResult] | None:
+        """(provider name, result) of the first provider to succeed, or None if all fail."""
+        queue = self.ordered()
+        pending: dict[asyncio.Task, str] = {}
+
+        def launch() -> None:
+            name, searcher = queue.pop(0)
+            pending[asyncio.create_task(self._timed(name, searcher, kwargs))] = name
+
+        launch()
+        if self.hedge_delay == 0:
+            while queue:
+                launch()
+        try:
+            while pending:
+                timeout = self.hedge_delay if queue else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = pending.pop(task)
+                    result = task.result()
+                    if result is not None:
+                        self._stats[name].wins += 1
+                        return name, result
+                # Hedge timer fired, or a provider failed: bring in the next one
+                if queue:
+                    launch()
+            return None
+        finally:
+            for task, name in pending.items():
+                task.cancel()
+                self._stats[name].cancelled += 1
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _timed(self, name: str, searcher: Any, kwargs: dict[str, Any]) -> SearchResult | None:
+        start = time.perf_counter()
+        error: str | None = None
+        result: SearchResult | None = None
+        try:
+            result = await searcher.search(**kwargs)
+            error = result.error
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self._stats[name].record((time.perf_counter() - start) * 1000, error)
+        if error is not None:
+            logger.debug("[HedgedSearch] %s failed: %s", name, error)
+            return None
+        return result
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "hedge_delay": self.hedge_delay,
+            "order": [name for name, _ in self.ordered()],
+            "providers": {name: stats.snapshot() for name, stats in self._stats.items()},
+        }
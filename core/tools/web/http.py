@@ -0,0 +1,77 @@
+"""HttpClientPool — pooled httpx.AsyncClient shared by a WebService's fetchers.
+
+Fetchers used to open a fresh ``httpx.AsyncClient`` per fetch, paying DNS,
+TCP and TLS setup on every call and never reusing a keep-alive connection.
+The pool keeps one long-lived client per event loop (httpx connections are
+bound to the loop that opened them) and per TLS-verify mode, so repeated
+fetches to the same host ride the same connection. Timeouts and headers stay
+per request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import weakref
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60.0)
+
+
+class HttpClientPool:
+    """One pooled AsyncClient per (event loop, verify) pair, created lazily."""
+
+    def __init__(
+        self,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        follow_redirects: bool = True,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.limits = limits
+        self.follow_redirects = follow_redirects
+        self.transport = transport
+        self._lock = threading.Lock()
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[bool, httpx.AsyncClient]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def client(self, verify: bool = True) -> httpx.AsyncClient:
+        """Client for the running loop; must be called from a coroutine."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            per_loop = self._clients.setdefault(loop, {})
+            client = per_loop.get(verify)
+            if client is None or client.is_closed:
+                client = per_loop[verify] = httpx.AsyncClient(
+                    limits=self.limits,
+                    follow_redirects=self.follow_redirects,
+                    verify=verify,
+                    transport=self.transport,
+                )
+            return client
+
+    async def aclose(self) -> None:
+        """Close the clients owned by the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = list(self._clients.pop(loop, {}).values())
+        for client in clients:
+            await client.aclose()
+
+    def close(self) -> None:
+        """Close every client from any thread; clients of stopped loops are dropped."""
+        with self._lock:
+            owned = [(loop, list(per_loop.values())) for loop, per_loop in self._clients.items()]
+            self._clients.clear()
+        for loop, clients in owned:
+            if loop.is_closed() or not loop.is_running():
+                continue
+            for client in clients:
+                try:
+                    asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+                except RuntimeError as e:
+                    logger.debug("[HttpClientPool] close skipped: %s", e)
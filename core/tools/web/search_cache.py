@@ -0,0 +1,312 @@
+"""WebSearchCache — deduplicating result cache in front of WebSearch.
+
+Agents of a team often issue the same (or trivially different) WebSearch
+within the hour, and each one used to cost a provider call. The cache is
+shared by every agent in the process (``get_shared_search_cache``):
+
+- keys are normalized: NFKC + casefold, collapsed whitespace, trailing
+  ``?``/``.``/``!`` dropped; domain filters lowercased, ``www.``/scheme
+  stripped, deduplicated and sorted
+- ``max_results`` is part of the lookup: an entry fetched with N results
+  serves any request for up to N (sliced), a larger request refetches
+- identical searches already in flight are joined instead of repeated
+- entries expire after ``ttl`` seconds; beyond ``max_entries`` the least
+  recently used are evicted
+- with ``db_path`` entries are also persisted in SQLite, so a restart or a
+  second backend process starts warm
+- only successful provider results are cached; hit/miss counters are
+  exposed through the monitor (``/api/monitor/web-search-cache``)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from core.tools.web.types import SearchItem, SearchResult
+from storage.providers.sqlite.connection import create_connection
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_TTL = 60 * 60
+SEARCH_CACHE_MAX_ENTRIES = 1000
+
+_SPACE_RE = re.compile(r"\s+")
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS web_search_cache (
+    key TEXT PRIMARY KEY,
+    max_results INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+def default_search_cache_db() -> Path:
+    return Path(os.getenv("LEON_WEB_SEARCH_CACHE_DB") or (Path.home() / ".leon" / "web_search_cache.db"))
+
+
+def normalize_query(query: str) -> str:
+    text = _SPACE_RE.sub(" ", unicodedata.normalize("NFKC", query).casefold()).strip()
+    return text.rstrip("?.! ").strip() or text
+
+
+def normalize_domains(domains: list[str] | None) -> tuple[str, ...]:
+    normalized = set()
+    for domain in domains or ():
+        d = domain.strip().lower().split("://", 1)[-1].split("/", 1)[0]
+        d = d.removeprefix("www.")
+        if d:
+            normalized.add(d)
+    return tuple(sorted(normalized))
+
+
+def cache_key(query: str, include_domains: list[str] | None, exclude_domains: list[str] | None) -> str:
+    return json.dumps(
+        [normalize_query(query), normalize_domains(include_domains), normalize_domains(exclude_domains)],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+@dataclass
+class _Entry:
+    max_results: int
+    result: SearchResult
+    created_at: float
+
+
+def _dump(result: SearchResult) -> str:
+    return json.dumps(asdict(result), ensure_ascii=False)
+
+
+def _load(payload: str) -> SearchResult:
+    data = json.loads(payload)
+    data["results"] = [SearchItem(**item) for item in data.get("results", [])]
+    return SearchResult(**data)
+
+
+def _sliced(result: SearchResult, query: str, max_results: int) -> SearchResult:
+    """A copy for this caller: their own query text and at most max_results items."""
+    items = list(result.results[:max_results])
+    return SearchResult(query=query, results=items, total_results=len(items))
+
+
+class WebSearchCache:
+    """Process-wide LRU+TTL cache of successful search results, optionally persisted."""
+
+    def __init__(
+        self,
+        ttl: float = SEARCH_CACHE_TTL,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+        db_path: Path | None = None,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "joined": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0,
+        }
+
+    async def get_or_search(
+        self,
+        query: str,
+        max_results: int,
+        include_domains: list[str] | None,
+        exclude_domains: list[str] | None,
+        search: Callable[[], Awaitable[SearchResult | None]],
+    ) -> SearchResult | None:
+        """Cached result for the normalized query, else run search() once (joining identical in-flight calls)."""
+        key = cache_key(query, include_domains, exclude_domains)
+        cached = self._get_memory(key, max_results)
+        if cached is None and self.db_path is not None:
+            cached = await asyncio.to_thread(self._get_disk, key, max_results)
+        if cached is not None:
+            return _sliced(cached, query, max_results)
+
+        loop = asyncio.get_running_loop()
+        flight_key = f"{key}|{max_results}"
+        inflight = self._inflight.get(flight_key)
+        if inflight is not None and inflight.get_loop() is loop:
+            with self._lock:
+                self._stats["joined"] += 1
+            try:
+                result = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # this caller was cancelled
+                # The leading call was cancelled or failed: search on our own
+                return await self.get_or_search(query, max_results, include_domains, exclude_domains, search)
+            return None if result is None else _sliced(result, query, max_results)
+
+        with self._lock:
+            self._stats["misses"] += 1
+        future: asyncio.Future = loop.create_future()
+        self._inflight[flight_key] = future
+        try:
+            result = await search()
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            if self._inflight.get(flight_key) is future:
+                del self._inflight[flight_key]
+        future.set_result(result)
+        if result is not None and not result.error:
+            if self.db_path is not None:
+                await asyncio.to_thread(self.put, key, max_results, result)
+            else:
+                self.put(key, max_results, result)
+        return result
+
+    def put(self, key: str, max_results: int, result: SearchResult) -> None:
+        entry = _Entry(max_results=max_results, result=result, created_at=time.time())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+            self._stats["stores"] += 1
+        if self.db_path is not None:
+            try:
+                self._put_disk(key, entry)
+            except sqlite3.Error as e:
+                logger.warning("[WebSearchCache] Failed to persist entry: %s", e)
+
+    def _get_memory(self, key: str, max_results: int) -> SearchResult | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if now - entry.created_at >= self.ttl:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                return None
+            if entry.max_results < max_results:
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.result
+
+    def _get_disk(self, key: str, max_results: int) -> SearchResult | None:
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT max_results, payload, created_at FROM web_search_cache WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("[WebSearchCache] Disk lookup failed: %s", e)
+            return None
+        if row is None or time.time() - row[2] >= self.ttl or row[0] < max_results:
+            return None
+        result = _load(row[1])
+        with self._lock:
+            self._entries[key] = _Entry(max_results=row[0], result=result, created_at=row[2])
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+            self._stats["hits"] += 1
+            self._stats["disk_hits"] += 1
+        return result
+
+    def _put_disk(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO web_search_cache (key, max_results, payload, created_at) VALUES (?, ?, ?, ?)",
+                (key, entry.max_results, _dump(entry.result), entry.created_at),
+            )
+            conn.execute("DELETE FROM web_search_cache WHERE created_at < ?", (time.time() - self.ttl,))
+            conn.execute(
+                "DELETE FROM web_search_cache WHERE key NOT IN "
+                "(SELECT key FROM web_search_cache ORDER BY created_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            assert self.db_path is not None
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = create_connection(self.db_path)
+            self._conn.execute(_SCHEMA)
+        return self._conn
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        served = stats["hits"] + stats["joined"]
+        lookups = served + stats["misses"]
+        stats["hit_rate"] = round(served / lookups, 3) if lookups else 0.0
+        stats.update(ttl=self.ttl, max_entries=self.max_entries, persisted=self.db_path is not None)
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM web_search_cache")
+                self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_shared_cache: WebSearchCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_search_cache(
+    ttl: float = SEARCH_CACHE_TTL,
+    max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+    persist: bool = False,
+) -> WebSearchCache:
+    """Process-wide cache shared by every agent's WebService (configured by the first caller)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = WebSearchCache(
+                ttl=ttl,
+                max_entries=max_entries,
+                db_path=default_search_cache_db() if persist else None,
+            )
+        return _shared_cache
+
+
+def shared_search_cache_stats() -> dict[str, Any]:
+    """Stats of the shared cache for the monitor; ``enabled`` is False until an agent creates it."""
+    with _shared_lock:
+        cache = _shared_cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.get_stats()}
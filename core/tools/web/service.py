@@ -1,22 +1,46 @@
 """Web Service - registers WebSearch and WebFetch tools with ToolRegistry.
 
 Tools:
-- WebSearch: Web search (Tavily -> Exa -> Firecrawl fallback)
+- WebSearch: Web search (Tavily -> Exa -> Firecrawl, hedged: see ``hedging``)
 - WebFetch: Fetch web content and extract information using AI
+
+Fetchers share one pooled HTTP client (keep-alive across fetches) and, when
+``fetch_cache`` is given, an on-disk page cache so a repeated WebFetch costs
+one conditional request or none.
+
+Large pages are extracted map-reduce style (see ``extraction``): the chunks
+most relevant to the prompt are extracted concurrently, then merged.
 """
 
 from __future__ import annotations
 
 import asyncio
+import logging
 from typing import Any
 
 from core.runtime.registry import ToolEntry, ToolMode, ToolRegistry
+from core.tools.web.cache import WebFetchCache
+from core.tools.web.extraction import (
+    MAX_PARALLEL_EXTRACTIONS,
+    NO_ANSWER,
+    SINGLE_CALL_CHARS,
+    extraction_limits,
+    join_batch,
+    select_batches,
+)
 from core.tools.web.fetchers.jina import JinaFetcher
 from core.tools.web.fetchers.markdownify import MarkdownifyFetcher
+from core.tools.web.hedging import DEFAULT_HEDGE_DELAY, HedgedSearch
+from core.tools.web.http import HttpClientPool
+from core.tools.web.search_cache import WebSearchCache
 from core.tools.web.searchers.exa import ExaSearcher
 from core.tools.web.searchers.firecrawl import FirecrawlSearcher
 from core.tools.web.searchers.tavily import TavilySearcher
-from core.tools.web.types import FetchLimits, FetchResult, SearchResult
+from core.tools.web.types import ContentChunk, FetchLimits, FetchResult, SearchResult
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_TIMEOUT = 30
 
 
 class WebService:
@@ -34,11 +58,18 @@ class WebService:
         max_search_results: int = 5,
         timeout: int = 15,
         extraction_model: Any = None,
+        fetch_cache: WebFetchCache | None = None,
+        search_hedge_delay: float | None = DEFAULT_HEDGE_DELAY,
+        search_adaptive_order: bool = True,
+        search_cache: WebSearchCache | None = None,
     ):
         self.fetch_limits = fetch_limits or FetchLimits()
         self.max_search_results = max_search_results
         self.timeout = timeout
         self._extraction_model = extraction_model
+        self.http = HttpClientPool()
+        self.fetch_cache = fetch_cache
+        self.search_cache = search_cache
 
         self._searchers: list[tuple[str, Any]] = []
         if tavily_api_key:
@@ -47,14 +78,34 @@ class WebService:
             self._searchers.append(("Exa", ExaSearcher(exa_api_key, max_search_results, timeout)))
         if firecrawl_api_key:
             self._searchers.append(("Firecrawl", FirecrawlSearcher(firecrawl_api_key, max_search_results, timeout)))
+        self._search = HedgedSearch(self._searchers, hedge_delay=search_hedge_delay, adaptive=search_adaptive_order)
 
+        # Map-reduce ranks the whole page, so the fetch-side max_chars cut only applies without a model.
+        fetcher_limits = self.fetch_limits if extraction_model is None else extraction_limits(self.fetch_limits)
         self._fetchers: list[tuple[str, Any]] = []
         if jina_api_key:
-            self._fetchers.append(("Jina", JinaFetcher(jina_api_key, self.fetch_limits, timeout)))
-        self._fetchers.append(("Markdownify", MarkdownifyFetcher(self.fetch_limits, timeout)))
+            self._fetchers.append(
+                ("Jina", JinaFetcher(jina_api_key, fetcher_limits, timeout, http=self.http, cache=fetch_cache))
+            )
+        self._fetchers.append(
+            ("Markdownify", MarkdownifyFetcher(fetcher_limits, timeout, http=self.http, cache=fetch_cache))
+        )
 
         self._register(registry)
 
+    def get_search_stats(self) -> dict[str, Any]:
+        """Per-provider latency/error stats, the current provider order and result-cache counters."""
+        stats = self._search.get_stats()
+        if self.search_cache is not None:
+            stats["cache"] = self.search_cache.get_stats()
+        return stats
+
+    def close(self) -> None:
+        """Release pooled connections and the cache handle (safe from any thread)."""
+        self.http.close()
+        if self.fetch_cache is not None:
+            self.fetch_cache.close()
+
     def _register(self, registry: ToolRegistry) -> None:
         registry.register(ToolEntry(
             name="WebSearch",
@@ -128,18 +179,23 @@ class WebService:
 
         effective_max = max_results or self.max_search_results
 
-        for name, searcher in self._searchers:
-            try:
-                result: SearchResult = await searcher.search(
-                    query=query,
-                    max_results=effective_max,
-                    include_domains=include_domains,
-                    exclude_domains=exclude_domains,
-                )
-                if not result.error:
-                    return result.format_output()
-            except Exception:
-                continue
+        async def search() -> SearchResult | None:
+            found = await self._search.search(
+                query=query,
+                max_results=effective_max,
+                include_domains=include_domains,
+                exclude_domains=exclude_domains,
+            )
+            return None if found is None else found[1]
+
+        if self.search_cache is not None:
+            result = await self.search_cache.get_or_search(
+                query, effective_max, include_domains, exclude_domains, search
+            )
+        else:
+            result = await search()
+        if result is not None:
+            return result.format_output()
 
         return "All search providers failed"
 
@@ -164,12 +220,77 @@ class WebService:
         if not content:
             return f"Error: No content retrieved from URL: {url}"
 
+        if (
+            self._extraction_model is not None
+            and len(content) > SINGLE_CALL_CHARS
+            and len(fetch_result.chunks) > 1
+        ):
+            return await self._map_reduce_extract(fetch_result.chunks, content, prompt, url)
+
         max_chars = 100_000
         if len(content) > max_chars:
             content = content[:max_chars]
 
         return await self._ai_extract(content, prompt, url)
 
+    async def _map_reduce_extract(self, chunks: list[ContentChunk], content: str, prompt: str, url: str) -> str:
+        """Extract from the most relevant chunks concurrently, then merge the partial answers."""
+        model = self._extraction_model
+        batches = select_batches(chunks, prompt)
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_EXTRACTIONS)
+
+        async def extract(index: int, text: str) -> str | None:
+            extraction_prompt = (
+                f"You are extracting information from excerpts of a web page "
+                f"(part {index + 1} of {len(batches)} selected parts).\n"
+                f"URL: {url}\n\n"
+                f"Web page excerpts:\n{text}\n\n"
+                f"User's request: {prompt}\n\n"
+                f"Provide a concise answer using only these excerpts. "
+                f"If they contain nothing relevant, reply with exactly {NO_ANSWER}."
+            )
+            async with semaphore:
+                try:
+                    response = await asyncio.wait_for(
+                        model.ainvoke(extraction_prompt, config={"callbacks": []}),
+                        timeout=EXTRACTION_TIMEOUT,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "[WebService] Chunk extraction %d/%d failed for %s: %s", index + 1, len(batches), url, e
+                    )
+                    return None
+            return response.content
+
+        answers = await asyncio.gather(*(extract(i, join_batch(batch)) for i, batch in enumerate(batches)))
+        if all(answer is None for answer in answers):
+            preview = content[:5000]
+            return f"AI extraction failed for every part of the page. Raw content preview:\n\n{preview}"
+
+        relevant = [answer for answer in answers if answer and answer.strip() != NO_ANSWER]
+        if not relevant:
+            return f"The page at {url} does not appear to contain information relevant to: {prompt}"
+        if len(relevant) == 1:
+            return relevant[0]
+
+        partials = "\n\n".join(f"[Part {i + 1}]\n{answer}" for i, answer in enumerate(relevant))
+        merge_prompt = (
+            f"You extracted information from different parts of a web page.\n"
+            f"URL: {url}\n\n"
+            f"Partial answers:\n{partials}\n\n"
+            f"User's request: {prompt}\n\n"
+            f"Merge the partial answers into one concise answer without repeating information."
+        )
+        try:
+            response = await asyncio.wait_for(
+                model.ainvoke(merge_prompt, config={"callbacks": []}),
+                timeout=EXTRACTION_TIMEOUT,
+            )
+            return response.content
+        except Exception as e:
+            logger.warning("[WebService] Merging extraction answers failed for %s: %s", url, e)
+            return "\n\n".join(relevant)
+
     async def _ai_extract(self, content: str, prompt: str, url: str) -> str:
         try:
             model = self._extraction_model
@@ -190,7 +311,7 @@ class WebService:
 
             response = await asyncio.wait_for(
                 model.ainvoke(extraction_prompt, config={"callbacks": []}),
-                timeout=30,
+                timeout=EXTRACTION_TIMEOUT,
             )
             return response.content
         except asyncio.TimeoutError:
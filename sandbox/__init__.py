@@ -71,7 +71,13 @@ def create_sandbox(
         dc = config.docker
         logger.info("[DockerSandbox] Initialized (image=%s)", dc.image)
         return RemoteSandbox(
-            provider=DockerProvider(image=dc.image, mount_path=dc.mount_path, provider_name=config.name),
+            provider=DockerProvider(
+                image=dc.image,
+                mount_path=dc.mount_path,
+                provider_name=config.name,
+                docker_host=dc.docker_host,
+                transport=dc.transport,
+            ),
             config=config,
             default_cwd=dc.mount_path,
             db_path=db_path,
@@ -8,6 +8,7 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -28,6 +29,8 @@ class DockerConfig(BaseModel):
     image: str = "python:3.12-slim"
     mount_path: str = "/workspace"
     docker_host: str | None = None  # e.g. "unix:///var/run/docker.sock" to bypass stuck Docker Desktop context
+    # "api": talk to the Engine API socket directly instead of spawning a docker CLI per operation
+    transport: Literal["cli", "api"] = "cli"
 
 
 class E2BConfig(BaseModel):
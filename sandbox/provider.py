@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Mapping
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from sandbox.runtime import PhysicalTerminalRuntime
@@ -162,6 +163,21 @@ class SandboxProvider(ABC):
         """Create the appropriate PhysicalTerminalRuntime for this provider."""
         pass
 
+    def get_metrics_bulk(self, session_ids: Sequence[str]) -> dict[str, Metrics | Exception | None]:
+        """Metrics for many sessions at once.
+
+        Each value is the session's Metrics, None when unavailable, or the exception raised
+        while probing it. The default probes one session at a time; providers that can read
+        every session in one round trip override this.
+        """
+        results: dict[str, Metrics | Exception | None] = {}
+        for session_id in session_ids:
+            try:
+                results[session_id] = self.get_metrics(session_id)
+            except Exception as exc:
+                results[session_id] = exc
+        return results
+
     def get_metrics_via_commands(self, session_id: str) -> Metrics | None:
         """Get metrics by running Linux shell commands inside the sandbox."""
         try:
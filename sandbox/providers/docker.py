@@ -2,16 +2,27 @@
 Docker sandbox provider.
 
 Implements SandboxProvider using local Docker containers.
+
+Two transports for session/file/metrics operations:
+- ``cli`` (default): one ``docker`` CLI subprocess per operation
+- ``api``: Docker Engine API over the daemon's Unix socket (see
+  ``docker_engine``) — pooled connection, streaming exec, tar file transfer;
+  no process startup per call
+The PTY terminal runtime uses ``docker exec -it`` in both modes.
 """
 
 from __future__ import annotations
 
 import asyncio
+import io
 import os
+import posixpath
 import shlex
 import subprocess
+import tarfile
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 from sandbox.interfaces.executor import ExecuteResult
@@ -23,6 +34,12 @@ from sandbox.provider import (
     SessionInfo,
     build_resource_capabilities,
 )
+from sandbox.providers.docker_engine import (
+    DockerEngineClient,
+    DockerEngineError,
+    single_file_tar,
+    socket_path_from_host,
+)
 from sandbox.runtime import (
     _RemoteRuntimeBase,
     _SubprocessPtySession,
@@ -38,13 +55,17 @@ if TYPE_CHECKING:
     from sandbox.runtime import PhysicalTerminalRuntime
     from sandbox.terminal import AbstractTerminal
 
+# "uid gid mode" of an existing file, else "uid gid" of the container user a new file would belong to
+_STAT_OWNER_SCRIPT = 'stat -L -c "%u %g %a" -- "$1" 2>/dev/null || echo "$(id -u) $(id -g)"'
+
 
 class DockerProvider(SandboxProvider):
     """
     Local Docker sandbox provider.
 
     Notes:
-    - Requires Docker CLI available on host.
+    - Requires Docker CLI available on host (``transport="api"`` only needs the daemon socket,
+      except for the interactive terminal).
     - Uses one container per session.
     - If context_id is provided, uses a named Docker volume for persistence.
     """
@@ -80,18 +101,31 @@ class DockerProvider(SandboxProvider):
         command_timeout_sec: float = 20.0,
         provider_name: str | None = None,
         docker_host: str | None = None,
+        transport: str = "cli",
     ):
         if provider_name:
             self.name = provider_name
+        if transport not in ("cli", "api"):
+            raise ValueError(f"Unknown docker transport: {transport}")
         self.image = image
         self.mount_path = mount_path
         self.command_timeout_sec = command_timeout_sec
         self._docker_host = docker_host
+        self.transport = transport
+        self._api: DockerEngineClient | None = (
+            DockerEngineClient(socket_path_from_host(docker_host), timeout=command_timeout_sec)
+            if transport == "api"
+            else None
+        )
         self._sessions: dict[str, str] = {}  # session_id -> container_id
 
     def create_session(self, context_id: str | None = None) -> SessionInfo:
         session_id = f"leon-{uuid.uuid4().hex[:12]}"
         container_name = session_id
+        if self._api is not None:
+            container_id = self._api_create_container(container_name, session_id, context_id)
+            self._sessions[session_id] = container_id
+            return SessionInfo(session_id=session_id, provider=self.name, status="running")
 
         cmd = [
             "docker",
@@ -121,6 +155,11 @@ class DockerProvider(SandboxProvider):
 
     def destroy_session(self, session_id: str, sync: bool = True) -> bool:
         container_id = self._get_container_id(session_id)
+        if self._api is not None:
+            ok = self._api_ok("DELETE", f"/containers/{container_id}", query={"force": "true"})
+            if ok:
+                self._sessions.pop(session_id, None)
+            return ok
         result = self._run(["docker", "rm", "-f", container_id], timeout=self.command_timeout_sec, check=False)
         if result.returncode == 0:
             self._sessions.pop(session_id, None)
@@ -129,11 +168,15 @@ class DockerProvider(SandboxProvider):
 
     def pause_session(self, session_id: str) -> bool:
         container_id = self._get_container_id(session_id)
+        if self._api is not None:
+            return self._api_ok("POST", f"/containers/{container_id}/pause")
         result = self._run(["docker", "pause", container_id], timeout=self.command_timeout_sec, check=False)
         return result.returncode == 0
 
     def resume_session(self, session_id: str) -> bool:
         container_id = self._get_container_id(session_id)
+        if self._api is not None:
+            return self._api_ok("POST", f"/containers/{container_id}/unpause")
         result = self._run(["docker", "unpause", container_id], timeout=self.command_timeout_sec, check=False)
         return result.returncode == 0
 
@@ -141,15 +184,26 @@ class DockerProvider(SandboxProvider):
         container_id = self._get_container_id(session_id, allow_missing=True)
         if not container_id:
             return "deleted"
-        try:
-            result = self._run(
-                ["docker", "inspect", "-f", "{{.State.Status}}", container_id],
-                timeout=self.command_timeout_sec,
-                check=False,
-            )
-        except RuntimeError:
-            return "unknown"
-        status = result.stdout.strip().lower()
+        if self._api is not None:
+            try:
+                status = self._api.inspect(container_id)["State"]["Status"].lower()
+            except DockerEngineError as e:
+                if e.status != 404:
+                    return "unknown"
+                self._sessions.pop(session_id, None)
+                return "deleted"
+            except (RuntimeError, KeyError, TypeError):
+                return "unknown"
+        else:
+            try:
+                result = self._run(
+                    ["docker", "inspect", "-f", "{{.State.Status}}", container_id],
+                    timeout=self.command_timeout_sec,
+                    check=False,
+                )
+            except RuntimeError:
+                return "unknown"
+            status = result.stdout.strip().lower()
         if status in {"running", "paused", "exited", "dead"}:
             return "paused" if status == "paused" else "running" if status == "running" else "deleted"
         return "unknown"
@@ -164,6 +218,17 @@ class DockerProvider(SandboxProvider):
         container_id = self._get_container_id(session_id)
         workdir = cwd or self.mount_path
         shell_cmd = f"cd {shlex.quote(workdir)} && {command}"
+        if self._api is not None:
+            exit_code, stdout, stderr = self._api.exec(
+                container_id,
+                ["/bin/sh", "-lc", shell_cmd],
+                timeout=max(timeout_ms / 1000, self.command_timeout_sec),
+            )
+            return ProviderExecResult(
+                output=stdout.decode("utf-8", "replace"),
+                exit_code=exit_code,
+                error=stderr.decode("utf-8", "replace") or None,
+            )
         result = self._run(
             ["docker", "exec", container_id, "/bin/sh", "-lc", shell_cmd],
             timeout=max(timeout_ms / 1000, self.command_timeout_sec),
@@ -177,6 +242,8 @@ class DockerProvider(SandboxProvider):
 
     def read_file(self, session_id: str, path: str) -> str:
         container_id = self._get_container_id(session_id)
+        if self._api is not None:
+            return self._api_read_file(container_id, path)
         result = self._run(
             ["docker", "exec", container_id, "cat", path],
             timeout=self.command_timeout_sec,
@@ -188,6 +255,9 @@ class DockerProvider(SandboxProvider):
 
     def write_file(self, session_id: str, path: str, content: str) -> str:
         container_id = self._get_container_id(session_id)
+        if self._api is not None:
+            self._api_write_file(container_id, path, content.encode("utf-8"))
+            return f"Written: {path}"
         cmd = ["docker", "exec", "-i", container_id, "/bin/sh", "-lc", f"cat > {shlex.quote(path)}"]
         result = self._run(cmd, input_text=content, timeout=self.command_timeout_sec, check=False)
         if result.returncode != 0:
@@ -204,15 +274,22 @@ class DockerProvider(SandboxProvider):
             'printf "%s\\t%s\\t%s\\n" "$t" "$s" "$f"; '
             "done"
         )
-        result = self._run(
-            ["docker", "exec", container_id, "/bin/sh", "-lc", script],
-            timeout=self.command_timeout_sec,
-            check=False,
-        )
-        if result.returncode != 0:
-            return []
+        if self._api is not None:
+            exit_code, raw, _ = self._api.exec(container_id, ["/bin/sh", "-lc", script])
+            if exit_code != 0:
+                return []
+            listing = raw.decode("utf-8", "replace")
+        else:
+            result = self._run(
+                ["docker", "exec", container_id, "/bin/sh", "-lc", script],
+                timeout=self.command_timeout_sec,
+                check=False,
+            )
+            if result.returncode != 0:
+                return []
+            listing = result.stdout
         items: list[dict] = []
-        for line in result.stdout.splitlines():
+        for line in listing.splitlines():
             parts = line.split("\t", 2)
             if len(parts) != 3:
                 continue
@@ -226,6 +303,16 @@ class DockerProvider(SandboxProvider):
 
     def upload(self, session_id: str, local_path: str, remote_path: str) -> str:
         container_id = self._get_container_id(session_id)
+        if self._api is not None:
+            target = self._container_path(remote_path)
+            buf = io.BytesIO()
+            with tarfile.open(fileobj=buf, mode="w") as tar:
+                tar.add(local_path, arcname=posixpath.basename(target))
+            try:
+                self._api.put_archive(container_id, posixpath.dirname(target) or "/", buf.getvalue())
+            except DockerEngineError as e:
+                raise OSError(str(e) or "Failed to upload file") from e
+            return f"Uploaded: {local_path} -> {remote_path}"
         result = self._run(
             ["docker", "cp", local_path, f"{container_id}:{remote_path}"],
             timeout=self.command_timeout_sec,
@@ -237,6 +324,13 @@ class DockerProvider(SandboxProvider):
 
     def download(self, session_id: str, remote_path: str, local_path: str) -> str:
         container_id = self._get_container_id(session_id)
+        if self._api is not None:
+            try:
+                archive = self._api.get_archive(container_id, self._container_path(remote_path))
+            except DockerEngineError as e:
+                raise OSError(str(e) or "Failed to download file") from e
+            self._extract_download(archive, local_path)
+            return f"Downloaded: {remote_path} -> {local_path}"
         result = self._run(
             ["docker", "cp", f"{container_id}:{remote_path}", local_path],
             timeout=self.command_timeout_sec,
@@ -250,6 +344,8 @@ class DockerProvider(SandboxProvider):
         container_id = self._get_container_id(session_id, allow_missing=True)
         if not container_id:
             return None
+        if self._api is not None:
+            return self._api_metrics(container_id)
 
         # Check state — docker stats only works on running containers.
         state_result = self._run(
@@ -314,6 +410,136 @@ class DockerProvider(SandboxProvider):
             disk_total_gb=None,  # @@@docker-disk-no-limit - no --storage-opt, df / total = host disk
         )
 
+    def get_metrics_bulk(self, session_ids: Sequence[str]) -> dict[str, Metrics | Exception | None]:
+        """All sessions in two docker calls (or one API listing plus parallel stats reads).
+
+        The Engine API has no multi-container stats endpoint, so API mode still makes one
+        /stats request per running container; each blocks ~1s for the CPU sample. They run
+        concurrently (see _api_stats_many), so a refresh takes about
+        ceil(running / (2 * pool_size)) seconds rather than one second per container.
+
+        @@@docker-bulk-disk - disk_used_gb is the writable-layer size from `ps --size` for every
+        state, not `df /` inside running containers (which reports the host filesystem anyway).
+        """
+        wanted = set(session_ids)
+        if not wanted:
+            return {}
+        if self._api is not None:
+            containers = self._api_list_sessions()
+        else:
+            containers = self._cli_list_sessions()
+        results: dict[str, Metrics | Exception | None] = {sid: None for sid in session_ids}
+        running: dict[str, str] = {}  # container_id -> session_id
+        for container in containers:
+            sid = container["session_id"]
+            if sid not in wanted:
+                continue
+            self._sessions[sid] = container["id"]
+            results[sid] = Metrics(disk_used_gb=container["disk_used_gb"])
+            if container["state"] == "running":
+                running[container["id"]] = sid
+        if not running:
+            return results
+
+        stats = self._api_stats_many(list(running)) if self._api is not None else self._cli_stats_many(list(running))
+        for container_id, sid in running.items():
+            sample = stats.get(container_id)
+            if isinstance(sample, Exception):
+                results[sid] = sample
+            elif sample is not None:
+                current = results[sid]
+                results[sid] = Metrics(
+                    cpu_percent=sample[0],
+                    memory_used_mb=sample[1],
+                    memory_total_mb=None,  # @@@docker-memory-limit
+                    disk_used_gb=current.disk_used_gb if isinstance(current, Metrics) else None,
+                    disk_total_gb=None,
+                )
+        return results
+
+    def _cli_list_sessions(self) -> list[dict]:
+        result = self._run(
+            [
+                "docker",
+                "ps",
+                "-a",
+                "--size",
+                "--filter",
+                "label=leon.session_id",
+                "--format",
+                '{{.ID}}\t{{.Label "leon.session_id"}}\t{{.State}}\t{{.Size}}',
+            ],
+            timeout=self.command_timeout_sec,
+        )
+        containers = []
+        for line in result.stdout.splitlines():
+            parts = line.split("\t")
+            if len(parts) != 4:
+                continue
+            containers.append(
+                {
+                    "id": parts[0],
+                    "session_id": parts[1],
+                    "state": parts[2].strip().lower(),
+                    "disk_used_gb": self._parse_ps_size(parts[3].strip()),
+                }
+            )
+        return containers
+
+    def _cli_stats_many(self, container_ids: list[str]) -> dict[str, tuple[float, float] | Exception]:
+        result = self._run(
+            [
+                "docker",
+                "stats",
+                "--no-stream",
+                "--format",
+                "{{.Container}}\t{{.CPUPerc}}\t{{.MemUsage}}",
+                *container_ids,
+            ],
+            timeout=self.command_timeout_sec,
+            check=False,
+        )
+        if result.returncode != 0:
+            error = RuntimeError(result.stderr.strip() or "docker stats failed")
+            return dict.fromkeys(container_ids, error)
+        stats: dict[str, tuple[float, float] | Exception] = {}
+        for line in result.stdout.splitlines():
+            parts = line.split("\t")
+            if len(parts) != 3:
+                continue
+            mem_used, _ = self._parse_mem_usage(parts[2])
+            stats[parts[0].strip()] = (self._parse_percent(parts[1]), mem_used)
+        return stats
+
+    def _api_list_sessions(self) -> list[dict]:
+        assert self._api is not None
+        containers = []
+        for item in self._api.list_containers(label="leon.session_id", size=True):
+            size_rw = item.get("SizeRw")
+            containers.append(
+                {
+                    "id": item["Id"],
+                    "session_id": (item.get("Labels") or {}).get("leon.session_id", ""),
+                    "state": str(item.get("State", "")).lower(),
+                    "disk_used_gb": size_rw / (1024.0**3) if size_rw is not None else None,
+                }
+            )
+        return containers
+
+    def _api_stats_many(self, container_ids: list[str]) -> dict[str, tuple[float, float] | Exception]:
+        assert self._api is not None
+
+        def sample(container_id: str) -> tuple[float, float] | Exception:
+            try:
+                stats = self._api.stats(container_id)
+            except (DockerEngineError, RuntimeError) as exc:
+                return exc
+            return self._stats_cpu_percent(stats), self._stats_memory_mb(stats)
+
+        # @@@docker-api-stats - no multi-container stats call; each read blocks ~1s for the CPU sample
+        with ThreadPoolExecutor(max_workers=min(len(container_ids), self._api.pool_size * 2)) as pool:
+            return dict(zip(container_ids, pool.map(sample, container_ids)))
+
     def _disk_usage_from_ps(self, container_id: str) -> float | None:
         """Read writable-layer size for any container state via docker ps --size."""
         result = self._run(
@@ -323,7 +549,10 @@ class DockerProvider(SandboxProvider):
         )
         if result.returncode != 0:
             return None
-        size_str = result.stdout.strip()
+        return self._parse_ps_size(result.stdout.strip())
+
+    @staticmethod
+    def _parse_ps_size(size_str: str) -> float | None:
         if not size_str:
             return None
         # Output: "8.19kB (virtual 159MB)" — first token is writable layer
@@ -348,12 +577,15 @@ class DockerProvider(SandboxProvider):
         container_id = self._sessions.get(session_id)
         if container_id:
             return container_id
-        result = self._run(
-            ["docker", "ps", "-aq", "--filter", f"label=leon.session_id={session_id}"],
-            timeout=self.command_timeout_sec,
-            check=False,
-        )
-        container_id = result.stdout.strip()
+        if self._api is not None:
+            container_id = self._api.find_container(f"leon.session_id={session_id}") or ""
+        else:
+            result = self._run(
+                ["docker", "ps", "-aq", "--filter", f"label=leon.session_id={session_id}"],
+                timeout=self.command_timeout_sec,
+                check=False,
+            )
+            container_id = result.stdout.strip()
         if container_id:
             self._sessions[session_id] = container_id
             return container_id
@@ -361,6 +593,182 @@ class DockerProvider(SandboxProvider):
             return None
         raise RuntimeError(f"Docker session not found: {session_id}")
 
+    # ── Engine API transport ────────────────────────────────────────────────
+
+    def _container_path(self, path: str) -> str:
+        # Archive endpoints resolve from /, exec'd commands from the working dir
+        return path if posixpath.isabs(path) else posixpath.join(self.mount_path, path)
+
+    def _api_ok(self, method: str, path: str, query: dict | None = None) -> bool:
+        assert self._api is not None
+        try:
+            self._api.call(method, path, query=query)
+        except (DockerEngineError, RuntimeError):
+            return False
+        return True
+
+    def _api_state(self, container_id: str) -> str | None:
+        assert self._api is not None
+        try:
+            return self._api.inspect(container_id)["State"]["Status"]
+        except (DockerEngineError, RuntimeError, KeyError, TypeError):
+            return None
+
+    def _api_create_container(self, name: str, session_id: str, context_id: str | None) -> str:
+        assert self._api is not None
+        labels = {"leon.session_id": session_id}
+        spec: dict = {
+            "Image": self.image,
+            "Cmd": ["sleep", "infinity"],
+            "WorkingDir": self.mount_path,
+            "Labels": labels,
+            "HostConfig": {},
+        }
+        if context_id:
+            # @@@context-label - also label with context_id so probe can find container via lease_id
+            labels["leon.context_id"] = context_id
+            spec["HostConfig"]["Binds"] = [f"{context_id}:{self.mount_path}"]
+        try:
+            created = self._api.call("POST", "/containers/create", query={"name": name}, json_body=spec)
+        except DockerEngineError as e:
+            if e.status != 404:
+                raise
+            # `docker run` pulls a missing image; do the same before retrying once
+            self._api.pull(self.image, timeout=max(self.command_timeout_sec, 300.0))
+            created = self._api.call("POST", "/containers/create", query={"name": name}, json_body=spec)
+        container_id = (created or {}).get("Id")
+        if not container_id:
+            raise RuntimeError("Failed to create docker container session")
+        self._api.call("POST", f"/containers/{container_id}/start")
+        return container_id
+
+    def _api_read_file(self, container_id: str, path: str) -> str:
+        assert self._api is not None
+        try:
+            archive = self._api.get_archive(container_id, self._container_path(path))
+        except DockerEngineError as e:
+            raise OSError(str(e) or "Failed to read file") from e
+        with tarfile.open(fileobj=io.BytesIO(archive), mode="r") as tar:
+            member = tar.next()
+            if member is None:
+                raise OSError(f"Failed to read file: {path}")
+            if member.isdir():
+                raise OSError(f"Is a directory: {path}")
+            data = tar.extractfile(member)
+            if data is None:
+                raise OSError(f"Not a regular file: {path}")
+            return data.read().decode("utf-8", "replace")
+
+    def _api_write_file(self, container_id: str, path: str, data: bytes) -> None:
+        assert self._api is not None
+        target = self._container_path(path)
+        directory, name = posixpath.split(target)
+        # @@@api-write-owner - put_archive applies the tar header's owner and mode, while `cat >` kept the
+        # existing file's. Stat first so scripts stay executable and non-root images can still edit their files.
+        try:
+            exit_code, out, _ = self._api.exec(container_id, ["/bin/sh", "-c", _STAT_OWNER_SCRIPT, "sh", target])
+        except DockerEngineError as e:
+            raise OSError(str(e) or "Failed to write file") from e
+        fields = out.decode("utf-8", "replace").split() if exit_code == 0 else []
+        try:
+            uid, gid = int(fields[0]), int(fields[1])
+            mode = int(fields[2], 8) if len(fields) > 2 else 0o644
+        except (IndexError, ValueError):
+            raise OSError(f"Failed to write file: cannot stat {path} in container") from None
+        try:
+            self._api.put_archive(
+                container_id, directory or "/", single_file_tar(name, data, mode=mode, uid=uid, gid=gid)
+            )
+        except DockerEngineError as e:
+            raise OSError(str(e) or "Failed to write file") from e
+
+    def _extract_download(self, archive: bytes, local_path: str) -> None:
+        with tarfile.open(fileobj=io.BytesIO(archive), mode="r") as tar:
+            members = tar.getmembers()
+            if not members:
+                raise OSError("Failed to download file: empty archive")
+            root = members[0].name.rstrip("/")
+            if members[0].isfile():
+                data = tar.extractfile(members[0])
+                with open(local_path, "wb") as f:
+                    f.write(data.read() if data else b"")
+                return
+            # Directory: same layout as `docker cp`, rooted at local_path
+            for member in members:
+                member.name = posixpath.join(posixpath.basename(local_path), member.name[len(root) :].lstrip("/"))
+            tar.extractall(os.path.dirname(os.path.abspath(local_path)), members=members, filter="data")
+
+    def _api_metrics(self, container_id: str) -> Metrics | None:
+        assert self._api is not None
+        state = self._api_state(container_id)
+        if state is None:
+            return None
+        if state != "running":
+            # @@@docker-paused-disk - same as the CLI path: only the writable layer size is meaningful
+            try:
+                size_rw = self._api.writable_layer_size(container_id)
+            except (DockerEngineError, RuntimeError):
+                size_rw = None
+            return Metrics(
+                cpu_percent=None,
+                memory_used_mb=None,
+                memory_total_mb=None,
+                disk_used_gb=size_rw / (1024.0**3) if size_rw is not None else None,
+                disk_total_gb=None,
+            )
+        try:
+            stats = self._api.stats(container_id)
+        except (DockerEngineError, RuntimeError):
+            return None
+        disk_used_gb = None
+        try:
+            exit_code, out, _ = self._api.exec(container_id, ["df", "-BG", "/"])
+        except (DockerEngineError, RuntimeError):
+            exit_code, out = 1, b""
+        if exit_code == 0:
+            lines = out.decode("utf-8", "replace").strip().splitlines()
+            if len(lines) >= 2:
+                df_parts = lines[1].split()
+                if len(df_parts) >= 3:
+                    try:
+                        disk_used_gb = float(df_parts[2].rstrip("G"))
+                    except ValueError:
+                        pass
+        return Metrics(
+            cpu_percent=self._stats_cpu_percent(stats),
+            memory_used_mb=self._stats_memory_mb(stats),
+            memory_total_mb=None,  # @@@docker-memory-limit - no --memory limit → no meaningful total
+            disk_used_gb=disk_used_gb,
+            disk_total_gb=None,
+        )
+
+    @staticmethod
+    def _stats_cpu_percent(stats: dict) -> float:
+        """Same formula as `docker stats` (CPUPerc)."""
+        cpu = stats.get("cpu_stats") or {}
+        pre = stats.get("precpu_stats") or {}
+        cpu_delta = (cpu.get("cpu_usage") or {}).get("total_usage", 0) - (pre.get("cpu_usage") or {}).get(
+            "total_usage", 0
+        )
+        system_delta = cpu.get("system_cpu_usage", 0) - pre.get("system_cpu_usage", 0)
+        online = cpu.get("online_cpus") or len((cpu.get("cpu_usage") or {}).get("percpu_usage") or []) or 1
+        if cpu_delta <= 0 or system_delta <= 0:
+            return 0.0
+        return round(cpu_delta / system_delta * online * 100.0, 2)
+
+    @staticmethod
+    def _stats_memory_mb(stats: dict) -> float:
+        """Same as `docker stats` MemUsage: usage minus page cache (cgroup v2 inactive_file, v1 total_inactive_file)."""
+        memory = stats.get("memory_stats") or {}
+        detail = memory.get("stats") or {}
+        cache = detail.get("inactive_file", detail.get("total_inactive_file", 0))
+        usage = memory.get("usage", 0)
+        return max(usage - cache, 0) / 1024 / 1024
+
+    def close(self) -> None:
+        if self._api is not None:
+            self._api.close()
+
     def _run(
         self,
         cmd: list[str],
@@ -0,0 +1,330 @@
+"""
+Docker Engine API client over the daemon's Unix socket.
+
+DockerProvider's CLI mode spawns a ``docker`` process (with a copy of the
+whole environment) for every read_file / write_file / list_dir / status /
+metrics call, paying tens of milliseconds of process startup each time.
+This client speaks the Engine API directly:
+
+- HTTP/1.1 over ``AF_UNIX`` with a small pool of keep-alive connections
+  (a stale pooled connection is retried once on a fresh one)
+- exec: create + start, decoding the multiplexed stdout/stderr frames as
+  they arrive, then inspect for the exit code
+- files: tar archives via ``GET``/``PUT /containers/{id}/archive`` instead of
+  ``cat`` through a shell
+"""
+
+from __future__ import annotations
+
+import http.client
+import io
+import json
+import os
+import socket
+import struct
+import tarfile
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+from urllib.parse import quote, urlencode
+
+DEFAULT_SOCKET_PATH = "/var/run/docker.sock"
+API_VERSION = "v1.41"  # Docker Engine 20.10+
+_POOL_SIZE = 4
+_STREAM_HEADER = struct.Struct(">BxxxL")
+
+
+def socket_path_from_host(docker_host: str | None) -> str:
+    """Socket path for a DOCKER_HOST value; only ``unix://`` hosts are supported."""
+    host = docker_host or os.getenv("DOCKER_HOST") or f"unix://{DEFAULT_SOCKET_PATH}"
+    if not host.startswith("unix://"):
+        raise ValueError(f"Docker Engine API mode needs a unix:// docker_host, got: {host}")
+    return host[len("unix://") :]
+
+
+class DockerEngineError(RuntimeError):
+    """Non-2xx Engine API response."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class DockerEngineClient:
+    """Thread-safe Engine API client with pooled keep-alive connections."""
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        timeout: float = 20.0,
+        pool_size: int = _POOL_SIZE,
+        api_version: str = API_VERSION,
+    ):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.api_version = api_version
+        self._idle: list[_UnixHTTPConnection] = []
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # transport
+    # ------------------------------------------------------------------
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        query: dict[str, Any] | None = None,
+        json_body: Any = None,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> tuple[int, bytes]:
+        conn, response = self._open(method, path, query, json_body, body, headers, timeout)
+        try:
+            data = response.read()
+        except TimeoutError as exc:
+            conn.close()
+            raise RuntimeError(f"Docker API {method} {path} timed out after {timeout or self.timeout}s") from exc
+        except (OSError, http.client.HTTPException) as exc:
+            conn.close()
+            raise RuntimeError(f"Docker API {method} {path} failed: {exc}") from exc
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+        return response.status, data
+
+    def _open(
+        self,
+        method: str,
+        path: str,
+        query: dict[str, Any] | None,
+        json_body: Any,
+        body: bytes | None,
+        headers: dict[str, str] | None,
+        timeout: float | None,
+    ) -> tuple[_UnixHTTPConnection, http.client.HTTPResponse]:
+        """Send a request and return (connection, response) with the body still unread."""
+        url = f"/{self.api_version}{path}"
+        if query:
+            url += "?" + urlencode({k: v for k, v in query.items() if v is not None})
+        send_headers = dict(headers or {})
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            send_headers["Content-Type"] = "application/json"
+        if body is not None:
+            send_headers["Content-Length"] = str(len(body))
+
+        for attempt in range(2):
+            conn, reused = self._acquire(timeout)
+            try:
+                conn.request(method, url, body=body, headers=send_headers)
+                return conn, conn.getresponse()
+            except TimeoutError as exc:
+                conn.close()
+                raise RuntimeError(f"Docker API {method} {path} timed out after {timeout or self.timeout}s") from exc
+            except (OSError, http.client.HTTPException) as exc:
+                conn.close()
+                # @@@stale-keepalive - the daemon may have closed an idle pooled connection; retry once fresh
+                if reused and attempt == 0:
+                    continue
+                raise RuntimeError(f"Docker API {method} {path} failed: {exc}") from exc
+        raise AssertionError("unreachable")
+
+    def call(self, method: str, path: str, **kwargs: Any) -> Any:
+        """request() that raises DockerEngineError on non-2xx and decodes a JSON body."""
+        status, data = self.request(method, path, **kwargs)
+        if status >= 300:
+            raise DockerEngineError(status, _error_message(status, data))
+        if not data:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return data
+
+    def _acquire(self, timeout: float | None) -> tuple[_UnixHTTPConnection, bool]:
+        effective = timeout if timeout is not None else self.timeout
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            return _UnixHTTPConnection(self.socket_path, effective), False
+        conn.timeout = effective
+        if conn.sock is not None:
+            try:
+                conn.sock.settimeout(effective)
+            except OSError:
+                conn.close()  # dead socket: reconnects on the next request
+        return conn, True
+
+    def _release(self, conn: _UnixHTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # containers
+    # ------------------------------------------------------------------
+
+    def find_container(self, label: str) -> str | None:
+        containers = self.list_containers(label=label)
+        return containers[0]["Id"] if containers else None
+
+    def list_containers(self, *, label: str | None = None, size: bool = False) -> list[dict]:
+        query = {"all": "true", "size": "true" if size else None}
+        if label:
+            query["filters"] = json.dumps({"label": [label]})
+        return self.call("GET", "/containers/json", query=query) or []
+
+    def inspect(self, container_id: str) -> dict:
+        return self.call("GET", f"/containers/{quote(container_id)}/json")
+
+    def writable_layer_size(self, container_id: str) -> int | None:
+        containers = self.call(
+            "GET",
+            "/containers/json",
+            query={"all": "true", "size": "true", "filters": json.dumps({"id": [container_id]})},
+        )
+        return containers[0].get("SizeRw") if containers else None
+
+    def stats(self, container_id: str) -> dict:
+        # stream=false (not one-shot) so precpu_stats is populated, as for `docker stats --no-stream`
+        return self.call("GET", f"/containers/{quote(container_id)}/stats", query={"stream": "false"})
+
+    def pull(self, image: str, timeout: float | None = None) -> None:
+        name, tag = _split_image(image)
+        self.call("POST", "/images/create", query={"fromImage": name, "tag": tag}, timeout=timeout)
+
+    # ------------------------------------------------------------------
+    # exec
+    # ------------------------------------------------------------------
+
+    def exec(
+        self,
+        container_id: str,
+        cmd: list[str],
+        *,
+        workdir: str | None = None,
+        timeout: float | None = None,
+        on_stdout: Callable[[bytes], None] | None = None,
+    ) -> tuple[int, bytes, bytes]:
+        """Run cmd in the container; returns (exit_code, stdout, stderr).
+
+        Output frames are decoded as they arrive; ``on_stdout`` sees each stdout chunk.
+        """
+        spec: dict[str, Any] = {"Cmd": cmd, "AttachStdout": True, "AttachStderr": True, "Tty": False}
+        if workdir:
+            spec["WorkingDir"] = workdir
+        exec_id = self.call("POST", f"/containers/{quote(container_id)}/exec", json_body=spec)["Id"]
+        path = f"/exec/{exec_id}/start"
+        conn, response = self._open("POST", path, None, {"Detach": False, "Tty": False}, None, None, timeout)
+        stdout = bytearray()
+        stderr = bytearray()
+        try:
+            if response.status >= 300:
+                raise DockerEngineError(response.status, _error_message(response.status, response.read()))
+            while True:
+                header = response.read(_STREAM_HEADER.size)
+                if len(header) < _STREAM_HEADER.size:
+                    break
+                stream, size = _STREAM_HEADER.unpack(header)
+                chunk = response.read(size)
+                if stream == 2:
+                    stderr.extend(chunk)
+                else:
+                    stdout.extend(chunk)
+                    if on_stdout is not None:
+                        on_stdout(chunk)
+        except TimeoutError as exc:
+            raise RuntimeError(f"Docker exec timed out after {timeout or self.timeout}s: {cmd!r}") from exc
+        finally:
+            # The daemon ends an exec stream by closing the connection; never pool it
+            conn.close()
+
+        exit_code = None
+        # ExitCode can lag the stream close by a moment
+        for _ in range(20):
+            exit_code = self.call("GET", f"/exec/{exec_id}/json").get("ExitCode")
+            if exit_code is not None:
+                break
+            time.sleep(0.01)
+        return (exit_code if exit_code is not None else -1), bytes(stdout), bytes(stderr)
+
+    # ------------------------------------------------------------------
+    # archives
+    # ------------------------------------------------------------------
+
+    def get_archive(self, container_id: str, path: str) -> bytes:
+        return self._archive_call("GET", container_id, path)
+
+    def put_archive(self, container_id: str, directory: str, tar_bytes: bytes) -> None:
+        self._archive_call("PUT", container_id, directory, body=tar_bytes)
+
+    def _archive_call(self, method: str, container_id: str, path: str, body: bytes | None = None) -> bytes:
+        headers = {"Content-Type": "application/x-tar"} if body is not None else None
+        status, data = self.request(
+            method, f"/containers/{quote(container_id)}/archive", query={"path": path}, body=body, headers=headers
+        )
+        if status >= 300:
+            raise DockerEngineError(status, _error_message(status, data))
+        return data
+
+
+def single_file_tar(name: str, data: bytes, mode: int = 0o644, uid: int = 0, gid: int = 0) -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mode = mode
+        info.uid = uid
+        info.gid = gid
+        info.mtime = int(time.time())
+        tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _split_image(image: str) -> tuple[str, str]:
+    if "@" in image:
+        name, digest = image.split("@", 1)
+        return name, digest
+    slash = image.rfind("/")
+    colon = image.rfind(":")
+    if colon > slash:
+        return image[:colon], image[colon + 1 :]
+    return image, "latest"
+
+
+def _error_message(status: int, data: bytes) -> str:
+    try:
+        message = json.loads(data).get("message")
+    except (ValueError, AttributeError):
+        message = None
+    return message or data.decode("utf-8", "replace").strip() or f"Docker API error {status}"
@@ -19,6 +19,7 @@ __all__ = [
     "upsert_lease_resource_snapshot",
     "list_snapshots_by_lease_ids",
     "probe_and_upsert_for_instance",
+    "upsert_probe_result",
 ]
 
 
@@ -49,6 +50,33 @@ def probe_and_upsert_for_instance(
 ) -> dict[str, Any]:
     """Probe provider metrics and persist to storage."""
     metrics = None
+    probe_error: str | None = None
+    try:
+        metrics = provider.get_metrics(instance_id)
+    except Exception as exc:
+        probe_error = str(exc)
+    return upsert_probe_result(
+        lease_id=lease_id,
+        provider_name=provider_name,
+        observed_state=observed_state,
+        probe_mode=probe_mode,
+        metrics=metrics,
+        probe_error=probe_error,
+        db_path=db_path,
+    )
+
+
+def upsert_probe_result(
+    *,
+    lease_id: str,
+    provider_name: str,
+    observed_state: str,
+    probe_mode: str,
+    metrics: Any,
+    probe_error: str | None,
+    db_path: Path = DEFAULT_DB_PATH,
+) -> dict[str, Any]:
+    """Persist already-collected metrics (e.g. from get_metrics_bulk) for one lease."""
     cpu_used = None
     cpu_limit = None
     memory_used_mb = None
@@ -57,11 +85,6 @@ def probe_and_upsert_for_instance(
     disk_total_gb = None
     network_rx_kbps = None
     network_tx_kbps = None
-    probe_error: str | None = None
-    try:
-        metrics = provider.get_metrics(instance_id)
-    except Exception as exc:
-        probe_error = str(exc)
 
     # @@@metrics-type-guard - Provider SDK/mocks may return non-numeric placeholders; persist only numeric metrics.
     if metrics is not None:
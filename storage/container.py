@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import importlib
+import os
 from collections.abc import Mapping
 from pathlib import Path
 from typing import Any, Literal
@@ -180,7 +181,9 @@ class StorageContainer:
 
     def _sqlite_run_event_repo(self):
         from storage.providers.sqlite.run_event_repo import SQLiteRunEventRepo
-        return SQLiteRunEventRepo(db_path=self._run_event_db)
+        # @@@run-event-group-commit - opt-in: coalesce streaming appends into batched commits.
+        batched = os.getenv("LEON_RUN_EVENT_GROUP_COMMIT", "").strip().lower() in {"1", "true", "yes", "on"}
+        return SQLiteRunEventRepo(db_path=self._run_event_db, batched=batched)
 
     def _sqlite_file_operation_repo(self):
         from storage.providers.sqlite.file_operation_repo import SQLiteFileOperationRepo
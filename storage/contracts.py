@@ -79,6 +79,27 @@ class ChatMessageRow(BaseModel):
     created_at: float
 
 
+class ChatSearchHit(BaseModel):
+    message: ChatMessageRow
+    snippet: str  # matched text marked with [ ], trimmed with …
+    score: float = 0.0  # bm25, lower is more relevant; 0.0 for substring fallback matches
+
+
+class ChatInboxRow(BaseModel):
+    """One chat as seen by one participant (materialized chat_inbox row + chat + participants)."""
+
+    chat_id: str
+    title: str | None = None
+    status: str = "active"
+    created_at: float
+    participant_ids: list[str] = []
+    last_message_content: str | None = None
+    last_sender_entity_id: str | None = None
+    last_message_at: float | None = None
+    unread_count: int = 0
+    has_mention: bool = False
+
+
 # ---------------------------------------------------------------------------
 # Delivery strategy — contact relationships + delivery actions
 # ---------------------------------------------------------------------------
@@ -112,6 +133,7 @@ class CheckpointRepo(Protocol):
 
 class RunEventRepo(Protocol):
     def close(self) -> None: ...
+    def flush(self) -> None: ...
     def append_event(
         self,
         thread_id: str,
@@ -181,6 +203,9 @@ class SummaryRepo(Protocol):
     ) -> None: ...
     def get_latest_summary_row(self, thread_id: str) -> SummaryRow | None: ...
     def list_summaries(self, thread_id: str) -> list[dict[str, object]]: ...
+    def save_summary_nodes(self, thread_id: str, nodes: list[dict[str, object]], created_at: str) -> None: ...
+    def list_summary_node_rows(self, thread_id: str, roots_only: bool = False) -> list[dict[str, object]]: ...
+    def delete_summary_nodes(self, thread_id: str) -> None: ...
     def delete_thread_summaries(self, thread_id: str) -> None: ...
     def close(self) -> None: ...
 
@@ -227,6 +252,7 @@ class MemberRepo(Protocol):
     def close(self) -> None: ...
     def create(self, row: MemberRow) -> None: ...
     def get_by_id(self, member_id: str) -> MemberRow | None: ...
+    def get_by_ids(self, member_ids: list[str]) -> list[MemberRow]: ...
     def get_by_name(self, name: str) -> MemberRow | None: ...
     def list_all(self) -> list[MemberRow]: ...
     def list_by_owner(self, owner_id: str) -> list[MemberRow]: ...
@@ -248,6 +274,7 @@ class EntityRepo(Protocol):
     def close(self) -> None: ...
     def create(self, row: EntityRow) -> None: ...
     def get_by_id(self, entity_id: str) -> EntityRow | None: ...
+    def get_by_ids(self, entity_ids: list[str]) -> list[EntityRow]: ...
     def get_by_member_id(self, member_id: str) -> list[EntityRow]: ...
     def get_by_thread_id(self, thread_id: str) -> EntityRow | None: ...
     def list_all(self) -> list[EntityRow]: ...
@@ -271,6 +298,7 @@ class ChatEntityRepo(Protocol):
     def update_last_read(self, chat_id: str, entity_id: str, last_read_at: float) -> None: ...
     def update_mute(self, chat_id: str, entity_id: str, muted: bool, mute_until: float | None = None) -> None: ...
     def find_chat_between(self, entity_a: str, entity_b: str) -> str | None: ...
+    def list_inbox(self, entity_id: str) -> list[ChatInboxRow]: ...
 
 
 class ChatMessageRepo(Protocol):
@@ -279,8 +307,18 @@ class ChatMessageRepo(Protocol):
     def list_by_chat(self, chat_id: str, *, limit: int = 50, before: float | None = None) -> list[ChatMessageRow]: ...
     def list_unread(self, chat_id: str, entity_id: str) -> list[ChatMessageRow]: ...
     def count_unread(self, chat_id: str, entity_id: str) -> int: ...
+    def has_unread_mention(self, chat_id: str, entity_id: str) -> bool: ...
+    def count_unread_mentions(self, entity_id: str) -> dict[str, int]: ...
+    def list_unread_mentions(self, entity_id: str, *, limit: int = 50) -> list[ChatMessageRow]: ...
     def list_by_time_range(self, chat_id: str, *, after: float | None = None, before: float | None = None, limit: int = 100) -> list[ChatMessageRow]: ...
-    def search(self, query: str, *, chat_id: str | None = None, limit: int = 50) -> list[ChatMessageRow]: ...
+    def search(
+        self, query: str, *, chat_id: str | None = None, sender_entity_id: str | None = None,
+        after: float | None = None, before: float | None = None, limit: int = 50,
+    ) -> list[ChatMessageRow]: ...
+    def search_ranked(
+        self, query: str, *, chat_id: str | None = None, sender_entity_id: str | None = None,
+        after: float | None = None, before: float | None = None, limit: int = 20,
+    ) -> list[ChatSearchHit]: ...
 
 
 class ThreadRepo(Protocol):
@@ -298,6 +336,7 @@ class ContactRepo(Protocol):
     def close(self) -> None: ...
     def upsert(self, row: ContactRow) -> None: ...
     def get(self, owner_entity_id: str, target_entity_id: str) -> ContactRow | None: ...
+    def get_for_owners(self, owner_entity_ids: list[str], target_entity_id: str) -> list[ContactRow]: ...
     def list_for_entity(self, owner_entity_id: str) -> list[ContactRow]: ...
     def delete(self, owner_entity_id: str, target_entity_id: str) -> None: ...
 
@@ -308,3 +347,7 @@ class DeliveryResolver(Protocol):
     Checks contact-level block/mute, then chat-level mute, then defaults to DELIVER.
     """
     def resolve(self, recipient_entity_id: str, chat_id: str, sender_entity_id: str, *, is_mentioned: bool = False) -> DeliveryAction: ...
+    def resolve_many(
+        self, recipients: list[ChatEntityRow], chat_id: str, sender_entity_id: str,
+        *, mentioned_entity_ids: set[str] | None = None,
+    ) -> dict[str, DeliveryAction]: ...
@@ -1,15 +1,244 @@
-"""SQLite repositories for chats, chat entities, and chat messages."""
+"""SQLite repositories for chats, chat entities, and chat messages.
+
+@@@chat-inbox - ``chat_inbox`` materializes, per (chat, entity), what the inbox
+shows: the chat's last message, the entity's unread count and whether an
+unread message mentions it. It is maintained in the same transaction as the
+writes that change it (add_entity, message create, update_last_read), so the
+whole inbox is one indexed read instead of a count/mention/last-message query
+per chat. Existing databases are backfilled when the table is first created.
+
+@@@chat-mentions - mentions are also stored one row per (message, mentioned
+entity) in ``chat_message_mentions``, indexed by (entity_id, chat_id,
+created_at). Unread-mention checks are index seeks there instead of a
+``mentions LIKE '%"id"%'`` scan over the chat's JSON column, and an entity's
+unread mentions across all its chats are one query. The JSON column stays the
+source for ChatMessageRow.mentioned_entity_ids.
+
+@@@chat-fts - ``chat_messages_fts`` is an external-content FTS5 index over
+chat_messages.content with the trigram tokenizer (substring matching that also
+works for CJK text, which has no word boundaries). Triggers keep it in sync;
+databases created before it are rebuilt from chat_messages on first open.
+Queries shorter than a trigram, or SQLite builds without FTS5, fall back to a
+LIKE scan.
+"""
 
 from __future__ import annotations
 
+import json
+import logging
 import sqlite3
 import threading
 from pathlib import Path
 
-from storage.contracts import ChatEntityRow, ChatMessageRow, ChatRow
+from storage.contracts import ChatEntityRow, ChatInboxRow, ChatMessageRow, ChatRow, ChatSearchHit
 from storage.providers.sqlite.connection import create_connection
 from storage.providers.sqlite.kernel import SQLiteDBRole, resolve_role_db_path, retry_on_locked as _retry_on_locked
 
+logger = logging.getLogger(__name__)
+
+_TRIGRAM = 3
+_SNIPPET_CHARS = 48
+
+
+_CHAT_ENTITIES_DDL = """
+CREATE TABLE IF NOT EXISTS chat_entities (
+    chat_id TEXT NOT NULL REFERENCES chats(id),
+    entity_id TEXT NOT NULL REFERENCES entities(id),
+    joined_at REAL NOT NULL,
+    last_read_at REAL,
+    muted INTEGER NOT NULL DEFAULT 0,
+    mute_until REAL,
+    UNIQUE(chat_id, entity_id)
+)
+"""
+
+_CHAT_MESSAGES_DDL = """
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id TEXT PRIMARY KEY,
+    chat_id TEXT NOT NULL REFERENCES chats(id),
+    sender_entity_id TEXT NOT NULL,
+    content TEXT NOT NULL,
+    mentions TEXT,
+    created_at REAL NOT NULL
+)
+"""
+
+_CHAT_MENTIONS_DDL = """
+CREATE TABLE IF NOT EXISTS chat_message_mentions (
+    message_id TEXT NOT NULL,
+    chat_id TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (message_id, entity_id)
+)
+"""
+
+_CHAT_INBOX_DDL = """
+CREATE TABLE IF NOT EXISTS chat_inbox (
+    chat_id TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    last_message_id TEXT,
+    last_sender_entity_id TEXT,
+    last_message_content TEXT,
+    last_message_at REAL,
+    unread_count INTEGER NOT NULL DEFAULT 0,
+    unread_mention INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (chat_id, entity_id)
+)
+"""
+
+# Recompute the unread counters of inbox rows from chat_messages (same rules as count_unread /
+# has_unread_mention: messages from others after the entity's last_read_at).
+_INBOX_RECOMPUTE_UNREAD = """
+UPDATE chat_inbox SET
+    unread_count = (
+        SELECT COUNT(*) FROM chat_messages m
+        WHERE m.chat_id = chat_inbox.chat_id AND m.sender_entity_id != chat_inbox.entity_id
+          AND m.created_at > COALESCE((
+              SELECT ce.last_read_at FROM chat_entities ce
+              WHERE ce.chat_id = chat_inbox.chat_id AND ce.entity_id = chat_inbox.entity_id), -1)
+    ),
+    unread_mention = EXISTS (
+        SELECT 1 FROM chat_message_mentions m
+        WHERE m.entity_id = chat_inbox.entity_id AND m.chat_id = chat_inbox.chat_id
+          AND m.created_at > COALESCE((
+              SELECT ce.last_read_at FROM chat_entities ce
+              WHERE ce.chat_id = chat_inbox.chat_id AND ce.entity_id = chat_inbox.entity_id), -1)
+    )
+"""
+
+_INBOX_SET_LAST_MESSAGE = """
+UPDATE chat_inbox SET
+    (last_message_id, last_sender_entity_id, last_message_content, last_message_at) = (
+        SELECT m.id, m.sender_entity_id, m.content, m.created_at FROM chat_messages m
+        WHERE m.chat_id = chat_inbox.chat_id ORDER BY m.created_at DESC LIMIT 1
+    )
+"""
+
+
+def _mention_rows(message_id: str, chat_id: str, sender_entity_id: str, mentioned: list[str], created_at: float):
+    # Self-mentions never count as unread, so they are not indexed
+    return [
+        (message_id, chat_id, entity_id, created_at)
+        for entity_id in dict.fromkeys(mentioned)
+        if entity_id != sender_entity_id
+    ]
+
+
+def _ensure_mentions_table(conn: sqlite3.Connection) -> None:
+    """Create chat_message_mentions (backfilling it from chat_messages.mentions) if it does not exist yet."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chat_message_mentions'"
+    ).fetchone()
+    conn.execute(_CHAT_MENTIONS_DDL)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_chat_mentions_entity ON chat_message_mentions(entity_id, chat_id, created_at)"
+    )
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS chat_message_mentions_ad AFTER DELETE ON chat_messages BEGIN"
+        " DELETE FROM chat_message_mentions WHERE message_id = old.id; END"
+    )
+    if not exists:
+        # @@@chat-mentions-backfill - one-time migration from the JSON column; no JSON1 dependency
+        rows = []
+        for message_id, chat_id, sender, mentions, created_at in conn.execute(
+            "SELECT id, chat_id, sender_entity_id, mentions, created_at FROM chat_messages WHERE mentions IS NOT NULL"
+        ):
+            rows.extend(_mention_rows(message_id, chat_id, sender, json.loads(mentions), created_at))
+        conn.executemany(
+            "INSERT OR IGNORE INTO chat_message_mentions (message_id, chat_id, entity_id, created_at)"
+            " VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+
+def _ensure_inbox_table(conn: sqlite3.Connection) -> None:
+    """Create chat_inbox (backfilling it from existing chats) if it does not exist yet."""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chat_inbox'").fetchone()
+    # Inbox maintenance reads these, whichever repo opens the DB first
+    conn.execute(_CHAT_ENTITIES_DDL)
+    conn.execute(_CHAT_MESSAGES_DDL)
+    _ensure_mentions_table(conn)
+    conn.execute(_CHAT_INBOX_DDL)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_inbox_entity ON chat_inbox(entity_id)")
+    if not exists:
+        # @@@chat-inbox-backfill - one-time migration for databases created before chat_inbox
+        conn.execute(
+            "INSERT OR IGNORE INTO chat_inbox (chat_id, entity_id) SELECT chat_id, entity_id FROM chat_entities"
+        )
+        conn.execute(_INBOX_SET_LAST_MESSAGE)
+        conn.execute(_INBOX_RECOMPUTE_UNREAD)
+    conn.commit()
+
+
+_CHAT_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS chat_messages_fts USING fts5("
+    "content, content='chat_messages', content_rowid='rowid', tokenize='trigram')"
+)
+
+_CHAT_FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_messages_fts_ai AFTER INSERT ON chat_messages BEGIN
+        INSERT INTO chat_messages_fts(rowid, content) VALUES (new.rowid, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_messages_fts_ad AFTER DELETE ON chat_messages BEGIN
+        INSERT INTO chat_messages_fts(chat_messages_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_messages_fts_au AFTER UPDATE OF content ON chat_messages BEGIN
+        INSERT INTO chat_messages_fts(chat_messages_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+        INSERT INTO chat_messages_fts(rowid, content) VALUES (new.rowid, new.content);
+    END
+    """,
+)
+
+
+def _ensure_message_fts(conn: sqlite3.Connection) -> bool:
+    """Create the FTS index and its triggers (backfilling existing messages); False if FTS5 is unavailable."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chat_messages_fts'"
+    ).fetchone()
+    try:
+        conn.execute(_CHAT_FTS_DDL)
+    except sqlite3.OperationalError as e:
+        logger.warning("[chat] FTS5 trigram index unavailable, message search falls back to LIKE: %s", e)
+        return False
+    for trigger in _CHAT_FTS_TRIGGERS:
+        conn.execute(trigger)
+    if not exists:
+        # @@@chat-fts-backfill - one-time index build for databases created before chat_messages_fts
+        conn.execute("INSERT INTO chat_messages_fts(chat_messages_fts) VALUES ('rebuild')")
+    conn.commit()
+    return True
+
+
+def _fts_phrase(query: str) -> str:
+    # One quoted phrase: trigram phrases match substrings, same as the LIKE search they replace
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _like_snippet(content: str, query: str) -> str:
+    """Python-side equivalent of FTS5 snippet() for substring fallback matches."""
+    pos = content.lower().find(query.lower())
+    if pos < 0:
+        return content[:_SNIPPET_CHARS] + ("…" if len(content) > _SNIPPET_CHARS else "")
+    end = pos + len(query)
+    start = max(0, pos - (_SNIPPET_CHARS - len(query)) // 2)
+    stop = min(len(content), max(end, start + _SNIPPET_CHARS))
+    return (
+        ("…" if start > 0 else "")
+        + content[start:pos] + "[" + content[pos:end] + "]" + content[end:stop]
+        + ("…" if stop < len(content) else "")
+    )
+
 
 class SQLiteChatRepo:
 
@@ -91,6 +320,14 @@ class SQLiteChatEntityRepo:
                 " VALUES (?, ?, ?)",
                 (chat_id, entity_id, joined_at),
             )
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO chat_inbox (chat_id, entity_id) VALUES (?, ?)", (chat_id, entity_id),
+            )
+            if cur.rowcount:
+                # Joining a chat with history: everything from others so far is unread
+                where = " WHERE chat_id = ? AND entity_id = ?"
+                self._conn.execute(_INBOX_SET_LAST_MESSAGE + where, (chat_id, entity_id))
+                self._conn.execute(_INBOX_RECOMPUTE_UNREAD + where, (chat_id, entity_id))
             self._conn.commit()
 
     def list_entities(self, chat_id: str) -> list[ChatEntityRow]:
@@ -130,6 +367,10 @@ class SQLiteChatEntityRepo:
                 "UPDATE chat_entities SET last_read_at = ? WHERE chat_id = ? AND entity_id = ?",
                 (last_read_at, chat_id, entity_id),
             )
+            # Usually nothing is newer than the read marker, so this scans an empty index range
+            self._conn.execute(
+                _INBOX_RECOMPUTE_UNREAD + " WHERE chat_id = ? AND entity_id = ?", (chat_id, entity_id),
+            )
             self._conn.commit()
 
     def update_mute(self, chat_id: str, entity_id: str, muted: bool, mute_until: float | None = None) -> None:
@@ -142,6 +383,36 @@ class SQLiteChatEntityRepo:
                 self._conn.commit()
         _retry_on_locked(_do)
 
+    def list_inbox(self, entity_id: str) -> list[ChatInboxRow]:
+        """Active chats of an entity with summaries, most recently active first (two queries)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.id, c.title, c.status, c.created_at, i.last_message_content,"
+                " i.last_sender_entity_id, i.last_message_at, i.unread_count, i.unread_mention"
+                " FROM chat_inbox i JOIN chats c ON c.id = i.chat_id"
+                " WHERE i.entity_id = ? AND c.status = 'active'"
+                " ORDER BY COALESCE(i.last_message_at, c.created_at) DESC",
+                (entity_id,),
+            ).fetchall()
+            members = self._conn.execute(
+                "SELECT ce.chat_id, ce.entity_id FROM chat_entities mine"
+                " JOIN chat_entities ce ON ce.chat_id = mine.chat_id"
+                " WHERE mine.entity_id = ? ORDER BY ce.chat_id, ce.entity_id",  # list_entities order
+                (entity_id,),
+            ).fetchall()
+        participants: dict[str, list[str]] = {}
+        for chat_id, member_id in members:
+            participants.setdefault(chat_id, []).append(member_id)
+        return [
+            ChatInboxRow(
+                chat_id=r[0], title=r[1], status=r[2], created_at=r[3],
+                participant_ids=participants.get(r[0], []),
+                last_message_content=r[4], last_sender_entity_id=r[5], last_message_at=r[6],
+                unread_count=r[7], has_mention=bool(r[8]),
+            )
+            for r in rows
+        ]
+
     # @@@find-chat-between — find the 1:1 chat (exactly 2 members) between two entities.
     # Must NOT return group chats that happen to contain both entities.
     def find_chat_between(self, entity_a: str, entity_b: str) -> str | None:
@@ -157,19 +428,7 @@ class SQLiteChatEntityRepo:
             return row[0] if row else None
 
     def _ensure_table(self) -> None:
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS chat_entities (
-                chat_id TEXT NOT NULL REFERENCES chats(id),
-                entity_id TEXT NOT NULL REFERENCES entities(id),
-                joined_at REAL NOT NULL,
-                last_read_at REAL,
-                muted INTEGER NOT NULL DEFAULT 0,
-                mute_until REAL,
-                UNIQUE(chat_id, entity_id)
-            )
-            """
-        )
+        self._conn.execute(_CHAT_ENTITIES_DDL)
         # @@@chat-entity-migration - add muted/mute_until if table already exists
         try:
             self._conn.execute("ALTER TABLE chat_entities ADD COLUMN muted INTEGER NOT NULL DEFAULT 0")
@@ -182,6 +441,7 @@ class SQLiteChatEntityRepo:
         # @@@chat-entity-index — speeds up find_chat_between and list_chats_for_entity
         self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_entities_entity ON chat_entities(entity_id, chat_id)")
         self._conn.commit()
+        _ensure_inbox_table(self._conn)
 
 
 class SQLiteChatMessageRepo:
@@ -211,9 +471,39 @@ class SQLiteChatMessageRepo:
                     " VALUES (?, ?, ?, ?, ?, ?)",
                     (row.id, row.chat_id, row.sender_entity_id, row.content, mentions_json, row.created_at),
                 )
+                if row.mentioned_entity_ids:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO chat_message_mentions (message_id, chat_id, entity_id, created_at)"
+                        " VALUES (?, ?, ?, ?)",
+                        _mention_rows(
+                            row.id, row.chat_id, row.sender_entity_id, row.mentioned_entity_ids, row.created_at
+                        ),
+                    )
+                self._update_inbox(row)
                 self._conn.commit()
         _retry_on_locked(_do)
 
+    def _update_inbox(self, row: ChatMessageRow) -> None:
+        """Fold a new message into every participant's chat_inbox row (caller holds the lock)."""
+        mentioned = [eid for eid in dict.fromkeys(row.mentioned_entity_ids) if eid != row.sender_entity_id]
+        mention_expr = f"entity_id IN ({','.join('?' * len(mentioned))})" if mentioned else "0"
+        # Unread only for others whose read marker is older than the message (same rule as count_unread)
+        self._conn.execute(
+            "UPDATE chat_inbox SET"
+            " unread_count = unread_count + 1,"
+            f" unread_mention = MAX(unread_mention, {mention_expr})"
+            " WHERE chat_id = ? AND entity_id != ?"
+            " AND ? > COALESCE((SELECT ce.last_read_at FROM chat_entities ce"
+            "   WHERE ce.chat_id = chat_inbox.chat_id AND ce.entity_id = chat_inbox.entity_id), -1)",
+            (*mentioned, row.chat_id, row.sender_entity_id, row.created_at),
+        )
+        self._conn.execute(
+            "UPDATE chat_inbox SET last_message_id = ?, last_sender_entity_id = ?,"
+            " last_message_content = ?, last_message_at = ?"
+            " WHERE chat_id = ? AND (last_message_at IS NULL OR last_message_at <= ?)",
+            (row.id, row.sender_entity_id, row.content, row.created_at, row.chat_id, row.created_at),
+        )
+
     _MSG_COLS = "id, chat_id, sender_entity_id, content, mentions, created_at"
 
     def _to_msg(self, r: tuple) -> ChatMessageRow:
@@ -312,56 +602,109 @@ class SQLiteChatMessageRepo:
     def has_unread_mention(self, chat_id: str, entity_id: str) -> bool:
         """Check if there are unread messages that @mention this entity."""
         with self._lock:
-            cursor_row = self._conn.execute(
-                "SELECT last_read_at FROM chat_entities WHERE chat_id = ? AND entity_id = ?",
-                (chat_id, entity_id),
+            row = self._conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM chat_message_mentions"
+                " WHERE entity_id = ? AND chat_id = ? AND created_at > COALESCE(("
+                "   SELECT last_read_at FROM chat_entities WHERE chat_id = ? AND entity_id = ?), -1))",
+                (entity_id, chat_id, chat_id, entity_id),
             ).fetchone()
-            last_read = cursor_row[0] if cursor_row else None
-            # @@@mention-query — JSON LIKE is crude but sufficient for SQLite without JSON1 extension
-            mention_pattern = f'%"{entity_id}"%'
-            if last_read is None:
-                row = self._conn.execute(
-                    "SELECT COUNT(*) FROM chat_messages WHERE chat_id = ? AND mentions LIKE ? AND sender_entity_id != ?",
-                    (chat_id, mention_pattern, entity_id),
-                ).fetchone()
-            else:
-                row = self._conn.execute(
-                    "SELECT COUNT(*) FROM chat_messages WHERE chat_id = ? AND mentions LIKE ? AND sender_entity_id != ? AND created_at > ?",
-                    (chat_id, mention_pattern, entity_id, last_read),
-                ).fetchone()
-            return int(row[0]) > 0 if row else False
+            return bool(row[0])
 
-    def search(self, query: str, *, chat_id: str | None = None, limit: int = 50) -> list[ChatMessageRow]:
+    def count_unread_mentions(self, entity_id: str) -> dict[str, int]:
+        """Unread @mentions of this entity per chat it participates in (chats without any are omitted)."""
         with self._lock:
-            if chat_id:
-                rows = self._conn.execute(
-                    f"SELECT {self._MSG_COLS} FROM chat_messages"
-                    " WHERE chat_id = ? AND content LIKE ?"
-                    " ORDER BY created_at ASC LIMIT ?",
-                    (chat_id, f"%{query}%", limit),
-                ).fetchall()
-            else:
-                rows = self._conn.execute(
-                    f"SELECT {self._MSG_COLS} FROM chat_messages"
-                    " WHERE content LIKE ?"
-                    " ORDER BY created_at ASC LIMIT ?",
-                    (f"%{query}%", limit),
-                ).fetchall()
+            rows = self._conn.execute(
+                "SELECT mm.chat_id, COUNT(*) FROM chat_entities ce"
+                " JOIN chat_message_mentions mm ON mm.entity_id = ce.entity_id AND mm.chat_id = ce.chat_id"
+                "   AND mm.created_at > COALESCE(ce.last_read_at, -1)"
+                " WHERE ce.entity_id = ? GROUP BY mm.chat_id",
+                (entity_id,),
+            ).fetchall()
+        return {chat_id: count for chat_id, count in rows}
+
+    def list_unread_mentions(self, entity_id: str, *, limit: int = 50) -> list[ChatMessageRow]:
+        """Unread messages that @mention this entity across all its chats, newest first."""
+        cols = ", ".join(f"m.{c}" for c in self._MSG_COLS.split(", "))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {cols} FROM chat_entities ce"
+                " JOIN chat_message_mentions mm ON mm.entity_id = ce.entity_id AND mm.chat_id = ce.chat_id"
+                "   AND mm.created_at > COALESCE(ce.last_read_at, -1)"
+                " JOIN chat_messages m ON m.id = mm.message_id"
+                " WHERE ce.entity_id = ? ORDER BY mm.created_at DESC LIMIT ?",
+                (entity_id, limit),
+            ).fetchall()
         return [self._to_msg(r) for r in rows]
 
-    def _ensure_table(self) -> None:
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS chat_messages (
-                id TEXT PRIMARY KEY,
-                chat_id TEXT NOT NULL REFERENCES chats(id),
-                sender_entity_id TEXT NOT NULL,
-                content TEXT NOT NULL,
-                mentions TEXT,
-                created_at REAL NOT NULL
-            )
-            """
+    def search(
+        self, query: str, *, chat_id: str | None = None, sender_entity_id: str | None = None,
+        after: float | None = None, before: float | None = None, limit: int = 50,
+    ) -> list[ChatMessageRow]:
+        """Messages containing query (case-insensitive substring), oldest first."""
+        return [hit.message for hit in self._search(
+            query, chat_id=chat_id, sender_entity_id=sender_entity_id, after=after, before=before,
+            limit=limit, ranked=False,
+        )]
+
+    def search_ranked(
+        self, query: str, *, chat_id: str | None = None, sender_entity_id: str | None = None,
+        after: float | None = None, before: float | None = None, limit: int = 20,
+    ) -> list[ChatSearchHit]:
+        """Best matches first (bm25, newest first on ties), each with a highlighted snippet."""
+        return self._search(
+            query, chat_id=chat_id, sender_entity_id=sender_entity_id, after=after, before=before,
+            limit=limit, ranked=True,
         )
+
+    def _search(
+        self, query: str, *, chat_id: str | None, sender_entity_id: str | None,
+        after: float | None, before: float | None, limit: int, ranked: bool,
+    ) -> list[ChatSearchHit]:
+        query = query.strip()
+        if not query:
+            return []
+        clauses: list[str] = []
+        params: list = []
+        for clause, value in (
+            ("m.chat_id = ?", chat_id),
+            ("m.sender_entity_id = ?", sender_entity_id),
+            ("m.created_at >= ?", after),
+            ("m.created_at <= ?", before),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        cols = ", ".join(f"m.{c}" for c in self._MSG_COLS.split(", "))
+        use_fts = self._fts and len(query) >= _TRIGRAM
+        if use_fts:
+            where = " AND ".join(["chat_messages_fts MATCH ?", *clauses])
+            order = "rank, m.created_at DESC" if ranked else "m.created_at ASC"
+            sql = (
+                f"SELECT {cols}, snippet(chat_messages_fts, 0, '[', ']', '…', {_SNIPPET_CHARS // 2}),"
+                " bm25(chat_messages_fts)"
+                " FROM chat_messages_fts JOIN chat_messages m ON m.rowid = chat_messages_fts.rowid"
+                f" WHERE {where} ORDER BY {order} LIMIT ?"
+            )
+            args = (_fts_phrase(query), *params, limit)
+        else:
+            where = " AND ".join(["m.content LIKE ? ESCAPE '\\'", *clauses])
+            order = "m.created_at DESC" if ranked else "m.created_at ASC"
+            sql = f"SELECT {cols} FROM chat_messages m WHERE {where} ORDER BY {order} LIMIT ?"
+            args = (_like_pattern(query), *params, limit)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        n = len(self._MSG_COLS.split(", "))
+        hits = []
+        for r in rows:
+            msg = self._to_msg(r[:n])
+            if use_fts:
+                hits.append(ChatSearchHit(message=msg, snippet=r[n], score=r[n + 1]))
+            else:
+                hits.append(ChatSearchHit(message=msg, snippet=_like_snippet(msg.content, query)))
+        return hits
+
+    def _ensure_table(self) -> None:
+        self._conn.execute(_CHAT_MESSAGES_DDL)
         self._conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_chat_messages_chat_time ON chat_messages(chat_id, created_at)"
         )
@@ -371,3 +714,5 @@ class SQLiteChatMessageRepo:
         except sqlite3.OperationalError:
             pass
         self._conn.commit()
+        _ensure_inbox_table(self._conn)
+        self._fts = _ensure_message_fts(self._conn)
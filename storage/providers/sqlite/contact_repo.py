@@ -9,6 +9,9 @@ from pathlib import Path
 from storage.contracts import ContactRow
 from storage.providers.sqlite.connection import create_connection
 from storage.providers.sqlite.kernel import SQLiteDBRole, resolve_role_db_path, retry_on_locked as _retry_on_locked
+from storage.providers.sqlite.row_cache import shared_row_cache
+
+_IN_CHUNK = 500  # stay under SQLITE_MAX_VARIABLE_NUMBER on older builds
 
 
 class SQLiteContactRepo:
@@ -23,6 +26,8 @@ class SQLiteContactRepo:
                 db_path = resolve_role_db_path(SQLiteDBRole.CHAT)
             self._conn = create_connection(db_path)
         self._ensure_table()
+        # @@@row-cache - (owner, target) lookups read through the process-wide cache; writes here invalidate it
+        self._cache = shared_row_cache("contacts", self._conn)
 
     def close(self) -> None:
         if self._own_conn:
@@ -40,20 +45,38 @@ class SQLiteContactRepo:
                 )
                 self._conn.commit()
         _retry_on_locked(_do)
+        self._cache.invalidate((row.owner_entity_id, row.target_entity_id))
 
     def get(self, owner_entity_id: str, target_entity_id: str) -> ContactRow | None:
+        key = (owner_entity_id, target_entity_id)
+        return self._cache.get_or_load_many([key], self._load).get(key)
+
+    def get_for_owners(self, owner_entity_ids: list[str], target_entity_id: str) -> list[ContactRow]:
+        """Contacts from each of the given owners to one target (cache misses in one lookup per chunk)."""
+        keys = [(owner, target_entity_id) for owner in owner_entity_ids]
+        return list(self._cache.get_or_load_many(keys, self._load).values())
+
+    def _load(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], ContactRow]:
+        by_target: dict[str, list[str]] = {}
+        for owner, target in keys:
+            by_target.setdefault(target, []).append(owner)
+        rows: list[tuple] = []
         with self._lock:
-            row = self._conn.execute(
-                "SELECT owner_entity_id, target_entity_id, relation, created_at, updated_at"
-                " FROM contacts WHERE owner_entity_id = ? AND target_entity_id = ?",
-                (owner_entity_id, target_entity_id),
-            ).fetchone()
-        if not row:
-            return None
-        return ContactRow(
-            owner_entity_id=row[0], target_entity_id=row[1],
-            relation=row[2], created_at=row[3], updated_at=row[4],
-        )
+            for target, owners in by_target.items():
+                for i in range(0, len(owners), _IN_CHUNK):
+                    chunk = owners[i : i + _IN_CHUNK]
+                    rows += self._conn.execute(
+                        "SELECT owner_entity_id, target_entity_id, relation, created_at, updated_at FROM contacts"
+                        f" WHERE owner_entity_id IN ({','.join('?' * len(chunk))}) AND target_entity_id = ?",
+                        (*chunk, target),
+                    ).fetchall()
+        return {
+            (r[0], r[1]): ContactRow(
+                owner_entity_id=r[0], target_entity_id=r[1],
+                relation=r[2], created_at=r[3], updated_at=r[4],
+            )
+            for r in rows
+        }
 
     def list_for_entity(self, owner_entity_id: str) -> list[ContactRow]:
         with self._lock:
@@ -79,6 +102,7 @@ class SQLiteContactRepo:
                 )
                 self._conn.commit()
         _retry_on_locked(_do)
+        self._cache.invalidate((owner_entity_id, target_entity_id))
 
     def _ensure_table(self) -> None:
         with self._lock:
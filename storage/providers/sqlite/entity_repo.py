@@ -9,6 +9,9 @@ from pathlib import Path
 from storage.contracts import EntityRow
 from storage.providers.sqlite.connection import create_connection
 from storage.providers.sqlite.kernel import SQLiteDBRole, resolve_role_db_path
+from storage.providers.sqlite.row_cache import shared_row_cache
+
+_IN_CHUNK = 500  # stay under SQLITE_MAX_VARIABLE_NUMBER on older builds
 
 
 class SQLiteEntityRepo:
@@ -23,6 +26,8 @@ class SQLiteEntityRepo:
                 db_path = resolve_role_db_path(SQLiteDBRole.MAIN)
             self._conn = create_connection(db_path)
         self._ensure_table()
+        # @@@row-cache - id lookups read through the process-wide cache; writes here invalidate it
+        self._cache = shared_row_cache("entities", self._conn)
 
     def close(self) -> None:
         if self._own_conn:
@@ -36,12 +41,30 @@ class SQLiteEntityRepo:
                 (row.id, row.type, row.member_id, row.name, row.avatar, row.thread_id, row.created_at),
             )
             self._conn.commit()
+        self._cache.invalidate(row.id)
 
     def get_by_id(self, entity_id: str) -> EntityRow | None:
+        return self._cache.get_or_load(entity_id, lambda: self._load_by_id(entity_id))
+
+    def _load_by_id(self, entity_id: str) -> EntityRow | None:
         with self._lock:
             row = self._conn.execute("SELECT * FROM entities WHERE id = ?", (entity_id,)).fetchone()
             return self._to_row(row) if row else None
 
+    def get_by_ids(self, entity_ids: list[str]) -> list[EntityRow]:
+        """Entities for the given ids (cache misses in one round trip per chunk); unknown ids are skipped."""
+        return list(self._cache.get_or_load_many(entity_ids, self._load_by_ids).values())
+
+    def _load_by_ids(self, ids: list[str]) -> dict[str, EntityRow]:
+        rows: list[tuple] = []
+        with self._lock:
+            for i in range(0, len(ids), _IN_CHUNK):
+                chunk = ids[i : i + _IN_CHUNK]
+                rows += self._conn.execute(
+                    f"SELECT * FROM entities WHERE id IN ({','.join('?' * len(chunk))})", chunk,
+                ).fetchall()
+        return {r[0]: self._to_row(r) for r in rows}
+
     def get_by_member_id(self, member_id: str) -> list[EntityRow]:
         with self._lock:
             rows = self._conn.execute("SELECT * FROM entities WHERE member_id = ?", (member_id,)).fetchall()
@@ -68,6 +91,7 @@ class SQLiteEntityRepo:
         with self._lock:
             self._conn.execute("DELETE FROM entities WHERE id = ?", (entity_id,))
             self._conn.commit()
+        self._cache.invalidate(entity_id)
 
     def _to_row(self, r: tuple) -> EntityRow:
         return EntityRow(
@@ -13,8 +13,10 @@ from typing import Any
 from storage.contracts import AccountRow, MemberRow, MemberType
 from storage.providers.sqlite.connection import create_connection
 from storage.providers.sqlite.kernel import SQLiteDBRole, resolve_role_db_path
+from storage.providers.sqlite.row_cache import shared_row_cache
 
 _ID_ALPHABET = string.ascii_letters + string.digits
+_IN_CHUNK = 500  # stay under SQLITE_MAX_VARIABLE_NUMBER on older builds
 
 
 def generate_member_id() -> str:
@@ -34,6 +36,8 @@ class SQLiteMemberRepo:
                 db_path = resolve_role_db_path(SQLiteDBRole.MAIN)
             self._conn = create_connection(db_path)
         self._ensure_table()
+        # @@@row-cache - id lookups read through the process-wide cache; writes here invalidate it
+        self._cache = shared_row_cache("members", self._conn)
 
     def close(self) -> None:
         if self._own_conn:
@@ -47,12 +51,30 @@ class SQLiteMemberRepo:
                 (row.id, row.name, row.type.value, row.avatar, row.description, row.config_dir, row.owner_id, row.created_at, row.updated_at),
             )
             self._conn.commit()
+        self._cache.invalidate(row.id)
 
     def get_by_id(self, member_id: str) -> MemberRow | None:
+        return self._cache.get_or_load(member_id, lambda: self._load_by_id(member_id))
+
+    def _load_by_id(self, member_id: str) -> MemberRow | None:
         with self._lock:
             row = self._conn.execute("SELECT * FROM members WHERE id = ?", (member_id,)).fetchone()
             return self._to_row(row) if row else None
 
+    def get_by_ids(self, member_ids: list[str]) -> list[MemberRow]:
+        """Members for the given ids (cache misses in one round trip per chunk); unknown ids are skipped."""
+        return list(self._cache.get_or_load_many(member_ids, self._load_by_ids).values())
+
+    def _load_by_ids(self, ids: list[str]) -> dict[str, MemberRow]:
+        rows: list[tuple] = []
+        with self._lock:
+            for i in range(0, len(ids), _IN_CHUNK):
+                chunk = ids[i : i + _IN_CHUNK]
+                rows += self._conn.execute(
+                    f"SELECT * FROM members WHERE id IN ({','.join('?' * len(chunk))})", chunk,
+                ).fetchall()
+        return {r[0]: self._to_row(r) for r in rows}
+
     def get_by_name(self, name: str) -> MemberRow | None:
         with self._lock:
             row = self._conn.execute("SELECT * FROM members WHERE name = ?", (name,)).fetchone()
@@ -83,6 +105,7 @@ class SQLiteMemberRepo:
                 (*updates.values(), member_id),
             )
             self._conn.commit()
+        self._cache.invalidate(member_id)
 
     def increment_entity_seq(self, member_id: str) -> int:
         """Atomically increment next_entity_seq and return the new value."""
@@ -95,14 +118,16 @@ class SQLiteMemberRepo:
                 "SELECT next_entity_seq FROM members WHERE id = ?", (member_id,),
             ).fetchone()
             self._conn.commit()
-            if not row:
-                raise ValueError(f"Member {member_id} not found")
-            return row[0]
+        self._cache.invalidate(member_id)  # next_entity_seq is part of MemberRow
+        if not row:
+            raise ValueError(f"Member {member_id} not found")
+        return row[0]
 
     def delete(self, member_id: str) -> None:
         with self._lock:
             self._conn.execute("DELETE FROM members WHERE id = ?", (member_id,))
             self._conn.commit()
+        self._cache.invalidate(member_id)
 
     def _to_row(self, r: tuple) -> MemberRow:
         return MemberRow(
@@ -0,0 +1,179 @@
+"""RowCache — read-through LRU of rows by primary key for rarely-changing tables.
+
+Entities, members and contacts are looked up by id on every hot path (chat
+delivery, inbox listing, the directory tool, avatar URLs, thread ownership
+checks) but change rarely, so each lookup used to be a SQLite round trip per
+row. The SQLite repos for those tables read through a RowCache:
+
+- one cache per (table, database file), shared by every repo instance in the
+  process, so a write through any instance invalidates what the others see
+  (``:memory:``/temporary databases get a private cache per connection)
+- writes invalidate after commit (write-through invalidation); a load that
+  raced with a write is not stored (generation check)
+- unknown keys are cached as absent for a short while
+  (``ROW_CACHE_NEGATIVE_TTL_S``) so an id created elsewhere shows up quickly
+- bounded size, least recently used evicted first; callers get copies
+- hit/miss counters are exposed through the monitor (``/api/monitor/row-cache``)
+
+Writes from other processes (other backend workers sharing the database) are
+not invalidated; they become visible once the entry expires, after at most
+``ROW_CACHE_TTL_S`` seconds.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+from pydantic import BaseModel
+
+ROW_CACHE_MAX_ENTRIES = 4096
+ROW_CACHE_TTL_S = 30.0
+ROW_CACHE_NEGATIVE_TTL_S = 2.0
+
+
+def _copy(row: BaseModel | None) -> BaseModel | None:
+    return row.model_copy() if row is not None else None
+
+
+class RowCache:
+    """Thread-safe LRU of key → row (or None for a known-absent key), each entry with an expiry."""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = ROW_CACHE_MAX_ENTRIES,
+        ttl: float = ROW_CACHE_TTL_S,
+        negative_ttl: float = ROW_CACHE_NEGATIVE_TTL_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._rows: OrderedDict[Hashable, tuple[BaseModel | None, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Cached row for key, else load() once and remember its result."""
+        with self._lock:
+            entry = self._lookup(key, self._clock())
+            if entry is not None:
+                self._stats["hits"] += 1
+                return _copy(entry[0])
+            self._stats["misses"] += 1
+            generation = self._generation
+        row = load()
+        with self._lock:
+            self._store(generation, {key: row})
+        return _copy(row)
+
+    def get_or_load_many(
+        self, keys: Iterable[Hashable], load_many: Callable[[list[Hashable]], dict[Hashable, Any]]
+    ) -> dict[Hashable, Any]:
+        """Rows for keys (absent keys omitted); misses are fetched with a single load_many(missing) call."""
+        found: dict[Hashable, Any] = {}
+        missing: list[Hashable] = []
+        with self._lock:
+            now = self._clock()
+            for key in dict.fromkeys(keys):
+                entry = self._lookup(key, now)
+                if entry is not None:
+                    found[key] = entry[0]
+                    self._stats["hits"] += 1
+                else:
+                    missing.append(key)
+                    self._stats["misses"] += 1
+            generation = self._generation
+        result = {key: _copy(row) for key, row in found.items() if row is not None}
+        if not missing:
+            return result
+
+        loaded = load_many(missing)
+        with self._lock:
+            self._store(generation, {key: loaded.get(key) for key in missing})
+        for key in missing:
+            row = loaded.get(key)
+            if row is not None:
+                result[key] = _copy(row)
+        return result
+
+    def _lookup(self, key: Hashable, now: float) -> tuple[BaseModel | None, float] | None:
+        entry = self._rows.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            del self._rows[key]
+            return None
+        self._rows.move_to_end(key)
+        return entry
+
+    def _store(self, generation: int, rows: dict[Hashable, Any]) -> None:
+        # @@@row-cache-race - a write committed while we were loading may have made `rows` stale
+        if generation != self._generation:
+            return
+        now = self._clock()
+        for key, row in rows.items():
+            self._rows[key] = (row, now + (self.ttl if row is not None else self.negative_ttl))
+            self._rows.move_to_end(key)
+        while len(self._rows) > self.max_entries:
+            self._rows.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._rows.pop(key, None)
+            self._stats["invalidations"] += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._rows)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_shared: dict[tuple[str, str], RowCache] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_row_cache(table: str, conn: sqlite3.Connection) -> RowCache:
+    """The process-wide cache for table in the database conn is attached to."""
+    db_file = conn.execute("PRAGMA database_list").fetchone()[2]
+    if not db_file:
+        return RowCache(table)  # in-memory database: nothing to share with
+    with _shared_lock:
+        cache = _shared.get((table, db_file))
+        if cache is None:
+            cache = _shared[(table, db_file)] = RowCache(table)
+        return cache
+
+
+def row_cache_stats() -> dict[str, dict[str, Any]]:
+    """Counters of the shared caches for the monitor, summed per table."""
+    with _shared_lock:
+        caches = list(_shared.values())
+    totals: dict[str, dict[str, Any]] = {}
+    for cache in caches:
+        stats = cache.get_stats()
+        table = totals.setdefault(
+            cache.name, {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "entries": 0}
+        )
+        for name in table:
+            table[name] += stats[name]
+    for table in totals.values():
+        lookups = table["hits"] + table["misses"]
+        table["hit_rate"] = round(table["hits"] / lookups, 3) if lookups else 0.0
+    return totals
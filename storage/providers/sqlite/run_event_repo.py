@@ -9,6 +9,12 @@ from pathlib import Path
 from typing import Any
 
 from storage.providers.sqlite.connection import create_connection
+from storage.providers.sqlite.run_event_writer import (
+    RunEventWriter,
+    acquire_writer,
+    ensure_run_events_table,
+    release_writer,
+)
 
 
 class SQLiteRunEventRepo:
@@ -16,23 +22,50 @@ class SQLiteRunEventRepo:
 
     Thread-safe: all connection access is serialized via a lock, allowing
     concurrent ``asyncio.to_thread`` callers from the event loop.
+
+    With ``batched=True`` appends go through a process-wide group-commit
+    writer shared by every repo on the same database file: ``append_event``
+    returns its seq immediately and rows are committed within ~20 ms. Reads
+    and deletes flush pending rows first, so callers always see their writes.
     """
 
-    def __init__(self, db_path: str | Path | None = None, conn: sqlite3.Connection | None = None) -> None:
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        conn: sqlite3.Connection | None = None,
+        *,
+        batched: bool = False,
+    ) -> None:
         self._own_conn = conn is None
         self._lock = threading.Lock()
+        self._writer: RunEventWriter | None = None
         if conn is not None:
+            if batched:
+                raise ValueError("Batched run event repo needs db_path; the writer owns its own connection.")
             self._conn = conn
         else:
             if db_path is None:
                 db_path = Path.home() / ".leon" / "events.db"
             self._conn = create_connection(db_path)
         self._ensure_table()
+        if batched:
+            self._writer = acquire_writer(db_path)
 
     def close(self) -> None:
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            try:
+                writer.flush()
+            finally:
+                release_writer(writer)
         if self._own_conn:
             self._conn.close()
 
+    def flush(self) -> None:
+        """Wait until every appended event is durable. No-op when unbatched."""
+        if self._writer is not None:
+            self._writer.flush()
+
     def append_event(
         self,
         thread_id: str,
@@ -42,6 +75,8 @@ class SQLiteRunEventRepo:
         message_id: str | None = None,
     ) -> int:
         payload = json.dumps(data, ensure_ascii=False)
+        if self._writer is not None:
+            return self._writer.submit(thread_id, run_id, event_type, payload, message_id)
         with self._lock:
             cursor = self._conn.execute(
                 """
@@ -61,6 +96,7 @@ class SQLiteRunEventRepo:
         after: int = 0,
         limit: int = 200,
     ) -> list[dict[str, Any]]:
+        self.flush()
         with self._lock:
             rows = self._conn.execute(
                 """
@@ -83,6 +119,7 @@ class SQLiteRunEventRepo:
         ]
 
     def latest_seq(self, thread_id: str) -> int:
+        self.flush()
         with self._lock:
             row = self._conn.execute(
                 "SELECT MAX(seq) FROM run_events WHERE thread_id = ?",
@@ -91,6 +128,7 @@ class SQLiteRunEventRepo:
         return int(row[0]) if row and row[0] is not None else 0
 
     def run_start_seq(self, thread_id: str, run_id: str) -> int:
+        self.flush()
         with self._lock:
             row = self._conn.execute(
                 "SELECT MIN(seq) FROM run_events WHERE thread_id = ? AND run_id = ?",
@@ -99,6 +137,7 @@ class SQLiteRunEventRepo:
         return int(row[0]) if row and row[0] is not None else 0
 
     def latest_run_id(self, thread_id: str) -> str | None:
+        self.flush()
         with self._lock:
             row = self._conn.execute(
                 """
@@ -113,6 +152,7 @@ class SQLiteRunEventRepo:
         return row[0] if row else None
 
     def list_run_ids(self, thread_id: str) -> list[str]:
+        self.flush()
         with self._lock:
             rows = self._conn.execute(
                 """
@@ -131,6 +171,7 @@ class SQLiteRunEventRepo:
             return 0
 
         placeholders = ",".join("?" for _ in run_ids)
+        self.flush()
         # @@@param_sql - run ids can be external input; keep IN-clause values fully parameterized.
         with self._lock:
             cursor = self._conn.execute(
@@ -141,6 +182,7 @@ class SQLiteRunEventRepo:
         return int(cursor.rowcount)
 
     def delete_thread_events(self, thread_id: str) -> int:
+        self.flush()
         with self._lock:
             cursor = self._conn.execute(
                 "DELETE FROM run_events WHERE thread_id = ?",
@@ -150,23 +192,4 @@ class SQLiteRunEventRepo:
         return int(cursor.rowcount)
 
     def _ensure_table(self) -> None:
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS run_events (
-                seq INTEGER PRIMARY KEY AUTOINCREMENT,
-                thread_id TEXT NOT NULL,
-                run_id TEXT NOT NULL,
-                event_type TEXT NOT NULL,
-                data TEXT NOT NULL,
-                message_id TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-        )
-        self._conn.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_run_events_thread_run
-            ON run_events (thread_id, run_id, seq)
-            """
-        )
-        self._conn.commit()
+        ensure_run_events_table(self._conn)
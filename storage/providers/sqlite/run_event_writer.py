@@ -0,0 +1,302 @@
+"""Background group-commit writer shared by SQLite run event repos.
+
+Streaming emits one run event per token chunk. Committing each row on its own
+serializes every stream on one lock and pays one WAL sync per chunk. The
+writer hands out sequence numbers immediately and commits queued rows in
+batches from a single background thread, bounded by ``max_delay`` seconds or
+``max_batch`` rows, whichever comes first.
+
+Sequence numbers come from blocks reserved in the database itself: the
+writer advances ``sqlite_sequence`` by ``seq_block`` in one write transaction
+and hands out that range locally. Other writers on the same file, batched or
+plain AUTOINCREMENT inserts, in this process or another, always allocate above
+it, so seqs never collide. A batch that cannot be committed is retried row by
+row; rows that still fail put the writer into a failed state in which every
+later ``submit``/``flush`` raises, so callers that were already handed a seq
+learn that it was lost.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from storage.providers.sqlite.connection import create_connection
+from storage.providers.sqlite.kernel import retry_on_locked
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_DELAY_S = 0.02
+DEFAULT_MAX_BATCH = 256
+DEFAULT_SEQ_BLOCK = 256
+
+_INSERT_SQL = """
+    INSERT INTO run_events (seq, thread_id, run_id, event_type, data, message_id)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_RESERVE_SQL = """
+    UPDATE sqlite_sequence
+    SET seq = MAX(seq, (SELECT IFNULL(MAX(seq), 0) FROM run_events)) + ?
+    WHERE name = 'run_events'
+"""
+
+
+def ensure_run_events_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS run_events (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            thread_id TEXT NOT NULL,
+            run_id TEXT NOT NULL,
+            event_type TEXT NOT NULL,
+            data TEXT NOT NULL,
+            message_id TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_run_events_thread_run
+        ON run_events (thread_id, run_id, seq)
+        """
+    )
+    conn.commit()
+
+
+class RunEventWriter:
+    """Coalesces run event inserts from many threads into group commits."""
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        *,
+        max_delay: float = DEFAULT_MAX_DELAY_S,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        seq_block: int = DEFAULT_SEQ_BLOCK,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {max_batch}")
+        if seq_block < 1:
+            raise ValueError(f"seq_block must be >= 1, got {seq_block}")
+        self._max_delay = max_delay
+        self._max_batch = max_batch
+        self._seq_block = seq_block
+        self._conn = create_connection(db_path)
+        self._db_lock = threading.Lock()  # submit() reserves seq blocks while the writer thread commits
+        self._reserve_lock = threading.Lock()  # one submitter refills the block; the rest wait for it
+        ensure_run_events_table(self._conn)
+
+        self._cond = threading.Condition()
+        self._pending: list[tuple[Any, ...]] = []
+        self._first_pending_at = 0.0
+        self._flush_requested = False
+        self._closed = False
+        self._error: BaseException | None = None
+        self._next_seq = self._block_end = 0
+        self._committed_seq = 0  # last seq the writer thread has finished with; only _run advances it
+        self._submitted_seq = 0
+        self.batches_committed = 0
+        self.rows_committed = 0
+
+        self._thread = threading.Thread(target=self._run, name="run-event-writer", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        thread_id: str,
+        run_id: str,
+        event_type: str,
+        payload: str,
+        message_id: str | None,
+    ) -> int:
+        """Queue one row and return its sequence number without waiting for disk."""
+        while True:
+            with self._cond:
+                self._check_usable()
+                if self._has_seq():
+                    seq = self._next_seq
+                    self._next_seq += 1
+                    self._submitted_seq = seq
+                    if not self._pending:
+                        self._first_pending_at = time.monotonic()
+                        self._cond.notify_all()
+                    self._pending.append((seq, thread_id, run_id, event_type, payload, message_id))
+                    if len(self._pending) >= self._max_batch:
+                        self._cond.notify_all()
+                    return seq
+            # Reserving commits to the database; keep it off _cond so queued submits and flushes don't stall.
+            with self._reserve_lock:
+                with self._cond:
+                    self._check_usable()
+                    if self._has_seq():
+                        continue
+                first, last = self._reserve_block()
+                with self._cond:
+                    self._next_seq, self._block_end = first, last
+
+    def _has_seq(self) -> bool:
+        return 0 < self._next_seq <= self._block_end
+
+    def _check_usable(self) -> None:
+        if self._closed:
+            raise RuntimeError("Run event writer is closed")
+        if self._error is not None:
+            raise RuntimeError("Run event writer failed to commit queued events") from self._error
+
+    def flush(self) -> None:
+        """Block until every row submitted so far is committed."""
+        with self._cond:
+            target = self._submitted_seq
+            if self._committed_seq < target:
+                self._flush_requested = True
+                self._cond.notify_all()
+                while self._committed_seq < target and self._thread.is_alive():
+                    self._cond.wait()
+            error = self._error
+        if error is not None:
+            raise RuntimeError("Run event writer failed to commit queued events") from error
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        with self._reserve_lock:
+            self._release_block()
+            self._conn.close()
+        if self._error is not None:
+            logger.error("Run event writer closed with uncommitted failure: %s", self._error)
+
+    def _reserve_block(self) -> tuple[int, int]:
+        """Claim the next seq_block seqs in the database; returns (first, last)."""
+
+        # @@@writer-seq-block - AUTOINCREMENT never reuses anything at or below sqlite_sequence, and
+        # the UPDATE takes the write lock first, so concurrent reservations get disjoint ranges.
+        def reserve() -> int:
+            try:
+                if self._conn.execute(_RESERVE_SQL, (self._seq_block,)).rowcount == 0:
+                    self._conn.execute(
+                        "INSERT INTO sqlite_sequence (name, seq)"
+                        " SELECT 'run_events', IFNULL(MAX(seq), 0) + ? FROM run_events",
+                        (self._seq_block,),
+                    )
+                row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'run_events'").fetchone()
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+            return int(row[0])
+
+        with self._db_lock:
+            last = retry_on_locked(reserve)
+        return last - self._seq_block + 1, last
+
+    def _release_block(self) -> None:
+        # Hand back the unused tail of the block unless someone reserved past it meanwhile.
+        if not self._next_seq or self._next_seq > self._block_end:
+            return
+        try:
+            self._conn.execute(
+                "UPDATE sqlite_sequence SET seq = ? WHERE name = 'run_events' AND seq = ?",
+                (self._next_seq - 1, self._block_end),
+            )
+            self._conn.commit()
+        except sqlite3.Error:
+            logger.warning("Run event writer could not release seqs %d..%d", self._next_seq, self._block_end)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = self._first_pending_at + self._max_delay
+                while len(self._pending) < self._max_batch and not self._flush_requested and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[: self._max_batch]
+                del self._pending[: self._max_batch]
+                if self._pending:
+                    self._first_pending_at = time.monotonic()
+                else:
+                    self._flush_requested = False
+
+            committed, error = self._commit(batch)
+
+            with self._cond:
+                self._committed_seq = batch[-1][0]
+                if error is not None and self._error is None:
+                    self._error = error
+                self.batches_committed += 1
+                self.rows_committed += committed
+                self._cond.notify_all()
+
+    def _commit(self, batch: list[tuple[Any, ...]]) -> tuple[int, BaseException | None]:
+        """Insert batch in one transaction, falling back to one row at a time; returns (rows committed, error)."""
+
+        def insert(rows: list[tuple[Any, ...]]) -> None:
+            try:
+                self._conn.executemany(_INSERT_SQL, rows)
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+        with self._db_lock:
+            try:
+                retry_on_locked(lambda: insert(batch))
+                return len(batch), None
+            except Exception:
+                pass
+            committed = 0
+            error: BaseException | None = None
+            for row in batch:
+                try:
+                    retry_on_locked(lambda row=row: insert([row]))
+                    committed += 1
+                except Exception as exc:
+                    logger.error("Run event writer lost event seq=%d (%s/%s): %s", row[0], row[1], row[2], exc)
+                    error = exc
+            return committed, error
+
+
+# @@@shared-writer - one writer per database file so appends from every run/repo coalesce into the same commits.
+_writers: dict[str, tuple[RunEventWriter, int]] = {}
+_writers_lock = threading.Lock()
+
+
+def acquire_writer(db_path: str | Path) -> RunEventWriter:
+    key = str(Path(db_path).resolve())
+    with _writers_lock:
+        entry = _writers.get(key)
+        if entry is None:
+            writer = RunEventWriter(db_path)
+            _writers[key] = (writer, 1)
+            return writer
+        writer, refs = entry
+        _writers[key] = (writer, refs + 1)
+        return writer
+
+
+def release_writer(writer: RunEventWriter) -> None:
+    with _writers_lock:
+        for key, (candidate, refs) in _writers.items():
+            if candidate is writer:
+                if refs > 1:
+                    _writers[key] = (writer, refs - 1)
+                    return
+                del _writers[key]
+                # Close under the registry lock so a re-acquire cannot seed seq before the tail is committed.
+                writer.close()
+                return
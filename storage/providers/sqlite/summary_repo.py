@@ -67,6 +67,26 @@ class SQLiteSummaryRepo:
                 ON summaries(thread_id, is_active, created_at DESC)
                 """
             )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS summary_nodes (
+                    node_id TEXT PRIMARY KEY,
+                    thread_id TEXT NOT NULL,
+                    level INTEGER NOT NULL,
+                    start_index INTEGER NOT NULL,
+                    end_index INTEGER NOT NULL,
+                    summary_text TEXT NOT NULL,
+                    parent_id TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_summary_nodes_thread
+                ON summary_nodes(thread_id, parent_id, start_index)
+                """
+            )
             conn.commit()
 
     def close(self) -> None:
@@ -151,10 +171,60 @@ class SQLiteSummaryRepo:
             ).fetchall()
         return [dict(row) for row in rows]
 
+    def save_summary_nodes(self, thread_id: str, nodes: list[dict[str, object]], created_at: str) -> None:
+        """Insert tree nodes and point their children at them, in one transaction."""
+        with self._connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO summary_nodes (
+                    node_id, thread_id, level, start_index, end_index,
+                    summary_text, parent_id, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, NULL, ?)
+                """,
+                [
+                    (
+                        node["node_id"],
+                        thread_id,
+                        node["level"],
+                        node["start_index"],
+                        node["end_index"],
+                        node["summary_text"],
+                        created_at,
+                    )
+                    for node in nodes
+                ],
+            )
+            conn.executemany(
+                "UPDATE summary_nodes SET parent_id = ? WHERE node_id = ? AND thread_id = ?",
+                [(node["node_id"], child_id, thread_id) for node in nodes for child_id in node["child_ids"]],
+            )
+            conn.commit()
+
+    def list_summary_node_rows(self, thread_id: str, roots_only: bool = False) -> list[dict[str, object]]:
+        sql = """
+            SELECT node_id, thread_id, level, start_index, end_index,
+                   summary_text, parent_id, created_at
+            FROM summary_nodes
+            WHERE thread_id = ?
+        """
+        if roots_only:
+            sql += " AND parent_id IS NULL"
+        sql += " ORDER BY start_index, level DESC"
+        with self._connection() as conn:
+            rows = conn.execute(sql, (thread_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete_summary_nodes(self, thread_id: str) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM summary_nodes WHERE thread_id = ?", (thread_id,))
+            conn.commit()
+
     def delete_thread_summaries(self, thread_id: str) -> None:
         with self._connection() as conn:
             conn.execute(
                 "DELETE FROM summaries WHERE thread_id = ?",
                 (thread_id,),
             )
+            conn.execute("DELETE FROM summary_nodes WHERE thread_id = ?", (thread_id,))
             conn.commit()
@@ -20,6 +20,9 @@ class SupabaseRunEventRepo:
     def close(self) -> None:
         return None
 
+    def flush(self) -> None:
+        return None
+
     def append_event(
         self,
         thread_id: str,
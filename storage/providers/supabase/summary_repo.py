@@ -8,6 +8,7 @@ from storage.providers.supabase import _query as q
 
 _REPO = "summary repo"
 _TABLE = "summaries"
+_NODES_TABLE = "summary_nodes"
 
 
 class SupabaseSummaryRepo:
@@ -85,12 +86,69 @@ class SupabaseSummaryRepo:
         )
         return [self._hydrate_listing(row, "list_summaries") for row in q.rows(query.execute(), _REPO, "list_summaries")]
 
+    def save_summary_nodes(self, thread_id: str, nodes: list[dict[str, object]], created_at: str) -> None:
+        if not nodes:
+            return
+        self._nodes().insert(
+            [
+                {
+                    "node_id": node["node_id"],
+                    "thread_id": thread_id,
+                    "level": node["level"],
+                    "start_index": node["start_index"],
+                    "end_index": node["end_index"],
+                    "summary_text": node["summary_text"],
+                    "parent_id": None,
+                    "created_at": created_at,
+                }
+                for node in nodes
+            ]
+        ).execute()
+        for node in nodes:
+            child_ids = list(node["child_ids"])
+            if child_ids:
+                self._nodes().update({"parent_id": node["node_id"]}).eq("thread_id", thread_id).in_(
+                    "node_id", child_ids
+                ).execute()
+
+    def list_summary_node_rows(self, thread_id: str, roots_only: bool = False) -> list[dict[str, object]]:
+        query = self._nodes().select(
+            "node_id,thread_id,level,start_index,end_index,summary_text,parent_id,created_at"
+        ).eq("thread_id", thread_id)
+        query = q.order(query, "start_index", desc=False, repo=_REPO, operation="list_summary_node_rows")
+        rows = q.rows(query.execute(), _REPO, "list_summary_node_rows")
+        # Same order as SQLite: by start, then the higher level first
+        return sorted(
+            (
+                {
+                    "node_id": str(self._required(row, "node_id", "list_summary_node_rows")),
+                    "thread_id": str(self._required(row, "thread_id", "list_summary_node_rows")),
+                    "level": int(self._required(row, "level", "list_summary_node_rows")),
+                    "start_index": int(self._required(row, "start_index", "list_summary_node_rows")),
+                    "end_index": int(self._required(row, "end_index", "list_summary_node_rows")),
+                    "summary_text": str(self._required(row, "summary_text", "list_summary_node_rows")),
+                    "parent_id": str(row["parent_id"]) if row.get("parent_id") is not None else None,
+                    "created_at": str(row.get("created_at")) if row.get("created_at") is not None else None,
+                }
+                for row in rows
+                if not roots_only or row.get("parent_id") is None
+            ),
+            key=lambda r: (r["start_index"], -r["level"]),
+        )
+
+    def delete_summary_nodes(self, thread_id: str) -> None:
+        self._nodes().delete().eq("thread_id", thread_id).execute()
+
     def delete_thread_summaries(self, thread_id: str) -> None:
         self._t().delete().eq("thread_id", thread_id).execute()
+        self._nodes().delete().eq("thread_id", thread_id).execute()
 
     def _t(self) -> Any:
         return self._client.table(_TABLE)
 
+    def _nodes(self) -> Any:
+        return self._client.table(_NODES_TABLE)
+
     def _required(self, row: dict[str, Any], field: str, operation: str) -> Any:
         value = row.get(field)
         if value is None:
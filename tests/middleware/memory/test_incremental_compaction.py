@@ -0,0 +1,192 @@
+"""Tests for rolling summaries and the chunk-summary tree."""
+
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from core.runtime.middleware.memory.compactor import (
+    CHUNK_SUMMARY_PROMPT,
+    MERGE_SUMMARY_PROMPT,
+    ROLLING_SUMMARY_PROMPT,
+    ContextCompactor,
+    SummaryNode,
+)
+from core.runtime.middleware.memory.middleware import MemoryMiddleware
+from core.runtime.middleware.memory.summary_store import SummaryStore
+
+
+class RecordingModel:
+    """Fake summarization model that records every prompt it receives."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+
+    async def ainvoke(self, messages):
+        system, human = messages[0].content, messages[1].content
+        self.calls.append((system, human))
+        response = MagicMock()
+        response.content = f"summary#{len(self.calls)}"
+        return response
+
+    def prompts(self, prompt: str) -> list[str]:
+        return [human for system, human in self.calls if system == prompt]
+
+
+def make_turns(start: int, count: int) -> list:
+    messages = []
+    for i in range(start, start + count):
+        messages.append(HumanMessage(content=f"question-{i} " * 50))
+        messages.append(AIMessage(content=f"answer-{i} " * 50))
+    return messages
+
+
+@pytest.fixture
+def temp_db():
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+    yield db_path
+    db_path.unlink(missing_ok=True)
+    for suffix in ["-wal", "-shm"]:
+        Path(str(db_path) + suffix).unlink(missing_ok=True)
+
+
+class TestRollingSummary:
+    @pytest.mark.asyncio
+    async def test_only_previous_summary_and_new_messages_are_sent(self):
+        compactor = ContextCompactor(chunk_tokens=100_000)
+        model = RecordingModel()
+        new_messages = make_turns(10, 3)
+
+        text, nodes = await compactor.compact_incremental(
+            new_messages, model, previous_summary="OLD-SUMMARY", start_index=20
+        )
+
+        [rolling] = model.prompts(ROLLING_SUMMARY_PROMPT)
+        assert "OLD-SUMMARY" in rolling
+        assert "question-10" in rolling and "answer-12" in rolling
+        assert "question-9" not in rolling
+        assert text.startswith("summary#")
+        assert [(n.level, n.start_index, n.end_index) for n in nodes] == [(0, 20, 26)]
+
+    @pytest.mark.asyncio
+    async def test_large_eviction_is_chunked_and_bounded(self):
+        compactor = ContextCompactor(chunk_tokens=1000, fanout=3)
+        model = RecordingModel()
+        messages = make_turns(0, 40)  # ~330 tokens each → ~27 chunks
+
+        text, nodes = await compactor.compact_incremental(messages, model)
+
+        leaves = [n for n in nodes if n.level == 0]
+        assert len(leaves) > 10
+        assert leaves[0].start_index == 0 and leaves[-1].end_index == len(messages)
+        assert all(a.end_index == b.start_index for a, b in zip(leaves, leaves[1:]))
+        # No call sees more raw text than one chunk (chars // 2 ≈ tokens)
+        assert all(len(human) // 2 <= 1200 for human in model.prompts(CHUNK_SUMMARY_PROMPT))
+        assert any(n.level >= 2 for n in nodes)
+        assert text == f"summary#{len(model.calls)}"
+
+    @pytest.mark.asyncio
+    async def test_new_leaf_merged_with_old_roots_is_still_folded(self):
+        compactor = ContextCompactor(chunk_tokens=50, fanout=4)
+        model = RecordingModel()
+        roots = [SummaryNode(0, i, i + 10, f"old{i}") for i in (0, 10, 20)]
+        new_messages = make_turns(15, 1)  # two messages, one chunk each
+
+        text, nodes = await compactor.compact_incremental(
+            new_messages, model, previous_summary="OLD-SUMMARY", start_index=30, roots=roots
+        )
+
+        leaves = [n for n in nodes if n.level == 0]
+        [parent] = [n for n in nodes if n.level == 1]
+        # The first new leaf completes a level with the three old roots; its parent straddles the boundary
+        assert (parent.start_index, parent.end_index) == (0, 31)
+        [rolling] = model.prompts(ROLLING_SUMMARY_PROMPT)
+        assert all(leaf.summary_text in rolling for leaf in leaves)
+        assert parent.summary_text not in rolling and "old0" not in rolling
+        assert text == f"summary#{len(model.calls)}"
+
+    @pytest.mark.asyncio
+    async def test_single_chunk_takes_one_call(self):
+        compactor = ContextCompactor(chunk_tokens=100_000)
+        model = RecordingModel()
+
+        text, [leaf] = await compactor.compact_incremental(
+            make_turns(3, 2), model, previous_summary="OLD-SUMMARY", start_index=6
+        )
+
+        assert len(model.calls) == 1 and text == "summary#1"
+        assert "question-3" in leaf.summary_text and "answer-4" in leaf.summary_text
+
+
+class TestRollUp:
+    @pytest.mark.asyncio
+    async def test_merges_full_levels_like_a_counter(self):
+        compactor = ContextCompactor(fanout=2)
+        model = RecordingModel()
+        leaves = [SummaryNode(0, i, i + 1, f"leaf{i}") for i in range(5)]
+
+        roots, created = await compactor.roll_up(leaves, model)
+
+        assert [(r.level, r.start_index, r.end_index) for r in roots] == [(2, 0, 4), (0, 4, 5)]
+        assert [(p.level, p.start_index, p.end_index) for p in created] == [(1, 0, 2), (1, 2, 4), (2, 0, 4)]
+        assert len(model.prompts(MERGE_SUMMARY_PROMPT)) == 3
+
+
+class TestSummaryTreeStore:
+    def test_roots_and_parent_links_round_trip(self, temp_db):
+        store = SummaryStore(temp_db)
+        a, b = SummaryNode(0, 0, 4, "a"), SummaryNode(0, 4, 8, "b")
+        store.save_summary_nodes("t1", [a, b])
+        parent = SummaryNode(1, 0, 8, "ab", children=[a, b])
+        c = SummaryNode(0, 8, 10, "c")
+        store.save_summary_nodes("t1", [c, parent])
+
+        roots = store.get_summary_roots("t1")
+        assert [(r.node_id, r.level) for r in roots] == [(parent.node_id, 1), (c.node_id, 0)]
+        assert len(store.list_summary_nodes("t1")) == 4
+
+        store.delete_thread_summaries("t1")
+        assert store.get_summary_roots("t1") == []
+
+
+class TestMiddlewareIncremental:
+    @pytest.mark.asyncio
+    async def test_second_compaction_folds_only_new_messages(self, temp_db):
+        compaction_config = MagicMock()
+        compaction_config.reserve_tokens = 16384
+        compaction_config.keep_recent_tokens = 2000
+        middleware = MemoryMiddleware(
+            context_limit=10000, compaction_threshold=0.5, compaction_config=compaction_config, db_path=temp_db
+        )
+        model = RecordingModel()
+        middleware.set_model(model)
+        request = MagicMock()
+        request.system_message = None
+        request.config.configurable = {"thread_id": "t-roll"}
+        request.override = lambda **kw: MagicMock(messages=kw["messages"])
+
+        async def handler(req):
+            return MagicMock()
+
+        first = make_turns(0, 12)
+        request.messages = first
+        await middleware.awrap_model_call(request, handler)
+        first_index = middleware._compact_up_to_index
+        first_summary = middleware._cached_summary
+        assert first_index > 0
+
+        model.calls.clear()
+        request.messages = first + make_turns(12, 8)
+        await middleware.awrap_model_call(request, handler)
+
+        [rolling] = model.prompts(ROLLING_SUMMARY_PROMPT)
+        assert first_summary in rolling
+        assert "question-0 " not in rolling  # already summarized
+        assert middleware._compact_up_to_index > first_index
+
+        roots = SummaryStore(temp_db).get_summary_roots("t-roll")
+        assert roots[0].start_index == 0
+        assert roots[-1].end_index == middleware._compact_up_to_index
@@ -464,8 +464,8 @@ class TestSummaryUpdateOnSecondCompaction:
         store = SummaryStore(temp_db)
         summary1 = store.get_latest_summary("test-thread-1")
         assert summary1 is not None
-        # Summary may include split turn context, so check for version 1 presence
-        assert "Summary version 1" in summary1.summary_text or "Summary version 2" in summary1.summary_text
+        # Large first eviction is summarized in chunks, then merged (and may carry split turn context)
+        assert summary1.summary_text.startswith("Summary version")
 
         # Second compaction with more messages
         messages2 = create_large_message_list(60)
@@ -493,3 +493,68 @@ class TestSummaryUpdateOnSecondCompaction:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestSpeculativeCompaction:
+    """Background compaction above the lower watermark, swapped in on a later call."""
+
+    @staticmethod
+    def _middleware(temp_db, model):
+        compaction_config = MagicMock()
+        compaction_config.reserve_tokens = 16384
+        compaction_config.keep_recent_tokens = 2000
+        middleware = MemoryMiddleware(
+            context_limit=40000,
+            compaction_threshold=0.9,
+            speculative_threshold=0.5,
+            compaction_config=compaction_config,
+            db_path=temp_db,
+        )
+        middleware.set_model(model)
+        return middleware
+
+    @pytest.mark.asyncio
+    async def test_summary_computed_in_background_and_adopted(self, temp_db, mock_model, mock_request):
+        middleware = self._middleware(temp_db, mock_model)
+        messages = create_large_message_list(16)  # ~22000 tokens: above 50%, below 90%
+        mock_request.messages = messages
+        sent: list[list] = []
+
+        async def mock_handler(req):
+            sent.append(req.messages)
+            return MagicMock()
+
+        mock_request.override = lambda **kw: MagicMock(messages=kw["messages"])
+        await middleware.awrap_model_call(mock_request, mock_handler)
+        # Turn 1 is not blocked: full history sent, compaction running in background.
+        assert len(sent[0]) == len(messages)
+        assert middleware._speculative_task is not None
+        await middleware._speculative_task
+
+        mock_request.messages = messages + [HumanMessage(content="next question")]
+        await middleware.awrap_model_call(mock_request, mock_handler)
+        assert sent[1][0].content.startswith("[Conversation Summary]")
+        assert middleware._compact_up_to_index > 0
+        assert len(sent[1]) == len(mock_request.messages) - middleware._compact_up_to_index + 1
+
+        summary = SummaryStore(temp_db).get_latest_summary("test-thread-1")
+        assert summary is not None
+        assert summary.compact_up_to_index == middleware._compact_up_to_index
+
+    @pytest.mark.asyncio
+    async def test_summary_discarded_when_split_point_changed(self, temp_db, mock_model, mock_request):
+        middleware = self._middleware(temp_db, mock_model)
+        mock_request.messages = create_large_message_list(16)
+        mock_request.override = lambda **kw: MagicMock(messages=kw["messages"])
+
+        async def mock_handler(req):
+            return MagicMock()
+
+        await middleware.awrap_model_call(mock_request, mock_handler)
+        await middleware._speculative_task
+
+        # History rewritten (different message objects, no ids) — split is no longer valid.
+        mock_request.messages = create_large_message_list(3)
+        await middleware.awrap_model_call(mock_request, mock_handler)
+        assert middleware._cached_summary is None
+        assert SummaryStore(temp_db).get_latest_summary("test-thread-1") is None
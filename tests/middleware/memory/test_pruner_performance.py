@@ -0,0 +1,108 @@
+"""Benchmark + correctness for memoized SessionPruner.prune.
+
+Synthetic 5k-message thread: after the first call, each turn appends a few
+messages and re-prunes. Per-call work should be O(new messages), reusing the
+previous pruned prefix and the cached pruned copies.
+"""
+
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from core.runtime.middleware.memory.pruner import SessionPruner
+
+
+def _turn(i: int) -> list:
+    tc_id = f"tc-{i}"
+    return [
+        HumanMessage(content=f"step {i}", id=f"h-{i}"),
+        AIMessage(content="", tool_calls=[{"id": tc_id, "name": "read_file", "args": {}}], id=f"a-{i}"),
+        ToolMessage(content=("line\n" * (800 if i % 3 else 3000)), tool_call_id=tc_id, id=f"t-{i}"),
+        AIMessage(content=f"done {i}", id=f"r-{i}"),
+    ]
+
+
+def _thread(turns: int) -> list:
+    messages = []
+    for i in range(turns):
+        messages.extend(_turn(i))
+    return messages
+
+
+def test_memoized_prune_matches_fresh_prune():
+    messages = _thread(20)
+    memo = SessionPruner(protect_recent=3)
+    memo.prune(messages)
+    for i in range(20, 25):
+        messages = messages + _turn(i)
+        incremental = memo.prune(messages)
+        fresh = SessionPruner(protect_recent=3).prune(messages)
+        assert [m.content for m in incremental] == [m.content for m in fresh]
+
+
+def test_memoized_prune_reuses_pruned_copies():
+    messages = _thread(10)
+    pruner = SessionPruner(protect_recent=2)
+    first = pruner.prune(messages)
+    second = pruner.prune(messages + _turn(10))
+    # Old pruned ToolMessages are the very same objects across calls.
+    assert first[2] is second[2]
+    assert first[2] is not messages[2]
+    assert "[Tool output cleared" in first[2].content or "[...trimmed...]" in first[2].content
+
+    pruner.soft_trim_chars = 1000
+    third = pruner.prune(messages + _turn(10))
+    assert third[2] is not first[2]
+
+
+def _counting(pruner: SessionPruner) -> list[int]:
+    """Count messages the pruner walks (each one gets a _is_tool_message check)."""
+    walked = [0]
+    is_tool_message = pruner._is_tool_message
+
+    def counted(msg):
+        walked[0] += 1
+        return is_tool_message(msg)
+
+    pruner._is_tool_message = counted
+    return walked
+
+
+def test_prune_benchmark_5k_messages():
+    turns = 1250  # 5000 messages
+    messages = _thread(turns)
+    pruner = SessionPruner()
+    walked = _counting(pruner)
+
+    start = time.perf_counter()
+    pruner.prune(messages)
+    cold = time.perf_counter() - start
+    cold_walked = walked[0]
+
+    rounds = 50
+    walked[0] = 0
+    start = time.perf_counter()
+    for i in range(rounds):
+        messages = messages + _turn(turns + i)
+        pruner.prune(messages)
+    warm = (time.perf_counter() - start) / rounds
+    warm_walked = walked[0] / rounds
+
+    baseline_rounds = 5
+    fresh_walked = 0
+    start = time.perf_counter()
+    for _ in range(baseline_rounds):
+        baseline = SessionPruner()
+        counter = _counting(baseline)
+        baseline.prune(messages)
+        fresh_walked += counter[0]
+    fresh = (time.perf_counter() - start) / baseline_rounds
+    fresh_walked /= baseline_rounds
+
+    print(
+        f"\n[Performance Test] prune 5k msgs: cold={cold * 1000:.2f}ms, "
+        f"incremental={warm * 1000:.3f}ms/call, fresh={fresh * 1000:.2f}ms/call"
+    )
+    print(f"  messages walked: cold={cold_walked}, incremental={warm_walked:.0f}/call, fresh={fresh_walked:.0f}/call")
+    # Each warm call re-walks only the new turn plus the protected window, not the whole thread.
+    assert warm_walked * 100 < fresh_walked
@@ -0,0 +1,90 @@
+"""Tests for TokenLedger incremental token accounting."""
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from core.runtime.middleware.memory.compactor import ContextCompactor
+from core.runtime.middleware.memory.token_ledger import TokenLedger
+
+
+class _CountingCounter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, text: str) -> int:
+        self.calls += 1
+        return len(text) // 2
+
+
+def _history(n: int) -> list:
+    messages = []
+    for i in range(n):
+        messages.append(HumanMessage(content=f"question {i} " * 10, id=f"h-{i}"))
+        messages.append(AIMessage(content=f"answer {i} " * 20, id=f"a-{i}"))
+    return messages
+
+
+def test_count_only_tokenizes_appended_messages():
+    counter = _CountingCounter()
+    ledger = TokenLedger(counter=counter)
+    messages = _history(50)
+
+    total = ledger.count(messages, view="raw")
+    assert total == sum(len(m.content) // 2 for m in messages)
+    assert counter.calls == 100
+
+    messages = messages + [HumanMessage(content="new turn", id="h-new")]
+    assert ledger.count(messages, view="raw") == total + len("new turn") // 2
+    assert counter.calls == 101
+
+    # Same list again: no recount at all.
+    ledger.count(messages, view="raw")
+    assert counter.calls == 101
+
+
+def test_replaced_message_recounts_from_per_id_cache():
+    counter = _CountingCounter()
+    ledger = TokenLedger(counter=counter)
+    tool = ToolMessage(content="x" * 5000, tool_call_id="tc-1", id="t-1")
+    messages = [HumanMessage(content="hi", id="h-1"), tool, AIMessage(content="ok", id="a-1")]
+    ledger.count(messages, view="pruned")
+    assert counter.calls == 3
+
+    pruned_copy = ToolMessage(content="[cleared]", tool_call_id="tc-1", id="t-1")
+    total = ledger.count([messages[0], pruned_copy, messages[2]], view="pruned")
+    assert total == 1 + len("[cleared]") // 2 + 1
+    # Only the changed content is re-tokenized; unchanged ids hit the cache.
+    assert counter.calls == 4
+
+
+def test_list_content_edits_under_same_id_are_recounted():
+    ledger = TokenLedger()
+    first = AIMessage(content=[{"type": "text", "text": "x" * 10}], id="a-1")
+    assert ledger.message_tokens(first) == 5
+
+    # Same id and block count, longer text inside the block.
+    grown = AIMessage(content=[{"type": "text", "text": "x" * 100}], id="a-1")
+    assert ledger.message_tokens(grown) == 50
+
+
+def test_compactor_split_matches_backwards_walk():
+    messages = _history(40)
+    compactor = ContextCompactor(keep_recent_tokens=500)
+    to_summarize, to_keep = compactor.split_messages(messages)
+
+    accumulated = 0
+    expected = len(messages)
+    for i in range(len(messages) - 1, -1, -1):
+        tokens = len(messages[i].content) // 2
+        if accumulated + tokens > 500:
+            expected = i + 1
+            break
+        accumulated += tokens
+    expected = compactor._adjust_boundary(messages, expected)
+    assert len(to_summarize) == expected
+    assert to_keep[0].__class__.__name__ == "HumanMessage"
+
+
+def test_compactor_keeps_everything_when_under_budget():
+    messages = _history(3)
+    compactor = ContextCompactor(keep_recent_tokens=100_000)
+    assert compactor.split_messages(messages) == ([], messages)
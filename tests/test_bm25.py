@@ -0,0 +1,31 @@
+"""Tests for the shared BM25 helper used by tool_search and WebFetch extraction."""
+
+from core.bm25 import score_documents, tokenize
+from core.runtime.tool_index import ToolSearchIndex
+
+
+def test_tokenize_splits_identifiers():
+    tokens = tokenize("createGitHubIssue v2_items HTTP2")
+    assert tokens == ["create", "git", "hub", "issue", "v", "2", "items", "http", "2"]
+
+
+def test_score_documents_matches_tool_index():
+    descriptions = {
+        "a": "create an issue in the tracker",
+        "b": "list issues and close an issue",
+        "c": "send a message",
+    }
+    index = ToolSearchIndex()
+    docs = []
+    for name, description in descriptions.items():
+        # Name and params fields are empty apart from the single-letter name, which the query never hits.
+        index.add(name, {"description": description})
+        terms: dict[str, float] = {name: 3.0}
+        for token in tokenize(description):
+            terms[token] = terms.get(token, 0.0) + 1.0
+        docs.append(terms)
+
+    scores = score_documents(docs, {"issue"})
+    assert scores[2] == 0.0
+    assert dict(index.search("issue", 3)) == {"a": scores[0], "b": scores[1]}
+    assert score_documents([], {"issue"}) == []
@@ -0,0 +1,224 @@
+"""Tests for the bulk delivery planner in ChatService._deliver_to_agents and bounded async delivery."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+import pytest
+
+from backend.web.services.chat_service import ChatService
+from backend.web.services.delivery_resolver import DefaultDeliveryResolver
+from storage.contracts import ContactRow, DeliveryAction, EntityRow, MemberRow, MemberType
+from storage.providers.sqlite.chat_repo import SQLiteChatEntityRepo, SQLiteChatMessageRepo, SQLiteChatRepo
+from storage.providers.sqlite.contact_repo import SQLiteContactRepo
+from storage.providers.sqlite.entity_repo import SQLiteEntityRepo
+from storage.providers.sqlite.member_repo import SQLiteMemberRepo
+
+
+class Recorder:
+    """Delivery function that records recipients."""
+
+    def __init__(self, fail_for: set[str] | None = None):
+        self.fail_for = fail_for or set()
+        self.delivered: list[str] = []
+
+    def __call__(self, entity, content, sender_name, chat_id, sender_entity_id, sender_avatar_url, signal=None):
+        if entity.id in self.fail_for:
+            raise RuntimeError("thread gone")
+        self.delivered.append(entity.id)
+
+
+class Store:
+    def __init__(self, root):
+        self.members = SQLiteMemberRepo(root / "leon.db")
+        self.entities = SQLiteEntityRepo(root / "leon.db")
+        self.chats = SQLiteChatRepo(root / "chat.db")
+        self.chat_entities = SQLiteChatEntityRepo(root / "chat.db")
+        self.messages = SQLiteChatMessageRepo(root / "chat.db")
+        self.contacts = SQLiteContactRepo(root / "chat.db")
+        self.resolver = DefaultDeliveryResolver(self.contacts, self.chat_entities)
+
+    def close(self):
+        for repo in (self.members, self.entities, self.chats, self.chat_entities, self.messages, self.contacts):
+            repo.close()
+
+    def service(self, delivery_fn, resolver=None) -> ChatService:
+        return ChatService(
+            self.chats, self.chat_entities, self.messages, self.entities, self.members,
+            delivery_fn=delivery_fn, delivery_resolver=resolver or self.resolver,
+        )
+
+    def add_entity(self, name: str, agent: bool = True, thread: bool = True) -> str:
+        self.members.create(MemberRow(id=f"m_{name}", name=name, type=MemberType.HUMAN, created_at=1.0))
+        self.entities.create(
+            EntityRow(
+                id=f"e_{name}", type="agent" if agent else "human", member_id=f"m_{name}", name=name,
+                thread_id=f"t_{name}" if agent and thread else None, created_at=1.0,
+            )
+        )
+        return f"e_{name}"
+
+    def contact(self, owner: str, target: str, relation: str):
+        self.contacts.upsert(
+            ContactRow(owner_entity_id=owner, target_entity_id=target, relation=relation, created_at=1.0)
+        )
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = Store(tmp_path)
+    yield s
+    s.close()
+
+
+def legacy_deliver(s: Store, chat_id: str, sender: str, mentions: set[str], delivery_fn) -> None:
+    """The serial per-recipient loop _deliver_to_agents used before the planner."""
+    for ce in s.chat_entities.list_entities(chat_id):
+        if ce.entity_id == sender:
+            continue
+        entity = s.entities.get_by_id(ce.entity_id)
+        if not entity or entity.type != "agent" or not entity.thread_id:
+            continue
+        action = s.resolver.resolve(ce.entity_id, chat_id, sender, is_mentioned=ce.entity_id in mentions)
+        if action != DeliveryAction.DELIVER:
+            continue
+        try:
+            delivery_fn(entity, "hi", "sender", chat_id, sender, None)
+        except Exception:
+            pass
+
+
+def test_plan_applies_contacts_mutes_and_mentions(store):
+    human = store.add_entity("human", agent=False)
+    agents = [store.add_entity(n) for n in ("blocker", "muter", "chatmute", "expired", "plain", "mentioned")]
+    threadless = store.add_entity("threadless", thread=False)
+    chat = store.service(Recorder()).create_group_chat([human, *agents, threadless])
+    store.contact("e_blocker", human, "blocked")
+    store.contact("e_muter", human, "muted")
+    store.contact("e_mentioned", human, "muted")
+    store.contact("e_plain", human, "normal")
+    store.chat_entities.update_mute(chat.id, "e_chatmute", True, None)
+    store.chat_entities.update_mute(chat.id, "e_expired", True, time.time() - 10)
+
+    recorder = Recorder()
+    store.service(recorder).send_message(chat.id, human, "hello", mentioned_entity_ids=["e_mentioned", "e_blocker"])
+    assert sorted(recorder.delivered) == ["e_expired", "e_mentioned", "e_plain"]
+
+    actions = store.resolver.resolve_many(store.chat_entities.list_entities(chat.id), chat.id, human)
+    assert actions["e_blocker"] == DeliveryAction.DROP
+    assert actions["e_muter"] == actions["e_chatmute"] == actions["e_mentioned"] == DeliveryAction.NOTIFY
+
+
+def test_plan_matches_legacy_loop_on_random_policies(store):
+    rng = random.Random(9)
+    people = [store.add_entity(f"a{i}", agent=i % 5 != 0, thread=i % 7 != 1) for i in range(30)]
+    chat = store.service(Recorder()).create_group_chat(people)
+    for owner in people:
+        for target in rng.sample(people, 4):
+            store.contact(owner, target, rng.choice(["normal", "blocked", "muted"]))
+        if rng.random() < 0.3:
+            until = rng.choice([None, time.time() - 5, time.time() + 500])
+            store.chat_entities.update_mute(chat.id, owner, True, until)
+
+    for _ in range(20):
+        sender = rng.choice(people)
+        mentions = set(rng.sample(people, 3))
+        planned, legacy = Recorder(), Recorder()
+        store.service(planned).send_message(chat.id, sender, "x", mentioned_entity_ids=list(mentions))
+        legacy_deliver(store, chat.id, sender, mentions, legacy)
+        assert sorted(planned.delivered) == sorted(legacy.delivered)
+
+
+def test_fanout_isolates_failures(store):
+    human = store.add_entity("human", agent=False)
+    agents = [store.add_entity(f"a{i}") for i in range(20)]
+    recorder = Recorder(fail_for={"e_a3"})
+    service = store.service(recorder)
+    chat = service.create_group_chat([human, *agents])
+
+    service.send_message(chat.id, human, "go")
+    assert len(recorder.delivered) == 19 and "e_a3" not in recorder.delivered
+
+
+def test_async_deliveries_are_bounded(monkeypatch):
+    from core.agents.communication import delivery
+
+    active = peak = 0
+    done: list[str] = []
+
+    async def fake_async_deliver(app, entity, *args, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        done.append(entity.id)
+
+    monkeypatch.setattr(delivery, "_async_deliver", fake_async_deliver)
+
+    async def _run():
+        deliver = delivery.make_chat_delivery_fn(app=None)
+        entities = [
+            EntityRow(id=f"e{i}", type="agent", member_id=f"m{i}", name=f"a{i}", thread_id=f"t{i}", created_at=1.0)
+            for i in range(30)
+        ]
+        # ChatService calls the delivery function from the request's worker thread
+        await asyncio.to_thread(lambda: [deliver(e, "hi", "sender", "c1", "e_sender") for e in entities])
+        while len(done) < len(entities):
+            await asyncio.sleep(0.01)
+
+    asyncio.run(_run())
+    assert 1 < peak <= delivery._DELIVERY_PARALLELISM
+
+
+def test_resolver_without_resolve_many_still_works(store):
+    human = store.add_entity("human", agent=False)
+    a, b = store.add_entity("a"), store.add_entity("b")
+
+    class PerRecipient:
+        def resolve(self, recipient_entity_id, chat_id, sender_entity_id, *, is_mentioned=False):
+            return DeliveryAction.DELIVER if recipient_entity_id == a or is_mentioned else DeliveryAction.NOTIFY
+
+    recorder = Recorder()
+    service = store.service(recorder, resolver=PerRecipient())
+    chat = service.create_group_chat([human, a, b])
+    service.send_message(chat.id, human, "hi")
+    service.send_message(chat.id, human, "hi", mentioned_entity_ids=[b])
+    assert sorted(recorder.delivered) == [a, a, b]
+
+
+def test_planner_scales_to_50_agent_group(store):
+    """[Performance Test] one message to a 50-agent group: serial per-recipient loop vs bulk plan + fan-out."""
+    human = store.add_entity("human", agent=False)
+    agents = [store.add_entity(f"agent{i}") for i in range(50)]
+    chat = store.service(Recorder()).create_group_chat([human, *agents])
+    for i, agent in enumerate(agents):
+        store.contact(agent, human, "muted" if i % 10 == 0 else "normal")
+    repos = (store.members, store.entities, store.chat_entities, store.contacts)
+
+    def run(deliver) -> tuple[int, float]:
+        statements: list[str] = []
+        for repo in repos:
+            repo._conn.set_trace_callback(statements.append)
+        start = time.perf_counter()
+        try:
+            deliver()
+        finally:
+            for repo in repos:
+                repo._conn.set_trace_callback(None)
+        return len(statements), time.perf_counter() - start
+
+    legacy = Recorder()
+    legacy_queries, legacy_s = run(lambda: legacy_deliver(store, chat.id, human, set(), legacy))
+    planned = Recorder()
+    service = store.service(planned)
+    planned_queries, planned_s = run(lambda: service._deliver_to_agents(chat.id, human, "hi"))
+
+    print("\n[Performance Test] one message to a 50-agent group")
+    print(f"  serial per-recipient: {legacy_queries} SQL statements, {legacy_s * 1000:.1f}ms")
+    print(f"  bulk plan:            {planned_queries} SQL statements, {planned_s * 1000:.1f}ms")
+
+    assert sorted(planned.delivered) == sorted(legacy.delivered) and len(planned.delivered) == 45
+    assert planned_queries * 10 < legacy_queries
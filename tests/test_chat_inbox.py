@@ -0,0 +1,245 @@
+"""Tests for the materialized chat inbox (chat_inbox) behind ChatService.list_chats_for_entity."""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+import time
+import uuid
+
+import pytest
+
+from backend.web.services.chat_service import ChatService
+from backend.web.utils.serializers import avatar_url
+from storage.contracts import ChatMessageRow, ChatRow, EntityRow, MemberRow, MemberType
+from storage.providers.sqlite.chat_repo import SQLiteChatEntityRepo, SQLiteChatMessageRepo, SQLiteChatRepo
+from storage.providers.sqlite.entity_repo import SQLiteEntityRepo
+from storage.providers.sqlite.member_repo import SQLiteMemberRepo
+
+
+class Store:
+    def __init__(self, root):
+        self.root = root
+        self.members = SQLiteMemberRepo(root / "leon.db")
+        self.entities = SQLiteEntityRepo(root / "leon.db")
+        self.open_chat_repos()
+
+    def open_chat_repos(self):
+        chat_db = self.root / "chat.db"
+        self.chats = SQLiteChatRepo(chat_db)
+        self.chat_entities = SQLiteChatEntityRepo(chat_db)
+        self.messages = SQLiteChatMessageRepo(chat_db)
+        self.service = ChatService(self.chats, self.chat_entities, self.messages, self.entities, self.members)
+
+    def close_chat_repos(self):
+        for repo in (self.chats, self.chat_entities, self.messages):
+            repo.close()
+
+    def add_entity(self, name: str, avatar: bool = False) -> str:
+        member_id = f"m_{name}"
+        avatar_path = "a.png" if avatar else None
+        self.members.create(
+            MemberRow(id=member_id, name=name, type=MemberType.HUMAN, avatar=avatar_path, created_at=1.0)
+        )
+        entity_id = f"e_{name}"
+        self.entities.create(EntityRow(id=entity_id, type="human", member_id=member_id, name=name, created_at=1.0))
+        return entity_id
+
+    def message(self, chat_id: str, sender: str, content: str, at: float, mentions: list[str] | None = None):
+        self.messages.create(
+            ChatMessageRow(
+                id=str(uuid.uuid4()), chat_id=chat_id, sender_entity_id=sender,
+                content=content, mentioned_entity_ids=mentions or [], created_at=at,
+            )
+        )
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = Store(tmp_path)
+    yield s
+    s.close_chat_repos()
+    s.members.close()
+    s.entities.close()
+
+
+def legacy_list_chats(s: Store, entity_id: str) -> list[dict]:
+    """The per-chat cascade list_chats_for_entity used before chat_inbox."""
+    result = []
+    for cid in s.chat_entities.list_chats_for_entity(entity_id):
+        chat = s.chats.get_by_id(cid)
+        if not chat or chat.status != "active":
+            continue
+        entities_info = []
+        for p in s.chat_entities.list_entities(cid):
+            e = s.entities.get_by_id(p.entity_id)
+            if e:
+                m = s.members.get_by_id(e.member_id)
+                entities_info.append(
+                    {
+                        "id": e.id,
+                        "name": e.name,
+                        "type": e.type,
+                        "avatar_url": avatar_url(e.member_id, bool(m.avatar if m else None)),
+                    }
+                )
+        msgs = s.messages.list_by_chat(cid, limit=1)
+        last_msg = None
+        if msgs:
+            sender = s.entities.get_by_id(msgs[0].sender_entity_id)
+            last_msg = {
+                "content": msgs[0].content,
+                "sender_name": sender.name if sender else "unknown",
+                "created_at": msgs[0].created_at,
+            }
+        result.append({
+            "id": cid,
+            "title": chat.title,
+            "status": chat.status,
+            "created_at": chat.created_at,
+            "entities": entities_info,
+            "last_message": last_msg,
+            "unread_count": s.messages.count_unread(cid, entity_id),
+            "has_mention": s.messages.has_unread_mention(cid, entity_id),
+        })
+    return result
+
+
+def _by_id(chats: list[dict]) -> dict[str, dict]:
+    return {c["id"]: c for c in chats}
+
+
+def test_inbox_tracks_messages_reads_and_mentions(store):
+    alice, bob, carol = store.add_entity("alice", avatar=True), store.add_entity("bob"), store.add_entity("carol")
+    direct = store.service.find_or_create_chat([alice, bob], title="direct").id
+    group = store.service.create_group_chat([alice, bob, carol], title="group").id
+
+    store.message(direct, bob, "hi alice", 10.0)
+    store.message(group, carol, "hey @alice", 11.0, mentions=[alice])
+    store.message(group, alice, "on it", 12.0)
+
+    inbox = store.service.list_chats_for_entity(alice)
+    assert [c["id"] for c in inbox] == [group, direct]  # most recent activity first
+    chats = _by_id(inbox)
+    assert chats[direct]["unread_count"] == 1 and not chats[direct]["has_mention"]
+    assert chats[group]["unread_count"] == 1 and chats[group]["has_mention"]
+    assert chats[group]["last_message"] == {"content": "on it", "sender_name": "alice", "created_at": 12.0}
+    assert chats[group]["entities"][0]["avatar_url"] == "/api/members/m_alice/avatar"
+
+    store.chat_entities.update_last_read(group, alice, 12.5)
+    chats = _by_id(store.service.list_chats_for_entity(alice))
+    assert chats[group]["unread_count"] == 0 and not chats[group]["has_mention"]
+    assert _by_id(store.service.list_chats_for_entity(bob))[group]["unread_count"] == 2
+
+    # Older than the reader's marker (clock skew): not unread, but still the newest message
+    store.message(group, bob, "late", 12.2)
+    chats = _by_id(store.service.list_chats_for_entity(alice))
+    assert chats[group]["unread_count"] == 0
+    assert chats[group]["last_message"]["content"] == "late"
+    # Older than the current last message: does not replace it
+    store.message(group, bob, "delayed", 11.5)
+    assert _by_id(store.service.list_chats_for_entity(bob))[group]["last_message"]["content"] == "late"
+
+    # Joining a chat with history: everything so far from others is unread
+    dave = store.add_entity("dave")
+    store.chat_entities.add_entity(group, dave, 13.0)
+    assert _by_id(store.service.list_chats_for_entity(dave))[group]["unread_count"] == 4
+
+    store.chats._conn.execute("UPDATE chats SET status = 'archived' WHERE id = ?", (direct,))
+    store.chats._conn.commit()
+    assert [c["id"] for c in store.service.list_chats_for_entity(alice)] == [group]
+
+
+def test_inbox_matches_legacy_cascade_on_random_history(store):
+    rng = random.Random(7)
+    people = [store.add_entity(f"p{i}", avatar=i % 3 == 0) for i in range(12)]
+    chat_ids = []
+    for n in range(25):
+        members = rng.sample(people, rng.randint(2, 6))
+        chat = (
+            store.service.create_group_chat(members, title=f"c{n}")
+            if len(members) > 2
+            else store.service.find_or_create_chat(members)
+        )
+        chat_ids.append((chat.id, members))
+    clock = 100.0
+    for _ in range(400):
+        chat_id, members = rng.choice(chat_ids)
+        clock += rng.random()
+        if rng.random() < 0.2:
+            store.chat_entities.update_last_read(chat_id, rng.choice(members), clock)
+        else:
+            mentions = rng.sample(members, rng.randint(0, 2))
+            store.message(chat_id, rng.choice(members), f"m{clock:.3f}", clock, mentions=mentions)
+
+    for person in people:
+        assert _by_id(store.service.list_chats_for_entity(person)) == _by_id(legacy_list_chats(store, person))
+
+
+def test_existing_chat_db_is_backfilled(store):
+    alice, bob = store.add_entity("alice"), store.add_entity("bob")
+    chat_id = store.service.find_or_create_chat([alice, bob]).id
+    store.message(chat_id, bob, "before the migration", 5.0, mentions=[alice])
+    store.message(chat_id, alice, "reply", 6.0)
+    store.chat_entities.update_last_read(chat_id, bob, 5.5)
+    expected = legacy_list_chats(store, alice) + legacy_list_chats(store, bob)
+    store.close_chat_repos()
+
+    conn = sqlite3.connect(store.root / "chat.db")
+    conn.execute("DROP TABLE chat_inbox")
+    conn.commit()
+    conn.close()
+
+    store.open_chat_repos()
+    actual = store.service.list_chats_for_entity(alice) + store.service.list_chats_for_entity(bob)
+    assert actual == expected
+    assert actual[0]["unread_count"] == 1 and actual[0]["has_mention"]
+    assert actual[1]["unread_count"] == 1 and not actual[1]["has_mention"]
+
+
+def test_inbox_scales_to_500_chats_with_20_participants(store):
+    """[Performance Test] inbox of an entity in 500 chats x 20 participants: per-chat cascade vs chat_inbox."""
+    viewer = store.add_entity("viewer")
+    pool = [store.add_entity(f"u{i}", avatar=i % 2 == 0) for i in range(60)]
+    rng = random.Random(1)
+    chat_conn, now = store.chats._conn, 1000.0
+    # Bulk-load the membership directly; the inbox rows then come from the same path add_entity uses
+    for n in range(500):
+        chat_id = f"chat-{n:03d}"
+        store.chats.create(ChatRow(id=chat_id, title=None, created_at=now + n))
+        for eid in [viewer, *rng.sample(pool, 19)]:
+            chat_conn.execute(
+                "INSERT INTO chat_entities (chat_id, entity_id, joined_at) VALUES (?, ?, ?)", (chat_id, eid, now)
+            )
+            chat_conn.execute("INSERT INTO chat_inbox (chat_id, entity_id) VALUES (?, ?)", (chat_id, eid))
+    chat_conn.commit()
+    for n in range(500):
+        for k in range(3):
+            mentions = [viewer] if k == 2 and n % 7 == 0 else None
+            store.message(f"chat-{n:03d}", pool[(n + k) % 60], f"msg {k}", now + n + k * 0.1, mentions=mentions)
+
+    repos = (store.members, store.entities, store.chats, store.chat_entities, store.messages)
+
+    def run(list_chats):
+        statements: list[str] = []
+        for repo in repos:
+            repo._conn.set_trace_callback(statements.append)
+        start = time.perf_counter()
+        try:
+            result = list_chats(viewer)
+        finally:
+            for repo in repos:
+                repo._conn.set_trace_callback(None)
+        return result, len(statements), time.perf_counter() - start
+
+    legacy, legacy_queries, legacy_s = run(lambda eid: legacy_list_chats(store, eid))
+    inbox, inbox_queries, inbox_s = run(store.service.list_chats_for_entity)
+
+    print("\n[Performance Test] inbox for an entity in 500 chats x 20 participants")
+    print(f"  per-chat cascade: {legacy_queries} SQL statements, {legacy_s * 1000:.0f}ms")
+    print(f"  chat_inbox:       {inbox_queries} SQL statements, {inbox_s * 1000:.1f}ms")
+
+    assert len(inbox) == 500
+    assert _by_id(inbox) == _by_id(legacy)
+    assert sum(c["has_mention"] for c in inbox) == len(range(0, 500, 7))
+    assert inbox_queries * 100 < legacy_queries
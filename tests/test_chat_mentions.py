@@ -0,0 +1,195 @@
+"""Tests for the normalized mentions table (chat_message_mentions)."""
+
+from __future__ import annotations
+
+import json
+import random
+import sqlite3
+import time
+import uuid
+
+import pytest
+
+from storage.contracts import ChatMessageRow
+from storage.providers.sqlite.chat_repo import SQLiteChatEntityRepo, SQLiteChatMessageRepo
+
+
+class Chats:
+    def __init__(self, db_path):
+        self.entities = SQLiteChatEntityRepo(db_path)
+        self.messages = SQLiteChatMessageRepo(db_path)
+
+    def close(self):
+        self.messages.close()
+        self.entities.close()
+
+    def send(self, chat_id: str, sender: str, at: float, mentions: list[str] | None = None) -> str:
+        msg_id = str(uuid.uuid4())
+        self.messages.create(
+            ChatMessageRow(
+                id=msg_id, chat_id=chat_id, sender_entity_id=sender,
+                content=f"message at {at}", mentioned_entity_ids=mentions or [], created_at=at,
+            )
+        )
+        return msg_id
+
+
+@pytest.fixture
+def chats(tmp_path):
+    c = Chats(tmp_path / "chat.db")
+    yield c
+    c.close()
+
+
+def legacy_has_unread_mention(conn: sqlite3.Connection, chat_id: str, entity_id: str) -> bool:
+    """The JSON LIKE scan has_unread_mention used before chat_message_mentions."""
+    cursor_row = conn.execute(
+        "SELECT last_read_at FROM chat_entities WHERE chat_id = ? AND entity_id = ?", (chat_id, entity_id)
+    ).fetchone()
+    last_read = cursor_row[0] if cursor_row and cursor_row[0] is not None else -1
+    row = conn.execute(
+        "SELECT COUNT(*) FROM chat_messages WHERE chat_id = ? AND mentions LIKE ? AND sender_entity_id != ?"
+        " AND created_at > ?",
+        (chat_id, f'%"{entity_id}"%', entity_id, last_read),
+    ).fetchone()
+    return row[0] > 0
+
+
+def test_unread_mentions_across_chats(chats):
+    for chat_id in ("c1", "c2", "c3"):
+        for eid in ("alice", "bob", "carol"):
+            chats.entities.add_entity(chat_id, eid, 0.0)
+
+    chats.send("c1", "bob", 1.0, mentions=["alice"])
+    chats.send("c1", "carol", 2.0, mentions=["alice", "bob", "alice"])
+    chats.send("c2", "bob", 3.0, mentions=["alice"])
+    chats.send("c3", "alice", 4.0, mentions=["alice", "bob"])  # self-mention is never unread
+    chats.send("c3", "carol", 5.0)
+
+    assert chats.messages.count_unread_mentions("alice") == {"c1": 2, "c2": 1}
+    assert chats.messages.count_unread_mentions("bob") == {"c1": 1, "c3": 1}
+    assert [m.created_at for m in chats.messages.list_unread_mentions("alice")] == [3.0, 2.0, 1.0]
+    assert [m.created_at for m in chats.messages.list_unread_mentions("alice", limit=1)] == [3.0]
+    assert chats.messages.list_unread_mentions("alice")[1].mentioned_entity_ids == ["alice", "bob", "alice"]
+    assert not chats.messages.has_unread_mention("c3", "alice")
+
+    chats.entities.update_last_read("c1", "alice", 1.5)
+    assert chats.messages.count_unread_mentions("alice") == {"c1": 1, "c2": 1}
+    assert chats.messages.has_unread_mention("c1", "alice")
+    chats.entities.update_last_read("c1", "alice", 2.0)
+    assert not chats.messages.has_unread_mention("c1", "alice")
+    assert chats.messages.count_unread_mentions("alice") == {"c2": 1}
+
+    # Deleting a message drops its mentions
+    chats.messages._conn.execute("DELETE FROM chat_messages WHERE chat_id = 'c2'")
+    chats.messages._conn.commit()
+    assert chats.messages.list_unread_mentions("alice") == []
+    # Not a participant: no badge, even if mentioned
+    chats.send("c4", "bob", 6.0, mentions=["alice"])
+    assert chats.messages.count_unread_mentions("alice") == {}
+
+
+def test_matches_legacy_like_scan_on_random_history(chats):
+    rng = random.Random(11)
+    people = [f"e{i}" for i in range(8)] + ["e1x"]  # e1x: prefix collisions must not match e1
+    rooms = [f"c{i}" for i in range(6)]
+    for chat_id in rooms:
+        for eid in rng.sample(people, 5):
+            chats.entities.add_entity(chat_id, eid, 0.0)
+    for step in range(500):
+        chat_id = rng.choice(rooms)
+        if rng.random() < 0.15:
+            chats.entities.update_last_read(chat_id, rng.choice(people), float(step))
+        else:
+            chats.send(chat_id, rng.choice(people), float(step), mentions=rng.sample(people, rng.randint(0, 3)))
+
+    conn = chats.messages._conn
+    for chat_id in rooms:
+        for eid in people:
+            assert chats.messages.has_unread_mention(chat_id, eid) == legacy_has_unread_mention(conn, chat_id, eid)
+    for eid in people:
+        expected = {
+            c for c in rooms if chats.entities.is_entity_in_chat(c, eid) and legacy_has_unread_mention(conn, c, eid)
+        }
+        assert set(chats.messages.count_unread_mentions(eid)) == expected
+
+
+def test_existing_database_is_backfilled(tmp_path):
+    db_path = tmp_path / "chat.db"
+    chats = Chats(db_path)
+    chats.entities.add_entity("c1", "alice", 0.0)
+    chats.entities.add_entity("c1", "bob", 0.0)
+    chats.send("c1", "bob", 1.0, mentions=["alice"])
+    chats.send("c1", "alice", 2.0, mentions=["alice", "bob"])
+    chats.close()
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP TABLE chat_message_mentions")
+    conn.execute("DROP TABLE chat_inbox")  # inbox backfill reads the mentions table
+    conn.commit()
+    conn.close()
+
+    chats = Chats(db_path)
+    try:
+        assert chats.messages.count_unread_mentions("alice") == {"c1": 1}
+        assert chats.messages.count_unread_mentions("bob") == {"c1": 1}
+        assert chats.messages._conn.execute(
+            "SELECT unread_count, unread_mention FROM chat_inbox WHERE chat_id = 'c1' AND entity_id = 'alice'"
+        ).fetchone() == (1, 1)
+    finally:
+        chats.close()
+
+
+def test_mention_checks_use_the_index(chats):
+    """[Performance Test] unread-mention badges for 200 chats x 300 messages: JSON LIKE scan vs mentions index."""
+    entity = "agent-0"
+    team = [f"agent-{i}" for i in range(40)]
+    rng = random.Random(5)
+    rows = []
+    for c in range(200):
+        chat_id = f"chat-{c}"
+        for eid in team[:10] if c % 2 else team[::4]:
+            chats.entities.add_entity(chat_id, eid, 0.0)
+        for k in range(300):
+            mentions = rng.sample(team, 2) if k % 25 == 0 else []
+            sender = team[(c + k) % 40 or 1]
+            mentions_json = json.dumps(mentions) if mentions else None
+            rows.append((f"{chat_id}-{k}", chat_id, sender, f"m{k}", mentions_json, float(k)))
+    conn = chats.messages._conn
+    conn.executemany(
+        "INSERT INTO chat_messages (id, chat_id, sender_entity_id, content, mentions, created_at)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.executemany(
+        "INSERT INTO chat_message_mentions (message_id, chat_id, entity_id, created_at) VALUES (?, ?, ?, ?)",
+        [(r[0], r[1], eid, r[5]) for r in rows if r[4] for eid in json.loads(r[4]) if eid != r[2]],
+    )
+    conn.commit()
+    chat_ids = chats.entities.list_chats_for_entity(entity)
+
+    def run(query):
+        # SQLite VM instructions executed (in units of 100): machine-independent work, unlike wall-clock time
+        steps = [0]
+        conn.set_progress_handler(lambda: steps.__setitem__(0, steps[0] + 1), 100)
+        start = time.perf_counter()
+        try:
+            result = query()
+        finally:
+            conn.set_progress_handler(None, 0)
+        return result, steps[0], time.perf_counter() - start
+
+    legacy, legacy_steps, legacy_s = run(lambda: {c for c in chat_ids if legacy_has_unread_mention(conn, c, entity)})
+    per_chat, per_chat_steps, per_chat_s = run(
+        lambda: {c for c in chat_ids if chats.messages.has_unread_mention(c, entity)}
+    )
+    badges, bulk_steps, bulk_s = run(lambda: chats.messages.count_unread_mentions(entity))
+
+    print(f"\n[Performance Test] unread-mention badges for one entity in {len(chat_ids)} chats x 300 messages")
+    print(f"  JSON LIKE per chat:      {legacy_steps / 10:.1f}k VM steps, {legacy_s * 1000:.1f}ms")
+    print(f"  mentions index per chat: {per_chat_steps / 10:.1f}k VM steps, {per_chat_s * 1000:.1f}ms")
+    print(f"  count_unread_mentions:   {bulk_steps / 10:.1f}k VM steps, {bulk_s * 1000:.2f}ms")
+
+    assert legacy and per_chat == legacy == set(badges)
+    assert per_chat_steps * 10 < legacy_steps
+    assert bulk_steps * 10 < legacy_steps
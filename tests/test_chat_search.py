@@ -0,0 +1,217 @@
+"""Tests for FTS5 trigram chat message search (chat_messages_fts) and the chat_search tool."""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+import time
+import uuid
+
+import pytest
+
+from core.agents.communication.chat_tool_service import ChatToolService
+from core.runtime.registry import ToolRegistry
+from storage.contracts import ChatMessageRow, EntityRow
+from storage.providers.sqlite.chat_repo import SQLiteChatEntityRepo, SQLiteChatMessageRepo
+from storage.providers.sqlite.entity_repo import SQLiteEntityRepo
+
+
+@pytest.fixture
+def messages(tmp_path):
+    repo = SQLiteChatMessageRepo(tmp_path / "chat.db")
+    yield repo
+    repo.close()
+
+
+def _send(repo: SQLiteChatMessageRepo, chat_id: str, sender: str, content: str, at: float) -> str:
+    msg_id = str(uuid.uuid4())
+    repo.create(ChatMessageRow(id=msg_id, chat_id=chat_id, sender_entity_id=sender, content=content, created_at=at))
+    return msg_id
+
+
+def _contents(rows) -> list[str]:
+    return [r.content for r in rows]
+
+
+def test_substring_and_cjk_matches_with_snippets(messages):
+    _send(messages, "c1", "alice", "Deploy the staging cluster tonight", 1.0)
+    _send(messages, "c1", "bob", "明天下午三点开会讨论部署方案", 2.0)
+    _send(messages, "c2", "bob", "staging is green, deploying prod", 3.0)
+    _send(messages, "c2", "alice", "100% done_ok", 4.0)
+
+    assert messages._fts
+    assert _contents(messages.search("STAGING")) == [
+        "Deploy the staging cluster tonight",
+        "staging is green, deploying prod",
+    ]
+    assert _contents(messages.search("tag")) == _contents(messages.search("staging"))  # substring, not word match
+    assert _contents(messages.search("部署方案")) == ["明天下午三点开会讨论部署方案"]
+
+    (hit,) = messages.search_ranked("部署方案")
+    assert hit.snippet == "明天下午三点开会讨论[部署方案]"
+    assert hit.score < 0
+    assert messages.search_ranked("stag")[0].snippet.count("[") == 1
+
+    # Queries are literal phrases, never FTS5 syntax
+    assert _contents(messages.search('staging" OR "x')) == []
+    assert _contents(messages.search("% done_")) == ["100% done_ok"]
+    assert messages.search("   ") == []
+
+
+def test_filters_by_chat_sender_and_time(messages):
+    for i in range(6):
+        _send(messages, f"c{i % 2}", "alice" if i < 3 else "bob", f"release note {i}", float(i))
+
+    assert _contents(messages.search("release", chat_id="c0")) == ["release note 0", "release note 2", "release note 4"]
+    assert _contents(messages.search("release", sender_entity_id="bob")) == [
+        "release note 3",
+        "release note 4",
+        "release note 5",
+    ]
+    assert _contents(messages.search("release", after=2.0, before=4.0)) == [
+        "release note 2",
+        "release note 3",
+        "release note 4",
+    ]
+    assert _contents(messages.search("release", chat_id="c1", sender_entity_id="alice", after=1.0)) == [
+        "release note 1"
+    ]
+    assert len(messages.search("release", limit=2)) == 2
+    # Equal bm25 scores: newest first
+    assert [h.message.content for h in messages.search_ranked("note", limit=2)] == ["release note 5", "release note 4"]
+
+
+def test_ranking_prefers_denser_matches(messages):
+    _send(messages, "c1", "a", "a long message about many things that mentions rollback once in passing", 1.0)
+    _send(messages, "c1", "a", "rollback rollback", 2.0)
+    ranked = messages.search_ranked("rollback")
+    assert [h.message.content for h in ranked][0] == "rollback rollback"
+    assert ranked[0].score <= ranked[1].score
+
+
+def test_triggers_follow_updates_and_deletes(messages):
+    msg_id = _send(messages, "c1", "alice", "original wording", 1.0)
+    conn = messages._conn
+    conn.execute("UPDATE chat_messages SET content = 'revised phrasing' WHERE id = ?", (msg_id,))
+    conn.commit()
+    assert messages.search("original") == []
+    assert _contents(messages.search("phrasing")) == ["revised phrasing"]
+
+    conn.execute("DELETE FROM chat_messages WHERE id = ?", (msg_id,))
+    conn.commit()
+    assert messages.search("phrasing") == []
+    assert conn.execute("INSERT INTO chat_messages_fts(chat_messages_fts) VALUES ('integrity-check')")
+
+
+def test_short_queries_fall_back_to_like(messages):
+    _send(messages, "c1", "alice", "ok 好的", 1.0)
+    _send(messages, "c1", "bob", "nothing here", 2.0)
+    assert _contents(messages.search("好")) == ["ok 好的"]
+    assert _contents(messages.search("OK", sender_entity_id="alice")) == ["ok 好的"]
+    (hit,) = messages.search_ranked("好的")
+    assert (hit.snippet, hit.score) == ("ok [好的]", 0.0)
+
+
+def test_existing_database_is_backfilled(tmp_path):
+    db_path = tmp_path / "chat.db"
+    repo = SQLiteChatMessageRepo(db_path)
+    _send(repo, "c1", "alice", "written before the index existed", 1.0)
+    repo.close()
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP TABLE chat_messages_fts")
+    for suffix in ("ai", "ad", "au"):
+        conn.execute(f"DROP TRIGGER chat_messages_fts_{suffix}")
+    conn.commit()
+    conn.close()
+
+    repo = SQLiteChatMessageRepo(db_path)
+    try:
+        assert _contents(repo.search("before the index")) == ["written before the index existed"]
+        _send(repo, "c1", "bob", "and one after the index", 2.0)
+        assert _contents(repo.search("the index")) == ["written before the index existed", "and one after the index"]
+    finally:
+        repo.close()
+
+
+def test_chat_search_tool_filters_and_shows_snippets(tmp_path):
+    entities = SQLiteEntityRepo(tmp_path / "leon.db")
+    chat_entities = SQLiteChatEntityRepo(tmp_path / "chat.db")
+    messages = SQLiteChatMessageRepo(tmp_path / "chat.db")
+    try:
+        for name in ("me", "alice", "bob"):
+            entities.create(EntityRow(id=f"e_{name}", type="human", member_id=f"m_{name}", name=name, created_at=1.0))
+        for chat_id, other in (("c_alice", "e_alice"), ("c_bob", "e_bob")):
+            chat_entities.add_entity(chat_id, "e_me", 0.0)
+            chat_entities.add_entity(chat_id, other, 0.0)
+        now = time.time()
+        _send(messages, "c_alice", "e_alice", "the invoice is attached", now - 3 * 86400)
+        _send(messages, "c_alice", "e_me", "thanks, invoice received", now - 60)
+        _send(messages, "c_bob", "e_bob", "where is the invoice?", now - 30)
+
+        registry = ToolRegistry()
+        ChatToolService(
+            registry, "e_me", "e_owner",
+            entity_repo=entities, chat_entity_repo=chat_entities, chat_message_repo=messages,
+        )
+        search = registry.get("chat_search").handler
+
+        assert search("invoice").splitlines()[-1].startswith("[")
+        assert sorted(search("invoice", entity_id="e_alice").splitlines()) == [
+            "[alice] the [invoice] is attached",
+            "[me] thanks, [invoice] received",
+        ]
+        assert search("invoice", chat_id="c_bob") == "[bob] where is the [invoice]?"
+        assert search("invoice", sender_id="e_alice") == "[alice] the [invoice] is attached"
+        assert search("invoice", range="-1d:").count("\n") == 1
+        assert "time range" in search("invoice", range="-5:")
+        assert search("receipt") == "No messages matching 'receipt'."
+    finally:
+        messages.close()
+        chat_entities.close()
+        entities.close()
+
+
+def test_fts_search_scales_past_like_scan(messages):
+    """[Performance Test] rare-term search over 100k messages: LIKE scan vs FTS5 trigram index."""
+    rng = random.Random(3)
+    words = ["deploy", "review", "lunch", "meeting", "ticket", "build", "进度", "周会", "测试", "上线"]
+    rows = [
+        (f"m{i}", f"c{i % 50}", f"e{i % 7}", " ".join(rng.choice(words) for _ in range(12)), None, float(i))
+        for i in range(100_000)
+    ]
+    rare = {1234: "kubernetes upgrade", 55_555: "kubernetes rollback", 98_765: "kubernetes 升级"}
+    for i, content in rare.items():
+        rows[i] = (*rows[i][:3], content, None, rows[i][5])
+    conn = messages._conn
+    conn.executemany(
+        "INSERT INTO chat_messages (id, chat_id, sender_entity_id, content, mentions, created_at)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+
+    def run(query):
+        # SQLite VM instructions executed (in units of 1000): machine-independent work, unlike wall-clock time
+        steps = [0]
+        conn.set_progress_handler(lambda: steps.__setitem__(0, steps[0] + 1), 1000)
+        start = time.perf_counter()
+        try:
+            result = query()
+        finally:
+            conn.set_progress_handler(None, 0)
+        return result, steps[0], time.perf_counter() - start
+
+    like, like_steps, like_s = run(
+        lambda: conn.execute(
+            "SELECT content FROM chat_messages WHERE content LIKE ? ORDER BY created_at", ("%kubernetes%",)
+        ).fetchall()
+    )
+    hits, fts_steps, fts_s = run(lambda: messages.search_ranked("kubernetes"))
+
+    print("\n[Performance Test] rare-term search over 100k messages")
+    print(f"  LIKE scan: {like_steps}k VM steps, {like_s * 1000:.1f}ms")
+    print(f"  FTS5:      {fts_steps}k VM steps, {fts_s * 1000:.2f}ms")
+
+    assert sorted(h.message.content for h in hits) == sorted(r[0] for r in like) == sorted(rare.values())
+    assert fts_steps * 50 < like_steps
@@ -0,0 +1,397 @@
+"""Tests for DockerProvider's Engine API transport against a fake Unix-socket daemon."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import posixpath
+import socketserver
+import stat
+import struct
+import tarfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from sandbox.providers.docker import DockerProvider
+from sandbox.providers.docker_engine import DockerEngineClient, socket_path_from_host
+
+
+class FakeDaemon:
+    """Just enough of the Engine API: containers, exec of a few shell commands, archives, stats."""
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.containers: dict[str, dict] = {}
+        self.execs: dict[str, dict] = {}
+        self.images = {"python:3.12-slim"}
+        self.connections = 0
+        self.requests: list[tuple[str, str]] = []
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                daemon.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def address_string(self):
+                return "fake-docker"
+
+            def _reply(self, status: int, body: bytes = b"", content_type="application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:  # the client may already be gone after an empty reply
+                    self.wfile.write(body)
+
+            def _json(self, status: int, data):
+                self._reply(status, json.dumps(data).encode())
+
+            def _handle(self):
+                url = urlparse(self.path)
+                path = url.path.split("/", 2)[2]  # strip /v1.41
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                daemon.requests.append((self.command, "/" + path))
+                result = daemon.route(self.command, "/" + path, query, body)
+                if result[0] == "stream":
+                    # Exec attach: raw frames, then the daemon hangs up
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/vnd.docker.raw-stream")
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    self.wfile.write(result[1])
+                    self.close_connection = True
+                    return
+                status, payload = result
+                if isinstance(payload, bytes):
+                    self._reply(status, payload, "application/x-tar")
+                elif payload is None:
+                    self._reply(status)
+                else:
+                    self._json(status, payload)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle  # noqa: N815
+
+        class Server(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+
+        self.server = Server(socket_path, Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # ── API ────────────────────────────────────────────────────────────────
+
+    def route(self, method: str, path: str, query: dict, body: bytes):
+        parts = path.strip("/").split("/")
+        if path == "/containers/create":
+            spec = json.loads(body)
+            if spec["Image"] not in self.images:
+                return 404, {"message": f"No such image: {spec['Image']}"}
+            cid = uuid.uuid4().hex
+            self.containers[cid] = {
+                "name": query["name"],
+                "labels": spec["Labels"],
+                "state": "created",
+                "files": {},
+                "owners": {},
+                "workdir": spec["WorkingDir"],
+            }
+            return 201, {"Id": cid}
+        if path == "/images/create":
+            self.images.add(f"{query['fromImage']}:{query['tag']}")
+            return 200, b'{"status":"Pulling"}\n{"status":"Done"}\n'
+        if path == "/containers/json":
+            filters = json.loads(query.get("filters", "{}"))
+            out = []
+            for cid, c in self.containers.items():
+                labels = [f"{k}={v}" for k, v in c["labels"].items()] + list(c["labels"])
+                if any(f not in labels for f in filters.get("label", [])):
+                    continue
+                if filters.get("id") and cid not in filters["id"]:
+                    continue
+                out.append(
+                    {
+                        "Id": cid,
+                        "Labels": c["labels"],
+                        "State": c["state"],
+                        "SizeRw": sum(len(d) for d in c["files"].values()),
+                    }
+                )
+            return 200, out
+        if parts[0] == "containers":
+            c = self.containers.get(parts[1])
+            if c is None:
+                return 404, {"message": f"No such container: {parts[1]}"}
+            action = parts[2] if len(parts) > 2 else None
+            if method == "DELETE":
+                del self.containers[parts[1]]
+                return 204, None
+            if action == "start":
+                c["state"] = "running"
+                return 204, None
+            if action in ("pause", "unpause"):
+                c["state"] = "paused" if action == "pause" else "running"
+                return 204, None
+            if action == "json":
+                return 200, {"Id": parts[1], "State": {"Status": c["state"]}}
+            if action == "stats":
+                return 200, {
+                    "cpu_stats": {"cpu_usage": {"total_usage": 400}, "system_cpu_usage": 2000, "online_cpus": 2},
+                    "precpu_stats": {"cpu_usage": {"total_usage": 200}, "system_cpu_usage": 1000},
+                    "memory_stats": {"usage": 80 * 1024 * 1024, "stats": {"inactive_file": 16 * 1024 * 1024}},
+                }
+            if action == "exec":
+                exec_id = uuid.uuid4().hex
+                self.execs[exec_id] = {"container": c, "spec": json.loads(body), "exit": None}
+                return 201, {"Id": exec_id}
+            if action == "archive":
+                return self._archive(c, method, query["path"], body)
+        if parts[0] == "exec":
+            ex = self.execs[parts[1]]
+            if parts[2] == "start":
+                code, out, err = self._run(ex["container"], ex["spec"]["Cmd"])
+                ex["exit"] = code
+                frames = b""
+                if out:
+                    frames += struct.pack(">BxxxL", 1, len(out)) + out
+                if err:
+                    frames += struct.pack(">BxxxL", 2, len(err)) + err
+                return "stream", frames
+            return 200, {"ExitCode": ex["exit"], "Running": False}
+        return 404, {"message": f"page not found: {path}"}
+
+    def _archive(self, c: dict, method: str, path: str, body: bytes):
+        if method == "PUT":
+            with tarfile.open(fileobj=io.BytesIO(body)) as tar:
+                for member in tar.getmembers():
+                    if member.isfile():
+                        target = posixpath.join(path, member.name)
+                        c["files"][target] = tar.extractfile(member).read()
+                        c["owners"][target] = (member.uid, member.gid, member.mode)
+            return 200, None
+        if path not in c["files"]:
+            return 404, {"message": f"Could not find the file {path} in container"}
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w") as tar:
+            info = tarfile.TarInfo(posixpath.basename(path))
+            info.size = len(c["files"][path])
+            tar.addfile(info, io.BytesIO(c["files"][path]))
+        return 200, buf.getvalue()
+
+    def _run(self, c: dict, cmd: list[str]) -> tuple[int, bytes, bytes]:
+        if cmd == ["df", "-BG", "/"]:
+            return 0, b"Filesystem 1G-blocks Used Available Use% Mounted on\noverlay 100G 3G 97G 3% /\n", b""
+        if "stat -L -c" in " ".join(cmd):  # owner lookup before write_file; the container runs as 1000:1000
+            uid, gid, mode = c["owners"].get(cmd[-1], (1000, 1000, None))
+            return 0, (f"{uid} {gid} {mode:o}" if mode is not None else f"{uid} {gid}").encode(), b""
+        script = cmd[-1]
+        if "ls -A1" in script:  # list_dir
+            directory = script.split("cd ", 1)[1].split(" ", 1)[0].strip("'")
+            rows = [
+                f"file\t{len(data)}\t{posixpath.basename(p)}"
+                for p, data in sorted(c["files"].items())
+                if posixpath.dirname(p) == directory
+            ]
+            return 0, ("\n".join(rows) + "\n").encode(), b""
+        command = script.split(" && ", 1)[1]
+        if command.startswith("echo "):
+            return 0, command[5:].encode() + b"\n", b""
+        return 127, b"", f"sh: {command}: not found\n".encode()
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    # AF_UNIX paths are length-limited; pytest's tmp_path can exceed it
+    sock = f"/tmp/leon-fake-docker-{uuid.uuid4().hex[:8]}.sock"
+    fake = FakeDaemon(sock)
+    yield fake
+    fake.close()
+    os.unlink(sock)
+
+
+def _provider(daemon: FakeDaemon, **kwargs) -> DockerProvider:
+    return DockerProvider(
+        image="python:3.12-slim", docker_host=f"unix://{daemon.socket_path}", transport="api", **kwargs
+    )
+
+
+def test_socket_path_and_transport_validation():
+    assert socket_path_from_host("unix:///run/docker.sock") == "/run/docker.sock"
+    with pytest.raises(ValueError):
+        socket_path_from_host("tcp://127.0.0.1:2375")
+    with pytest.raises(ValueError):
+        DockerProvider(image="x", transport="ssh")
+
+
+def test_session_lifecycle_over_api(daemon):
+    provider = _provider(daemon)
+    info = provider.create_session(context_id="ctx-1")
+    assert info.status == "running"
+    assert provider.get_session_status(info.session_id) == "running"
+
+    assert provider.pause_session(info.session_id)
+    assert provider.get_session_status(info.session_id) == "paused"
+    assert provider.resume_session(info.session_id)
+
+    # A fresh provider finds the container through its session label
+    other = _provider(daemon)
+    assert other.get_session_status(info.session_id) == "running"
+    container = next(iter(daemon.containers.values()))
+    assert container["labels"] == {"leon.session_id": info.session_id, "leon.context_id": "ctx-1"}
+
+    assert provider.destroy_session(info.session_id)
+    assert other.get_session_status(info.session_id) == "deleted"
+    provider.close()
+    other.close()
+
+
+def test_missing_image_is_pulled(daemon):
+    provider = DockerProvider(image="alpine:3.20", docker_host=f"unix://{daemon.socket_path}", transport="api")
+    provider.create_session()
+    assert ("POST", "/images/create") in daemon.requests
+    assert "alpine:3.20" in daemon.images
+
+
+def test_files_exec_and_metrics_over_api(daemon, tmp_path):
+    provider = _provider(daemon)
+    sid = provider.create_session().session_id
+
+    assert provider.write_file(sid, "notes/todo.txt", "héllo\n") == "Written: notes/todo.txt"
+    assert provider.read_file(sid, "/workspace/notes/todo.txt") == "héllo\n"
+    with pytest.raises(OSError):
+        provider.read_file(sid, "missing.txt")
+    assert provider.list_dir(sid, "/workspace/notes") == [{"name": "todo.txt", "type": "file", "size": 7}]
+
+    result = provider.execute(sid, "echo hi")
+    assert (result.output, result.exit_code, result.error) == ("hi\n", 0, None)
+    result = provider.execute(sid, "nope")
+    assert result.exit_code == 127 and "not found" in result.error
+
+    local = tmp_path / "up.bin"
+    local.write_bytes(b"\x00\x01payload")
+    provider.upload(sid, str(local), "/workspace/up.bin")
+    provider.download(sid, "/workspace/up.bin", str(tmp_path / "down.bin"))
+    assert (tmp_path / "down.bin").read_bytes() == b"\x00\x01payload"
+
+    metrics = provider.get_metrics(sid)
+    assert metrics.cpu_percent == 40.0  # 200/1000 * 2 cpus * 100
+    assert metrics.memory_used_mb == 64.0
+    assert metrics.disk_used_gb == 3.0
+
+    provider.pause_session(sid)
+    paused = provider.get_metrics(sid)
+    assert paused.cpu_percent is None and paused.disk_used_gb > 0
+
+
+def test_write_file_keeps_owner_and_mode(daemon):
+    provider = _provider(daemon)
+    sid = provider.create_session().session_id
+    container = next(iter(daemon.containers.values()))
+
+    provider.write_file(sid, "new.txt", "x")
+    assert container["owners"]["/workspace/new.txt"] == (1000, 1000, 0o644)
+
+    container["owners"]["/workspace/run.sh"] = (1001, 1002, 0o755)
+    provider.write_file(sid, "run.sh", "#!/bin/sh\necho hi\n")
+    assert container["owners"]["/workspace/run.sh"] == (1001, 1002, 0o755)
+
+
+def test_bulk_metrics_over_api(daemon):
+    provider = _provider(daemon)
+    running = [provider.create_session().session_id for _ in range(3)]
+    paused = provider.create_session().session_id
+    provider.write_file(paused, "big.bin", "x" * 2048)
+    provider.pause_session(paused)
+    daemon.requests.clear()
+
+    results = provider.get_metrics_bulk([*running, paused, "leon-gone"])
+    assert all(results[sid].cpu_percent == 40.0 and results[sid].memory_used_mb == 64.0 for sid in running)
+    assert results[paused].cpu_percent is None
+    assert results[paused].disk_used_gb == 2048 / 1024**3
+    assert results["leon-gone"] is None
+    # One listing for every container, then one stats read per running container
+    assert daemon.requests.count(("GET", "/containers/json")) == 1
+    assert sum(1 for _, path in daemon.requests if path.endswith("/stats")) == 3
+    assert not any("/exec" in path for _, path in daemon.requests)
+
+
+def test_requests_reuse_pooled_connections(daemon):
+    provider = _provider(daemon)
+    sid = provider.create_session().session_id
+    provider.write_file(sid, "a.txt", "a")
+    before = daemon.connections
+    for _ in range(20):
+        provider.read_file(sid, "a.txt")
+        provider.get_session_status(sid)
+    assert daemon.connections == before  # 40 requests, no new connections
+
+    # Exec streams end with the daemon hanging up, so only those open fresh connections
+    provider.execute(sid, "echo x")
+    assert daemon.connections == before + 1
+
+
+def test_stale_pooled_connection_is_retried(daemon):
+    client = DockerEngineClient(daemon.socket_path)
+    assert client.call("GET", "/containers/json", query={"all": "true"}) == []
+    # Daemon restarts: the pooled keep-alive socket is dead
+    for conn in client._idle:
+        conn.sock.close()
+    assert client.call("GET", "/containers/json", query={"all": "true"}) == []
+    client.close()
+
+
+def test_api_transport_beats_cli_subprocesses(daemon, tmp_path, monkeypatch):
+    """[Performance Test] 50 read_file calls: docker CLI subprocess per call vs pooled Engine API."""
+    calls = 50
+    workspace = tmp_path / "container"
+    workspace.mkdir()
+    (workspace / "a.txt").write_text("x" * 1024)
+
+    # Stand-in docker CLI: `docker exec <id> cat <path>` serves files from a local directory
+    fake_docker = tmp_path / "bin" / "docker"
+    fake_docker.parent.mkdir()
+    fake_docker.write_text(f'#!/bin/sh\nexec cat "{workspace}/$(basename "$4")"\n')
+    fake_docker.chmod(fake_docker.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{fake_docker.parent}{os.pathsep}{os.environ['PATH']}")
+
+    cli = DockerProvider(image="python:3.12-slim")
+    cli._sessions["s"] = "cid"
+    api = _provider(daemon)
+    sid = api.create_session().session_id
+    api.write_file(sid, "a.txt", "x" * 1024)
+
+    def timed(provider: DockerProvider, session_id: str) -> float:
+        start = time.perf_counter()
+        for _ in range(calls):
+            assert len(provider.read_file(session_id, "a.txt")) == 1024
+        return (time.perf_counter() - start) / calls * 1000
+
+    cli_ms = timed(cli, "s")
+    connections = daemon.connections
+    daemon.requests.clear()
+    api_ms = timed(api, sid)
+
+    print(f"\n[Performance Test] read_file latency over {calls} calls")
+    print(f"  docker CLI subprocess: {cli_ms:.2f}ms/call")
+    print(f"  Engine API (pooled):   {api_ms:.2f}ms/call")
+
+    # One archive request per read, all over the already-open pooled connection
+    assert len(daemon.requests) == calls
+    assert daemon.connections == connections
@@ -0,0 +1,274 @@
+"""Tests for cross-process event fan-out via the Unix-socket broker."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from backend.web.services.chat_events import ChatEventBus
+from backend.web.services.event_broker import EventBrokerClient, EventBrokerServer, thread_topic
+from backend.web.services.streaming_service import get_or_create_thread_buffer
+
+
+def _event(seq: int, content: str) -> dict:
+    return {"event": "text", "data": json.dumps({"content": content, "_seq": seq})}
+
+
+async def _settle() -> None:
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture()
+def socket_path(tmp_path):
+    # Unix socket paths are length-limited; keep it short.
+    return tmp_path / "b.sock"
+
+
+def test_thread_buffers_fan_out_between_workers(socket_path):
+    async def _run():
+        server = EventBrokerServer(socket_path)
+        await server.start()
+        worker_a = EventBrokerClient(socket_path)
+        worker_b = EventBrokerClient(socket_path)
+        await worker_a.connect()
+        await worker_b.connect()
+        try:
+            app_a = SimpleNamespace(
+                state=SimpleNamespace(thread_event_buffers={}, thread_fanout_unsubs={}, event_fanout=worker_a)
+            )
+            app_b = SimpleNamespace(
+                state=SimpleNamespace(thread_event_buffers={}, thread_fanout_unsubs={}, event_fanout=worker_b)
+            )
+            buf_a = get_or_create_thread_buffer(app_a, "t-1")
+            buf_b = get_or_create_thread_buffer(app_b, "t-1")
+            await _settle()
+
+            await buf_a.put(_event(1, "hello"))
+            await buf_a.put({"event": "display_delta", "data": "{}"})
+            await buf_a.put(_event(2, "world"))
+            events, cursor = await buf_b.read_with_timeout(0, timeout=1)
+            while cursor < 3:
+                more, cursor = await buf_b.read_with_timeout(cursor, timeout=1)
+                events += more
+            assert [e["event"] for e in events] == ["text", "display_delta", "text"]
+            # Publisher is not echoed back to itself.
+            assert buf_a.total_count == 3
+        finally:
+            await worker_a.close()
+            await worker_b.close()
+            await server.stop()
+
+    asyncio.run(_run())
+
+
+def test_client_drops_stale_seq(socket_path):
+    async def _run():
+        server = EventBrokerServer(socket_path)
+        await server.start()
+        publisher = EventBrokerClient(socket_path)
+        subscriber = EventBrokerClient(socket_path)
+        await publisher.connect()
+        await subscriber.connect()
+        received: list[dict] = []
+        try:
+            subscriber.subscribe(thread_topic("t-2"), received.append)
+            await _settle()
+            for seq in (5, 6, 6, 4, 7):
+                publisher.publish(thread_topic("t-2"), _event(seq, str(seq)))
+            await _settle()
+            assert [json.loads(e["data"])["_seq"] for e in received] == [5, 6, 7]
+        finally:
+            await publisher.close()
+            await subscriber.close()
+            await server.stop()
+
+    asyncio.run(_run())
+
+
+def test_lower_seq_from_another_worker_is_delivered(socket_path):
+    async def _run():
+        server = EventBrokerServer(socket_path)
+        await server.start()
+        worker_a = EventBrokerClient(socket_path)
+        worker_b = EventBrokerClient(socket_path)
+        subscriber = EventBrokerClient(socket_path)
+        for client in (worker_a, worker_b, subscriber):
+            await client.connect()
+        received: list[dict] = []
+        try:
+            subscriber.subscribe(thread_topic("t-3"), received.append)
+            await _settle()
+            # Each worker hands out seqs from its own reserved block.
+            worker_b.publish(thread_topic("t-3"), _event(257, "b"))
+            await _settle()
+            worker_a.publish(thread_topic("t-3"), _event(12, "a"))
+            await _settle()
+            assert [json.loads(e["data"])["content"] for e in received] == ["b", "a"]
+        finally:
+            for client in (worker_a, worker_b, subscriber):
+                await client.close()
+            await server.stop()
+
+    asyncio.run(_run())
+
+
+def test_events_over_default_stream_limit_are_relayed(socket_path):
+    async def _run():
+        server = EventBrokerServer(socket_path)
+        await server.start()
+        publisher = EventBrokerClient(socket_path)
+        subscriber = EventBrokerClient(socket_path)
+        await publisher.connect()
+        await subscriber.connect()
+        received: list[dict] = []
+        try:
+            subscriber.subscribe(thread_topic("t-4"), received.append)
+            await _settle()
+            big = "x" * (256 * 1024)
+            publisher.publish(thread_topic("t-4"), _event(1, big))
+            publisher.publish(thread_topic("t-4"), _event(2, "after"))
+            await _settle()
+            assert [json.loads(e["data"])["content"] for e in received] == [big, "after"]
+        finally:
+            await publisher.close()
+            await subscriber.close()
+            await server.stop()
+
+    asyncio.run(_run())
+
+
+def test_chat_event_bus_delivers_across_workers(socket_path):
+    async def _run():
+        server = EventBrokerServer(socket_path)
+        await server.start()
+        worker_a = EventBrokerClient(socket_path)
+        worker_b = EventBrokerClient(socket_path)
+        await worker_a.connect()
+        await worker_b.connect()
+        try:
+            bus_a = ChatEventBus(fanout=worker_a)
+            bus_b = ChatEventBus(fanout=worker_b)
+            local_q = bus_a.subscribe("c-1")
+            remote_q = bus_b.subscribe("c-1")
+            await _settle()
+
+            bus_a.publish("c-1", {"event": "message", "data": {"content": "hi"}})
+            assert (await asyncio.wait_for(local_q.get(), 1))["data"] == {"content": "hi"}
+            assert (await asyncio.wait_for(remote_q.get(), 1))["data"] == {"content": "hi"}
+            assert local_q.empty()
+
+            bus_b.unsubscribe("c-1", remote_q)
+            assert "chat:c-1" not in worker_b._handlers
+        finally:
+            await worker_a.close()
+            await worker_b.close()
+            await server.stop()
+
+    asyncio.run(_run())
+
+
+def test_connect_fails_loudly_without_broker(socket_path):
+    async def _run():
+        client = EventBrokerClient(socket_path)
+        with pytest.raises(RuntimeError, match="not reachable"):
+            await client.connect(timeout=0.2)
+
+    asyncio.run(_run())
+
+
+def test_reconnect_replay_is_not_republished(monkeypatch):
+    from backend.web.routers import threads
+    from backend.web.services import event_store
+
+    published = []
+    fanout = SimpleNamespace(
+        publish=lambda topic, event: published.append(event),
+        subscribe=lambda topic, cb: lambda: None,
+    )
+    app = SimpleNamespace(
+        state=SimpleNamespace(
+            thread_event_buffers={},
+            thread_fanout_unsubs={},
+            event_fanout=fanout,
+            auth_service=SimpleNamespace(verify_token=lambda token: {"member_id": "owner"}),
+            thread_repo=SimpleNamespace(get_by_id=lambda tid: {"member_id": "agent"}),
+            member_repo=SimpleNamespace(get_by_id=lambda mid: SimpleNamespace(owner_id="owner")),
+        )
+    )
+
+    async def latest_run_id(thread_id):
+        return "run-1"
+
+    async def events_after(thread_id, run_id, after):
+        return [
+            {"seq": 3, "event": "text", "data": json.dumps({"content": "a"})},
+            {"seq": 4, "event": "text", "data": "{}"},
+        ]
+
+    monkeypatch.setattr(event_store, "get_latest_run_id", latest_run_id)
+    monkeypatch.setattr(event_store, "read_events_after", events_after)
+
+    async def _run():
+        request = SimpleNamespace(headers={})
+        await threads.stream_thread_events("t-1", request, after=2, token="tok", app=app)
+        buf = app.state.thread_event_buffers["t-1"]
+        events, _ = await buf.read_with_timeout(0, timeout=1)
+        assert [json.loads(e["data"])["_seq"] for e in events] == [3, 4]
+        assert published == []
+
+    asyncio.run(_run())
+
+
+def test_remote_events_during_replay_follow_it_without_duplicates(monkeypatch):
+    from backend.web.routers import threads
+    from backend.web.services import event_store
+
+    handlers = []
+    fanout = SimpleNamespace(
+        publish=lambda topic, event: None,
+        subscribe=lambda topic, cb: handlers.append(cb) or (lambda: None),
+    )
+    app = SimpleNamespace(
+        state=SimpleNamespace(
+            thread_event_buffers={},
+            thread_fanout_unsubs={},
+            event_fanout=fanout,
+            auth_service=SimpleNamespace(verify_token=lambda token: {"member_id": "owner"}),
+            thread_repo=SimpleNamespace(get_by_id=lambda tid: {"member_id": "agent"}),
+            member_repo=SimpleNamespace(get_by_id=lambda mid: SimpleNamespace(owner_id="owner")),
+        )
+    )
+
+    async def latest_run_id(thread_id):
+        # Another worker publishes while the replay is still reading SQLite.
+        [deliver] = handlers
+        deliver(_event(5, "live"))
+        return "run-1"
+
+    async def events_after(thread_id, run_id, after):
+        [deliver] = handlers
+        deliver(_event(4, "b"))  # already persisted, so it is also in the replay below
+        return [
+            {"seq": 3, "event": "text", "data": json.dumps({"content": "a"})},
+            {"seq": 4, "event": "text", "data": json.dumps({"content": "b"})},
+        ]
+
+    monkeypatch.setattr(event_store, "get_latest_run_id", latest_run_id)
+    monkeypatch.setattr(event_store, "read_events_after", events_after)
+
+    async def _run():
+        request = SimpleNamespace(headers={})
+        await threads.stream_thread_events("t-1", request, after=2, token="tok", app=app)
+        buf = app.state.thread_event_buffers["t-1"]
+        events, _ = await buf.read_with_timeout(0, timeout=1)
+        assert [json.loads(e["data"])["_seq"] for e in events] == [3, 4, 5]
+
+        handlers[0](_event(6, "later"))
+        events, _ = await buf.read_with_timeout(3, timeout=1)
+        assert [json.loads(e["data"])["_seq"] for e in events] == [6]
+
+    asyncio.run(_run())
@@ -0,0 +1,72 @@
+"""Microbenchmark for ThreadEventBuffer fan-out reads.
+
+Measures subscriber reads/sec while a producer streams token events into a
+full ring, with 1, 10 and 100 concurrent subscribers. Each read should cost
+O(new events), not O(ring size).
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from backend.web.services.event_buffer import ThreadEventBuffer
+
+EVENTS = 1000
+
+
+class _CountingSlots(list):
+    """Ring storage that counts how many slots reads copy out."""
+
+    copied = 0
+
+    def __getitem__(self, index):
+        item = super().__getitem__(index)
+        if isinstance(index, slice):
+            self.copied += len(item)
+        return item
+
+
+async def _bench(subscribers: int) -> tuple[float, int, int, int]:
+    buf = ThreadEventBuffer()
+    # Pre-fill so the ring is at capacity, as in a long-lived thread.
+    for i in range(buf.maxlen):
+        await buf.put({"event": "text", "data": f"warm-{i}"})
+    buf._slots = slots = _CountingSlots(buf._slots)
+    start_cursor = buf.total_count
+    target = start_cursor + EVENTS
+    reads = 0
+    delivered = 0
+
+    async def _subscriber() -> None:
+        nonlocal reads, delivered
+        cursor = start_cursor
+        while cursor < target:
+            events, cursor = await buf.read_with_timeout(cursor, timeout=5)
+            assert events is not None
+            reads += 1
+            delivered += len(events)
+
+    async def _producer() -> None:
+        for i in range(EVENTS):
+            await buf.put({"event": "text", "data": f"tok-{i}"})
+            await asyncio.sleep(0)
+
+    tasks = [asyncio.create_task(_subscriber()) for _ in range(subscribers)]
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await _producer()
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - started, reads, delivered, slots.copied
+
+
+@pytest.mark.parametrize("subscribers", [1, 10, 100])
+def test_thread_event_buffer_read_throughput(subscribers):
+    elapsed, reads, delivered, copied = asyncio.run(_bench(subscribers))
+    rate = reads / elapsed
+    print(f"\n[Performance Test] {subscribers} subscribers: {reads} reads in {elapsed:.3f}s ({rate:,.0f} reads/sec)")
+    print(f"  {copied:,} ring slots copied for {delivered:,} delivered events")
+    assert reads >= subscribers
+    assert delivered == subscribers * EVENTS
+    # Reads copy only the new events, never the whole ring (the old O(ring) cost).
+    assert copied == delivered
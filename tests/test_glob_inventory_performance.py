@@ -0,0 +1,85 @@
+"""Benchmark: Glob over a cached WorkspaceInventory vs the per-call walk.
+
+Synthetic tree of 20k files in 400 directories (plus an excluded
+node_modules). The walk stats every file on each call; the warm inventory
+does one stat per directory per poll and answers repeated patterns from its
+per-version cache.
+"""
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.tools.search.service import SearchService
+
+DIRS = 400
+FILES_PER_DIR = 50
+CALLS = 5
+
+
+@pytest.fixture(scope="module")
+def big_workspace(tmp_path_factory) -> Path:
+    root = tmp_path_factory.mktemp("inventory_bench")
+    for d in range(DIRS):
+        pkg = root / f"pkg{d // 20}" / f"mod{d}"
+        pkg.mkdir(parents=True)
+        for f in range(FILES_PER_DIR):
+            suffix = ".py" if f % 2 else ".ts"
+            (pkg / f"file{f}{suffix}").write_text("")
+    nm = root / "node_modules" / "dep"
+    nm.mkdir(parents=True)
+    for f in range(500):
+        (nm / f"x{f}.py").write_text("")
+    return root
+
+
+def _time_calls(mw: SearchService, pattern: str) -> tuple[float, int, str]:
+    """Per-call ms and per-call filesystem ops (os.stat + os.scandir) for repeated Globs."""
+    ops = 0
+    real_stat, real_scandir = os.stat, os.scandir
+
+    def counted(fn):
+        def wrapper(*args, **kwargs):
+            nonlocal ops
+            ops += 1
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    with patch("os.stat", counted(real_stat)), patch("os.scandir", counted(real_scandir)):
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            result = mw._glob(pattern=pattern)
+        elapsed = time.perf_counter() - start
+    return elapsed / CALLS * 1000, ops // CALLS, result
+
+
+@pytest.mark.parametrize("pattern", ["**/*.py", "pkg3/**/*.ts"])
+def test_inventory_glob_faster_than_walk(big_workspace: Path, pattern: str):
+    with patch("shutil.which", return_value=None):
+        walk = SearchService(MagicMock(), workspace_root=big_workspace)
+        cached = SearchService(MagicMock(), workspace_root=big_workspace, use_inventory=True, inventory_poll_interval=0)
+
+    build_start = time.perf_counter()
+    cached.inventory.refresh(force=True)
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    walk_ms, walk_ops, walk_result = _time_calls(walk, pattern)
+    # poll_interval=0: every call still re-stats all directories — the worst case for the inventory
+    polled_ms, polled_ops, polled_result = _time_calls(cached, pattern)
+    cached.inventory.poll_interval = 60
+    warm_ms, warm_ops, warm_result = _time_calls(cached, pattern)
+
+    print(f"\n[Performance Test] Glob {pattern!r} over {cached.inventory.file_count()} files")
+    print(f"  Inventory build: {build_ms:.1f}ms")
+    print(f"  Walk:            {walk_ms:.1f}ms/call, {walk_ops:,} fs ops/call")
+    print(f"  Inventory poll:  {polled_ms:.1f}ms/call, {polled_ops:,} fs ops/call")
+    print(f"  Inventory warm:  {warm_ms:.2f}ms/call, {warm_ops:,} fs ops/call")
+
+    assert sorted(polled_result.split("\n")) == sorted(walk_result.split("\n"))
+    assert warm_result == polled_result
+    # A warm inventory only checks the search root; the walk touches every matching directory and file.
+    assert warm_ops * 100 < walk_ops
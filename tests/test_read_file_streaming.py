@@ -0,0 +1,222 @@
+"""Tests for the streaming, index-backed text reader.
+
+The indexed path must return exactly what the in-memory readlines() path
+returns — same numbering, truncation, totals and errors.
+"""
+
+from __future__ import annotations
+
+import builtins
+import io
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from core.tools.filesystem.read import line_index as line_index_mod
+from core.tools.filesystem.read.line_index import LineIndexCache, build_line_index, count_lines, count_text_lines
+from core.tools.filesystem.read.readers import text as text_mod
+from core.tools.filesystem.read.readers.text import read_text
+from core.tools.filesystem.read.types import ReadLimits
+
+
+@pytest.fixture(autouse=True)
+def index_dir(tmp_path, monkeypatch) -> Path:
+    directory = tmp_path / "line_index"
+    monkeypatch.setenv("LEON_LINE_INDEX_DIR", str(directory))
+    monkeypatch.setattr(line_index_mod, "_default_cache", LineIndexCache(interval=7))
+    return directory
+
+
+def _read_both(path: Path, monkeypatch, **kwargs):
+    limits = kwargs.pop("limits", ReadLimits())
+    monkeypatch.setattr(text_mod, "LINE_INDEX_MIN_BYTES", 1 << 62)
+    in_memory = read_text(path, limits, **kwargs)
+    monkeypatch.setattr(text_mod, "LINE_INDEX_MIN_BYTES", 0)
+    indexed = read_text(path, limits, **kwargs)
+    return in_memory, indexed
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "".join(f"line {i}\n" for i in range(100)),
+        "".join(f"line {i}\r\n" for i in range(100)),
+        "".join(f"line {i}\n" for i in range(100)) + "no trailing newline",
+        "héllo wörld ✓\n" * 50,
+        "single line",
+    ],
+    ids=["lf", "crlf", "no-trailing-newline", "multibyte", "one-line"],
+)
+@pytest.mark.parametrize(("offset", "limit"), [(None, None), (1, 10), (37, 20), (50, None), (99, 5)])
+def test_indexed_read_matches_in_memory(tmp_path, monkeypatch, content, offset, limit):
+    path = tmp_path / "f.txt"
+    path.write_bytes(content.encode("utf-8"))
+    in_memory, indexed = _read_both(path, monkeypatch, offset=offset, limit=limit)
+    assert indexed == in_memory
+
+
+def test_limits_and_errors_match(tmp_path, monkeypatch):
+    path = tmp_path / "f.txt"
+    path.write_text("".join(("x" * (i * 10)) + "\n" for i in range(60)))
+    limits = ReadLimits(max_lines=25, max_chars=3000, max_line_length=200)
+    in_memory, indexed = _read_both(path, monkeypatch, limits=limits, offset=10)
+    assert indexed == in_memory
+    assert indexed.truncated
+
+    in_memory, indexed = _read_both(path, monkeypatch, offset=500)
+    assert indexed.error == in_memory.error == "Offset 500 exceeds file length 60"
+
+
+def test_non_utf8_anywhere_is_rejected(tmp_path, monkeypatch):
+    path = tmp_path / "f.txt"
+    path.write_bytes(b"ok\n" * 100 + b"\xff\xfe\n")
+    in_memory, indexed = _read_both(path, monkeypatch, offset=1, limit=5)
+    assert indexed.error == in_memory.error
+    assert "not UTF-8" in indexed.error
+
+
+def test_lone_cr_falls_back_to_in_memory(tmp_path, monkeypatch):
+    path = tmp_path / "f.txt"
+    path.write_bytes(b"a\rb\rc\n" * 20)
+    assert build_line_index(path).lone_cr
+    in_memory, indexed = _read_both(path, monkeypatch, offset=5, limit=10)
+    assert indexed == in_memory
+
+
+def test_crlf_split_across_blocks_is_not_a_lone_cr(tmp_path, monkeypatch):
+    path = tmp_path / "f.txt"
+    path.write_bytes(b"abc\r\n" * 20)
+    monkeypatch.setattr(line_index_mod, "_BLOCK_SIZE", 4)
+    index = build_line_index(path, interval=3)
+    assert not index.lone_cr
+    assert index.total_lines == 20
+    with open(path, "rb") as f:
+        assert all(index.line_offset(f, n) == n * 5 for n in range(20))
+
+
+def test_checkpoints_are_sparse_and_seekable(tmp_path):
+    path = tmp_path / "f.txt"
+    lines = [f"{i:05d}\n" for i in range(20_000)]
+    path.write_text("".join(lines))
+    index = build_line_index(path, interval=1000)
+    assert 1 < len(index.checkpoint_lines) <= 20
+    assert all(b - a >= 1000 for a, b in zip(index.checkpoint_lines[1:], index.checkpoint_lines[2:]))
+    assert next(index.iter_lines(path, 12_345)) == lines[12_345]
+
+
+def test_index_is_persisted_and_invalidated_by_mtime_or_size(tmp_path, index_dir):
+    path = tmp_path / "f.txt"
+    path.write_text("a\nb\n")
+    assert count_lines(path) == 2
+    [persisted] = index_dir.glob("*.json")
+    assert json.loads(persisted.read_text())["total_lines"] == 2
+
+    fresh = LineIndexCache(interval=7)
+    assert fresh.get(path).total_lines == 2
+
+    path.write_text("a\nb\nc\n")
+    assert count_lines(path) == 3
+    assert fresh.get(path).total_lines == 3
+
+
+class _CountingReader(io.BufferedReader):
+    """Binary reader that tallies the bytes handed out, however they are read."""
+
+    bytes_read = 0
+
+    def _count(self, n: int) -> int:
+        _CountingReader.bytes_read += n
+        return n
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self._count(len(data))
+        return data
+
+    def read1(self, size=-1):
+        data = super().read1(size)
+        self._count(len(data))
+        return data
+
+    def readinto(self, b):
+        return self._count(super().readinto(b))
+
+    def readinto1(self, b):
+        return self._count(super().readinto1(b))
+
+
+def _counting_open(file, mode="r", *args, **kwargs):
+    if mode == "rb":
+        return _CountingReader(io.FileIO(file))
+    return builtins.open(file, mode, *args, **kwargs)
+
+
+@pytest.mark.parametrize("content", ["", "a", "a\n", "a\nb", "a\nb\n", "a\r\nb\r\n", "\n\n"])
+def test_in_memory_line_count_matches_index(tmp_path, content):
+    path = tmp_path / "f.txt"
+    path.write_bytes(content.encode())
+    assert count_text_lines(content) == count_lines(path) == len(path.read_bytes().splitlines(keepends=True))
+
+
+def test_persisted_indexes_are_capped(tmp_path, index_dir):
+    cache = LineIndexCache(max_persisted=3)
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"f{i}.txt"
+        path.write_text("x\n" * (i + 1))
+        paths.append(path)
+    for age, path in enumerate(paths[:3]):
+        cache.get(path)
+        os.utime(cache._index_file(str(path)), (1000 + age, 1000 + age))
+    # Re-loading from disk marks f0 as recently used, so f1 is evicted first.
+    LineIndexCache().get(paths[0])
+    cache.get(paths[3])
+    assert len(list(index_dir.glob("*.json"))) == 3
+    assert cache._load(str(paths[0])) is not None
+    assert cache._load(str(paths[1])) is None
+
+
+def test_offset_read_of_large_file_is_bounded(tmp_path, monkeypatch):
+    """[Performance Test] offset read near the end of a ~40 MB file: index build once, then O(limit) reads."""
+    monkeypatch.setattr(line_index_mod, "_default_cache", LineIndexCache())
+    path = tmp_path / "big.log"
+    line = "2026-01-01T00:00:00 INFO request handled in 12ms path=/api/v1/items?page=1\n"
+    total = 500_000
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(0, total, 10_000):
+            f.write(line * 10_000)
+
+    start = time.perf_counter()
+    with open(path, encoding="utf-8") as f:
+        f.readlines()
+    readlines_ms = (time.perf_counter() - start) * 1000
+
+    monkeypatch.setattr(line_index_mod, "open", _counting_open, raising=False)
+    monkeypatch.setattr(_CountingReader, "bytes_read", 0)
+    start = time.perf_counter()
+    first = read_text(path, ReadLimits(), offset=450_000, limit=100)
+    first_ms = (time.perf_counter() - start) * 1000
+    first_bytes = _CountingReader.bytes_read
+
+    _CountingReader.bytes_read = 0
+    start = time.perf_counter()
+    for _ in range(10):
+        warm = read_text(path, ReadLimits(), offset=450_000, limit=100)
+    warm_ms = (time.perf_counter() - start) * 1000 / 10
+    warm_bytes = _CountingReader.bytes_read // 10
+    size = path.stat().st_size
+
+    print(f"\n[Performance Test] read_text offset=450000 limit=100 on {size / 1e6:.0f} MB")
+    print(f"  readlines():            {readlines_ms:.1f}ms, {size:,} bytes read")
+    print(f"  first read (build idx): {first_ms:.1f}ms, {first_bytes:,} bytes read")
+    print(f"  warm read:              {warm_ms:.2f}ms, {warm_bytes:,} bytes read")
+
+    assert warm == first
+    assert warm.total_lines == total
+    assert (warm.start_line, warm.end_line) == (450_000, 450_099)
+    # The index is built by one pass over the file; warm reads only touch the blocks around the offset.
+    assert first_bytes < size * 2
+    assert warm_bytes * 100 < size
@@ -0,0 +1,199 @@
+"""Tests for bulk metrics collection (SandboxProvider.get_metrics_bulk) and its use in resource refresh."""
+
+from __future__ import annotations
+
+import os
+import stat
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.web.services import resource_service
+from sandbox import resource_snapshot
+from sandbox.provider import Metrics, SandboxProvider
+from sandbox.providers.docker import DockerProvider
+
+# Stand-in docker CLI over N running containers cid-s0..cid-s{N-1} labelled s0..s{N-1}; logs every call
+_FAKE_DOCKER = r"""#!/bin/sh
+echo "$1" >> "$FAKE_DOCKER_LOG"
+case "$1" in
+  ps)
+    if [ "$2" = "-aq" ]; then echo "cid-${4##*=}"; exit 0; fi
+    i=0
+    while [ $i -lt "$FAKE_DOCKER_N" ]; do
+      printf 'cid-s%d\ts%d\trunning\t%dMB (virtual 159MB)\n' $i $i $((i + 1))
+      i=$((i + 1))
+    done ;;
+  inspect) echo running ;;
+  stats)
+    format="$4"
+    shift 4
+    for c in "$@"; do
+      case "$format" in "{{.Container}}"*) printf '%s\t' "$c" ;; esac
+      printf '12.50%%\t64MiB / 7.6GiB\n'
+    done ;;
+  exec) printf 'Filesystem 1G-blocks Used Available Use%% Mounted on\noverlay 100G 3G 97G 3%% /\n' ;;
+esac
+"""
+
+
+@pytest.fixture
+def fake_docker(tmp_path, monkeypatch):
+    script = tmp_path / "bin" / "docker"
+    script.parent.mkdir()
+    script.write_text(_FAKE_DOCKER)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    log = tmp_path / "docker.log"
+    log.write_text("")
+    monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_DOCKER_LOG", str(log))
+
+    def configure(n: int):
+        monkeypatch.setenv("FAKE_DOCKER_N", str(n))
+        return log
+
+    return configure
+
+
+def _calls(log) -> list[str]:
+    return log.read_text().split()
+
+
+def test_docker_cli_bulk_uses_two_commands(fake_docker):
+    log = fake_docker(5)
+    provider = DockerProvider(image="python:3.12-slim")
+    results = provider.get_metrics_bulk(["s0", "s3", "missing"])
+
+    assert _calls(log) == ["ps", "stats"]
+    assert results["s0"] == Metrics(cpu_percent=12.5, memory_used_mb=64.0, disk_used_gb=1 / 1024)
+    assert results["s3"].disk_used_gb == 4 / 1024
+    assert results["missing"] is None
+    assert provider.get_metrics_bulk([]) == {}
+
+
+def test_default_bulk_reports_per_session_errors():
+    class Provider:
+        get_metrics_bulk = SandboxProvider.get_metrics_bulk
+
+        def get_metrics(self, session_id):
+            if session_id == "bad":
+                raise RuntimeError("probe failed")
+            return Metrics(cpu_percent=1.0)
+
+    results = Provider().get_metrics_bulk(["ok", "bad"])
+    assert results["ok"].cpu_percent == 1.0
+    assert str(results["bad"]) == "probe failed"
+
+
+class _BulkProvider:
+    def __init__(self, barrier: threading.Barrier | None = None, fail: bool = False):
+        self.barrier = barrier
+        self.fail = fail
+        self.bulk_calls: list[list[str]] = []
+
+    def get_metrics_bulk(self, session_ids):
+        self.bulk_calls.append(list(session_ids))
+        if self.barrier is not None:
+            self.barrier.wait()  # raises BrokenBarrierError unless the other provider is in flight too
+        if self.fail:
+            raise RuntimeError("daemon unreachable")
+        return {sid: Metrics(cpu_percent=5.0) if sid != "gone" else None for sid in session_ids}
+
+
+def _patch_refresh(monkeypatch, targets: list[dict], providers: dict[str, object]) -> list[dict]:
+    repo = MagicMock()
+    repo.list_probe_targets.return_value = targets
+    monkeypatch.setattr(resource_service, "ensure_resource_snapshot_table", lambda: None)
+    monkeypatch.setattr(resource_service, "SQLiteSandboxMonitorRepo", lambda: repo)
+    monkeypatch.setattr(resource_service, "build_provider_from_config_name", providers.get)
+    upserts: list[dict] = []
+    monkeypatch.setattr(resource_snapshot, "upsert_lease_resource_snapshot", lambda **kw: upserts.append(kw))
+    return upserts
+
+
+def test_refresh_makes_one_bulk_call_per_provider_in_parallel(monkeypatch):
+    both_in_flight = threading.Barrier(2, timeout=5)
+    docker, e2b, broken = _BulkProvider(both_in_flight), _BulkProvider(both_in_flight), _BulkProvider(fail=True)
+    targets = [
+        {"provider_name": name, "instance_id": f"{name}-{i}", "lease_id": f"l-{name}-{i}", "observed_state": state}
+        for name in ("docker", "e2b")
+        for i, state in enumerate(["running", "detached", "paused"] * 10)
+    ]
+    targets += [
+        {"provider_name": "docker", "instance_id": "gone", "lease_id": "l-gone", "observed_state": "running"},
+        {"provider_name": "broken", "instance_id": "b-1", "lease_id": "l-b", "observed_state": "running"},
+    ]
+    upserts = _patch_refresh(monkeypatch, targets, {"docker": docker, "e2b": e2b, "broken": broken})
+
+    result = resource_service.refresh_resource_snapshots()
+
+    assert result == {"probed": 62, "errors": 2, "running_targets": 42, "non_running_targets": 20}
+    assert len(docker.bulk_calls) == len(e2b.bulk_calls) == 1
+    assert len(docker.bulk_calls[0]) == 31
+    by_lease = {u["lease_id"]: u for u in upserts}
+    assert by_lease["l-docker-0"]["cpu_used"] == 5.0 and by_lease["l-docker-0"]["probe_error"] is None
+    assert by_lease["l-docker-2"]["probe_mode"] == "non_running_sdk"
+    assert by_lease["l-gone"]["probe_error"] == "metrics unavailable"
+    assert by_lease["l-b"]["probe_error"] == "daemon unreachable"
+
+
+def test_refresh_probes_providers_without_bulk_override_per_instance(monkeypatch):
+    class PlainProvider:
+        get_metrics_bulk = SandboxProvider.get_metrics_bulk
+
+        def get_metrics(self, session_id):
+            raise AssertionError("the per-instance probe is patched out")
+
+    targets = [
+        {"provider_name": "plain", "instance_id": f"s-{i}", "lease_id": f"l-{i}", "observed_state": "running"}
+        for i in range(3)
+    ]
+    _patch_refresh(monkeypatch, targets, {"plain": PlainProvider()})
+    probes: list[dict] = []
+    monkeypatch.setattr(
+        resource_service, "probe_and_upsert_for_instance", lambda **kw: probes.append(kw) or {"ok": True}
+    )
+
+    result = resource_service.refresh_resource_snapshots()
+    assert result["probed"] == 3 and result["errors"] == 0
+    assert [probe["instance_id"] for probe in probes] == ["s-0", "s-1", "s-2"]
+
+
+def test_bulk_refresh_replaces_per_instance_subprocesses(fake_docker, monkeypatch):
+    """[Performance Test] resource refresh over 50 docker sandboxes: per-instance probes vs bulk."""
+    n = 50
+    log = fake_docker(n)
+    targets = [
+        {"provider_name": "docker", "instance_id": f"s{i}", "lease_id": f"l-{i}", "observed_state": "running"}
+        for i in range(n)
+    ]
+
+    class PerInstanceDocker:
+        def __init__(self):
+            self._inner = DockerProvider(image="python:3.12-slim")
+
+        def get_metrics(self, session_id):
+            return self._inner.get_metrics(session_id)
+
+    _patch_refresh(monkeypatch, targets, {"docker": PerInstanceDocker()})
+    start = time.perf_counter()
+    resource_service.refresh_resource_snapshots()
+    per_instance_s = time.perf_counter() - start
+    per_instance_calls = len(_calls(log))
+
+    log.write_text("")
+    upserts = _patch_refresh(monkeypatch, targets, {"docker": DockerProvider(image="python:3.12-slim")})
+    start = time.perf_counter()
+    result = resource_service.refresh_resource_snapshots()
+    bulk_s = time.perf_counter() - start
+    bulk_calls = len(_calls(log))
+
+    print(f"\n[Performance Test] resource refresh over {n} running docker sandboxes")
+    print(f"  per-instance: {per_instance_calls} docker subprocesses, {per_instance_s * 1000:.0f}ms")
+    print(f"  bulk:         {bulk_calls} docker subprocesses, {bulk_s * 1000:.0f}ms")
+
+    assert result["errors"] == 0 and len(upserts) == n
+    assert per_instance_calls == 4 * n  # ps (id lookup) + inspect + stats + exec df
+    assert bulk_calls == 2
@@ -0,0 +1,203 @@
+"""Tests for the read-through row cache in front of the entity, member and contact repos."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+
+from storage.contracts import ContactRow, EntityRow, MemberRow, MemberType
+from storage.providers.sqlite.contact_repo import SQLiteContactRepo
+from storage.providers.sqlite.entity_repo import SQLiteEntityRepo
+from storage.providers.sqlite.member_repo import SQLiteMemberRepo
+from storage.providers.sqlite.row_cache import RowCache, row_cache_stats
+
+
+def _entity(eid: str, name: str = "n") -> EntityRow:
+    return EntityRow(id=eid, type="agent", member_id=f"m-{eid}", name=name, thread_id=f"t-{eid}", created_at=1.0)
+
+
+def _member(mid: str, name: str = "n") -> MemberRow:
+    return MemberRow(id=mid, name=name, type=MemberType.HUMAN, created_at=1.0)
+
+
+def test_entity_lookups_read_through_and_writes_invalidate(tmp_path):
+    db = tmp_path / "leon.db"
+    repo, other = SQLiteEntityRepo(db), SQLiteEntityRepo(db)
+    try:
+        assert repo.get_by_id("e1") is None  # absent is cached too...
+        repo.create(_entity("e1", "first"))  # ...until a create invalidates it
+        assert repo.get_by_id("e1").name == "first"
+        assert repo.get_by_id("e1").name == "first"
+        stats = repo._cache.get_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+
+        # Any instance on the same database shares the cache and its invalidation
+        assert other._cache is repo._cache
+        other.delete("e1")
+        assert repo.get_by_id("e1") is None
+
+        for i in range(2, 6):
+            repo.create(_entity(f"e{i}", f"name{i}"))
+        assert [e.id for e in repo.get_by_ids(["e3", "e2", "missing", "e3"])] == ["e3", "e2"]
+        before = repo._cache.get_stats()
+        assert [e.id for e in repo.get_by_ids(["e2", "e3", "e4", "missing"])] == ["e2", "e3", "e4"]
+        after = repo._cache.get_stats()
+        assert after["hits"] - before["hits"] == 3 and after["misses"] - before["misses"] == 1
+
+        # Callers get copies: mutating one never leaks into the cache
+        repo.get_by_id("e2").name = "mutated"
+        assert repo.get_by_id("e2").name == "name2"
+    finally:
+        repo.close()
+        other.close()
+
+
+def test_member_mutations_invalidate(tmp_path):
+    db = tmp_path / "leon.db"
+    repo, other = SQLiteMemberRepo(db), SQLiteMemberRepo(db)
+    try:
+        repo.create(_member("m1", "before"))
+        assert repo.get_by_id("m1").name == "before"
+        other.update("m1", name="after", avatar="a.png")
+        assert repo.get_by_id("m1").name == "after"
+        assert [m.avatar for m in repo.get_by_ids(["m1"])] == ["a.png"]
+
+        seq = repo.get_by_id("m1").next_entity_seq
+        assert other.increment_entity_seq("m1") == seq + 1
+        assert repo.get_by_id("m1").next_entity_seq == seq + 1
+
+        other.delete("m1")
+        assert repo.get_by_id("m1") is None and repo.get_by_ids(["m1"]) == []
+    finally:
+        repo.close()
+        other.close()
+
+
+def test_contact_lookups_and_invalidation(tmp_path):
+    repo = SQLiteContactRepo(tmp_path / "chat.db")
+    try:
+        assert repo.get("a", "sender") is None
+        for owner, relation in (("a", "blocked"), ("b", "muted"), ("c", "normal")):
+            repo.upsert(ContactRow(owner_entity_id=owner, target_entity_id="sender", relation=relation, created_at=1.0))
+        assert repo.get("a", "sender").relation == "blocked"
+        assert {c.owner_entity_id: c.relation for c in repo.get_for_owners(["a", "b", "c", "d"], "sender")} == {
+            "a": "blocked",
+            "b": "muted",
+            "c": "normal",
+        }
+        repo.upsert(ContactRow(owner_entity_id="a", target_entity_id="sender", relation="normal", created_at=2.0))
+        repo.delete("b", "sender")
+        assert {c.owner_entity_id: c.relation for c in repo.get_for_owners(["a", "b", "c"], "sender")} == {
+            "a": "normal",
+            "c": "normal",
+        }
+        assert repo._cache.get_stats()["invalidations"] == 5
+    finally:
+        repo.close()
+
+
+def test_lru_bound_and_load_race():
+    cache = RowCache("t", max_entries=2)
+    loads = []
+
+    def load(key):
+        loads.append(key)
+        return _entity(key)
+
+    for key in ("a", "b", "a", "c"):  # c evicts b (a was used more recently)
+        cache.get_or_load(key, lambda key=key: load(key))
+    cache.get_or_load("a", lambda: load("a"))
+    cache.get_or_load("b", lambda: load("b"))
+    assert loads == ["a", "b", "c", "b"]
+    assert cache.get_stats()["evictions"] == 2 and cache.get_stats()["entries"] == 2
+
+    # A write that commits while a miss is loading: the (possibly stale) result is returned but not kept
+    def racing_load():
+        cache.invalidate("x")
+        return _entity("x", "stale")
+
+    assert cache.get_or_load("x", racing_load).name == "stale"
+    assert cache.get_or_load("x", lambda: _entity("x", "fresh")).name == "fresh"
+
+
+def test_entries_expire_so_other_workers_writes_show_up():
+    now = [0.0]
+    cache = RowCache("t", ttl=30.0, negative_ttl=2.0, clock=lambda: now[0])
+    rows = {"known": _entity("known", "old")}
+
+    def load(key):
+        return lambda: rows.get(key)
+
+    assert cache.get_or_load("new", load("new")) is None
+    assert cache.get_or_load("known", load("known")).name == "old"
+    # Another worker creates "new" and renames "known"; this process never sees an invalidate.
+    rows["new"] = _entity("new")
+    rows["known"] = _entity("known", "renamed")
+    now[0] = 1.0
+    assert cache.get_or_load("new", load("new")) is None
+    assert cache.get_or_load("known", load("known")).name == "old"
+
+    now[0] = 2.5  # absent entries expire first
+    assert cache.get_or_load("new", load("new")) is not None
+    assert cache.get_or_load("known", load("known")).name == "old"
+    assert cache.get_or_load_many(["known"], lambda keys: {k: rows[k] for k in keys})["known"].name == "old"
+
+    now[0] = 31.0
+    assert cache.get_or_load("known", load("known")).name == "renamed"
+
+
+def test_in_memory_databases_do_not_share(tmp_path):
+    first, second = sqlite3.connect(":memory:"), sqlite3.connect(":memory:")
+    a, b = SQLiteEntityRepo(conn=first), SQLiteEntityRepo(conn=second)
+    a.create(_entity("e1"))
+    assert a._cache is not b._cache
+    assert b.get_by_id("e1") is None and a.get_by_id("e1") is not None
+
+
+def test_monitor_snapshot_reports_counters(tmp_path):
+    from backend.web.services.monitor_service import row_cache_snapshot
+
+    repo = SQLiteMemberRepo(tmp_path / "leon.db")
+    try:
+        before = row_cache_stats().get("members", {"hits": 0})["hits"]
+        repo.create(_member("m1"))
+        repo.get_by_id("m1")
+        repo.get_by_id("m1")
+        snapshot = row_cache_snapshot()
+        assert snapshot["tables"]["members"]["hits"] == before + 1
+        assert 0.0 < snapshot["tables"]["members"]["hit_rate"] <= 1.0
+    finally:
+        repo.close()
+
+
+def test_cached_lookups_skip_sqlite(tmp_path):
+    """[Performance Test] 20k entity+member lookups over 50 hot rows: SQLite per row vs row cache."""
+    db = tmp_path / "leon.db"
+    entities, members = SQLiteEntityRepo(db), SQLiteMemberRepo(db)
+    try:
+        for i in range(50):
+            members.create(_member(f"m-e{i}", f"agent{i}"))
+            entities.create(_entity(f"e{i}", f"agent{i}"))
+        ids = [f"e{i % 50}" for i in range(10_000)]
+
+        start = time.perf_counter()
+        for eid in ids:
+            e = entities._load_by_id(eid)
+            members._load_by_id(e.member_id)
+        uncached_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for eid in ids:
+            e = entities.get_by_id(eid)
+            members.get_by_id(e.member_id)
+        cached_s = time.perf_counter() - start
+
+        print("\n[Performance Test] 20k entity+member lookups over 50 hot rows")
+        print(f"  SQLite per row: {uncached_s * 1000:.0f}ms")
+        print(f"  row cache:      {cached_s * 1000:.0f}ms, entity hit rate {entities._cache.get_stats()['hit_rate']}")
+
+        assert entities._cache.get_stats()["hit_rate"] > 0.99
+        assert members._cache.get_stats()["hit_rate"] > 0.99
+    finally:
+        entities.close()
+        members.close()
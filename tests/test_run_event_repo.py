@@ -1,8 +1,10 @@
 import sqlite3
+import threading
 
 import pytest
 
 from storage.providers.sqlite.run_event_repo import SQLiteRunEventRepo
+from storage.providers.sqlite.run_event_writer import RunEventWriter
 from storage.providers.supabase.run_event_repo import SupabaseRunEventRepo
 
 
@@ -65,6 +67,135 @@ def test_delete_runs_and_thread_events(tmp_path):
         repo.close()
 
 
+def test_batched_append_returns_seq_before_commit_and_reads_flush(tmp_path):
+    db_path = tmp_path / "leon.db"
+    seed = SQLiteRunEventRepo(db_path)
+    seed.append_event("t-0", "r-0", "status", {"v": 0})
+    seed.close()
+
+    repo = SQLiteRunEventRepo(db_path, batched=True)
+    try:
+        seqs = [repo.append_event("t-4", "r-1", "text", {"i": i}) for i in range(5)]
+        assert seqs == [2, 3, 4, 5, 6]
+
+        # Reads flush pending rows first, so replay never misses the tail.
+        events = repo.list_events("t-4", "r-1")
+        assert [event["data"]["i"] for event in events] == [0, 1, 2, 3, 4]
+        assert repo.latest_seq("t-4") == 6
+    finally:
+        repo.close()
+
+
+def test_batched_repos_share_one_writer_and_group_commits(tmp_path):
+    db_path = tmp_path / "leon.db"
+    repos = [SQLiteRunEventRepo(db_path, batched=True) for _ in range(4)]
+    results: list[list[int]] = [[] for _ in repos]
+
+    def _append(idx: int) -> None:
+        for i in range(50):
+            results[idx].append(repos[idx].append_event(f"t-{idx}", "r-1", "text", {"i": i}))
+
+    threads = [threading.Thread(target=_append, args=(idx,)) for idx in range(len(repos))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    writer = repos[0]._writer
+    assert all(repo._writer is writer for repo in repos)
+    for seqs in results:
+        assert seqs == sorted(seqs)
+    assert sorted(seq for seqs in results for seq in seqs) == list(range(1, 201))
+
+    for repo in repos:
+        repo.flush()
+    assert writer.rows_committed == 200
+    assert writer.batches_committed < 200
+
+    for repo in repos:
+        repo.close()
+    with sqlite3.connect(str(db_path)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM run_events").fetchone()[0] == 200
+
+
+def test_batched_close_flushes_and_seq_survives_delete(tmp_path):
+    db_path = tmp_path / "leon.db"
+    repo = SQLiteRunEventRepo(db_path, batched=True)
+    repo.append_event("t-5", "r-1", "text", {"v": 1})
+    repo.append_event("t-5", "r-1", "text", {"v": 2})
+    assert repo.delete_thread_events("t-5") == 2
+    repo.close()
+
+    reopened = SQLiteRunEventRepo(db_path, batched=True)
+    try:
+        assert reopened.append_event("t-5", "r-2", "text", {"v": 3}) == 3
+    finally:
+        reopened.close()
+
+    with sqlite3.connect(str(db_path)) as conn:
+        assert conn.execute("SELECT seq FROM run_events").fetchall() == [(3,)]
+
+
+def test_batched_and_plain_appenders_never_collide(tmp_path):
+    db_path = tmp_path / "leon.db"
+    batched = SQLiteRunEventRepo(db_path, batched=True)
+    plain = SQLiteRunEventRepo(db_path)
+    try:
+        seqs = []
+        for i in range(10):
+            seqs.append(batched.append_event("t-6", "r-1", "text", {"i": i}))
+            seqs.append(plain.append_event("t-6", "r-2", "text", {"i": i}))
+        batched.flush()
+        assert len(set(seqs)) == 20
+        assert len(batched.list_events("t-6", "r-1")) == 10
+        assert len(plain.list_events("t-6", "r-2")) == 10
+    finally:
+        batched.close()
+        plain.close()
+
+
+def test_flush_waits_for_in_flight_batch_across_seq_blocks(tmp_path):
+    writer = RunEventWriter(tmp_path / "leon.db", max_delay=0, seq_block=2)
+    original_commit = writer._commit
+    in_commit = threading.Event()
+    release = threading.Event()
+
+    def _slow_commit(batch):
+        in_commit.set()
+        release.wait(5)
+        return original_commit(batch)
+
+    writer._commit = _slow_commit
+    try:
+        writer.submit("t-7", "r-1", "text", "{}", None)
+        writer.submit("t-7", "r-1", "text", "{}", None)
+        assert in_commit.wait(5)
+        flushed = threading.Event()
+        flusher = threading.Thread(target=lambda: (writer.flush(), flushed.set()))
+        flusher.start()
+        assert not flushed.wait(0.1)
+
+        # The block is exhausted while its rows are still in flight; this submit reserves a new one.
+        writer.submit("t-7", "r-1", "text", "{}", None)
+        assert not flushed.wait(0.2)
+        release.set()
+        flusher.join(5)
+        assert flushed.is_set()
+        assert writer.rows_committed == 3
+    finally:
+        release.set()
+        writer.close()
+
+
+def test_batched_requires_db_path(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "leon.db"))
+    try:
+        with pytest.raises(ValueError, match="needs db_path"):
+            SQLiteRunEventRepo(conn=conn, batched=True)
+    finally:
+        conn.close()
+
+
 from tests.fakes.supabase import FakeSupabaseClient
 
 
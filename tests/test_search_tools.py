@@ -459,3 +459,184 @@ class TestDefaultExcludes:
     def test_essential_entries(self):
         for entry in ["node_modules", ".git", "__pycache__", ".venv", "dist", "build"]:
             assert entry in DEFAULT_EXCLUDES
+
+
+# ---------------------------------------------------------------------------
+# Trigram index
+# ---------------------------------------------------------------------------
+
+
+from core.tools.search.trigram_index import query_trigrams, required_literals  # noqa: E402
+
+
+def _indexed(workspace: Path, ripgrep: bool) -> SearchService:
+    """Indexed service; patching index.candidates to None gives the same service's full scan."""
+    with patch("shutil.which", return_value="rg" if ripgrep else None):
+        return SearchService(MagicMock(), workspace_root=workspace, use_index=True)
+
+
+_ENGINES = [False] + ([True] if __import__("shutil").which("rg") else [])
+
+
+class TestRequiredLiterals:
+    def test_plain_word(self):
+        assert required_literals("hello") == (["hello"], False)
+
+    def test_optional_char_dropped(self):
+        assert required_literals("colou?r") == (["colo", "r"], False)
+
+    def test_groups_and_classes_skipped(self):
+        assert required_literals(r"def (foo|bar)_[a-z]+\(") == (["def ", "_", "("], False)
+
+    def test_escapes(self):
+        assert required_literals(r"\x41bc\.py") == (["bc.py"], False)
+
+    def test_top_level_alternation_disables_prefilter(self):
+        assert required_literals("foo|bar") is None
+        assert query_trigrams("foo|bar", False) is None
+
+    def test_inline_ignorecase(self):
+        assert required_literals("(?i)hello") == (["hello"], True)
+
+    def test_case_insensitive_skips_casefold_letters(self):
+        # 's' and 'k' can match non-ASCII code points under IGNORECASE
+        assert query_trigrams("ask", True) is None
+        assert query_trigrams("hello", True)
+
+
+@pytest.mark.parametrize("ripgrep", _ENGINES)
+class TestIndexedGrepEquivalence:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"pattern": "hello"},
+            {"pattern": "hello", "case_insensitive": True},
+            {"pattern": "HELLO"},
+            {"pattern": "def \\w+\\(", "output_mode": "content"},
+            {"pattern": "line\\d hello", "output_mode": "count"},
+            {"pattern": "hello", "glob": "*.py", "output_mode": "content"},
+            {"pattern": "return 42", "output_mode": "content", "context": 1},
+            {"pattern": "no-such-text-anywhere"},
+            {"pattern": "hel+o|world"},
+        ],
+    )
+    def test_same_output_as_full_scan(self, workspace: Path, ripgrep: bool, kwargs: dict):
+        mw = _indexed(workspace, ripgrep)
+        with patch.object(mw.index, "candidates", return_value=None):
+            full_scan = mw._grep(**kwargs)
+        assert sorted(mw._grep(**kwargs).split("\n")) == sorted(full_scan.split("\n"))
+
+    def test_index_stored_under_leon_and_not_searched(self, workspace: Path, ripgrep: bool):
+        mw = _indexed(workspace, ripgrep)
+        mw._grep(pattern="hello")
+        assert (workspace / ".leon" / "grep_index.db").exists()
+        with patch.object(mw.index, "candidates", return_value=None):
+            assert "grep_index" not in mw._grep(pattern="main")
+
+    def test_picks_up_changed_and_deleted_files(self, workspace: Path, ripgrep: bool):
+        indexed = _indexed(workspace, ripgrep)
+        indexed.index.refresh_interval = 0
+        assert indexed._grep(pattern="freshly_added") == "No matches found"
+        (workspace / "src" / "new.py").write_text("freshly_added = 1\n")
+        assert indexed._grep(pattern="freshly_added").endswith("new.py")
+        (workspace / "src" / "new.py").unlink()
+        assert indexed._grep(pattern="freshly_added") == "No matches found"
+
+    def test_binary_files_match_full_scan(self, workspace: Path, ripgrep: bool):
+        (workspace / "blob.bin").write_bytes(b"hello\0binary\n" * 4)
+        mw = _indexed(workspace, ripgrep)
+        for mode in ("files_with_matches", "content"):
+            with patch.object(mw.index, "candidates", return_value=None):
+                full_scan = mw._grep(pattern="hello", output_mode=mode)
+            assert sorted(mw._grep(pattern="hello", output_mode=mode).split("\n")) == sorted(full_scan.split("\n"))
+
+    def test_workspace_below_excluded_dir_name(self, tmp_path: Path, ripgrep: bool):
+        workspace = tmp_path / "build" / "project"
+        workspace.mkdir(parents=True)
+        (workspace / "main.py").write_text("needle = 1\n")
+        mw = _indexed(workspace, ripgrep)
+        assert mw.index.candidates(workspace, "needle", False) == [workspace / "main.py"]
+        assert mw._grep(pattern="needle").endswith("main.py")
+
+
+class TestIndexFileSystemHook:
+    def test_edit_event_visible_within_refresh_interval(self, workspace: Path):
+        from core.tools.filesystem.service import FileSystemService
+
+        with patch("shutil.which", return_value=None):
+            search = SearchService(MagicMock(), workspace_root=workspace, use_index=True, index_refresh_interval=3600)
+        fs = FileSystemService(MagicMock(), workspace_root=workspace, hooks=[search.index])
+        assert search._grep(pattern="brand_new_symbol") == "No matches found"
+
+        target = workspace / "src" / "utils.py"
+        fs._read_file(str(target))
+        fs._edit_file(str(target), "return 42", "return brand_new_symbol")
+        assert search._grep(pattern="brand_new_symbol") == str(target)
+        assert search.index.files_indexed > 0
+
+
+# ---------------------------------------------------------------------------
+# Glob inventory
+# ---------------------------------------------------------------------------
+
+
+def _inventory_mw(workspace: Path, **kwargs) -> SearchService:
+    with patch("shutil.which", return_value=None):
+        return SearchService(MagicMock(), workspace_root=workspace, use_inventory=True, **kwargs)
+
+
+class TestGlobInventory:
+    @pytest.mark.parametrize(
+        "pattern,subdir",
+        [
+            ("**/*.py", None),
+            ("*.py", None),
+            ("*.md", None),
+            ("src/*.js", None),
+            ("**/*", None),
+            ("[!m]*.py", "src"),
+            ("*.xyz", None),
+            ("**", None),  # not mirrored: falls back to the walk
+        ],
+    )
+    def test_same_output_as_walk(self, workspace: Path, pattern: str, subdir: str | None):
+        (workspace / "node_modules" / "pkg").mkdir(parents=True)
+        (workspace / "node_modules" / "pkg" / "index.py").write_text("x")
+        (workspace / "src" / "deep" / "deeper").mkdir(parents=True)
+        (workspace / "src" / "deep" / "deeper" / "leaf.py").write_text("x")
+        path = str(workspace / subdir) if subdir else None
+        walk = SearchService(MagicMock(), workspace_root=workspace)._glob(pattern=pattern, path=path)
+        cached = _inventory_mw(workspace)._glob(pattern=pattern, path=path)
+        assert sorted(cached.split("\n")) == sorted(walk.split("\n"))
+
+    def test_new_and_deleted_files_seen_after_poll(self, workspace: Path):
+        mw = _inventory_mw(workspace, inventory_poll_interval=0)
+        assert "later.py" not in _glob(mw, pattern="**/*.py")
+        (workspace / "src" / "later.py").write_text("x")
+        assert "later.py" in _glob(mw, pattern="**/*.py")
+        (workspace / "src" / "later.py").unlink()
+        assert "later.py" not in _glob(mw, pattern="**/*.py")
+
+    def test_file_system_edit_reorders_without_poll(self, workspace: Path):
+        from core.tools.filesystem.service import FileSystemService
+
+        mw = _inventory_mw(workspace, inventory_poll_interval=3600, inventory_full_rescan_interval=3600)
+        fs = FileSystemService(MagicMock(), workspace_root=workspace, hooks=[mw.inventory])
+        target = workspace / "src" / "utils.py"
+        os.utime(target, (1, 1))
+        mw.inventory.refresh(force=True)
+        assert _glob(mw, pattern="**/*.py").split("\n")[-1] == str(target)
+
+        fs._read_file(str(target))
+        fs._edit_file(str(target), "return 42", "return 43")
+        assert _glob(mw, pattern="**/*.py").split("\n")[0] == str(target)
+
+    def test_persisted_inventory_reloaded(self, workspace: Path):
+        mw = _inventory_mw(workspace, persist_inventory=True)
+        first = _glob(mw, pattern="**/*")
+        mw.inventory.save()
+        assert (workspace / ".leon" / "file_inventory.json").exists()
+
+        reloaded = _inventory_mw(workspace, persist_inventory=True)
+        assert reloaded.inventory.file_count() == mw.inventory.file_count()
+        assert sorted(_glob(reloaded, pattern="**/*").split("\n")) == sorted(first.split("\n"))
@@ -226,3 +226,49 @@ class TestObserveRunEvents:
             assert cursor == 0
 
         asyncio.run(_run())
+
+
+class TestThreadEventBufferRing:
+    """ThreadEventBuffer absolute-sequence ring reads."""
+
+    def test_reads_only_new_events_across_wraparound(self):
+        async def _run():
+            from backend.web.services.event_buffer import ThreadEventBuffer
+
+            buf = ThreadEventBuffer(maxlen=4)
+            for i in range(3):
+                await buf.put({"event": "text", "data": str(i)})
+            events, cursor = await buf.read_with_timeout(0, timeout=0.01)
+            assert [e["data"] for e in events] == ["0", "1", "2"]
+            assert cursor == 3
+
+            for i in range(3, 6):
+                await buf.put({"event": "text", "data": str(i)})
+            events, cursor = await buf.read_with_timeout(cursor, timeout=0.01)
+            assert [e["data"] for e in events] == ["3", "4", "5"]
+            assert cursor == 6
+
+            # Cursor older than the ring start returns everything retained.
+            events, cursor = await buf.read_with_timeout(0, timeout=0.01)
+            assert [e["data"] for e in events] == ["2", "3", "4", "5"]
+            assert cursor == 6
+
+        asyncio.run(_run())
+
+    def test_put_wakes_every_waiting_reader(self):
+        async def _run():
+            from backend.web.services.event_buffer import ThreadEventBuffer
+
+            buf = ThreadEventBuffer()
+            readers = [asyncio.create_task(buf.read_with_timeout(0, timeout=1)) for _ in range(5)]
+            await asyncio.sleep(0)
+            await buf.put({"event": "text", "data": "x"})
+            results = await asyncio.gather(*readers)
+            assert all(events == [{"event": "text", "data": "x"}] and cursor == 1 for events, cursor in results)
+            assert not buf._waiters
+
+            events, cursor = await buf.read_with_timeout(1, timeout=0.01)
+            assert events is None
+            assert cursor == 1
+
+        asyncio.run(_run())
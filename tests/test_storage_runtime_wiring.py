@@ -211,6 +211,9 @@ class _FakeRunEventRepo:
     def delete_runs(self, thread_id: str, run_ids: list[str]) -> int:
         return 0
 
+    def flush(self) -> None:
+        pass
+
     def close(self) -> None:
         self.closed = True
 
@@ -54,3 +54,26 @@ def test_supabase_summary_repo_save_list_get_and_delete():
 def test_supabase_summary_repo_requires_compatible_client():
     with pytest.raises(RuntimeError, match="table\\(name\\)"):
         SupabaseSummaryRepo(client=object())
+
+
+def test_supabase_summary_repo_summary_nodes():
+    tables: dict[str, list[dict]] = {"summaries": [], "summary_nodes": []}
+    repo = SupabaseSummaryRepo(client=FakeSupabaseClient(tables=tables))
+
+    leaf = {"level": 0, "start_index": 0, "end_index": 4, "summary_text": "a", "child_ids": []}
+    repo.save_summary_nodes(
+        "t-1",
+        [{**leaf, "node_id": "n-a"}, {**leaf, "node_id": "n-b", "start_index": 4, "end_index": 8}],
+        "2025-01-01T00:00:00",
+    )
+    repo.save_summary_nodes(
+        "t-1",
+        [{**leaf, "node_id": "n-ab", "level": 1, "end_index": 8, "summary_text": "ab", "child_ids": ["n-a", "n-b"]}],
+        "2025-01-01T00:01:00",
+    )
+
+    assert [row["node_id"] for row in repo.list_summary_node_rows("t-1", roots_only=True)] == ["n-ab"]
+    assert [row["node_id"] for row in repo.list_summary_node_rows("t-1")] == ["n-ab", "n-a", "n-b"]
+
+    repo.delete_thread_summaries("t-1")
+    assert repo.list_summary_node_rows("t-1") == []
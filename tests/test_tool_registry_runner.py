@@ -76,6 +76,47 @@ class TestToolRegistry:
         results = reg.search("TaskCreate")
         assert any(e.name == "TaskCreate" for e in results)
 
+    def test_search_ranks_by_name_description_and_params(self):
+        reg = ToolRegistry()
+        for name, desc, params in [
+            ("mcp__github__create_issue", "Open a new issue in a GitHub repository", ["repo", "title", "body"]),
+            ("mcp__github__list_issues", "List issues in a repository", ["repo", "state"]),
+            ("mcp__slack__post_message", "Post a message to a Slack channel", ["channel", "text"]),
+        ]:
+            reg.register(ToolEntry(
+                name=name,
+                mode=ToolMode.DEFERRED,
+                schema={
+                    "name": name,
+                    "description": desc,
+                    "parameters": {"type": "object", "properties": {p: {"type": "string"} for p in params}},
+                },
+                handler=lambda: "",
+                source="mcp",
+            ))
+
+        ranked = reg.search_scored("create github issue")
+        assert ranked[0][0].name == "mcp__github__create_issue"
+        assert ranked[0][1] > ranked[1][1] > 0
+        assert reg.search("channel")[0].name == "mcp__slack__post_message"  # parameter name
+        assert reg.search("creat")[0].name == "mcp__github__create_issue"  # prefix expansion
+        assert reg.search("nothing like this") == []
+
+    def test_tool_search_returns_top_k_with_scores(self):
+        from core.tools.tool_search.service import ToolSearchService
+
+        reg = ToolRegistry()
+        for i in range(30):
+            reg.register(self._make_entry(f"Task{i}", ToolMode.DEFERRED))
+        svc = ToolSearchService(reg)
+
+        results = json.loads(svc._search("task", max_results=3))
+        assert len(results) == 3
+        assert all("score" in r and r["name"].startswith("Task") for r in results)
+
+        miss = svc._search("zzz")
+        assert miss.startswith("No tools matched") and "Task0" in miss and '"description"' not in miss
+
     def test_allowed_tools_filter(self):
         reg = ToolRegistry(allowed_tools={"Read", "Grep"})
         reg.register(self._make_entry("Read"))
@@ -149,6 +190,87 @@ class TestToolValidator:
         result = v.validate(schema, {"a": "hello", "extra": "ok"})
         assert result.ok
 
+    def test_nested_objects_and_arrays_are_checked_with_paths(self):
+        v = ToolValidator()
+        schema = {
+            "name": "MultiEdit",
+            "parameters": {
+                "type": "object",
+                "required": ["edits"],
+                "properties": {
+                    "edits": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["old_string"],
+                            "properties": {
+                                "old_string": {"type": "string"},
+                                "mode": {"type": "string", "enum": ["replace", "append"]},
+                            },
+                        },
+                    },
+                },
+            },
+        }
+        assert v.validate(schema, {"edits": [{"old_string": "a"}]}).ok
+        with pytest.raises(InputValidationError, match=r"`edits\[1\]\.old_string` is missing"):
+            v.validate(schema, {"edits": [{"old_string": "a"}, {}]})
+        with pytest.raises(InputValidationError, match=r"`edits\[0\]\.old_string` type is expected as `string`"):
+            v.validate(schema, {"edits": [{"old_string": 3}]})
+        with pytest.raises(InputValidationError, match="append"):
+            v.validate(schema, {"edits": [{"old_string": "a", "mode": "delete"}]})
+
+    def test_defaults_and_numeric_string_coercion(self):
+        v = ToolValidator()
+        schema = {
+            "name": "chats",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "limit": {"type": "integer", "default": 20},
+                    "ratio": {"type": "number"},
+                    "unread_only": {"type": "boolean", "default": False},
+                },
+            },
+        }
+        assert v.validate(schema, {}).params == {"limit": 20, "unread_only": False}
+        assert v.validate(schema, {"limit": "5", "ratio": "0.5"}).params["limit"] == 5
+        assert v.validate(schema, {"ratio": "0.5"}).params["ratio"] == 0.5
+        for bad in ({"limit": "2.5"}, {"limit": "many"}, {"limit": True}, {"ratio": "nan"}):
+            with pytest.raises(InputValidationError):
+                v.validate(schema, bad)
+
+    def test_compiled_once_per_schema_object(self):
+        v = ToolValidator()
+        schema = self._schema(["a"], {"a": "string"})
+        assert v.compile(schema) is v.compile(schema)
+        assert v.compile(dict(schema)) is not v.compile(schema)
+
+    def test_runner_passes_coerced_args_to_handler(self):
+        received = {}
+
+        def handler(limit: int, unread_only: bool) -> str:
+            received.update(limit=limit, unread_only=unread_only)
+            return "ok"
+
+        entry = ToolEntry(
+            name="chats",
+            mode=ToolMode.INLINE,
+            schema={
+                "name": "chats",
+                "parameters": {
+                    "type": "object",
+                    "properties": {"limit": {"type": "integer"}, "unread_only": {"type": "boolean", "default": False}},
+                },
+            },
+            handler=handler,
+            source="test",
+        )
+        runner = _make_runner([entry])
+        result = runner.wrap_tool_call(_make_tool_call_request("chats", {"limit": "3"}), MagicMock())
+        assert result.content == "ok"
+        assert received == {"limit": 3, "unread_only": False}
+
 
 # ---------------------------------------------------------------------------
 # ToolRunner — P0 error normalization
@@ -312,6 +434,60 @@ class TestToolRunnerInlineInjection:
         schemas = runner._registry.get_inline_schemas()
         assert all(s["name"] != "TaskCreate" for s in schemas)
 
+    def test_inline_snapshot_is_reused_until_registry_changes(self):
+        calls = []
+
+        def provider():
+            calls.append(1)
+            return {"name": "load_skill", "description": "skills"}
+
+        reg = ToolRegistry()
+        reg.register(
+            ToolEntry(name="load_skill", mode=ToolMode.INLINE, schema=provider, handler=lambda: "", source="t")
+        )
+        first = reg.inline_snapshot()
+        calls_after_first = len(calls)
+        assert reg.inline_snapshot() is first
+        assert len(calls) == calls_after_first
+
+        reg.register(
+            ToolEntry(name="Read", mode=ToolMode.INLINE, schema={"name": "Read"}, handler=lambda: "", source="t")
+        )
+        second = reg.inline_snapshot()
+        assert second.version > first.version
+        assert second.schemas[0] == first.schemas[0]
+        assert second.names == {"load_skill", "Read"}
+
+        reg.set_blocked_tools({"Read"})
+        assert reg.inline_snapshot().names == {"load_skill"}
+        assert reg.get("Read") is None
+
+    def test_merged_tool_list_is_byte_stable_across_calls(self):
+        schema = {"name": "Read", "description": "read file"}
+        runner = _make_runner(
+            [ToolEntry(name="Read", mode=ToolMode.INLINE, schema=schema, handler=lambda: "ok", source="test")]
+        )
+        builtin = MagicMock()
+        builtin.name = "builtin"
+        builtin_tools = [builtin]
+
+        seen = []
+        for _ in range(3):
+            request = MagicMock()
+            request.tools = list(builtin_tools)
+            runner._inject_tools(request)
+            seen.append(request.override.call_args.kwargs["tools"])
+
+        assert seen[0] is seen[1] is seen[2]
+        assert seen[0][0] is builtin and seen[0][1] == schema
+        schema["description"] = "mutated after registration"
+        assert json.dumps(seen[0][1]) == json.dumps({"name": "Read", "description": "read file"})
+
+        request = MagicMock()
+        request.tools = [builtin, {"name": "Read"}]  # already present → not duplicated
+        runner._inject_tools(request)
+        assert request.override.call_args.kwargs["tools"] == [builtin, {"name": "Read"}]
+
 
 # ---------------------------------------------------------------------------
 # P1: tool_modes from config honored
@@ -346,3 +522,149 @@ class TestToolModeFromConfig:
             assert entry.mode == ToolMode.INLINE, (
                 f"{tool_name} should be INLINE, got {entry.mode}"
             )
+
+
+# ---------------------------------------------------------------------------
+# ToolRunner — blocking handlers on the tool pool
+# ---------------------------------------------------------------------------
+
+
+class TestBlockingToolPool:
+    def _blocking_entry(self, name: str, handler, max_concurrency: int | None = None) -> ToolEntry:
+        return ToolEntry(
+            name=name,
+            mode=ToolMode.INLINE,
+            schema={"name": name, "parameters": {"type": "object", "properties": {}}},
+            handler=handler,
+            source="test",
+            blocking=True,
+            max_concurrency=max_concurrency,
+        )
+
+    @pytest.mark.asyncio
+    async def test_blocking_handler_does_not_stall_event_loop(self):
+        import asyncio
+        import threading
+        import time
+
+        from core.runtime.tool_pool import BlockingToolPool
+
+        loop_thread = threading.get_ident()
+        seen: list[int] = []
+
+        def slow_grep() -> str:
+            seen.append(threading.get_ident())
+            time.sleep(0.3)
+            return "matches"
+
+        reg = ToolRegistry()
+        reg.register(self._blocking_entry("Grep", slow_grep))
+        runner = ToolRunner(registry=reg, pool=BlockingToolPool(max_workers=2))
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        result = await runner.awrap_tool_call(_make_tool_call_request("Grep", {}), MagicMock())
+        tick_task.cancel()
+
+        assert result.content == "matches"
+        assert seen and seen[0] != loop_thread
+        assert ticks >= 10  # loop kept running while the handler slept
+
+    @pytest.mark.asyncio
+    async def test_context_is_copied_and_errors_are_normalized(self):
+        from core.runtime.tool_pool import BlockingToolPool
+        from sandbox.thread_context import get_current_thread_id, set_current_thread_id
+
+        def whoami() -> str:
+            return get_current_thread_id() or "none"
+
+        def broken() -> str:
+            raise RuntimeError("disk on fire")
+
+        reg = ToolRegistry()
+        reg.register(self._blocking_entry("WhoAmI", whoami))
+        reg.register(self._blocking_entry("Broken", broken))
+        pool = BlockingToolPool(max_workers=2)
+        runner = ToolRunner(registry=reg, pool=pool)
+
+        set_current_thread_id("thread-42")
+        result = await runner.awrap_tool_call(_make_tool_call_request("WhoAmI", {}), MagicMock())
+        assert result.content == "thread-42"
+
+        result = await runner.awrap_tool_call(_make_tool_call_request("Broken", {}), MagicMock())
+        assert "<tool_use_error>" in result.content and "disk on fire" in result.content
+        assert pool.get_metrics()["tools"]["Broken"]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_per_tool_cap_and_queue_metrics(self):
+        import asyncio
+        import threading
+        import time
+
+        from core.runtime.tool_pool import BlockingToolPool
+
+        lock = threading.Lock()
+        running = peak = 0
+
+        def capped() -> str:
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return "ok"
+
+        reg = ToolRegistry()
+        reg.register(self._blocking_entry("Grep", capped, max_concurrency=2))
+        pool = BlockingToolPool(max_workers=8)
+        runner = ToolRunner(registry=reg, pool=pool)
+
+        results = await asyncio.gather(
+            *(runner.awrap_tool_call(_make_tool_call_request("Grep", {}, f"tc-{i}"), MagicMock()) for i in range(6))
+        )
+
+        assert [r.content for r in results] == ["ok"] * 6
+        assert peak == 2
+        stats = pool.get_metrics()["tools"]["Grep"]
+        assert stats["calls"] == 6 and stats["queued"] == 0 and stats["running"] == 0
+        assert stats["queue_ms_max"] >= 80  # the last pair waited for two earlier rounds
+
+    def test_sync_path_and_non_blocking_entries_are_unchanged(self):
+        entry = ToolEntry(
+            name="Echo", mode=ToolMode.INLINE, schema={"name": "Echo"}, handler=lambda: "hi", source="test"
+        )
+        assert entry.blocking is False
+        runner = _make_runner([entry])
+        assert runner.wrap_tool_call(_make_tool_call_request("Echo", {}), MagicMock()).content == "hi"
+
+    def test_io_services_register_blocking_handlers(self, tmp_path):
+        from core.tools.search.service import SearchService
+        from core.tools.task.service import TaskService
+
+        reg = ToolRegistry()
+        SearchService(registry=reg, workspace_root=tmp_path)
+        TaskService(registry=reg, db_path=tmp_path / "test.db")
+        assert all(reg.get(n).blocking for n in ["Grep", "Glob", "TaskCreate", "TaskList"])
+        assert reg.get("Grep").max_concurrency is not None
+
+
+class TestChatEventBusFromThreads:
+    @pytest.mark.asyncio
+    async def test_publish_from_tool_thread_reaches_subscriber(self):
+        import asyncio
+
+        from backend.web.services.chat_events import ChatEventBus
+
+        bus = ChatEventBus()
+        queue = bus.subscribe("chat-1")
+        await asyncio.to_thread(bus.publish, "chat-1", {"event": "message"})
+        assert await asyncio.wait_for(queue.get(), timeout=1) == {"event": "message"}
@@ -0,0 +1,103 @@
+"""Benchmark: tool_search over 1000 DEFERRED tools, BM25 index vs the linear substring scan.
+
+The linear scan calls get_schema() on every entry per query and, when
+nothing matches, returns every full schema pretty-printed. The index ranks
+only postings for the query terms and returns the top-k.
+"""
+
+import json
+import random
+import time
+
+from core.runtime.registry import ToolEntry, ToolMode, ToolRegistry
+from core.tools.tool_search.service import ToolSearchService
+
+N_TOOLS = 1000
+VERBS = ["create", "list", "get", "update", "delete", "search", "export", "sync", "archive", "merge"]
+NOUNS = [
+    "issue", "pull_request", "branch", "commit", "invoice", "customer", "ticket", "channel", "message",
+    "file", "folder", "calendar_event", "contact", "deployment", "pipeline", "alert", "dashboard",
+    "report", "user", "team", "project", "milestone", "label", "webhook", "secret",
+]
+SERVERS = ["github", "jira", "slack", "stripe", "gdrive", "gcal", "pagerduty", "grafana", "linear", "vercel"]
+QUERIES = ["create github issue", "list slack channels", "stripe invoice", "delete webhook", "pipeline deploy", "zzz"]
+
+
+def _legacy_search(registry: ToolRegistry, query: str) -> str:
+    q = query.lower()
+    results = []
+    for entry in registry.list_all():
+        schema = entry.get_schema()
+        if q in schema.get("name", "").lower() or q in schema.get("description", "").lower():
+            results.append(entry)
+    if not results:
+        results = registry.list_all()
+    return json.dumps([e.get_schema() for e in results], indent=2, ensure_ascii=False)
+
+
+def _build_registry() -> ToolRegistry:
+    rng = random.Random(7)
+    registry = ToolRegistry()
+    for i in range(N_TOOLS):
+        server, verb, noun = SERVERS[i % len(SERVERS)], VERBS[(i // 10) % len(VERBS)], NOUNS[i % len(NOUNS)]
+        name = f"mcp__{server}__{verb}_{noun}_{i}"
+        params = rng.sample(["id", "query", "limit", "cursor", "owner", "repo", "title", "body", "channel"], 3)
+        registry.register(ToolEntry(
+            name=name,
+            mode=ToolMode.DEFERRED,
+            schema={
+                "name": name,
+                "description": f"{verb.capitalize()} a {noun.replace('_', ' ')} in {server.capitalize()}. " * 3,
+                "parameters": {"type": "object", "properties": {p: {"type": "string"} for p in params}},
+            },
+            handler=lambda: "",
+            source="mcp",
+        ))
+    return registry
+
+
+def test_tool_search_index_vs_linear_scan(monkeypatch):
+    schema_reads = [0]
+    get_schema = ToolEntry.get_schema
+
+    def counted_get_schema(entry):
+        schema_reads[0] += 1
+        return get_schema(entry)
+
+    start = time.perf_counter()
+    registry = _build_registry()
+    build_ms = (time.perf_counter() - start) * 1000
+    service = ToolSearchService(registry)
+
+    monkeypatch.setattr(ToolEntry, "get_schema", counted_get_schema)
+    legacy_ms = indexed_ms = 0.0
+    legacy_bytes = indexed_bytes = 0
+    legacy_reads = indexed_reads = 0
+    for query in QUERIES:
+        schema_reads[0] = 0
+        start = time.perf_counter()
+        legacy = _legacy_search(registry, query)
+        legacy_ms += (time.perf_counter() - start) * 1000
+        legacy_reads += schema_reads[0]
+        schema_reads[0] = 0
+        start = time.perf_counter()
+        indexed = service._search(query)
+        indexed_ms += (time.perf_counter() - start) * 1000
+        indexed_reads += schema_reads[0]
+        legacy_bytes += len(legacy.encode())
+        indexed_bytes += len(indexed.encode())
+
+    print(f"\n[Performance Test] tool_search over {N_TOOLS} deferred tools, {len(QUERIES)} queries")
+    print(f"  Register + index: {build_ms:.1f}ms")
+    for label, ms, size, reads in (
+        ("Linear scan:", legacy_ms, legacy_bytes, legacy_reads),
+        ("BM25 index: ", indexed_ms, indexed_bytes, indexed_reads),
+    ):
+        n = len(QUERIES)
+        print(f"  {label}     {ms / n:.2f}ms/query, {size // n:,} bytes/query, {reads // n:,} get_schema()/query")
+
+    top = json.loads(service._search("create github issue"))
+    assert top[0]["name"].startswith("mcp__github__create_issue")
+    assert indexed_bytes < legacy_bytes / 20
+    # Only the top-k hits are materialized; the no-match query ("zzz") still falls back to one scan.
+    assert indexed_reads * 5 < legacy_reads
@@ -0,0 +1,160 @@
+"""Tests for map-reduce WebFetch extraction over page chunks."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from core.runtime.registry import ToolRegistry
+from core.tools.web.extraction import NO_ANSWER, join_batch, rank_chunks, select_batches
+from core.tools.web.fetchers.markdownify import MarkdownifyFetcher
+from core.tools.web.service import WebService
+from core.tools.web.types import ContentChunk, FetchResult
+
+
+class FakeModel:
+    """Answers from the excerpt it was given; tracks prompt sizes and concurrency."""
+
+    def __init__(self, delay: float = 0.0, per_char: float = 0.0):
+        self.delay = delay
+        self.per_char = per_char
+        self.prompts: list[str] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def ainvoke(self, prompt: str, config=None):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay + self.per_char * len(prompt))
+        finally:
+            self.active -= 1
+        if prompt.startswith("You extracted information from different parts"):
+            return SimpleNamespace(content="merged")
+        if "pricing" in prompt.split("User's request:")[0]:
+            return SimpleNamespace(content="plans cost $10")
+        return SimpleNamespace(content=NO_ANSWER)
+
+
+def _page(sections: int = 40, relevant: tuple[int, ...] = (7,)) -> str:
+    parts = []
+    for i in range(sections):
+        body = "The pricing table lists every plan." if i in relevant else "Unrelated setup instructions."
+        parts.append(f"## Section {i}\n" + (body + " filler text for this section.\n") * 90)
+    return "\n".join(parts)
+
+
+def _fetch_result(content: str) -> FetchResult:
+    fetcher = MarkdownifyFetcher()
+    return fetcher._finish(FetchResult(url="https://docs.example/big"), content)
+
+
+def _service(model) -> WebService:
+    return WebService(ToolRegistry(), extraction_model=model)
+
+
+async def _web_fetch(service: WebService, result: FetchResult, prompt: str) -> str:
+    async def fetch(url):
+        return result
+
+    service._fetchers = [("Fake", SimpleNamespace(fetch=fetch))]
+    return await service._web_fetch(result.url, prompt)
+
+
+def test_rank_chunks_prefers_prompt_terms_and_headings():
+    chunks = [
+        ContentChunk(0, "intro about installation"),
+        ContentChunk(1, "the pricing of enterprise plans", heading="Pricing"),
+        ContentChunk(2, "pricing mentioned once"),
+    ]
+    ranked = rank_chunks(chunks, "What is the pricing for plans?")
+    assert [chunk.position for chunk, _ in ranked] == [1, 2, 0]
+    assert ranked[-1][1] == 0
+
+
+def test_select_batches_respects_budget_and_page_order():
+    chunks = [ContentChunk(i, ("pricing " if i in (9, 3, 5) else "other ") * 100) for i in range(12)]
+    batches = select_batches(chunks, "pricing", budget=2500, batch_chars=1700)
+    positions = [[c.position for c in batch] for batch in batches]
+    assert positions == [[3, 5], [9]]
+    assert join_batch(batches[0]).count("[...]") == 1
+    assert join_batch([chunks[0], chunks[1]]) == chunks[0].content + "\n" + chunks[1].content
+
+
+def test_small_page_keeps_single_call():
+    model = FakeModel()
+    result = _fetch_result("short page about pricing")
+    asyncio.run(_web_fetch(_service(model), result, "pricing?"))
+    assert len(model.prompts) == 1
+    assert model.prompts[0].startswith("You are extracting information from a web page.")
+
+
+def test_large_page_maps_relevant_chunks_and_merges():
+    model = FakeModel(delay=0.01)
+    result = _fetch_result(_page(relevant=(3, 12)))
+    answer = asyncio.run(_web_fetch(_service(model), result, "What does the pricing table say?"))
+
+    map_prompts = [p for p in model.prompts if p.startswith("You are extracting information from excerpts")]
+    assert answer == "merged"
+    assert len(model.prompts) == len(map_prompts) + 1
+    assert 1 < len(map_prompts) <= 4
+    assert model.max_active <= 4
+    assert sum(len(p) for p in map_prompts) < len(result.content) / 2
+
+
+def test_single_relevant_answer_skips_merge_and_failures_fall_back():
+    model = FakeModel()
+    result = _fetch_result(_page(relevant=(5,)))
+    answer = asyncio.run(_web_fetch(_service(model), result, "pricing"))
+    assert answer == "plans cost $10"
+    assert not any(p.startswith("You extracted information") for p in model.prompts)
+
+    class Broken:
+        async def ainvoke(self, prompt, config=None):
+            raise RuntimeError("boom")
+
+    answer = asyncio.run(_web_fetch(_service(Broken()), result, "pricing"))
+    assert answer.startswith("AI extraction failed for every part of the page.")
+
+
+def test_answer_past_fetch_max_chars_is_found():
+    model = FakeModel()
+    service = _service(model)
+    content = _page(sections=120, relevant=(115,))
+    assert content.index("pricing") > 100_000
+
+    fetcher = service._fetchers[-1][1]
+    result = fetcher._finish(FetchResult(url="https://docs.example/long"), content)
+    assert not result.truncated
+
+    answer = asyncio.run(_web_fetch(service, result, "What does the pricing table say?"))
+    assert answer == "plans cost $10"
+
+
+def test_map_reduce_cuts_prompt_size_and_latency():
+    """[Performance Test] 100k-char page: one full-page call vs ranked, concurrent chunk extraction."""
+    content = _page(sections=50, relevant=(2, 15))
+    result = _fetch_result(content)
+    prompt = "Summarize the pricing table"
+    per_char = 2e-6  # simulated model latency grows with prompt length
+
+    single = FakeModel(per_char=per_char)
+    start = time.perf_counter()
+    asyncio.run(_service(single)._ai_extract(result.content, prompt, result.url))
+    single_s = time.perf_counter() - start
+
+    mapped = FakeModel(per_char=per_char)
+    start = time.perf_counter()
+    answer = asyncio.run(_web_fetch(_service(mapped), result, prompt))
+    mapped_s = time.perf_counter() - start
+
+    single_chars = sum(len(p) for p in single.prompts)
+    mapped_chars = sum(len(p) for p in mapped.prompts)
+    print(f"\n[Performance Test] extraction over {len(result.content):,} chars ({result.total_chunks} chunks)")
+    print(f"  single call: {single_chars:>8,} prompt chars, {single_s * 1000:.0f}ms")
+    print(f"  map-reduce:  {mapped_chars:>8,} prompt chars in {len(mapped.prompts)} calls, {mapped_s * 1000:.0f}ms")
+
+    assert answer == "merged"
+    assert mapped_chars < single_chars / 2
@@ -0,0 +1,208 @@
+"""Tests for the pooled HTTP client and on-disk page cache behind WebFetch."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from core.tools.web.cache import CachedPage, WebFetchCache
+from core.tools.web.fetchers.jina import JinaFetcher
+from core.tools.web.fetchers.markdownify import MarkdownifyFetcher
+from core.tools.web.http import HttpClientPool
+
+
+class _Origin:
+    """MockTransport origin serving one page with an ETag; records every request."""
+
+    def __init__(self, body: str = "# Docs\n\nhello", etag: str = '"v1"', headers: dict | None = None):
+        self.body = body
+        self.etag = etag
+        self.headers = headers or {}
+        self.requests: list[httpx.Request] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag})
+        return httpx.Response(
+            200,
+            text=self.body,
+            headers={"Content-Type": "text/plain", "ETag": self.etag, **self.headers},
+        )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = WebFetchCache(cache_dir=tmp_path / "web_cache", ttl=60)
+    yield cache
+    cache.close()
+
+
+def _fetcher(origin: _Origin, cache: WebFetchCache | None) -> MarkdownifyFetcher:
+    http = HttpClientPool(transport=httpx.MockTransport(origin.handler))
+    return MarkdownifyFetcher(http=http, cache=cache)
+
+
+def test_fresh_entry_is_served_without_a_request(cache):
+    origin = _Origin()
+    fetcher = _fetcher(origin, cache)
+
+    async def run():
+        first = await fetcher.fetch("https://docs.example/page")
+        second = await fetcher.fetch("https://docs.example/page")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.content == second.content == "# Docs\n\nhello"
+    assert second.total_chunks == first.total_chunks == 1
+    assert len(origin.requests) == 1
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_stale_entry_is_revalidated_with_etag(cache):
+    origin = _Origin()
+    fetcher = _fetcher(origin, cache)
+    url = "https://docs.example/page"
+
+    async def run():
+        await fetcher.fetch(url)
+        cache.ttl = 0  # everything is stale now
+        revalidated = await fetcher.fetch(url)
+        origin.body, origin.etag = "# Docs\n\nchanged", '"v2"'
+        changed = await fetcher.fetch(url)
+        return revalidated, changed
+
+    revalidated, changed = asyncio.run(run())
+    assert origin.requests[1].headers["if-none-match"] == '"v1"'
+    assert revalidated.content == "# Docs\n\nhello"
+    assert changed.content == "# Docs\n\nchanged"
+    assert cache.get_stats()["revalidated"] == 1
+    assert cache.get(fetcher._cache_key(url)).etag == '"v2"'
+
+
+def test_no_store_responses_are_not_cached(cache):
+    origin = _Origin(headers={"Cache-Control": "no-store"})
+    fetcher = _fetcher(origin, cache)
+
+    async def run():
+        await fetcher.fetch("https://docs.example/private")
+        await fetcher.fetch("https://docs.example/private")
+
+    asyncio.run(run())
+    assert len(origin.requests) == 2
+    assert cache.get_stats()["pages"] == 0
+
+
+def test_jina_fetcher_uses_cache_and_pool(cache):
+    origin = _Origin(body="# Title\n\nbody")
+    http = HttpClientPool(transport=httpx.MockTransport(origin.handler))
+    fetcher = JinaFetcher("key", http=http, cache=cache)
+
+    async def run():
+        return [await fetcher.fetch("https://docs.example/a") for _ in range(3)]
+
+    results = asyncio.run(run())
+    assert [r.title for r in results] == ["Title"] * 3
+    assert len(origin.requests) == 1
+    assert origin.requests[0].url == "https://r.jina.ai/https://docs.example/a"
+
+
+def test_identical_bodies_share_a_blob_and_lru_evicts(tmp_path):
+    cache = WebFetchCache(cache_dir=tmp_path / "web_cache", max_bytes=250)
+    try:
+        cache.put(CachedPage(key="a", url="https://a", content="x" * 100))
+        cache.put(CachedPage(key="b", url="https://b", content="x" * 100))
+        assert cache.get_stats()["bytes"] == 100
+        assert len(list((tmp_path / "web_cache" / "blobs").rglob("*.md"))) == 1
+
+        cache.put(CachedPage(key="c", url="https://c", content="y" * 100))
+        time.sleep(0.01)
+        cache.get("a")  # a is now more recently used than b
+        cache.put(CachedPage(key="d", url="https://d", content="z" * 100))
+
+        stats = cache.get_stats()
+        assert stats["bytes"] <= 250
+        assert cache.get("c") is None  # least recently used
+        assert cache.get("a") is not None and cache.get("d") is not None
+        assert len(list((tmp_path / "web_cache" / "blobs").rglob("*.md"))) == 2
+    finally:
+        cache.close()
+
+
+def test_pool_reuses_one_client_per_loop():
+    pool = HttpClientPool()
+
+    async def clients():
+        same = pool.client() is pool.client()
+        insecure = pool.client(verify=False) is not pool.client()
+        client = pool.client()
+        await pool.aclose()
+        return same, insecure, client.is_closed
+
+    assert asyncio.run(clients()) == (True, True, True)
+
+
+def test_pooled_fetches_reuse_the_connection():
+    """[Performance Test] 30 fetches of a keep-alive origin: pooled client vs a client per fetch."""
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address)
+
+        def do_GET(self):
+            body = b"# page\n\n" + b"text " * 200
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/doc"
+    rounds = 30
+
+    async def per_fetch_clients() -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            async with httpx.AsyncClient() as client:
+                (await client.get(url)).raise_for_status()
+        return time.perf_counter() - start
+
+    async def pooled() -> float:
+        fetcher = MarkdownifyFetcher(http=HttpClientPool())
+        start = time.perf_counter()
+        for _ in range(rounds):
+            assert (await fetcher.fetch(url)).error is None
+        elapsed = time.perf_counter() - start
+        await fetcher.http.aclose()
+        return elapsed
+
+    try:
+        fresh_s = asyncio.run(per_fetch_clients())
+        fresh_connections = len(connections)
+        connections.clear()
+        pooled_s = asyncio.run(pooled())
+        pooled_connections = len(connections)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"\n[Performance Test] {rounds} fetches of a local keep-alive origin")
+    print(f"  client per fetch: {fresh_s * 1000:.1f}ms, {fresh_connections} connections")
+    print(f"  pooled client:    {pooled_s * 1000:.1f}ms, {pooled_connections} connections")
+
+    assert fresh_connections == rounds
+    assert pooled_connections == 1
@@ -0,0 +1,198 @@
+"""Tests for the normalized-query WebSearch result cache."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from core.runtime.registry import ToolRegistry
+from core.tools.web import search_cache as search_cache_mod
+from core.tools.web.hedging import HedgedSearch
+from core.tools.web.search_cache import WebSearchCache, cache_key
+from core.tools.web.service import WebService
+from core.tools.web.types import SearchItem, SearchResult
+
+
+class CountingSearch:
+    def __init__(self, n_items: int = 5, delay: float = 0.0, error: str | None = None):
+        self.n_items = n_items
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def for_query(self, query: str):
+        async def search() -> SearchResult | None:
+            self.calls += 1
+            await asyncio.sleep(self.delay)
+            if self.error:
+                return None
+            items = [SearchItem(title=f"r{i}", url=f"https://example.com/{i}") for i in range(self.n_items)]
+            return SearchResult(query=query, results=items, total_results=len(items))
+
+        return search
+
+
+def _lookup(cache: WebSearchCache, provider: CountingSearch, query: str, max_results: int = 5, **domains):
+    return cache.get_or_search(
+        query,
+        max_results,
+        domains.get("include"),
+        domains.get("exclude"),
+        provider.for_query(query),
+    )
+
+
+def test_near_identical_queries_share_an_entry():
+    assert cache_key("  Python   asyncio TaskGroup? ", None, None) == cache_key("python asyncio taskgroup", None, None)
+    assert cache_key("q", ["https://www.Docs.python.org/3/", "docs.python.org"], None) == cache_key(
+        "q", ["docs.python.org"], []
+    )
+    assert cache_key("q", ["a.com"], None) != cache_key("q", None, ["a.com"])
+
+    cache = WebSearchCache()
+    provider = CountingSearch()
+
+    async def run():
+        first = await _lookup(cache, provider, "Python asyncio TaskGroup")
+        second = await _lookup(cache, provider, "python  asyncio taskgroup?")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert provider.calls == 1
+    assert second.query == "python  asyncio taskgroup?"
+    assert [i.url for i in second.results] == [i.url for i in first.results]
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_larger_entry_serves_smaller_max_results():
+    cache = WebSearchCache()
+    provider = CountingSearch(n_items=8)
+
+    async def run():
+        await _lookup(cache, provider, "q", max_results=8)
+        small = await _lookup(cache, provider, "q", max_results=3)
+        await _lookup(cache, provider, "q", max_results=10)
+        return small
+
+    small = asyncio.run(run())
+    assert len(small.results) == small.total_results == 3
+    assert provider.calls == 2  # 8 → served 3 from cache, 10 needed a refetch
+
+
+def test_ttl_lru_and_failures():
+    cache = WebSearchCache(ttl=60, max_entries=2)
+    provider = CountingSearch()
+    failing = CountingSearch(error="down")
+
+    async def run():
+        for q in ("a", "b", "a", "c"):  # c evicts b (a was used more recently)
+            await _lookup(cache, provider, q)
+        await _lookup(cache, provider, "a")
+        await _lookup(cache, provider, "b")
+        assert await _lookup(cache, failing, "x") is None
+        assert await _lookup(cache, failing, "x") is None
+
+    asyncio.run(run())
+    assert provider.calls == 4
+    assert failing.calls == 2
+    stats = cache.get_stats()
+    assert stats["evictions"] >= 1 and stats["entries"] == 2
+
+    cache.ttl = 0
+    asyncio.run(_lookup(cache, provider, "a"))
+    assert provider.calls == 5
+    assert cache.get_stats()["expired"] == 1
+
+
+def test_concurrent_identical_searches_are_joined():
+    cache = WebSearchCache()
+    provider = CountingSearch(delay=0.05)
+
+    async def run():
+        return await asyncio.gather(*(_lookup(cache, provider, "same query") for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert provider.calls == 1
+    assert all(len(r.results) == 5 for r in results)
+    stats = cache.get_stats()
+    assert stats["joined"] == 4
+    assert stats["hit_rate"] == 0.8
+
+
+def test_persisted_entries_survive_a_new_process(tmp_path):
+    db_path = tmp_path / "search.db"
+    provider = CountingSearch()
+    first = WebSearchCache(db_path=db_path)
+    asyncio.run(_lookup(first, provider, "persist me"))
+    first.close()
+
+    second = WebSearchCache(db_path=db_path)
+    result = asyncio.run(_lookup(second, provider, "Persist me"))
+    second.close()
+    assert provider.calls == 1
+    assert result.results[0] == SearchItem(title="r0", url="https://example.com/0")
+    assert second.get_stats()["disk_hits"] == 1
+
+
+def test_web_service_and_monitor_counters(monkeypatch):
+    from backend.web.services.monitor_service import web_search_cache_snapshot
+
+    monkeypatch.setattr(search_cache_mod, "_shared_cache", None)
+    assert web_search_cache_snapshot()["enabled"] is False
+
+    cache = search_cache_mod.get_shared_search_cache()
+    service = WebService(ToolRegistry(), search_cache=cache)
+    provider = CountingSearch()
+
+    class Searcher:
+        async def search(self, query, max_results=None, include_domains=None, exclude_domains=None):
+            return await provider.for_query(query)()
+
+    service._searchers[:] = [("Stub", Searcher())]
+    service._search = HedgedSearch(service._searchers)
+
+    async def run():
+        return [await service._web_search("What is BM25?") for _ in range(3)]
+
+    outputs = asyncio.run(run())
+    assert provider.calls == 1
+    assert outputs[0] == outputs[1] == outputs[2]
+    snapshot = web_search_cache_snapshot()
+    assert snapshot["enabled"] is True
+    assert (snapshot["hits"], snapshot["misses"]) == (2, 1)
+    assert service.get_search_stats()["cache"]["hits"] == 2
+
+
+def test_cache_absorbs_repeated_team_queries():
+    """[Performance Test] 5 agents x 20 searches over 10 distinct (variously spelled) queries."""
+    provider_latency = 0.02
+    topics = [f"how to configure service {i}" for i in range(10)]
+    spellings = [str.lower, str.title, lambda q: f"  {q}? ", lambda q: q.replace(" ", "  ")]
+
+    async def agent(cache: WebSearchCache | None, provider: CountingSearch, agent_id: int):
+        for n in range(20):
+            query = spellings[(agent_id + n) % len(spellings)](topics[(agent_id * 3 + n) % len(topics)])
+            if cache is None:
+                await provider.for_query(query)()
+            else:
+                await _lookup(cache, provider, query)
+
+    async def team(cache: WebSearchCache | None) -> tuple[float, int]:
+        provider = CountingSearch(delay=provider_latency)
+        start = time.perf_counter()
+        await asyncio.gather(*(agent(cache, provider, a) for a in range(5)))
+        return time.perf_counter() - start, provider.calls
+
+    uncached_s, uncached_calls = asyncio.run(team(None))
+    cache = WebSearchCache()
+    cached_s, cached_calls = asyncio.run(team(cache))
+
+    print("\n[Performance Test] 100 team searches, 10 distinct topics, 20ms provider latency")
+    print(f"  no cache: {uncached_calls} provider calls, {uncached_s * 1000:.0f}ms")
+    stats = cache.get_stats()
+    print(f"  cache:    {cached_calls} provider calls, {cached_s * 1000:.0f}ms, hit rate {stats['hit_rate']}")
+
+    assert uncached_calls == 100
+    assert cached_calls == 10
+    # Concurrent duplicates either hit the cache or join the in-flight lookup.
+    assert (stats["hits"] + stats["joined"], stats["misses"]) == (90, 10)
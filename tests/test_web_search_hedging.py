@@ -0,0 +1,137 @@
+"""Tests for hedged fan-out across web search providers."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from core.runtime.registry import ToolRegistry
+from core.tools.web.hedging import HedgedSearch
+from core.tools.web.service import WebService
+from core.tools.web.types import SearchItem, SearchResult
+
+
+class StubSearcher:
+    def __init__(self, name: str, delay: float, error: str | None = None, raises: bool = False):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.raises = raises
+        self.started = 0
+        self.cancelled = 0
+
+    async def search(self, query, max_results=None, include_domains=None, exclude_domains=None):
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.raises:
+            raise RuntimeError(f"{self.name} exploded")
+        result = SearchResult(query=query, error=self.error)
+        if not self.error:
+            result.results = [SearchItem(title=self.name, url=f"https://{self.name}.example")]
+        return result
+
+
+def _run(search: HedgedSearch):
+    return asyncio.run(search.search(query="q", max_results=3))
+
+
+def test_sequential_mode_matches_old_fallback():
+    first = StubSearcher("a", 0.01, error="HTTP error 500")
+    second = StubSearcher("b", 0.01)
+    search = HedgedSearch([("a", first), ("b", second)], hedge_delay=None)
+    name, result = _run(search)
+    assert name == "b"
+    assert result.results[0].title == "b"
+    assert (first.started, second.started) == (1, 1)
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    slow = StubSearcher("slow", 5.0)
+    fast = StubSearcher("fast", 0.01)
+    search = HedgedSearch([("slow", slow), ("fast", fast)], hedge_delay=0.05, adaptive=False)
+    start = time.perf_counter()
+    name, _ = _run(search)
+    assert name == "fast"
+    assert time.perf_counter() - start < 1.0
+    assert slow.cancelled == 1
+    stats = search.get_stats()["providers"]
+    assert stats["slow"]["cancelled"] == 1
+    assert stats["fast"]["wins"] == 1
+
+
+def test_failure_launches_next_without_waiting_for_hedge_delay():
+    broken = StubSearcher("broken", 0.0, raises=True)
+    good = StubSearcher("good", 0.0)
+    search = HedgedSearch([("broken", broken), ("good", good)], hedge_delay=10.0)
+    start = time.perf_counter()
+    name, _ = _run(search)
+    assert name == "good"
+    assert time.perf_counter() - start < 1.0
+    assert search.get_stats()["providers"]["broken"]["last_error"] == "RuntimeError: broken exploded"
+
+
+def test_zero_delay_launches_all_and_all_failures_return_none():
+    stubs = [StubSearcher(n, 0.01, error="down") for n in "abc"]
+    search = HedgedSearch([(s.name, s) for s in stubs], hedge_delay=0)
+    assert _run(search) is None
+    assert all(s.started == 1 for s in stubs)
+
+
+def test_adaptive_order_prefers_fast_healthy_providers():
+    flaky = StubSearcher("flaky", 0.0, error="429")
+    slowish = StubSearcher("slowish", 0.03)
+    quick = StubSearcher("quick", 0.0)
+    search = HedgedSearch([("flaky", flaky), ("slowish", slowish), ("quick", quick)], hedge_delay=0)
+    _run(search)
+    # slowish lost the race and was cancelled before it was measured, so it sorts last
+    assert search.get_stats()["order"] == ["quick", "flaky", "slowish"]
+
+    with pytest.raises(ValueError):
+        HedgedSearch([], hedge_delay=-1)
+
+
+def test_web_service_uses_hedged_search():
+    service = WebService(ToolRegistry(), search_hedge_delay=0.05)
+    slow, fast = StubSearcher("slow", 5.0), StubSearcher("fast", 0.01)
+    service._searchers[:] = [("slow", slow), ("fast", fast)]
+    service._search = HedgedSearch(service._searchers, hedge_delay=0.05, adaptive=False)
+    output = asyncio.run(service._web_search("q"))
+    assert "Title: fast" in output
+    assert service.get_search_stats()["providers"]["fast"]["wins"] == 1
+
+
+def test_hedging_bounds_latency_of_a_stalled_provider():
+    """[Performance Test] 10 searches with a stalled first provider: sequential vs hedged."""
+    rounds = 10
+
+    async def timed(search: HedgedSearch) -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            assert await search.search(query="q") is not None
+        return (time.perf_counter() - start) / rounds * 1000
+
+    def run(hedge_delay: float | None, adaptive: bool) -> tuple[float, StubSearcher]:
+        stalled = StubSearcher("stalled", 0.3, error="Timeout")
+        search = HedgedSearch([("stalled", stalled), ("backup", StubSearcher("backup", 0.005))], hedge_delay, adaptive)
+        return asyncio.run(timed(search)), stalled
+
+    sequential_ms, sequential = run(None, adaptive=False)
+    hedged_ms, hedged = run(0.05, adaptive=False)
+    adaptive_ms, adaptive = run(0.05, adaptive=True)
+
+    print(f"\n[Performance Test] search latency with a stalled first provider ({rounds} searches)")
+    print(f"  sequential: {sequential_ms:.1f}ms/search, stall cancelled {sequential.cancelled}/{sequential.started}")
+    print(f"  hedged:     {hedged_ms:.1f}ms/search, stall cancelled {hedged.cancelled}/{hedged.started}")
+    print(f"  adaptive:   {adaptive_ms:.1f}ms/search, stalled provider started {adaptive.started}x")
+
+    # Sequential waits out the full stall every time; hedging cancels it once the backup answers.
+    assert (sequential.started, sequential.cancelled) == (rounds, 0)
+    assert (hedged.started, hedged.cancelled) == (rounds, rounds)
+    # Adaptive ordering moves the measured backup first after one search, so the stall is never launched again.
+    assert adaptive.started == 1
@@ -272,6 +272,8 @@ def _create_provider(config):
         return DockerProvider(
             image=config.docker.image,
             mount_path=config.docker.mount_path,
+            docker_host=config.docker.docker_host,
+            transport=config.docker.transport,
         )
 
     elif config.provider == "e2b":
@@ -104,6 +104,8 @@ class SandboxManagerApp(App):
                     providers["docker"] = DockerProvider(
                         image=config.docker.image,
                         mount_path=config.docker.mount_path,
+                        docker_host=config.docker.docker_host,
+                        transport=config.docker.transport,
                     )
                 elif config.provider == "e2b":
                     from sandbox.providers.e2b import E2BProvider